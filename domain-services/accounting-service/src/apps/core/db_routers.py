@@ -0,0 +1,89 @@
+# apps/core/db_routers.py
+from django.db import DEFAULT_DB_ALIAS
+
+from .services.read_replicas import get_read_replicas, replica_reads_allowed, stop_replica_reads
+from .services.tenant_sharding import get_shard_directory, is_tenant_model
+from .tenant_context import get_current_tenant_id
+
+
+class TenantShardRouter:
+    """
+    Envoie les lectures et écritures des modèles multi-tenants au shard de
+    leur tenant (voir services.tenant_sharding).
+
+    Le tenant est, dans l'ordre :
+    - l'indication tenant_id des querysets for_tenant() et tenant_objects ;
+    - le tenant_id de l'instance enregistrée, supprimée ou dont on suit une relation ;
+    - le tenant courant (apps.core.tenant_context).
+
+    Sans tenant, ou avec un seul shard, le routeur n'exprime aucun choix :
+    la requête va sur 'default', sauf using() explicite. Toutes les
+    migrations s'appliquent à tous les shards.
+    """
+
+    def tenant_alias(self, model, hints):
+        if not is_tenant_model(model):
+            return None
+        directory = get_shard_directory()
+        if not directory.is_sharded:
+            return None
+        tenant_id = hints.get('tenant_id')
+        if tenant_id is None:
+            tenant_id = getattr(hints.get('instance'), 'tenant_id', None)
+        if tenant_id is None:
+            tenant_id = get_current_tenant_id()
+        if tenant_id is None:
+            return None
+        return directory.alias_for(tenant_id)
+
+    def db_for_read(self, model, **hints):
+        return self.tenant_alias(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self.tenant_alias(model, hints)
+
+
+class ReadReplicaRouter(TenantShardRouter):
+    """
+    Routeur des shards, dont les lectures des actions sûres vont sur un
+    réplica de la base primaire (voir services.read_replicas).
+
+    Sans READ_REPLICAS, il se comporte comme TenantShardRouter. Une instance
+    lue sur un réplica est enregistrée sur son primaire, et peut être reliée
+    aux instances de ce primaire ; les migrations ne s'appliquent pas aux
+    réplicas.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = super().db_for_read(model, **hints)
+        replicas = get_read_replicas()
+        if not replicas.enabled or not replica_reads_allowed():
+            return alias
+        if alias is None:
+            instance_db = getattr(getattr(hints.get('instance'), '_state', None), 'db', None)
+            alias = replicas.selector.primary_of(instance_db or DEFAULT_DB_ALIAS)
+        return replicas.selector.read_alias(alias)
+
+    def db_for_write(self, model, **hints):
+        alias = super().db_for_write(model, **hints)
+        replicas = get_read_replicas()
+        if not replicas.enabled:
+            return alias
+        # Lectures suivantes de la requête sur le primaire : lire ses propres écritures
+        stop_replica_reads()
+        if alias is None:
+            instance_db = getattr(getattr(hints.get('instance'), '_state', None), 'db', None)
+            if instance_db is not None and replicas.selector.is_replica(instance_db):
+                return replicas.selector.primary_of(instance_db)
+        return alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        selector = get_read_replicas().selector
+        if selector.primary_of(obj1._state.db) == selector.primary_of(obj2._state.db):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if get_read_replicas().selector.is_replica(db):
+            return False
+        return None
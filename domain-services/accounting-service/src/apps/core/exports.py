@@ -0,0 +1,123 @@
+# apps/core/exports.py
+"""
+Exports en flux des listes de l'API (CSV, NDJSON, XLSX).
+
+Les lignes sont des dictionnaires lus par morceaux depuis la base
+(QuerySet.iterator(chunk_size=...), curseur côté serveur sous PostgreSQL) :
+la mémoire utilisée ne dépend pas du nombre de lignes exportées.
+
+- csv, ndjson : écrits ligne par ligne dans une StreamingHttpResponse ;
+- xlsx : classeur openpyxl en mode write_only (dépendance facultative),
+  dont les lignes sont écrites au fur et à mesure dans un fichier
+  temporaire, renvoyé ensuite par morceaux (FileResponse).
+"""
+import csv
+import datetime
+import tempfile
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, StreamingHttpResponse
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - dépendance facultative
+    openpyxl = None
+
+# Nombre de lignes lues par aller-retour avec la base
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class ExportError(Exception):
+    """Format d'export inconnu ou indisponible"""
+
+
+class Echo:
+    """Pseudo-fichier pour csv.writer : renvoie la ligne écrite au lieu de la stocker"""
+
+    def write(self, value):
+        return value
+
+
+def text_cell(value):
+    """Valeur d'une cellule CSV : vide pour None, ISO 8601 pour les dates"""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def xlsx_cell(value):
+    """Valeur d'une cellule XLSX : les UUID en texte, les dates et heures sans fuseau (UTC)"""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def csv_stream(keys, rows):
+    """En-tête puis une ligne par dictionnaire"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(keys)
+    for row in rows:
+        yield writer.writerow([text_cell(row.get(key)) for key in keys])
+
+
+def ndjson_stream(keys, rows):
+    """Une ligne JSON par dictionnaire"""
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def xlsx_file(keys, rows, title):
+    """Classeur d'une feuille écrit en mode write_only dans un fichier temporaire"""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title[:31])
+    sheet.append(keys)
+    for row in rows:
+        sheet.append([xlsx_cell(row.get(key)) for key in keys])
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def check_export_format(export_format):
+    """
+    Raises:
+        ExportError: Si le format est inconnu, ou xlsx sans openpyxl installé
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(f"export doit être parmi: {', '.join(EXPORT_FORMATS)}")
+    if export_format == 'xlsx' and openpyxl is None:
+        raise ExportError("L'export xlsx nécessite openpyxl, qui n'est pas installé")
+
+
+def export_response(export_format, keys, rows, filename):
+    """
+    Réponse HTTP d'un export.
+
+    Args:
+        export_format (str): csv, ndjson ou xlsx (voir check_export_format)
+        keys (list): Colonnes exportées, dans l'ordre
+        rows (iterable): Dictionnaires, consommés une seule fois
+        filename (str): Nom du fichier, sans extension
+    """
+    if export_format == 'xlsx':
+        return FileResponse(
+            xlsx_file(keys, rows, filename), as_attachment=True, filename=f"{filename}.xlsx",
+            content_type=EXPORT_FORMATS['xlsx']
+        )
+    stream = csv_stream(keys, rows) if export_format == 'csv' else ndjson_stream(keys, rows)
+    response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,90 @@
+import os
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.models.account import AccountClass
+from apps.core.services.tenant_backup import DEFAULT_BATCH_SIZE, dump_tenants
+
+FORMATS = {
+    'ndjson.gz': '.ndjson.gz',
+    'ndjson': '.ndjson',
+    'json': '.json',
+}
+
+
+class Command(BaseCommand):
+    help = ("Sauvegarde en flux le plan comptable, les tiers et les exercices de tenants "
+            "(NDJSON compressé par tenant ou tableau JSON au format dumpdata)")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            action='append',
+            default=[],
+            help='UUID d\'un tenant à sauvegarder (option répétable)'
+        )
+        parser.add_argument(
+            '--all-tenants',
+            action='store_true',
+            help='Sauvegarder tous les tenants possédant un plan comptable'
+        )
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            help='Répertoire recevant un fichier par tenant (<tenant>.ndjson.gz par défaut)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Fichier unique pour tous les tenants (format déduit de l\'extension : .json, .ndjson, .gz)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='ndjson.gz',
+            help='Format des fichiers écrits avec --output-dir (défaut: ndjson.gz)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de lignes lues par requête (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        if bool(options['output_dir']) == bool(options['output']):
+            raise CommandError("Indiquer soit --output-dir, soit --output")
+
+        tenant_ids = []
+        try:
+            for value in options['tenant_id']:
+                tenant_ids.append(uuid.UUID(value))
+        except ValueError:
+            raise CommandError(f"'{value}' n'est pas un UUID valide")
+        if options['all_tenants']:
+            tenant_ids.extend(
+                AccountClass.objects.exclude(tenant_id=None).order_by('tenant_id')
+                .values_list('tenant_id', flat=True).distinct()
+            )
+        tenant_ids = list(dict.fromkeys(tenant_ids))
+        if not tenant_ids:
+            raise CommandError("Aucun tenant : utiliser --tenant-id ou --all-tenants")
+
+        started = time.perf_counter()
+        total = 0
+        if options['output']:
+            total = dump_tenants(tenant_ids, options['output'], options['batch_size'])
+            self.stdout.write(f"{options['output']}: {total} enregistrements")
+        else:
+            os.makedirs(options['output_dir'], exist_ok=True)
+            extension = FORMATS[options['format']]
+            for tenant_id in tenant_ids:
+                path = os.path.join(options['output_dir'], f"{tenant_id}{extension}")
+                count = dump_tenants([tenant_id], path, options['batch_size'])
+                total += count
+                self.stdout.write(f"{path}: {count} enregistrements")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sauvegarde terminée: {len(tenant_ids)} tenants, {total} enregistrements "
+            f"en {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,44 @@
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.services.classification import classifier
+from apps.core.management.commands._classification_reference import reference_classification
+
+# Longueurs de code mesurées
+CODE_LENGTHS = (1, 2, 4, 8, 16, 32)
+
+
+def measure(function, codes):
+    """Retourne le temps moyen par code, en nanosecondes"""
+    started = time.perf_counter()
+    for code in codes:
+        function(code)
+    return (time.perf_counter() - started) / len(codes) * 1e9
+
+
+class Command(BaseCommand):
+    help = ("Compare le coût par code de la classification OHADA (trie compilé) "
+            "et de l'ancienne chaîne de conditions, pour des codes de longueurs croissantes")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--codes',
+            type=int,
+            default=100000,
+            help='Nombre de codes par mesure (défaut: 100000)'
+        )
+
+    def handle(self, *args, **options):
+        if options['codes'] < 1:
+            raise CommandError("--codes doit être positif")
+
+        rng = random.Random(0)
+        self.stdout.write(f"Profondeur du trie: {classifier.depth}")
+        self.stdout.write(f"{'longueur':>8} {'trie (ns)':>10} {'lookup (ns)':>12} {'if/elif (ns)':>13}")
+        for length in CODE_LENGTHS:
+            codes = [''.join(rng.choice('0123456789') for _ in range(length)) for _ in range(options['codes'])]
+            self.stdout.write(
+                f"{length:>8} {measure(classifier.classify, codes):>10.0f} "
+                f"{measure(classifier.lookup, codes):>12.0f} "
+                f"{measure(reference_classification, codes):>13.0f}"
+            )
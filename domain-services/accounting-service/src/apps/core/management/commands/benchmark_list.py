@@ -0,0 +1,80 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from apps.core.models.account import Account
+from apps.core.serializers.account_serializers import AccountSerializer
+from apps.core.services.account_hierarchy import rebuild_hierarchy
+from apps.core.tenant_context import tenant_context
+from apps.core.views.account_views import AccountViewSet
+
+
+class Command(BaseCommand):
+    help = "Mesure le rendu de la liste des comptes : sérialiseur, sérialiseur avec jointures, liste .values()"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Nombre de sous-comptes générés en plus du plan OHADA (défaut: 10000)'
+        )
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1:
+            raise CommandError("--rows doit être positif")
+
+        tenant_id = uuid.uuid4()
+        with transaction.atomic():
+            count = self.setup_tenant(tenant_id, options['rows'])
+            self.stdout.write(f"Base: {connection.vendor}, {count} comptes, liste non paginée")
+
+            def serializer_without_joins():
+                accounts = Account.objects.filter(tenant_id=tenant_id).order_by('code')
+                return JSONRenderer().render(AccountSerializer(accounts, many=True).data)
+
+            cases = [
+                ("sérialiseur sans jointures", serializer_without_joins),
+                ("sérialiseur + select_related", lambda: self.render_list(tenant_id, list_values=None)),
+                ("values() + FastJSONRenderer", lambda: self.render_list(tenant_id)),
+            ]
+            reference = None
+            for label, render in cases:
+                queries = []
+                with connection.execute_wrapper(lambda execute, *args: queries.append(1) or execute(*args)):
+                    started = time.perf_counter()
+                    content = render()
+                    elapsed = time.perf_counter() - started
+                reference = reference or elapsed
+                self.stdout.write(
+                    f"{label:<30} {elapsed * 1000:9.1f} ms  {len(queries):6d} requêtes  "
+                    f"x{reference / elapsed:.1f}  ({len(content)} octets)"
+                )
+            transaction.set_rollback(True)
+
+    def setup_tenant(self, tenant_id, rows):
+        """Plan OHADA complété de sous-comptes rattachés aux comptes de détail"""
+        Account.create_default_accounts_ohada(tenant_id)
+        leaves = list(Account.objects.filter(tenant_id=tenant_id, descendant_count=0).order_by('code'))
+        Account.objects.bulk_create([
+            Account(
+                tenant_id=tenant_id, code=f"{leaf.code}{number:05d}", name=f"{leaf.name} - {number}",
+                account_class_id=leaf.account_class_id, category_id=leaf.category_id, parent=leaf,
+                level=leaf.level + 1, type=leaf.type, normal_balance=leaf.normal_balance
+            )
+            for number in range(rows) for leaf in [leaves[number % len(leaves)]]
+        ], batch_size=2000)
+        rebuild_hierarchy(tenant_id)
+        return Account.objects.filter(tenant_id=tenant_id).count()
+
+    def render_list(self, tenant_id, **initkwargs):
+        """Liste des comptes via AccountViewSet, sans pagination, rendue en JSON"""
+        view = AccountViewSet.as_view({'get': 'list'}, pagination_class=None, **initkwargs)
+        request = APIRequestFactory().get('/api/accounting/accounts/')
+        request.tenant_id = tenant_id
+        with tenant_context(tenant_id):
+            response = view(request)
+            response.render()
+        return response.content
@@ -0,0 +1,91 @@
+import statistics
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+from apps.core.models.account import Account
+from apps.core.models.tiers import Tiers
+from apps.core.pagination import KeysetPagination
+from apps.core.tenant_context import tenant_context
+from apps.core.views.tiers_views import TiersViewSet
+
+
+class Command(BaseCommand):
+    help = "Compare le coût d'une page lointaine et de la première page, par numéro de page et par curseur"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=50000,
+            help='Nombre de tiers générés (défaut: 50000)'
+        )
+        parser.add_argument(
+            '--page',
+            type=int,
+            default=1000,
+            help='Numéro de la page lointaine (défaut: 1000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Nombre de mesures par cas, la médiane est retenue (défaut: 5)'
+        )
+
+    def handle(self, *args, **options):
+        page_size = KeysetPagination.page_size
+        if options['repeat'] < 1 or options['page'] < 2:
+            raise CommandError("--repeat doit être positif et --page au moins 2")
+        if options['rows'] < options['page'] * page_size:
+            raise CommandError(f"--rows doit couvrir la page demandée ({options['page'] * page_size} lignes au moins)")
+
+        tenant_id = uuid.uuid4()
+        with transaction.atomic():
+            self.setup_tenant(tenant_id, options['rows'])
+            paginator = KeysetPagination()
+            keyset = ['code', 'id']
+            last_row = Tiers.objects.filter(tenant_id=tenant_id).order_by(*keyset)[
+                (options['page'] - 1) * page_size - 1
+            ]
+            cursor = paginator.encode_cursor(keyset, last_row, False)
+
+            cases = [
+                ("page 1", {}),
+                (f"page {options['page']}", {'page': options['page']}),
+                ("page 1 sans total", {'count': 'none'}),
+                (f"page {options['page']} sans total", {'page': options['page'], 'count': 'none'}),
+                ("curseur, page 1", {'pagination': 'cursor'}),
+                (f"curseur, page {options['page']}", {'cursor': cursor}),
+            ]
+            self.stdout.write(f"Base: {connection.vendor}, {options['rows']} tiers, {page_size} lignes par page")
+            for label, params in cases:
+                elapsed = self.measure(tenant_id, params, options['repeat'])
+                self.stdout.write(f"{label:<30} {elapsed * 1000:8.2f} ms")
+            transaction.set_rollback(True)
+
+    def setup_tenant(self, tenant_id, rows):
+        """Plan OHADA et tiers numérotés rattachés à un même compte"""
+        Account.create_default_accounts_ohada(tenant_id)
+        account = Account.objects.filter(tenant_id=tenant_id).order_by('code').first()
+        Tiers.objects.bulk_create([
+            Tiers(tenant_id=tenant_id, code=f"T{number:07d}", name=f"Tiers {number}", account=account, type='OTHER')
+            for number in range(rows)
+        ], batch_size=2000)
+
+    def measure(self, tenant_id, params, repeat):
+        """Durée médiane d'un appel à la liste des tiers"""
+        factory = APIRequestFactory()
+        view = TiersViewSet.as_view({'get': 'list'})
+        durations = []
+        for _ in range(repeat):
+            request = factory.get('/api/accounting/tiers/', params)
+            request.tenant_id = tenant_id
+            with tenant_context(tenant_id):
+                started = time.perf_counter()
+                response = view(request)
+            durations.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise CommandError(f"Réponse {response.status_code} pour {params}: {response.data}")
+        return statistics.median(durations)
@@ -0,0 +1,115 @@
+import datetime
+import random
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.core.models.account import Account
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.journal import Journal
+from apps.core.services.ledger_posting import DEFAULT_BATCH_SIZE, LedgerPoster
+
+# Objectif de débit en lignes par seconde (PostgreSQL local)
+TARGET_LINES_PER_SECOND = 10000
+
+
+class Command(BaseCommand):
+    help = "Mesure le débit de passation des écritures par lots sur un tenant temporaire"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entries',
+            type=int,
+            default=5000,
+            help='Nombre d\'écritures générées (défaut: 5000)'
+        )
+        parser.add_argument(
+            '--lines-per-entry',
+            type=int,
+            default=2,
+            help='Nombre de lignes par écriture (défaut: 2)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de lignes insérées par requête (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Graine du générateur aléatoire (défaut: 0)'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Conserver le tenant et les écritures générés (par défaut tout est annulé)'
+        )
+
+    def handle(self, *args, **options):
+        if options['entries'] < 1 or options['lines_per_entry'] < 2 or options['batch_size'] < 1:
+            raise CommandError("--entries et --batch-size doivent être positifs, --lines-per-entry au moins 2")
+
+        tenant_id = uuid.uuid4()
+        with transaction.atomic():
+            year = self.setup_tenant(tenant_id)
+            entries = self.generate_entries(tenant_id, year, options)
+
+            poster = LedgerPoster(tenant_id, batch_size=options['batch_size'])
+            started = time.perf_counter()
+            poster.load_references()
+            loaded = time.perf_counter()
+            poster.prepare(entries)
+            prepared = time.perf_counter()
+            poster.insert()
+            inserted = time.perf_counter()
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        lines = len(poster.lines)
+        elapsed = inserted - started
+        rate = lines / elapsed if elapsed else 0
+        self.stdout.write(f"Base: {connection.vendor}")
+        self.stdout.write(f"Écritures: {len(poster.entries)}, lignes: {lines}")
+        self.stdout.write(f"Chargement des références: {loaded - started:.3f}s")
+        self.stdout.write(f"Validation en mémoire: {prepared - loaded:.3f}s")
+        self.stdout.write(f"Insertion: {inserted - prepared:.3f}s")
+        message = f"{rate:.0f} lignes/s (objectif: {TARGET_LINES_PER_SECOND} lignes/s sur PostgreSQL)"
+        if rate >= TARGET_LINES_PER_SECOND:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.WARNING(message))
+        if options['keep']:
+            self.stdout.write(f"Tenant conservé: {tenant_id}")
+
+    def setup_tenant(self, tenant_id):
+        """Plan OHADA, journal d'opérations diverses et exercice mensualisé"""
+        Account.create_default_accounts_ohada(tenant_id)
+        Journal.objects.create(tenant_id=tenant_id, code="OD", name="Opérations diverses")
+        today = datetime.date.today()
+        year = FiscalYear.objects.create(
+            tenant_id=tenant_id, name=f"Exercice {today.year}", code=f"FY{today.year}",
+            start_date=datetime.date(today.year, 1, 1), end_date=datetime.date(today.year, 12, 31)
+        )
+        year.create_periods()
+        return year
+
+    def generate_entries(self, tenant_id, year, options):
+        """Écritures équilibrées aléatoires sur les comptes de détail du tenant"""
+        rng = random.Random(options['seed'])
+        codes = list(Account.objects.filter(tenant_id=tenant_id, descendant_count=0).values_list('code', flat=True))
+        days = (year.end_date - year.start_date).days
+        entries = []
+        for number in range(options['entries']):
+            amounts = [rng.randint(100, 1000000) for _ in range(options['lines_per_entry'] - 1)]
+            lines = [{'account': rng.choice(codes), 'debit': f"{amount / 100:.2f}"} for amount in amounts]
+            lines.append({'account': rng.choice(codes), 'credit': f"{sum(amounts) / 100:.2f}"})
+            entries.append({
+                'journal': "OD",
+                'date': year.start_date + datetime.timedelta(days=rng.randint(0, days)),
+                'reference': f"BENCH-{number:06d}",
+                'lines': lines,
+            })
+        return entries
@@ -0,0 +1,65 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.core.middleware.tenant_middleware import TenantMiddleware
+from apps.core.models.tenant import Tenant
+from apps.core.services.tenant_resolution import get_tenant_cache
+
+
+class Command(BaseCommand):
+    help = "Mesure le coût par requête de TenantMiddleware (en-tête, jeton JWT, cache froid)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20000,
+            help='Nombre de requêtes par cas (défaut: 20000)'
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests doit être positif")
+
+        with transaction.atomic(), override_settings(
+            DEFAULT_TENANT_ID=None, TRUST_TENANT_HEADER=True, TENANT_RESOLUTION={'RESOLVER': 'table', 'TTL': 3600}
+        ):
+            tenant = Tenant.objects.create(name="Benchmark")
+            user = get_user_model().objects.create_user(username=f"benchmark-{tenant.pk}")
+            token = AccessToken.for_user(user)
+            token['tenant_id'] = str(tenant.pk)
+
+            middleware = TenantMiddleware(lambda request: HttpResponse())
+            factory = RequestFactory()
+            url = '/api/accounting/accounts/'
+            cache = get_tenant_cache()
+            cases = [
+                ("sans middleware", factory.get(url), None),
+                ("en-tête, cache chaud", factory.get(url, HTTP_X_TENANT_ID=str(tenant.pk)), None),
+                ("jeton JWT, cache chaud", factory.get(url, HTTP_AUTHORIZATION=f"Bearer {token}"), None),
+                ("en-tête, cache froid", factory.get(url, HTTP_X_TENANT_ID=str(tenant.pk)), cache.invalidate),
+            ]
+            self.stdout.write(f"Base: {connection.vendor}, {options['requests']} requêtes par cas")
+
+            reference = None
+            for label, request, before_each in cases:
+                handler = middleware if label != "sans middleware" else middleware.get_response
+                handler(request)
+                queries = []
+                with connection.execute_wrapper(lambda execute, *args: queries.append(1) or execute(*args)):
+                    started = time.perf_counter()
+                    for _ in range(options['requests']):
+                        if before_each:
+                            before_each()
+                        handler(request)
+                    elapsed = (time.perf_counter() - started) / options['requests'] * 1e6
+                reference = elapsed if reference is None else reference
+                self.stdout.write(
+                    f"{label:<24} {elapsed:8.1f} µs/requête  (+{elapsed - reference:7.1f} µs)  "
+                    f"{len(queries) / options['requests']:.1f} requête(s) SQL"
+                )
+            transaction.set_rollback(True)
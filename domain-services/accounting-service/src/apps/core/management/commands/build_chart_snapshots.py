@@ -0,0 +1,58 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from apps.core.services.chart_snapshot import (
+    KIND_NESTED, ChartSnapshot, SnapshotError, compile_chart, snapshot_path_for, source_digest
+)
+
+DEFAULT_CHARTS = ['plan_comptable_ohada.json', 'plan_comptable_ohada_8chiffres.json']
+
+
+class Command(BaseCommand):
+    help = 'Compile les plans comptables JSON en snapshots binaires (.chart) pour le provisionnement'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            type=str,
+            action='append',
+            help='Fichier JSON ou NDJSON à compiler (répétable ; par défaut les plans OHADA livrés dans data/)'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Vérifier que les snapshots existent et sont à jour, sans les recompiler'
+        )
+
+    def handle(self, *args, **options):
+        files = options['file'] or [
+            os.path.join(settings.BASE_DIR, 'data', name) for name in DEFAULT_CHARTS
+        ]
+
+        stale = []
+        for source_path in files:
+            if not os.path.exists(source_path):
+                raise CommandError(f"Le fichier {source_path} n'existe pas")
+
+            if options['check']:
+                try:
+                    ChartSnapshot.open(snapshot_path_for(source_path), source_digest(source_path))
+                except SnapshotError as e:
+                    stale.append(source_path)
+                    self.stdout.write(self.style.WARNING(str(e)))
+                else:
+                    self.stdout.write(f"À jour: {snapshot_path_for(source_path)}")
+                continue
+
+            try:
+                path, kind, count = compile_chart(source_path)
+            except Exception as e:
+                raise CommandError(f"Erreur lors de la compilation de {source_path}: {str(e)}")
+
+            description = "plan imbriqué" if kind == KIND_NESTED else "plan à plat"
+            self.stdout.write(self.style.SUCCESS(
+                f"{path}: {count} comptes ({description}, {os.path.getsize(path)} octets)"
+            ))
+
+        if stale:
+            raise CommandError(f"{len(stale)} snapshot(s) absent(s) ou périmé(s), relancer build_chart_snapshots")
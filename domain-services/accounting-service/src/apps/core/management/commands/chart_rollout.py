@@ -0,0 +1,152 @@
+import os
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.models.account import AccountClass
+from apps.core.services.chart_import import DEFAULT_BATCH_SIZE
+from apps.core.services.tenant_runner import ACTIONS, IMPORT_COMMANDS, TenantRunner, default_chart_file
+from apps.core.services.tenant_sharding import get_shard_directory
+
+
+class Command(BaseCommand):
+    help = ("Importe, synchronise ou reclasse le plan comptable de nombreux tenants en parallèle "
+            "(un processus et une transaction par tenant, reprise possible)")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action',
+            choices=ACTIONS,
+            help="Opération à exécuter pour chaque tenant"
+        )
+        parser.add_argument(
+            '--tenant-id',
+            action='append',
+            default=[],
+            help='UUID d\'un tenant (option répétable)'
+        )
+        parser.add_argument(
+            '--tenants-file',
+            type=str,
+            help='Fichier contenant un UUID de tenant par ligne (lignes vides et # ignorées)'
+        )
+        parser.add_argument(
+            '--all-tenants',
+            action='store_true',
+            help='Traiter tous les tenants possédant déjà un plan comptable'
+        )
+        parser.add_argument(
+            '--command',
+            choices=IMPORT_COMMANDS,
+            default='import_ohada_8chiffres',
+            help='Commande d\'import utilisée pour import et sync (défaut: import_ohada_8chiffres)'
+        )
+        parser.add_argument(
+            '--file',
+            type=str,
+            help='Fichier du plan comptable pour import et sync (défaut: plan OHADA à 8 chiffres)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Nombre de processus (défaut: nombre de CPU ; 1 pour tout exécuter dans ce processus)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de comptes écrits par requête (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            help='Fichier de reprise : les tenants déjà traités avec succès sont ignorés'
+        )
+        parser.add_argument(
+            '--with-type',
+            action='store_true',
+            help='reclassify : recalculer aussi le type du compte'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='sync et reclassify : calculer les modifications sans rien écrire en base'
+        )
+
+    def get_tenants(self, options):
+        """Liste ordonnée et dédoublonnée des tenants à traiter"""
+        values = list(options['tenant_id'])
+        if options['tenants_file']:
+            if not os.path.exists(options['tenants_file']):
+                raise CommandError(f"Le fichier {options['tenants_file']} n'existe pas")
+            with open(options['tenants_file'], 'r', encoding='utf-8') as file:
+                for line in file:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        values.append(line)
+        if options['all_tenants']:
+            # Tenants ayant un plan comptable, sur chaque shard
+            for alias in get_shard_directory().shards:
+                values.extend(
+                    str(tenant_id) for tenant_id in AccountClass.objects.using(alias).exclude(tenant_id=None)
+                    .order_by('tenant_id').values_list('tenant_id', flat=True).distinct()
+                )
+
+        tenants = {}
+        for value in values:
+            try:
+                tenants.setdefault(str(uuid.UUID(value)), None)
+            except ValueError:
+                raise CommandError(f"'{value}' n'est pas un UUID valide")
+        return list(tenants)
+
+    def handle(self, *args, **options):
+        action = options['action']
+        if options['dry_run'] and action == 'import':
+            raise CommandError("--dry-run n'est disponible que pour sync et reclassify")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être supérieur à 0")
+        if options['workers'] < 1:
+            raise CommandError("--workers doit être supérieur à 0")
+
+        tenants = self.get_tenants(options)
+        if not tenants:
+            raise CommandError("Aucun tenant : utiliser --tenant-id, --tenants-file ou --all-tenants")
+
+        chart_file = options['file'] or default_chart_file()
+        if action != 'reclassify' and not os.path.exists(chart_file):
+            raise CommandError(f"Le fichier {chart_file} n'existe pas")
+
+        tasks = [{
+            'action': action,
+            'tenant_id': tenant_id,
+            'command': options['command'],
+            'file': os.path.abspath(chart_file),
+            'batch_size': options['batch_size'],
+            'with_type': options['with_type'],
+            'dry_run': options['dry_run'],
+        } for tenant_id in tenants]
+
+        self.stdout.write(f"{action}: {len(tasks)} tenants, {options['workers']} processus")
+        runner = TenantRunner(tasks, options['workers'], options['checkpoint'], on_result=self.report)
+        summary = runner.run()
+
+        if summary['skipped']:
+            self.stdout.write(f"{summary['skipped']} tenants déjà traités (reprise)")
+        for failure in summary['failures']:
+            self.stdout.write(self.style.ERROR(f"  {failure['tenant_id']}: {failure['error']}"))
+
+        message = (
+            f"{summary['ok']} tenants traités, {summary['failed']} en échec, {summary['rows']} comptes "
+            f"en {summary['elapsed']:.2f}s ({summary['tenants_per_second']:.1f} tenants/s, "
+            f"{summary['rows_per_second']:.0f} comptes/s)"
+        )
+        if summary['failed']:
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def report(self, result):
+        """Affiche le résultat d'un tenant dès sa réception"""
+        if result['status'] == 'ok':
+            self.stdout.write(f"[ok] {result['tenant_id']}: {result['rows']} comptes en {result['elapsed']:.2f}s")
+        else:
+            self.stdout.write(self.style.ERROR(f"[échec] {result['tenant_id']}: {result['error']}"))
@@ -0,0 +1,62 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from apps.core.services.tenant_clone import TenantCloneError, clone_tenant
+
+
+class Command(BaseCommand):
+    help = "Provisionne un tenant en copiant, côté base, le plan comptable, les exercices et les tiers d'un tenant modèle"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            type=str,
+            required=True,
+            help='UUID du tenant à provisionner'
+        )
+        parser.add_argument(
+            '--template-tenant-id',
+            type=str,
+            help='UUID du tenant modèle (par défaut: TEMPLATE_TENANT_ID des settings)'
+        )
+        parser.add_argument(
+            '--no-fiscal',
+            action='store_true',
+            help='Ne pas copier les exercices et périodes fiscales'
+        )
+        parser.add_argument(
+            '--no-tiers',
+            action='store_true',
+            help='Ne pas copier les tiers par défaut'
+        )
+
+    def handle(self, *args, **options):
+        template_tenant_id = options['template_tenant_id'] or settings.TEMPLATE_TENANT_ID
+        if not template_tenant_id:
+            raise CommandError("Aucun tenant modèle: utiliser --template-tenant-id ou TEMPLATE_TENANT_ID")
+
+        try:
+            tenant_uuid = uuid.UUID(options['tenant_id'])
+            template_uuid = uuid.UUID(str(template_tenant_id))
+        except ValueError as e:
+            raise CommandError(f"UUID invalide: {str(e)}")
+
+        if tenant_uuid == template_uuid:
+            raise CommandError("Le tenant cible doit être différent du tenant modèle")
+
+        started = time.perf_counter()
+        try:
+            stats = clone_tenant(
+                template_uuid, tenant_uuid,
+                include_fiscal=not options['no_fiscal'],
+                include_tiers=not options['no_tiers']
+            )
+        except TenantCloneError as e:
+            raise CommandError(str(e))
+
+        for name, count in stats.items():
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Tenant {tenant_uuid} provisionné depuis {template_uuid} en {time.perf_counter() - started:.2f}s"
+        ))
@@ -1,10 +1,14 @@
-import json
 import os
 import uuid
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from django.db import transaction
 from apps.core.models.account import AccountClass, AccountCategory, Account, AccountType
+from apps.core.services.chart_import import ChartImporter, DEFAULT_BATCH_SIZE
+from apps.core.services.chart_snapshot import load_chart_index
+from apps.core.services.chart_sync import ChartSynchronizer, sync_summary
+from apps.core.services.tenant_sharding import shard_for_tenant
+from apps.core.services.classification import classify, classification_fields
 
 
 class Command(BaseCommand):
@@ -20,13 +24,30 @@ class Command(BaseCommand):
         parser.add_argument(
             '--file',
             type=str,
-            help='Chemin vers le fichier JSON (facultatif, utilise le fichier par défaut si non spécifié)'
+            help='Chemin vers le fichier JSON ou NDJSON (facultatif, utilise le fichier par défaut si non spécifié)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de comptes écrits par requête (défaut: {DEFAULT_BATCH_SIZE})'
         )
         parser.add_argument(
             '--replace',
             action='store_true',
             help='Supprimer tous les comptes existants avant import'
         )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Synchroniser avec le plan existant : ajouter, mettre à jour les champs modifiés, '
+                 'désactiver les comptes absents du fichier (sans suppression)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Analyser et valider le fichier sans rien écrire en base (avec --sync : afficher les différences)'
+        )
 
     def handle(self, *args, **options):
         tenant_id = options['tenant_id']
@@ -34,6 +55,11 @@ class Command(BaseCommand):
             tenant_uuid = uuid.UUID(tenant_id)
         except ValueError:
             raise CommandError(f"'{tenant_id}' n'est pas un UUID valide")
+        # Base qui porte les données du tenant (voir services.tenant_sharding)
+        using = shard_for_tenant(tenant_uuid)
+
+        if options['sync'] and options['replace']:
+            raise CommandError("--sync ne peut pas être combiné avec une suppression des comptes existants")
 
         # Déterminer le chemin du fichier
         if options.get('file'):
@@ -50,99 +76,84 @@ class Command(BaseCommand):
             raise CommandError(f"Le fichier {json_file_path} n'existe pas")
 
         try:
-            # Lire le fichier JSON
-            with open(json_file_path, 'r', encoding='utf-8') as file:
-                accounts_data = json.load(file)
+            # Lecture du fichier en une passe : index code -> libellé et hiérarchie
+            index = load_chart_index(json_file_path, log=self.stdout.write)
+            for message in index.validate():
+                self.stdout.write(self.style.WARNING(message))
+
+            if options['sync']:
+                stats = self.sync_accounts(index, tenant_uuid, options['batch_size'], options['dry_run'])
+                for line in sync_summary(stats):
+                    self.stdout.write(line)
+                self.stdout.write(self.style.SUCCESS(
+                    "Simulation terminée, aucune donnée modifiée." if options['dry_run'] else
+                    f"Synchronisation terminée en {stats['elapsed']:.2f}s."
+                ))
+                return
+
+            if options['dry_run']:
+                for line in index.summary():
+                    self.stdout.write(line)
+                self.stdout.write(self.style.SUCCESS("Simulation terminée, aucune donnée modifiée."))
+                return
 
             # Supprimer les comptes existants si demandé
             if options['replace']:
                 self.stdout.write(self.style.WARNING(f"Suppression des comptes existants pour le tenant {tenant_id}..."))
-                with transaction.atomic():
-                    Account.objects.filter(tenant_id=tenant_uuid).delete()
-                    AccountCategory.objects.filter(tenant_id=tenant_uuid).delete()
-                    AccountClass.objects.filter(tenant_id=tenant_uuid).delete()
+                with transaction.atomic(using=using):
+                    Account.objects.using(using).filter(tenant_id=tenant_uuid).delete()
+                    AccountCategory.objects.using(using).filter(tenant_id=tenant_uuid).delete()
+                    AccountClass.objects.using(using).filter(tenant_id=tenant_uuid).delete()
 
             # Création des comptes
             self.stdout.write(self.style.SUCCESS(f"Début de l'importation des comptes à 8 chiffres..."))
             
             # Utiliser une transaction pour garantir l'intégrité des données
-            with transaction.atomic():
-                self.import_accounts(accounts_data, tenant_uuid)
+            with transaction.atomic(using=using):
+                stats = self.import_accounts(index, tenant_uuid, options['batch_size'])
 
-            self.stdout.write(self.style.SUCCESS(f"Importation terminée avec succès! {len(accounts_data)} comptes importés."))
+            self.stdout.write(self.style.SUCCESS(
+                f"Importation terminée avec succès! {stats['rows']} comptes importés "
+                f"en {stats['elapsed']:.2f}s ({stats['rows_per_second']:.0f} comptes/s)."
+            ))
 
         except Exception as e:
             raise CommandError(f"Erreur lors de l'importation: {str(e)}")
 
-    def import_accounts(self, accounts_data, tenant_id):
+    def import_accounts(self, index, tenant_id, batch_size=DEFAULT_BATCH_SIZE):
         """
-        Importe les comptes à partir des données JSON
+        Importe par lots les comptes d'un ChartIndex
         """
-        # Dictionnaire pour suivre les classes, catégories et comptes créés
-        classes = {}
-        categories = {}
-        parent_accounts = {}
-        
-        # Compter les comptes traités
-        count = 0
-        total = len(accounts_data)
-        
-        for account_data in accounts_data:
-            code = account_data['code']
-            name = account_data['libelle']
-            
-            count += 1
-            if count % 100 == 0:
-                self.stdout.write(f"Traitement: {count}/{total} comptes...")
-            
-            # Déterminer la classe (premier chiffre)
-            class_number = int(code[0])
-            
-            # Créer ou récupérer la classe
-            if class_number not in classes:
-                class_name = self.get_class_name(class_number)
-                classes[class_number] = self.get_or_create_class(tenant_id, class_number, class_name)
-            
-            account_class = classes[class_number]
-            
-            # Déterminer le type de compte en fonction du code complet
-            account_type = self.get_account_type_detailed(code)
-            
-            # Déterminer la catégorie (2 premiers chiffres)
-            category_code = code[:2]
-            
-            # Créer ou récupérer la catégorie si elle n'existe pas
-            if category_code not in categories:
-                # Chercher un compte avec le même code de catégorie pour obtenir le libellé
-                category_name = self.find_category_name(accounts_data, category_code)
-                categories[category_code] = self.get_or_create_category(
-                    tenant_id, account_class, category_code, category_name
-                )
-            
-            category = categories[category_code]
-            
-            # Déterminer le niveau hiérarchique et le compte parent
-            level, parent_code = self.determine_level_and_parent(code)
-            
-            # Créer ou récupérer le compte parent si nécessaire
-            parent = None
-            if parent_code and parent_code in parent_accounts:
-                parent = parent_accounts[parent_code]
-            
-            # Créer le compte
-            account = self.create_account(
-                tenant_id=tenant_id,
-                code=code,
-                name=name,
-                account_class=account_class,
-                category=category,
-                account_type=account_type,
-                level=level,
-                parent=parent
-            )
-            
-            # Stocker le compte pour qu'il puisse servir de parent
-            parent_accounts[code] = account
+        importer = ChartImporter(
+            tenant_id=tenant_id,
+            classify=self.classify_account,
+            class_name=self.get_class_name,
+            batch_size=batch_size,
+            log=self.stdout.write
+        )
+        return importer.run(index)
+
+    def sync_accounts(self, index, tenant_id, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+        """
+        Synchronise le plan du tenant avec un ChartIndex (diff puis opérations groupées)
+        """
+        synchronizer = ChartSynchronizer(
+            tenant_id=tenant_id,
+            classify=self.classify_account,
+            class_name=self.get_class_name,
+            batch_size=batch_size,
+            log=self.stdout.write
+        )
+        return synchronizer.run(index, dry_run=dry_run)
+
+    def classify_account(self, code):
+        """
+        Retourne les champs de classification d'un compte : le type suit
+        get_account_type_detailed, le reste la classification OHADA détaillée
+        """
+        fields = classification_fields(classify(code))
+        fields['type'] = self.get_account_type_detailed(code)
+        return fields
 
     def get_class_name(self, class_number):
         """Retourne le nom de la classe basé sur le numéro"""
@@ -257,101 +268,3 @@ class Command(BaseCommand):
         else:
             # Comptes de classe 9 (analytiques): majoritairement Actif
             return AccountType.ASSET
-
-    def find_category_name(self, accounts_data, category_code):
-        """Cherche le libellé de la catégorie dans les données"""
-        # Chercher un compte qui a exactement ce code de catégorie
-        exact_match = next(
-            (a['libelle'] for a in accounts_data if a['code'][:2] == category_code and len(a['code'][:2]) == len(category_code)),
-            None
-        )
-        if exact_match:
-            return exact_match
-        
-        # Sinon, prendre le premier compte qui commence par ce code
-        for account in accounts_data:
-            if account['code'].startswith(category_code):
-                return f"Catégorie {category_code}"
-        
-        # Par défaut
-        return f"Catégorie {category_code}"
-
-    def determine_level_and_parent(self, code):
-        """
-        Détermine le niveau hiérarchique et le code du parent
-        en fonction de la longueur du code.
-        
-        Pour un code à 8 chiffres, on a plusieurs niveaux:
-        - Niveau 1: XX000000 (2 premiers chiffres)
-        - Niveau 2: XXXX0000 (4 premiers chiffres)
-        - Niveau 3: XXXXXX00 (6 premiers chiffres)
-        - Niveau 4: XXXXXXXX (tous les 8 chiffres)
-        """
-        if code[2:] == '000000':  # XX000000
-            return 1, None  # Premier niveau, pas de parent
-        elif code[4:] == '0000':  # XXXX0000
-            return 2, code[:2] + '000000'  # Deuxième niveau, parent de niveau 1
-        elif code[6:] == '00':    # XXXXXX00
-            return 3, code[:4] + '0000'  # Troisième niveau, parent de niveau 2
-        else:                     # XXXXXXXX
-            return 4, code[:6] + '00'  # Quatrième niveau, parent de niveau 3
-
-    def get_or_create_class(self, tenant_id, number, name):
-        """Crée ou récupère une classe de compte"""
-        account_class, created = AccountClass.objects.get_or_create(
-            tenant_id=tenant_id,
-            number=number,
-            defaults={'name': name}
-        )
-        
-        if created:
-            self.stdout.write(f"Classe créée: {number} - {name}")
-        
-        return account_class
-
-    def get_or_create_category(self, tenant_id, account_class, code, name):
-        """Crée ou récupère une catégorie de compte"""
-        category, created = AccountCategory.objects.get_or_create(
-            tenant_id=tenant_id,
-            code=code,
-            defaults={
-                'account_class': account_class,
-                'name': name
-            }
-        )
-        
-        if created:
-            self.stdout.write(f"Catégorie créée: {code} - {name}")
-        
-        return category
-
-    def create_account(self, tenant_id, code, name, account_class, category, account_type, level, parent=None):
-        """Crée un compte"""
-        # Vérifier si le compte existe déjà
-        try:
-            account = Account.objects.get(
-                tenant_id=tenant_id,
-                code=code
-            )
-            # Mettre à jour le compte existant
-            account.name = name
-            account.account_class = account_class
-            account.category = category
-            account.type = account_type
-            account.level = level
-            account.parent = parent
-            account.save()
-            return account
-        except Account.DoesNotExist:
-            # Créer un nouveau compte
-            account = Account.objects.create(
-                tenant_id=tenant_id,
-                code=code,
-                name=name,
-                account_class=account_class,
-                category=category,
-                type=account_type,
-                level=level,
-                parent=parent
-            )
-            return account
\ No newline at end of file
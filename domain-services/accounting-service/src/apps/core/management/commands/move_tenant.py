@@ -0,0 +1,75 @@
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from apps.core.services.tenant_move import DEFAULT_BATCH_SIZE, TenantMoveError, move_tenant
+
+
+class Command(BaseCommand):
+    help = ("Déplace un tenant vers un autre shard sans l'interrompre : copie groupée, gel des écritures, "
+            "rattrapage et vérification ligne à ligne, bascule de l'annuaire")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            type=str,
+            required=True,
+            help='UUID du tenant à déplacer'
+        )
+        parser.add_argument(
+            '--to',
+            type=str,
+            required=True,
+            help='Alias du shard cible (TENANT_SHARDING["SHARDS"])'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de lignes lues ou insérées par requête (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--wait',
+            type=float,
+            help="Délai de propagation de l'annuaire en secondes (défaut: DIRECTORY_TTL + 5)"
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Supprimer les données du tenant déjà présentes sur le shard cible'
+        )
+        parser.add_argument(
+            '--keep-source',
+            action='store_true',
+            help='Conserver les données sur le shard source après la bascule'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être supérieur à 0")
+        if options['wait'] is not None and options['wait'] < 0:
+            raise CommandError("--wait doit être positif")
+        try:
+            tenant_uuid = uuid.UUID(options['tenant_id'])
+        except ValueError as e:
+            raise CommandError(f"UUID invalide: {str(e)}")
+
+        try:
+            stats = move_tenant(
+                tenant_uuid, options['to'],
+                batch_size=options['batch_size'],
+                wait=options['wait'],
+                replace=options['replace'],
+                keep_source=options['keep_source'],
+                log=self.stdout.write
+            )
+        except (TenantMoveError, DatabaseError) as e:
+            raise CommandError(f"Déplacement interrompu, tenant conservé sur son shard: {str(e)}")
+
+        for name, count in stats['counts'].items():
+            if count:
+                self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Tenant {tenant_uuid} déplacé de '{stats['source']}' vers '{stats['target']}': "
+            f"{sum(stats['counts'].values())} lignes copiées, {stats['resynced']} rattrapées, "
+            f"en {stats['elapsed']:.2f}s"
+        ))
@@ -0,0 +1,74 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.core.models.account import Account, ChartVersion
+from apps.core.services.account_hierarchy import DEFAULT_BATCH_SIZE, HierarchyError, rebuild_hierarchy
+from apps.core.services.tenant_sharding import get_shard_directory, shard_for_tenant
+
+
+class Command(BaseCommand):
+    help = "Recalcule l'index hiérarchique des comptes (chemin matérialisé, profondeur, nombre de descendants)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            type=str,
+            help='UUID du tenant à traiter (tous les tenants si non spécifié)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de comptes mis à jour par requête (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Compter les comptes dont l\'index est à corriger sans rien écrire'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être supérieur à 0")
+
+        if options['tenant_id']:
+            try:
+                tenant_uuid = uuid.UUID(options['tenant_id'])
+            except ValueError:
+                raise CommandError(f"'{options['tenant_id']}' n'est pas un UUID valide")
+            tenants = [(shard_for_tenant(tenant_uuid), tenant_uuid)]
+        else:
+            # Tenants de chaque shard, traités sur leur shard
+            tenants = [
+                (alias, tenant_id) for alias in get_shard_directory().shards
+                for tenant_id in Account.objects.using(alias).order_by('tenant_id').values_list(
+                    'tenant_id', flat=True).distinct()
+            ]
+
+        started = time.perf_counter()
+        total = updated = 0
+        for alias, tenant_id in tenants:
+            try:
+                with transaction.atomic(using=alias):
+                    stats = rebuild_hierarchy(tenant_id, options['batch_size'], using=alias, dry_run=options['check'])
+                    if stats['updated'] and not options['check']:
+                        ChartVersion.bump([tenant_id], alias)
+            except HierarchyError as e:
+                raise CommandError(f"Tenant {tenant_id}: {str(e)}")
+            total += stats['accounts']
+            updated += stats['updated']
+            if stats['updated']:
+                self.stdout.write(f"{tenant_id}: {stats['updated']} comptes sur {stats['accounts']}")
+
+        elapsed = time.perf_counter() - started
+        if options['check']:
+            message = f"{updated} comptes sur {total} ont un index à corriger."
+            if updated:
+                raise CommandError(message)
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Index reconstruit pour {len(tenants)} tenants: {updated} comptes corrigés sur {total} "
+                f"en {elapsed:.2f}s"
+            ))
@@ -0,0 +1,88 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.transaction import TransactionLine
+from apps.core.services.period_balances import DEFAULT_BATCH_SIZE, rebuild_period_balances
+from apps.core.services.tenant_sharding import get_shard_directory, shard_for_tenant
+
+
+class Command(BaseCommand):
+    help = "Recalcule depuis les lignes d'écriture les soldes des comptes par période fiscale"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            type=str,
+            help='UUID du tenant à traiter (tous les tenants ayant des écritures si non spécifié)'
+        )
+        parser.add_argument(
+            '--fiscal-year',
+            type=str,
+            help='Code de l\'exercice à recalculer (ex: FY2025), avec --tenant-id'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de soldes écrits par requête (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Compter les soldes à corriger sans rien écrire'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être supérieur à 0")
+        if options['fiscal_year'] and not options['tenant_id']:
+            raise CommandError("--fiscal-year nécessite --tenant-id")
+
+        if options['tenant_id']:
+            try:
+                tenant_uuid = uuid.UUID(options['tenant_id'])
+            except ValueError:
+                raise CommandError(f"'{options['tenant_id']}' n'est pas un UUID valide")
+            tenants = [(shard_for_tenant(tenant_uuid), tenant_uuid)]
+        else:
+            # Tenants ayant des écritures sur chaque shard, traités sur leur shard
+            tenants = [
+                (alias, tenant_id) for alias in get_shard_directory().shards
+                for tenant_id in TransactionLine.objects.using(alias).order_by('tenant_id').values_list(
+                    'tenant_id', flat=True).distinct()
+            ]
+
+        fiscal_year = None
+        if options['fiscal_year']:
+            try:
+                fiscal_year = FiscalYear.objects.for_tenant(tenants[0][1]).get(code=options['fiscal_year'])
+            except FiscalYear.DoesNotExist:
+                raise CommandError(f"Exercice {options['fiscal_year']} introuvable pour ce tenant")
+
+        started = time.perf_counter()
+        totals = {'balances': 0, 'created': 0, 'updated': 0, 'deleted': 0}
+        for alias, tenant_id in tenants:
+            stats = rebuild_period_balances(
+                tenant_id, fiscal_year, batch_size=options['batch_size'], using=alias, dry_run=options['check']
+            )
+            for key in totals:
+                totals[key] += stats[key]
+            if stats['created'] or stats['updated'] or stats['deleted']:
+                self.stdout.write(
+                    f"{tenant_id}: {stats['created']} créés, {stats['updated']} modifiés, "
+                    f"{stats['deleted']} supprimés"
+                )
+
+        elapsed = time.perf_counter() - started
+        corrections = totals['created'] + totals['updated'] + totals['deleted']
+        if options['check']:
+            message = f"{corrections} soldes à corriger ({totals['balances']} soldes existants)."
+            if corrections:
+                raise CommandError(message)
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Soldes recalculés pour {len(tenants)} tenants: {totals['created']} créés, "
+                f"{totals['updated']} modifiés, {totals['deleted']} supprimés en {elapsed:.2f}s"
+            ))
@@ -0,0 +1,106 @@
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.core.models.account import Account, ChartVersion
+from apps.core.services.classification import classify_many, classification_fields
+from apps.core.services.tenant_sharding import get_shard_directory, shard_for_tenant
+
+DEFAULT_BATCH_SIZE = 1000
+
+CLASSIFICATION_FIELDS = ['ref_financial_statement', 'is_amortization_depreciation', 'normal_balance']
+
+
+class Command(BaseCommand):
+    help = 'Recalcule la classification OHADA détaillée des comptes existants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            type=str,
+            help='UUID du tenant à reclasser (tous les comptes si non spécifié)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de comptes lus et mis à jour par lot (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--with-type',
+            action='store_true',
+            help='Recalculer aussi le type du compte (ACTIF, PASSIF, CHARGE, PRODUIT)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compter les comptes à modifier sans rien écrire en base'
+        )
+
+    def handle(self, *args, **options):
+        if options['tenant_id']:
+            try:
+                tenant_uuid = uuid.UUID(options['tenant_id'])
+            except ValueError:
+                raise CommandError(f"'{options['tenant_id']}' n'est pas un UUID valide")
+            querysets = [Account.objects.using(shard_for_tenant(tenant_uuid)).filter(tenant_id=tenant_uuid)]
+        else:
+            # Tous les comptes : chaque shard est traité à son tour
+            querysets = [Account.objects.using(alias).all() for alias in get_shard_directory().shards]
+
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size doit être supérieur à 0")
+
+        stats = {'scanned': 0, 'changed': 0}
+        for accounts in querysets:
+            for key, value in self.reclassify_accounts(
+                    accounts, batch_size, options['with_type'], options['dry_run']).items():
+                stats[key] += value
+
+        if options['dry_run']:
+            self.stdout.write(f"{stats['changed']} comptes sur {stats['scanned']} seraient reclassés.")
+            self.stdout.write("Simulation terminée, aucune donnée modifiée.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{stats['changed']} comptes reclassés sur {stats['scanned']} analysés."
+            ))
+
+    def reclassify_accounts(self, accounts, batch_size=DEFAULT_BATCH_SIZE, with_type=False, dry_run=False):
+        """
+        Reclasse par lots les comptes d'un queryset, dans sa base.
+
+        Returns:
+            dict: Nombre de comptes analysés ('scanned') et modifiés ('changed')
+        """
+        fields = CLASSIFICATION_FIELDS + (['type'] if with_type else [])
+        stats = {'scanned': 0, 'changed': 0}
+
+        with transaction.atomic(using=accounts.db):
+            batch = []
+            for row in accounts.order_by('id').values('id', 'tenant_id', 'code', *fields).iterator(chunk_size=batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self.reclassify(batch, fields, stats, dry_run, accounts.db)
+                    batch = []
+            self.reclassify(batch, fields, stats, dry_run, accounts.db)
+        return stats
+
+    def reclassify(self, rows, fields, stats, dry_run, using):
+        """Classe un lot de comptes et met à jour en une requête ceux dont la classification change"""
+        if not rows:
+            return
+        stats['scanned'] += len(rows)
+
+        classifications = classify_many({row['code'] for row in rows})
+        changed = []
+        tenant_ids = set()
+        for row in rows:
+            values = classification_fields(classifications[row['code']])
+            if any(row[field] != values[field] for field in fields):
+                changed.append(Account(id=row['id'], **{field: values[field] for field in fields}))
+                tenant_ids.add(row['tenant_id'])
+
+        stats['changed'] += len(changed)
+        if changed and not dry_run:
+            Account.objects.using(using).bulk_update(changed, fields)
+            ChartVersion.bump(tenant_ids, using)
@@ -0,0 +1,60 @@
+import os
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from apps.core.services.tenant_backup import DEFAULT_BATCH_SIZE, TenantBackupError, restore_backup
+
+
+class Command(BaseCommand):
+    help = ("Restaure des sauvegardes au format dumpdata (tableau JSON, NDJSON, .gz) par insertions groupées, "
+            "dans l'ordre des dépendances et en une seule transaction")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files',
+            nargs='+',
+            help='Fichiers de sauvegarde (ex: accounts_backup.json, <tenant>.ndjson.gz)'
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Supprimer les données existantes des tenants présents dans la sauvegarde'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Nombre de lignes insérées par requête (défaut: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Lire et valider les sauvegardes sans rien écrire en base'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être supérieur à 0")
+        for path in options['files']:
+            if not os.path.exists(path):
+                raise CommandError(f"Le fichier {path} n'existe pas")
+
+        try:
+            stats = restore_backup(
+                options['files'],
+                batch_size=options['batch_size'],
+                replace=options['replace'],
+                dry_run=options['dry_run'],
+                log=self.stdout.write
+            )
+        except (TenantBackupError, DatabaseError, ValidationError, ValueError) as e:
+            raise CommandError(f"Erreur lors de la restauration: {str(e)}")
+
+        for name, count in stats['counts'].items():
+            if count:
+                self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            "Simulation terminée, aucune donnée modifiée." if stats['dry_run'] else
+            f"Restauration terminée: {sum(stats['counts'].values())} enregistrements pour "
+            f"{stats['tenants']} tenants en {stats['elapsed']:.2f}s"
+        ))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.services.jobs import job_options, run_workers
+from apps.core.services.tenant_runner import supports_parallel_writes
+
+
+class Command(BaseCommand):
+    help = ("Exécute les jobs des tenants en attente (provisionnement du plan, tiers par défaut, "
+            "périodes des exercices) avec un pool de processus workers")
+
+    def add_arguments(self, parser):
+        options = job_options()
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=options['CONCURRENCY'],
+            help=f"Nombre de processus workers (défaut: {options['CONCURRENCY']}, 1 avec SQLite)"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=options['BATCH_SIZE'],
+            help=f"Nombre de jobs réservés par requête (défaut: {options['BATCH_SIZE']})"
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=options['POLL_INTERVAL'],
+            help=f"Attente en secondes quand la file est vide (défaut: {options['POLL_INTERVAL']})"
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="S'arrêter dès que la file est vide"
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            help="S'arrêter après ce nombre de jobs (par worker)"
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency doit être supérieur à 0")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être supérieur à 0")
+        if options['max_jobs'] is not None and options['max_jobs'] < 1:
+            raise CommandError("--max-jobs doit être supérieur à 0")
+        if options['poll_interval'] < 0:
+            raise CommandError("--poll-interval doit être positif")
+
+        concurrency = options['concurrency'] if supports_parallel_writes() else 1
+        self.stdout.write(f"{concurrency} worker(s), lots de {options['batch_size']} jobs")
+        counts = run_workers(
+            concurrency,
+            batch_size=options['batch_size'],
+            poll_interval=options['poll_interval'],
+            once=options['once'],
+            max_jobs=options['max_jobs'],
+        )
+
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"{sum(counts.values())} jobs exécutés"))
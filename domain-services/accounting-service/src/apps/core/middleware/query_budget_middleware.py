@@ -0,0 +1,47 @@
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from apps.core.query_budget import count_queries, get_query_budget
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Journalise les requêtes HTTP dont le nombre de requêtes SQL dépasse le budget
+    déclaré par la vue (voir apps.core.query_budget).
+
+    Actif uniquement avec DEBUG (ou QUERY_BUDGET_LOGGING = True) ; sinon
+    Django retire le middleware au démarrage.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_LOGGING', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as counter:
+            response = self.get_response(request)
+
+        view = getattr(request, '_query_budget_view', None)
+        if view is not None:
+            view_class, action = view
+            action = action or request.method.lower()
+            budget = get_query_budget(view_class, action)
+            if budget is not None and counter.count > budget:
+                logger.warning(
+                    "Budget de requêtes dépassé: %s %s (%s.%s) a exécuté %d requêtes pour un budget de %d",
+                    request.method, request.path, view_class.__name__, action, counter.count, budget
+                )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is not None:
+            # Viewset : action associée à la méthode HTTP ; APIView : la méthode elle-même
+            actions = getattr(view_func, 'actions', None) or {}
+            request._query_budget_view = (view_class, actions.get(request.method.lower()))
+        return None
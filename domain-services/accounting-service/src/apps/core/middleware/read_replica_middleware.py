@@ -0,0 +1,37 @@
+from django.core.exceptions import MiddlewareNotUsed
+
+from apps.core.services.read_replicas import get_read_replicas, replica_reads, start_replica_reads
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReadReplicaMiddleware:
+    """
+    Envoie les lectures des actions sûres des vues de l'API sur les réplicas
+    (voir apps.core.services.read_replicas), sauf pour un client ou un tenant
+    épinglé au primaire, et épingle au primaire après chaque écriture.
+
+    Une vue garde toutes ses lectures sur le primaire avec replica_reads = False.
+    Sans réplica dans READ_REPLICAS, Django retire le middleware au démarrage.
+    """
+
+    def __init__(self, get_response):
+        self.replicas = get_read_replicas()
+        if not self.replicas.enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Lectures sur le primaire, sauf si process_view les ouvre aux réplicas
+        with replica_reads(False):
+            response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            self.replicas.pin(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if (request.method in SAFE_METHODS and view_class is not None
+                and getattr(view_class, 'replica_reads', True) and not self.replicas.is_pinned(request)):
+            start_replica_reads()
+        return None
@@ -1,8 +1,153 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.services.tenant_resolution import get_tenant_cache
+from apps.core.services.tenant_sharding import get_shard_directory
+from apps.core.tenant_context import reset_current_tenant_id, set_current_tenant_id
+
+# Jetons dont le tenant est mémorisé (la vérification d'un jeton coûte ~90 µs)
+TOKEN_CACHE_SIZE = 1024
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Délai proposé aux clients dont les écritures sont suspendues (déplacement de shard)
+MOVING_RETRY_AFTER = 30
+
+
 class TenantMiddleware:
+    """
+    Identifie le tenant de chaque requête et l'expose dans request.tenant_id
+    (identifiant en texte) et request.tenant (TenantInfo).
+
+    Le tenant est lu, dans l'ordre :
+    - dans la revendication TENANT_ID_FIELD du jeton JWT (Authorization: Bearer) ;
+    - dans l'en-tête TENANT_HEADER (X-Tenant-ID par défaut), posé par la passerelle ;
+      sans jeton, l'en-tête n'est accepté que si TRUST_TENANT_HEADER est activé
+      (sinon 401) ;
+    - à défaut, DEFAULT_TENANT_ID (développement et tests).
+
+    Le jeton et l'en-tête doivent désigner le même tenant. Le tenant est
+    ensuite résolu à travers le cache des tenants (services.tenant_resolution) :
+    un tenant inconnu ou inactif est refusé (403). Les URL de PUBLIC_URLS ne
+    sont pas rattachées à un tenant ; celles de TENANT_REQUIRED_URLS sont
+    refusées (400) sans tenant.
+
+    Pendant le traitement de la requête, le tenant est aussi le tenant
+    courant (apps.core.tenant_context) des managers tenant_objects et du
+    routeur des shards. Pendant le déplacement du tenant vers un autre
+    shard, les écritures sont refusées (503).
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
-        
+        self.claim = settings.TENANT_ID_FIELD
+        self.header = getattr(settings, 'TENANT_HEADER', 'X-Tenant-ID')
+        self.trust_header = getattr(settings, 'TRUST_TENANT_HEADER', False)
+        self.public_urls = tuple(getattr(settings, 'PUBLIC_URLS', []))
+        self.required_urls = tuple(getattr(settings, 'TENANT_REQUIRED_URLS', []))
+        self.default_tenant_id = getattr(settings, 'DEFAULT_TENANT_ID', None)
+        self.auth_header_types = {
+            header_type.encode() for header_type in settings.SIMPLE_JWT.get('AUTH_HEADER_TYPES', ('Bearer',))
+        }
+        # jeton -> (date d'expiration, tenant), jusqu'à l'expiration du jeton
+        self.token_tenants = OrderedDict()
+        self.token_lock = threading.Lock()
+
     def __call__(self, request):
-        # Définir un tenant_id fixe pour tous les tests
-        request.tenant_id = '284e521a-7899-4290-88e3-ea6a50913210'
-        return self.get_response(request)
\ No newline at end of file
+        request.tenant_id = None
+        request.tenant = None
+        if not request.path_info.startswith(self.public_urls):
+            try:
+                tenant_id = self.requested_tenant_id(request)
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+            except PermissionError as e:
+                return JsonResponse({"error": str(e)}, status=401)
+            if tenant_id is None:
+                if request.path_info.startswith(self.required_urls):
+                    return JsonResponse({"error": "Tenant ID est requis pour cette opération"}, status=400)
+            else:
+                tenant = get_tenant_cache().get(tenant_id)
+                if tenant is None:
+                    return JsonResponse({"error": f"Tenant {tenant_id} inconnu"}, status=403)
+                if not tenant.is_active:
+                    return JsonResponse(
+                        {"error": f"Tenant {tenant_id} inactif ({tenant.status})"}, status=403
+                    )
+                if request.method not in SAFE_METHODS and not get_shard_directory().get(tenant.id).accepts_writes:
+                    response = JsonResponse(
+                        {"error": f"Tenant {tenant_id} en cours de déplacement, écritures suspendues"}, status=503
+                    )
+                    response['Retry-After'] = str(MOVING_RETRY_AFTER)
+                    return response
+                request.tenant_id = str(tenant.id)
+                request.tenant = tenant
+
+        # Tenant courant des managers tenant_objects pendant la requête
+        token = set_current_tenant_id(request.tenant.id if request.tenant else None)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_tenant_id(token)
+
+    def requested_tenant_id(self, request):
+        """
+        Identifiant du tenant demandé (UUID), None si la requête n'en désigne pas.
+
+        Raises:
+            ValueError: Identifiant invalide, ou jeton et en-tête en désaccord
+            PermissionError: En-tête sans jeton alors que TRUST_TENANT_HEADER est désactivé
+        """
+        from_token = self.token_tenant_id(request)
+        from_header = request.headers.get(self.header)
+        if from_header:
+            try:
+                from_header = uuid.UUID(from_header)
+            except ValueError:
+                raise ValueError(f"En-tête {self.header} : '{from_header}' n'est pas un UUID valide")
+            if from_token is None and not self.trust_header:
+                raise PermissionError(f"L'en-tête {self.header} n'est accepté qu'avec un jeton d'accès")
+            if from_token is not None and from_token != from_header:
+                raise ValueError(f"L'en-tête {self.header} ne correspond pas au tenant du jeton")
+            return from_header
+        if from_token is not None:
+            return from_token
+        return uuid.UUID(str(self.default_tenant_id)) if self.default_tenant_id else None
+
+    def token_tenant_id(self, request):
+        """
+        Tenant de la revendication du jeton d'accès, None sans jeton valide
+        (l'authentification DRF rejette ensuite un jeton invalide).
+        """
+        parts = request.META.get('HTTP_AUTHORIZATION', '').encode().split()
+        if len(parts) != 2 or parts[0] not in self.auth_header_types:
+            return None
+        raw_token = parts[1]
+        with self.token_lock:
+            cached = self.token_tenants.get(raw_token)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+
+        try:
+            token = AccessToken(raw_token.decode())
+        except TokenError:
+            return None
+        claim = token.get(self.claim)
+        if claim is None:
+            return None
+        try:
+            tenant_id = uuid.UUID(str(claim))
+        except ValueError:
+            raise ValueError(f"Revendication {self.claim} du jeton : '{claim}' n'est pas un UUID valide")
+
+        with self.token_lock:
+            self.token_tenants[raw_token] = (token['exp'], tenant_id)
+            while len(self.token_tenants) > TOKEN_CACHE_SIZE:
+                self.token_tenants.popitem(last=False)
+        return tenant_id
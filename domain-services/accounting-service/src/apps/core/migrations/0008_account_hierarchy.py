@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:56
+
+from django.db import migrations, models
+
+
+# Copie figée du calcul de services.account_hierarchy au moment de la migration :
+# chemin = identifiants hexadécimaux des ancêtres puis du compte, suivis de '/'
+SEGMENT_LENGTH = 33
+MAX_DEPTH = 30
+BATCH_SIZE = 1000
+
+
+def compute_hierarchy(nodes):
+    """id -> (path, depth, descendant_count), pour des couples (id, parent_id)"""
+    parents = dict(nodes)
+    children = {}
+    order = []
+    for pk, parent_id in parents.items():
+        if parent_id is None or parent_id not in parents:
+            order.append(pk)
+        else:
+            children.setdefault(parent_id, []).append(pk)
+
+    paths = {pk: pk.hex + '/' for pk in order}
+    position = 0
+    while position < len(order):
+        pk = order[position]
+        position += 1
+        for child in children.get(pk, ()):
+            paths[child] = paths[pk] + child.hex + '/'
+            if len(paths[child]) // SEGMENT_LENGTH > MAX_DEPTH:
+                raise ValueError(f"Hiérarchie trop profonde au compte {child} (maximum {MAX_DEPTH} niveaux)")
+            order.append(child)
+    if len(order) != len(parents):
+        unreached = next(pk for pk in parents if pk not in paths)
+        raise ValueError(f"Cycle dans la hiérarchie des comptes autour de {unreached}")
+
+    counts = dict.fromkeys(order, 0)
+    for pk in reversed(order):
+        if parents[pk] in counts:
+            counts[parents[pk]] += counts[pk] + 1
+    return {pk: (paths[pk], len(paths[pk]) // SEGMENT_LENGTH - 1, counts[pk]) for pk in order}
+
+
+def build_hierarchy(apps, schema_editor):
+    """Construit l'index hiérarchique des comptes existants, tenant par tenant"""
+    Account = apps.get_model('core', 'Account')
+    accounts = Account.objects.using(schema_editor.connection.alias)
+    tenant_ids = accounts.order_by().values_list('tenant_id', flat=True).distinct()
+    for tenant_id in list(tenant_ids):
+        rows = accounts.filter(tenant_id=tenant_id).values_list('id', 'parent_id')
+        hierarchy = compute_hierarchy(rows)
+        accounts.bulk_update(
+            [Account(id=pk, path=path, depth=depth, descendant_count=count)
+             for pk, (path, depth, count) in hierarchy.items()],
+            ['path', 'depth', 'descendant_count'], batch_size=BATCH_SIZE
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_add_account_classification_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Profondeur dans la hiérarchie (0 pour un compte racine)'),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='descendant_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Nombre de comptes du sous-arbre, compte exclu'),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Chemin matérialisé : identifiants des ancêtres puis du compte', max_length=990),
+        ),
+        migrations.RunPython(build_hierarchy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:06
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_chart_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionLine',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tenant_id', models.UUIDField(blank=True, null=True)),
+                ('date', models.DateField()),
+                ('description', models.CharField(blank=True, default='', max_length=255)),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='transaction_lines', to='core.account')),
+            ],
+            options={
+                'verbose_name': "Ligne d'écriture",
+                'verbose_name_plural': "Lignes d'écriture",
+                'ordering': ['date', 'created_at'],
+                'indexes': [models.Index(fields=['tenant_id', 'account', 'date'], name='core_txline_tenant_acc_date')],
+            },
+        ),
+    ]
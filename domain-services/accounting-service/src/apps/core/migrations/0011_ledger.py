@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:07
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_transaction_line'),
+    ]
+
+    # Les clés entry et fiscal_period des lignes sont ajoutées sans valeur par
+    # défaut : aucune ligne d'écriture n'était encore enregistrée
+    operations = [
+        migrations.AddField(
+            model_name='transactionline',
+            name='fiscal_period',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='transaction_lines', to='core.fiscalperiod'),
+        ),
+        migrations.CreateModel(
+            name='Journal',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tenant_id', models.UUIDField(blank=True, null=True)),
+                ('code', models.CharField(help_text='Code du journal (ex: VT, AC, BQ)', max_length=10)),
+                ('name', models.CharField(max_length=100)),
+                ('type', models.CharField(choices=[('SALES', 'Ventes'), ('PURCHASES', 'Achats'), ('BANK', 'Banque'), ('CASH', 'Caisse'), ('GENERAL', 'Opérations diverses')], default='GENERAL', max_length=20)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Journal',
+                'verbose_name_plural': 'Journaux',
+                'ordering': ['code'],
+                'unique_together': {('tenant_id', 'code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tenant_id', models.UUIDField(blank=True, null=True)),
+                ('date', models.DateField()),
+                ('reference', models.CharField(blank=True, default='', help_text='Pièce justificative', max_length=50)),
+                ('description', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('fiscal_period', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='entries', to='core.fiscalperiod')),
+                ('journal', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='entries', to='core.journal')),
+            ],
+            options={
+                'verbose_name': 'Écriture comptable',
+                'verbose_name_plural': 'Écritures comptables',
+                'ordering': ['date', 'created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='transactionline',
+            name='entry',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='core.journalentry'),
+        ),
+        migrations.AddIndex(
+            model_name='transactionline',
+            index=models.Index(fields=['tenant_id', 'fiscal_period', 'account'], name='core_txline_tenant_per_acc'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['tenant_id', 'journal', 'date'], name='core_entry_tenant_jnl_date'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['tenant_id', 'date'], name='core_entry_tenant_date'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountPeriodBalance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tenant_id', models.UUIDField(blank=True, null=True)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('opening', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('closing', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_balances', to='core.account')),
+                ('fiscal_period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='account_balances', to='core.fiscalperiod')),
+            ],
+            options={
+                'verbose_name': 'Solde de compte par période',
+                'verbose_name_plural': 'Soldes de comptes par période',
+                'ordering': ['period_start'],
+                'indexes': [models.Index(fields=['tenant_id', 'account', 'period_start'], name='core_balance_tenant_acc_start')],
+                'unique_together': {('account', 'fiscal_period')},
+            },
+        ),
+    ]
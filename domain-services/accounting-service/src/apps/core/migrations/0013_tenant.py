@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:44
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_account_period_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tenant',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=150)),
+                ('status', models.CharField(choices=[('ACTIVE', 'Actif'), ('SUSPENDED', 'Suspendu'), ('CLOSED', 'Clôturé')], default='ACTIVE', max_length=20)),
+                ('settings', models.JSONField(blank=True, default=dict, help_text='Paramètres propres au tenant')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tenant',
+                'verbose_name_plural': 'Tenants',
+                'ordering': ['name'],
+            },
+        ),
+    ]
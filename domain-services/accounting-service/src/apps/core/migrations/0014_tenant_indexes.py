@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_tenant'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['tenant_id', 'parent'], name='core_account_tenant_parent'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['tenant_id', 'type', 'is_active'], name='core_account_tenant_type_act'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['tenant_id', 'account_class'], name='core_account_tenant_class'),
+        ),
+        migrations.AddIndex(
+            model_name='accountcategory',
+            index=models.Index(fields=['tenant_id', 'account_class'], name='core_category_tenant_class'),
+        ),
+        migrations.AddIndex(
+            model_name='fiscalperiod',
+            index=models.Index(fields=['tenant_id', 'start_date', 'end_date'], name='core_period_tenant_dates'),
+        ),
+        migrations.AddIndex(
+            model_name='fiscalyear',
+            index=models.Index(fields=['tenant_id', 'start_date', 'end_date'], name='core_fy_tenant_dates'),
+        ),
+        migrations.AddIndex(
+            model_name='tiers',
+            index=models.Index(fields=['tenant_id', 'account'], name='core_tiers_tenant_account'),
+        ),
+        migrations.AddIndex(
+            model_name='tiers',
+            index=models.Index(fields=['tenant_id', 'type', 'is_active'], name='core_tiers_tenant_type_act'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_tenant_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantShard',
+            fields=[
+                ('tenant_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('alias', models.CharField(help_text='Alias de la base dans DATABASES', max_length=64)),
+                ('status', models.CharField(choices=[('ACTIVE', 'Actif'), ('MOVING', 'Déplacement en cours (écritures suspendues)')], default='ACTIVE', max_length=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': "Shard d'un tenant",
+                'verbose_name_plural': 'Shards des tenants',
+            },
+        ),
+    ]
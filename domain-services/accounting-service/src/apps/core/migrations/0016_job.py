@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:03
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_tenant_shard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tenant_id', models.UUIDField()),
+                ('kind', models.CharField(help_text='Type de job (voir services.jobs.HANDLERS)', max_length=50)),
+                ('dedupe_key', models.CharField(help_text="Clé d'unicité du job pour son tenant", max_length=150)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('PENDING', 'En attente'), ('RUNNING', 'En cours'), ('SUCCEEDED', 'Terminé'), ('FAILED', 'Échoué')], default='PENDING', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Avancement en pourcentage')),
+                ('message', models.CharField(blank=True, default='', max_length=255)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('worker', models.CharField(blank=True, default='', max_length=100)),
+                ('locked_until', models.DateTimeField(blank=True, help_text="Fin du bail du worker qui l'exécute", null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_job_status_created'), models.Index(fields=['tenant_id', 'created_at'], name='core_job_tenant_created')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ('PENDING', 'RUNNING', 'SUCCEEDED'))), fields=('tenant_id', 'dedupe_key'), name='core_job_tenant_dedupe_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='reversal_of',
+            field=models.OneToOneField(blank=True, help_text='Écriture extournée par celle-ci', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='reversed_by', to='core.journalentry'),
+        ),
+    ]
@@ -1,9 +1,13 @@
 # apps/core/models/__init__.py
-from .account import AccountClass, AccountCategory, Account
+from .account import AccountClass, AccountCategory, Account, ChartVersion
 from .fiscal_year import FiscalYear, FiscalPeriod
+from .journal import Journal, JournalEntry
+from .transaction import TransactionLine, AccountPeriodBalance
+from .tenant import Tenant, TenantShard
+from .job import Job
 
 __all__ = [
-    'AccountClass', 'AccountCategory', 'Account',
-    'FiscalYear', 'FiscalPeriod'
-    'Tiers'
+    'AccountClass', 'AccountCategory', 'Account', 'ChartVersion',
+    'FiscalYear', 'FiscalPeriod', 'Journal', 'JournalEntry', 'TransactionLine', 'AccountPeriodBalance',
+    'Tenant', 'TenantShard', 'Job', 'Tiers'
 ]
\ No newline at end of file
@@ -1,10 +1,20 @@
 # apps/core/models/account.py
-from django.db import models
+from django.db import DatabaseError, models, router, transaction
 import uuid
-import json
 import os
 from django.conf import settings
+from django.utils import timezone
+from ..services.account_hierarchy import (
+    SEGMENT_LENGTH, PATH_MAX_LENGTH, path_ancestor_ids, place_account, account_saved, detach_account
+)
 from ..utils import format_accounting_name, format_accounting_code
+from .tenant import TenantQuerySet, TenantManager
+
+# Colonnes de l'index hiérarchique, écrites par les seules fonctions de services.account_hierarchy
+HIERARCHY_FIELDS = ('path', 'depth', 'descendant_count')
+
+# Parent inconnu (compte non lu en base, ou parent différé)
+_UNKNOWN_PARENT = object()
 
 class AccountType(models.TextChoices):
     ASSET = 'ASSET', 'Actif'
@@ -25,6 +35,9 @@ class AccountClass(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TenantQuerySet.as_manager()
+    tenant_objects = TenantManager()
+    
     class Meta:
         verbose_name = "Classe de compte"
         verbose_name_plural = "Classes de comptes"
@@ -33,6 +46,16 @@ class AccountClass(models.Model):
     
     def __str__(self):
         return f"Classe {self.number} - {self.name}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        ChartVersion.bump([self.tenant_id], self._state.db)
+    
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        result = super().delete(*args, **kwargs)
+        ChartVersion.bump([self.tenant_id], using)
+        return result
 
 class AccountCategory(models.Model):
     """Catégorie de compte (ex: 10, 11, 12... dans le plan OHADA)"""
@@ -47,14 +70,103 @@ class AccountCategory(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TenantQuerySet.as_manager()
+    tenant_objects = TenantManager()
+    
     class Meta:
         verbose_name = "Catégorie de compte"
         verbose_name_plural = "Catégories de comptes"
         ordering = ['code']
         unique_together = [['tenant_id', 'code']]
+        indexes = [
+            models.Index(fields=['tenant_id', 'account_class'], name='core_category_tenant_class'),
+        ]
     
     def __str__(self):
         return f"{self.code} - {self.name}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        ChartVersion.bump([self.tenant_id], self._state.db)
+    
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        result = super().delete(*args, **kwargs)
+        ChartVersion.bump([self.tenant_id], using)
+        return result
+
+class ChartVersion(models.Model):
+    """
+    Version du plan comptable d'un tenant, incrémentée à chaque écriture sur
+    ses classes, catégories ou comptes (sert d'ETag aux lectures du plan).
+    """
+    tenant_id = models.UUIDField(unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TenantQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Version du plan comptable"
+        verbose_name_plural = "Versions des plans comptables"
+
+    def __str__(self):
+        return f"{self.tenant_id} - v{self.version}"
+
+    @classmethod
+    def current(cls, tenant_id, using=None):
+        """Version courante du plan d'un tenant (0 si le plan n'a jamais été modifié)"""
+        version = cls.objects.using(using).for_tenant(tenant_id).values_list('version', flat=True).first()
+        return version or 0
+
+    @classmethod
+    def bump(cls, tenant_ids, using=None):
+        """
+        Incrémente la version du plan des tenants donnés, en deux requêtes : la
+        ligne manquante est créée à 0 puis toutes les lignes sont incrémentées,
+        ce qui reste correct si deux écritures créent la version en même temps.
+        """
+        tenant_ids = {tenant_id for tenant_id in tenant_ids if tenant_id is not None}
+        if not tenant_ids:
+            return
+        manager = cls.objects.using(using or router.db_for_write(cls))
+        manager.bulk_create([cls(tenant_id=tenant_id) for tenant_id in tenant_ids], ignore_conflicts=True)
+        manager.filter(tenant_id__in=tenant_ids).update(version=models.F('version') + 1, updated_at=timezone.now())
+
+class AccountQuerySet(TenantQuerySet):
+    """Requêtes sur la hiérarchie des comptes (index matérialisé path/depth)"""
+
+    def descendants(self, account, include_self=False):
+        """Comptes du sous-arbre d'un compte : un préfixe de chemin, une requête"""
+        queryset = self.filter(path__startswith=account.path)
+        return queryset if include_self else queryset.exclude(pk=account.pk)
+
+    def ancestors(self, account, include_self=False):
+        """Ancêtres d'un compte, de la racine au parent : lus dans son chemin, une requête"""
+        ids = path_ancestor_ids(account.path) + ([account.pk] if include_self else [])
+        return self.filter(pk__in=ids).order_by('depth')
+
+    def subtree_rollup(self, depth=0, **aggregates):
+        """
+        Agrège les comptes du queryset par sous-arbre, en une requête groupée.
+
+        Chaque compte est rattaché à son ancêtre de profondeur depth (préfixe
+        de longueur fixe de son chemin) ; les comptes moins profonds sont ignorés.
+
+        Args:
+            depth (int): Profondeur des comptes racines des sous-arbres
+            **aggregates: Agrégats Django (par défaut accounts=Count('pk'))
+
+        Returns:
+            dict: id du compte racine -> {nom de l'agrégat: valeur}
+        """
+        aggregates = aggregates or {'accounts': models.Count('pk')}
+        start = SEGMENT_LENGTH * depth + 1
+        rows = self.filter(depth__gte=depth).annotate(
+            subtree_root=models.functions.Substr('path', start, SEGMENT_LENGTH - 1)
+        ).order_by().values('subtree_root').annotate(**aggregates)
+        return {uuid.UUID(row.pop('subtree_root')): row for row in rows}
+
 
 class Account(models.Model):
     """Compte du plan comptable OHADA"""
@@ -84,53 +196,147 @@ class Account(models.Model):
     is_reconcilable = models.BooleanField(default=True, help_text="Indique si le compte peut être rapproché")
     is_tax_relevant = models.BooleanField(default=False, help_text="Indique si le compte est pertinent pour la TVA")
     
+    # Index hiérarchique maintenu par save()/delete() (voir services.account_hierarchy)
+    path = models.CharField(max_length=PATH_MAX_LENGTH, default='', blank=True, editable=False, db_index=True,
+                            help_text="Chemin matérialisé : identifiants des ancêtres puis du compte")
+    depth = models.PositiveSmallIntegerField(default=0, editable=False,
+                                             help_text="Profondeur dans la hiérarchie (0 pour un compte racine)")
+    descendant_count = models.PositiveIntegerField(default=0, editable=False,
+                                                   help_text="Nombre de comptes du sous-arbre, compte exclu")
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = AccountQuerySet.as_manager()
+    tenant_objects = TenantManager.from_queryset(AccountQuerySet)()
+    
     class Meta:
         verbose_name = "Compte"
         verbose_name_plural = "Comptes"
         ordering = ['code']
         unique_together = [['tenant_id', 'code']]
+        # Filtres de l'API, tenant en tête (le tri par code passe par unique_together)
+        indexes = [
+            models.Index(fields=['tenant_id', 'parent'], name='core_account_tenant_parent'),
+            models.Index(fields=['tenant_id', 'type', 'is_active'], name='core_account_tenant_type_act'),
+            models.Index(fields=['tenant_id', 'account_class'], name='core_account_tenant_class'),
+        ]
     
     def __str__(self):
         return f"{self.code} - {self.name}"
     
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_parent_id = instance.__dict__.get('parent_id', _UNKNOWN_PARENT)
+        return instance
+    
+    def apply_accounting_format(self):
+        """Applique les conventions de formatage au libellé et au code (aussi utilisé avant un bulk_create)"""
         if self.name:
             self.name = format_accounting_name(self.name)
         if self.code:
             self.code = format_accounting_code(self.code)
-        super().save(*args, **kwargs)
     
-    def get_balance(self, start_date=None, end_date=None):
-        """Calcule le solde du compte pour une période donnée"""
-        from .transaction import TransactionLine
-        
-        query = TransactionLine.objects.filter(
-            account=self,
-            transaction__tenant_id=self.tenant_id
+    def apply_classification(self, force=False):
+        """
+        Renseigne la classification OHADA détaillée (référence des états financiers,
+        solde normal, amortissement/dépréciation) déduite du code.
+
+        Le type du compte n'est pas modifié. Sans force, un compte déjà classé
+        (solde normal renseigné) est laissé tel quel.
+        """
+        if not self.code or (self.normal_balance and not force):
+            return
+        from ..services.classification import classify, classification_fields
+        fields = classification_fields(classify(self.code))
+        self.ref_financial_statement = fields['ref_financial_statement']
+        self.is_amortization_depreciation = fields['is_amortization_depreciation']
+        self.normal_balance = fields['normal_balance']
+    
+    def save(self, *args, **kwargs):
+        self.apply_accounting_format()
+        self.apply_classification()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not kwargs.get('force_insert') and self.parent_unchanged(kwargs.get('using')):
+            # Parent inchangé depuis la lecture : l'index en base est à jour (il a pu être décalé
+            # depuis par le déplacement d'un ancêtre), ni le parent ni l'index ne sont réécrits
+            fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in ('parent', *HIERARCHY_FIELDS)
+            ]
+            using = kwargs.get('using') or router.db_for_write(Account, instance=self)
+            marked = transaction.get_connection(using).in_atomic_block and transaction.get_rollback(using)
+            try:
+                super().save(*args, **{**kwargs, 'update_fields': fields})
+            except DatabaseError as e:
+                # Ligne supprimée depuis la lecture : erreur levée par Django (aucune ligne mise à
+                # jour), pas par la base. La transaction reste utilisable et le compte est
+                # enregistré en entier ci-dessous
+                if type(e) is not DatabaseError:
+                    raise
+                if transaction.get_connection(using).in_atomic_block:
+                    transaction.set_rollback(marked, using)
+            else:
+                ChartVersion.bump([self.tenant_id], self._state.db)
+                return
+        if update_fields is not None:
+            if not {'parent', 'parent_id'} & set(update_fields):
+                super().save(*args, **kwargs)
+                ChartVersion.bump([self.tenant_id], self._state.db)
+                return
+            kwargs['update_fields'] = {*update_fields, *HIERARCHY_FIELDS}
+        using = kwargs.get('using') or router.db_for_write(Account, instance=self)
+        with transaction.atomic(using=using):
+            previous = place_account(self, using)
+            super().save(*args, **kwargs)
+            account_saved(self, previous, using)
+            ChartVersion.bump([self.tenant_id], using)
+        self._loaded_parent_id = self.parent_id
+    
+    def parent_unchanged(self, using=None):
+        """
+        Compte déjà indexé dans la base où il est enregistré, dont le parent n'a
+        pas changé depuis sa lecture ou son enregistrement
+        """
+        return (
+            not self._state.adding and using in (None, self._state.db) and bool(self.__dict__.get('path'))
+            and self.__dict__.get('parent_id', _UNKNOWN_PARENT) == getattr(self, '_loaded_parent_id', _UNKNOWN_PARENT)
         )
-        
-        if start_date:
-            query = query.filter(transaction__date__gte=start_date)
-        
-        if end_date:
-            query = query.filter(transaction__date__lte=end_date)
-        
-        # Calculer le solde (débit - crédit)
-        debit_sum = query.aggregate(models.Sum('debit'))['debit__sum'] or 0
-        credit_sum = query.aggregate(models.Sum('credit'))['credit__sum'] or 0
-        
-        # Le sens du solde dépend du type de compte
-        if self.type in [AccountType.ASSET, AccountType.EXPENSE]:
-            return debit_sum - credit_sum
-        else:
-            return credit_sum - debit_sum
+    
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(Account, instance=self)
+        with transaction.atomic(using=using):
+            detach_account(self, using)
+            result = super().delete(*args, **kwargs)
+            ChartVersion.bump([self.tenant_id], using)
+            return result
+    
+    def get_descendants(self, include_self=False):
+        """Comptes du sous-arbre de ce compte"""
+        return Account.objects.descendants(self, include_self)
+    
+    def get_ancestors(self, include_self=False):
+        """Ancêtres de ce compte, de la racine au parent"""
+        return Account.objects.ancestors(self, include_self)
+    
+    def get_balance(self, start_date=None, end_date=None):
+        """Calcule le solde du compte pour une période donnée (voir services.balances)"""
+        from ..services.balances import balances_for
+        return balances_for([self], start_date, end_date)[self.pk].balance
 
     @classmethod
     def create_default_accounts_ohada(cls, tenant_id):
-        """Crée le plan comptable OHADA par défaut pour un tenant"""
+        """
+        Crée le plan comptable OHADA par défaut pour un tenant.
+
+        Le plan est lu depuis son snapshot précompilé (ou le JSON à défaut),
+        puis inséré en quelques bulk_create par niveau hiérarchique (voir
+        apps.core.services.chart_snapshot et chart_provisioning).
+        """
+        from ..services.chart_provisioning import provision_chart
+        from ..services.chart_snapshot import load_chart_plan
+
         # Chemin vers le fichier JSON du plan comptable OHADA
         json_file_path = os.path.join(settings.BASE_DIR, 'data', 'plan_comptable_ohada.json')
         
@@ -141,132 +347,11 @@ class Account(models.Model):
             json_file_path = os.path.join(current_dir, '..', '..', '..', 'data', 'plan_comptable_ohada.json')
         
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as file:
-                plan_comptable = json.load(file)
+            plan = load_chart_plan(tenant_id, json_file_path)
         except FileNotFoundError:
             raise Exception(f"Le fichier du plan comptable OHADA n'a pas été trouvé à l'emplacement: {json_file_path}")
     
-        # Dictionnaire pour stocker les références aux comptes créés
-        account_refs = {}
-        
-        # Création des classes de comptes et leurs catégories
-        for class_key, class_data in plan_comptable.items():
-            # Extraire le numéro de classe (1 à 9)
-            class_number = int(class_key.split()[0])
-            class_name = class_key.split(' - ')[1] if ' - ' in class_key else class_key
-            
-            # Créer la classe de compte
-            account_class = AccountClass.objects.create(
-                tenant_id=tenant_id,
-                number=class_number,
-                name=class_name
-            )
-            
-            # Déterminer le type de compte en fonction de la classe
-            account_type = cls._get_account_type_for_class(class_number)
-            
-            # Parcourir les catégories de la classe
-            for category_key, category_data in class_data.items():
-                if isinstance(category_data, dict):
-                    # C'est une catégorie avec des sous-comptes
-                    category_code = category_key.split()[0] if ' ' in category_key else category_key
-                    category_name = ' '.join(category_key.split()[1:]) if ' ' in category_key else category_key
-                    
-                    # Créer la catégorie
-                    category = AccountCategory.objects.create(
-                        tenant_id=tenant_id,
-                        account_class=account_class,
-                        code=category_code,
-                        name=category_name
-                    )
-                    
-                    # Créer le compte principal pour cette catégorie
-                    parent_account = cls.objects.create(
-                        tenant_id=tenant_id,
-                        code=category_code,
-                        name=category_name,
-                        account_class=account_class,
-                        category=category,
-                        type=account_type,
-                        level=1
-                    )
-                    
-                    account_refs[category_code] = parent_account
-                    
-                    # Parcourir récursivement les sous-comptes
-                    cls._create_sub_accounts(
-                        tenant_id=tenant_id,
-                        parent_account=parent_account,
-                        account_class=account_class,
-                        category=category,
-                        data=category_data,
-                        account_type=account_type,
-                        level=2,
-                        account_refs=account_refs
-                    )
-                else:
-                    # C'est un compte simple sans sous-comptes
-                    account_code = category_key
-                    account_name = category_data
-                    
-                    # Créer le compte
-                    account = cls.objects.create(
-                        tenant_id=tenant_id,
-                        code=account_code,
-                        name=account_name,
-                        account_class=account_class,
-                        type=account_type,
-                        level=1
-                    )
-                    
-                    account_refs[account_code] = account
-        
-        return account_refs
-
-    @classmethod
-    def _create_sub_accounts(cls, tenant_id, parent_account, account_class, category, data, account_type, level, account_refs):
-        """Crée récursivement les sous-comptes"""
-        for code, value in data.items():
-            if isinstance(value, dict):
-                # C'est un sous-compte avec des sous-sous-comptes
-                sub_account = cls.objects.create(
-                    tenant_id=tenant_id,
-                    code=code,
-                    name=code if isinstance(code, str) and ' ' in code else code,
-                    account_class=account_class,
-                    category=category,
-                    parent=parent_account,
-                    type=account_type,
-                    level=level
-                )
-                
-                account_refs[code] = sub_account
-                
-                # Création récursive des sous-sous-comptes
-                cls._create_sub_accounts(
-                    tenant_id=tenant_id,
-                    parent_account=sub_account,
-                    account_class=account_class,
-                    category=category,
-                    data=value,
-                    account_type=account_type,
-                    level=level+1,
-                    account_refs=account_refs
-                )
-            else:
-                # C'est un compte terminal
-                sub_account = cls.objects.create(
-                    tenant_id=tenant_id,
-                    code=code,
-                    name=value,
-                    account_class=account_class,
-                    category=category,
-                    parent=parent_account,
-                    type=account_type,
-                    level=level
-                )
-                
-                account_refs[code] = sub_account
+        return provision_chart(plan)
     
     @staticmethod
     def _get_account_type_for_class(class_number):
@@ -3,6 +3,7 @@ from django.db import models
 import uuid
 from django.core.exceptions import ValidationError
 from datetime import datetime, timedelta
+from .tenant import TenantQuerySet, TenantManager
 
 class FiscalYear(models.Model):
     """Exercice fiscal"""
@@ -24,11 +25,17 @@ class FiscalYear(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TenantQuerySet.as_manager()
+    tenant_objects = TenantManager()
+    
     class Meta:
         verbose_name = "Exercice fiscal"
         verbose_name_plural = "Exercices fiscaux"
         ordering = ['-start_date']
         unique_together = [['tenant_id', 'code']]
+        indexes = [
+            models.Index(fields=['tenant_id', 'start_date', 'end_date'], name='core_fy_tenant_dates'),
+        ]
     
     def __str__(self):
         return self.name
@@ -153,11 +160,17 @@ class FiscalPeriod(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TenantQuerySet.as_manager()
+    tenant_objects = TenantManager()
+    
     class Meta:
         verbose_name = "Période fiscale"
         verbose_name_plural = "Périodes fiscales"
         ordering = ['fiscal_year', 'number']
         unique_together = [['fiscal_year', 'number']]
+        indexes = [
+            models.Index(fields=['tenant_id', 'start_date', 'end_date'], name='core_period_tenant_dates'),
+        ]
     
     def __str__(self):
         return f"{self.fiscal_year.name} - {self.name}"
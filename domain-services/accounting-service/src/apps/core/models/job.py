@@ -0,0 +1,87 @@
+# apps/core/models/job.py
+from django.db import models
+from django.utils import timezone
+from datetime import timedelta
+import uuid
+
+from .tenant import TenantQuerySet, TenantManager
+
+
+class JobStatus(models.TextChoices):
+    PENDING = 'PENDING', 'En attente'
+    RUNNING = 'RUNNING', 'En cours'
+    SUCCEEDED = 'SUCCEEDED', 'Terminé'
+    FAILED = 'FAILED', 'Échoué'
+
+
+# Un job échoué n'empêche pas d'en relancer un identique
+ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING, JobStatus.SUCCEEDED)
+
+
+class Job(models.Model):
+    """
+    Tâche de fond d'un tenant (provisionnement du plan, tiers par défaut,
+    génération des périodes), exécutée par la commande run_workers (voir
+    services.jobs).
+
+    La file est la table elle-même, dans la base 'default' quel que soit le
+    shard du tenant. Un tenant n'a qu'un job non échoué par clé
+    (dedupe_key) : une demande répétée renvoie le job existant.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant_id = models.UUIDField()
+
+    kind = models.CharField(max_length=50, help_text="Type de job (voir services.jobs.HANDLERS)")
+    dedupe_key = models.CharField(max_length=150, help_text="Clé d'unicité du job pour son tenant")
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.PENDING)
+
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Avancement en pourcentage")
+    message = models.CharField(max_length=255, blank=True, default='')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, default='')
+    locked_until = models.DateTimeField(null=True, blank=True, help_text="Fin du bail du worker qui l'exécute")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = TenantQuerySet.as_manager()
+    tenant_objects = TenantManager()
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='core_job_status_created'),
+            models.Index(fields=['tenant_id', 'created_at'], name='core_job_tenant_created'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant_id', 'dedupe_key'], condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='core_job_tenant_dedupe_key'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.tenant_id} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def report(self, progress, message='', lease_seconds=None):
+        """
+        Enregistre l'avancement du job (visible aussitôt par l'endpoint de
+        statut) et prolonge le bail du worker.
+        """
+        self.progress = max(0, min(100, int(progress)))
+        self.message = message[:255]
+        updates = {'progress': self.progress, 'message': self.message}
+        if lease_seconds is not None:
+            self.locked_until = updates['locked_until'] = timezone.now() + timedelta(seconds=lease_seconds)
+        Job.objects.filter(pk=self.pk).update(**updates)
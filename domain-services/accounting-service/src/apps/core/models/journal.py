@@ -0,0 +1,70 @@
+# apps/core/models/journal.py
+from django.db import models
+import uuid
+
+
+class JournalType(models.TextChoices):
+    SALES = 'SALES', 'Ventes'
+    PURCHASES = 'PURCHASES', 'Achats'
+    BANK = 'BANK', 'Banque'
+    CASH = 'CASH', 'Caisse'
+    GENERAL = 'GENERAL', 'Opérations diverses'
+
+
+class Journal(models.Model):
+    """Journal comptable (ventes, achats, banque, caisse, opérations diverses)"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant_id = models.UUIDField(null=True, blank=True)  # ID du tenant pour isolation
+
+    code = models.CharField(max_length=10, help_text="Code du journal (ex: VT, AC, BQ)")
+    name = models.CharField(max_length=100)
+    type = models.CharField(max_length=20, choices=JournalType.choices, default=JournalType.GENERAL)
+    is_active = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Journal"
+        verbose_name_plural = "Journaux"
+        ordering = ['code']
+        unique_together = [['tenant_id', 'code']]
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
+
+
+class JournalEntry(models.Model):
+    """
+    Écriture comptable : en-tête d'un ensemble de lignes équilibrées
+    (total des débits égal au total des crédits), passées dans un journal.
+
+    Les écritures sont créées par lots avec services.ledger_posting, qui
+    vérifie l'équilibre avant toute insertion.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant_id = models.UUIDField(null=True, blank=True)  # ID du tenant pour isolation
+
+    journal = models.ForeignKey(Journal, on_delete=models.PROTECT, related_name='entries')
+    fiscal_period = models.ForeignKey('core.FiscalPeriod', on_delete=models.PROTECT, related_name='entries')
+    date = models.DateField()
+    reference = models.CharField(max_length=50, blank=True, default='', help_text="Pièce justificative")
+    description = models.CharField(max_length=255, blank=True, default='')
+    reversal_of = models.OneToOneField(
+        'self', on_delete=models.PROTECT, null=True, blank=True, related_name='reversed_by',
+        help_text="Écriture extournée par celle-ci"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Écriture comptable"
+        verbose_name_plural = "Écritures comptables"
+        ordering = ['date', 'created_at']
+        indexes = [
+            models.Index(fields=['tenant_id', 'journal', 'date'], name='core_entry_tenant_jnl_date'),
+            models.Index(fields=['tenant_id', 'date'], name='core_entry_tenant_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.journal_id} {self.date} {self.reference}"
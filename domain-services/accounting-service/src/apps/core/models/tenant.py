@@ -0,0 +1,95 @@
+# apps/core/models/tenant.py
+from django.db import models
+import uuid
+
+from ..tenant_context import require_current_tenant_id
+
+
+class TenantStatus(models.TextChoices):
+    ACTIVE = 'ACTIVE', 'Actif'
+    SUSPENDED = 'SUSPENDED', 'Suspendu'
+    CLOSED = 'CLOSED', 'Clôturé'
+
+
+class Tenant(models.Model):
+    """
+    Tenant connu du service : statut et paramètres, lus par TenantMiddleware
+    à travers un cache en mémoire (voir services.tenant_resolution).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=150)
+    status = models.CharField(max_length=20, choices=TenantStatus.choices, default=TenantStatus.ACTIVE)
+    settings = models.JSONField(default=dict, blank=True, help_text="Paramètres propres au tenant")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Tenant"
+        verbose_name_plural = "Tenants"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class TenantShardStatus(models.TextChoices):
+    ACTIVE = 'ACTIVE', 'Actif'
+    MOVING = 'MOVING', 'Déplacement en cours (écritures suspendues)'
+
+
+class TenantShard(models.Model):
+    """
+    Annuaire des shards : base de données (alias de DATABASES) qui porte les
+    données d'un tenant. Un tenant absent de l'annuaire est sur le shard par
+    défaut (voir services.tenant_sharding). La table reste dans la base
+    'default'.
+    """
+    tenant_id = models.UUIDField(primary_key=True)
+    alias = models.CharField(max_length=64, help_text="Alias de la base dans DATABASES")
+    status = models.CharField(max_length=20, choices=TenantShardStatus.choices, default=TenantShardStatus.ACTIVE)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Shard d'un tenant"
+        verbose_name_plural = "Shards des tenants"
+
+    def __str__(self):
+        return f"{self.tenant_id} -> {self.alias} ({self.get_status_display()})"
+
+
+class TenantQuerySet(models.QuerySet):
+    """Requêtes sur un modèle isolé par tenant (champ tenant_id)"""
+
+    def for_tenant(self, tenant_id):
+        """Lignes d'un tenant donné, lues sur son shard"""
+        return self.filter(tenant_id=tenant_id).with_tenant_hint(tenant_id)
+
+    def with_tenant_hint(self, tenant_id):
+        """Indique le tenant au routeur des shards (apps.core.db_routers)"""
+        clone = self._chain()
+        clone._hints = {**self._hints, 'tenant_id': tenant_id}
+        return clone
+
+    def create(self, **kwargs):
+        # Sans tenant indiqué, la ligne est écrite sur le shard de son propre tenant
+        if kwargs.get('tenant_id') is not None and 'tenant_id' not in self._hints:
+            return super(TenantQuerySet, self.with_tenant_hint(kwargs['tenant_id'])).create(**kwargs)
+        return super().create(**kwargs)
+
+
+class TenantManager(models.Manager.from_queryset(TenantQuerySet)):
+    """
+    Manager limité au tenant courant (voir apps.core.tenant_context).
+
+    Déclaré en plus du manager objects, qui reste le manager par défaut
+    (relations, administration, commandes multi-tenants) : les vues lisent
+    Model.tenant_objects, filtré sans qu'elles aient à passer le tenant.
+
+    Raises:
+        TenantNotSetError: À la création du queryset, si aucun tenant n'est défini
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().for_tenant(require_current_tenant_id())
@@ -5,6 +5,7 @@ import uuid
 from django.db import models
 from django.core.exceptions import ValidationError
 from .account import Account
+from .tenant import TenantQuerySet, TenantManager
 from ..utils import format_accounting_name, format_accounting_code
 
 class Tiers(models.Model):
@@ -47,11 +48,18 @@ class Tiers(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TenantQuerySet.as_manager()
+    tenant_objects = TenantManager()
+    
     class Meta:
         verbose_name = "Tiers"
         verbose_name_plural = "Tiers"
         unique_together = [['tenant_id', 'code']]
         ordering = ['code', 'name']
+        indexes = [
+            models.Index(fields=['tenant_id', 'account'], name='core_tiers_tenant_account'),
+            models.Index(fields=['tenant_id', 'type', 'is_active'], name='core_tiers_tenant_type_act'),
+        ]
         
     def __str__(self):
         return f"{self.code} - {self.name}"
@@ -61,11 +69,14 @@ class Tiers(models.Model):
         super().clean()
         
         # Vérifier que le compte est bien un compte de tiers (classe 4)
-        if self.account and self.account.account_class.number != 4:
-            raise ValidationError({
-                'account': f"Le compte doit être un compte de tiers (classe 4), "
-                          f"pas un compte de classe {self.account.account_class.number}"
-            })
+        if self.account:
+            from ..services.chart_cache import account_class_number
+            class_number = account_class_number(self.account)
+            if class_number != 4:
+                raise ValidationError({
+                    'account': f"Le compte doit être un compte de tiers (classe 4), "
+                              f"pas un compte de classe {class_number}"
+                })
         
         # Vérifier le format du code
         if self.code:
@@ -104,58 +115,54 @@ class Tiers(models.Model):
         
         super().save(*args, **kwargs)
         
+    # Tiers génériques de create_default_tiers, rattachés aux comptes client, fournisseur et employé
+    DEFAULT_TIERS = [
+        {'code': 'CLIENT001', 'name': 'Client générique', 'type': 'CUSTOMER', 'notes': 'Compte client par défaut'},
+        {'code': 'FOURN001', 'name': 'Fournisseur générique', 'type': 'SUPPLIER',
+         'notes': 'Compte fournisseur par défaut'},
+        {'code': 'EMPL001', 'name': 'Employé générique', 'type': 'EMPLOYEE', 'notes': 'Compte employé par défaut'},
+    ]
+
+    @classmethod
+    def default_tiers_keys(cls):
+        """Type et nom (formaté comme à l'enregistrement) de chaque tiers par défaut"""
+        return [(spec['type'], format_accounting_name(spec['name'])) for spec in cls.DEFAULT_TIERS]
+
     @classmethod
     def create_default_tiers(cls, tenant_id):
         """
         Crée des comptes de tiers par défaut pour un tenant.
         Les tiers par défaut incluent un client générique, un fournisseur générique et un employé générique.
         """
-        # Récupérer les comptes clients et fournisseurs du plan comptable
-        try:
-            client_account = Account.objects.get(code='411', tenant_id=tenant_id)
-            supplier_account = Account.objects.get(code='401', tenant_id=tenant_id)
-            employee_account = Account.objects.get(code='421', tenant_id=tenant_id)
-        except Account.DoesNotExist:
+        # Récupérer les comptes clients et fournisseurs dans le plan en cache
+        from ..services.chart_cache import get_chart
+        chart = get_chart(tenant_id)
+        rows = [chart.account(code) for code in ('411', '401', '421')]
+        if None in rows:
             # Essayer avec des codes plus génériques
-            try:
-                client_account = Account.objects.filter(code__startswith='41', tenant_id=tenant_id).first()
-                supplier_account = Account.objects.filter(code__startswith='40', tenant_id=tenant_id).first()
-                employee_account = Account.objects.filter(code__startswith='42', tenant_id=tenant_id).first()
-                
-                if not client_account or not supplier_account or not employee_account:
-                    raise Exception("Les comptes de tiers standard n'ont pas été trouvés dans le plan comptable.")
-            except Exception as e:
-                raise Exception(f"Impossible de créer les tiers par défaut: {str(e)}")
+            codes = sorted(chart.accounts_by_code)
+            rows = [
+                next((chart.account(code) for code in codes if code.startswith(prefix)), None)
+                for prefix in ('41', '40', '42')
+            ]
+            if None in rows:
+                raise Exception(
+                    "Impossible de créer les tiers par défaut: "
+                    "Les comptes de tiers standard n'ont pas été trouvés dans le plan comptable."
+                )
+        accounts = Account.objects.for_tenant(tenant_id).select_related('account_class').in_bulk([row['id'] for row in rows])
+        client_account, supplier_account, employee_account = [accounts[row['id']] for row in rows]
         
         # Créer les tiers par défaut
         default_tiers = [
-            {
-                'code': 'CLIENT001',
-                'name': 'Client générique',
-                'type': 'CUSTOMER',
-                'account': client_account,
-                'notes': 'Compte client par défaut'
-            },
-            {
-                'code': 'FOURN001',
-                'name': 'Fournisseur générique',
-                'type': 'SUPPLIER',
-                'account': supplier_account,
-                'notes': 'Compte fournisseur par défaut'
-            },
-            {
-                'code': 'EMPL001',
-                'name': 'Employé générique',
-                'type': 'EMPLOYEE',
-                'account': employee_account,
-                'notes': 'Compte employé par défaut'
-            },
+            {**spec, 'account': account}
+            for spec, account in zip(cls.DEFAULT_TIERS, (client_account, supplier_account, employee_account))
         ]
         
         created_tiers = []
         for tiers_data in default_tiers:
             # Vérifier si le tiers existe déjà
-            if not cls.objects.filter(code=tiers_data['code'], tenant_id=tenant_id).exists():
+            if not cls.objects.for_tenant(tenant_id).filter(code=tiers_data['code']).exists():
                 tiers = cls.objects.create(
                     tenant_id=tenant_id,
                     **tiers_data
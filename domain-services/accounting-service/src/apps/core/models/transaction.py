@@ -0,0 +1,75 @@
+# apps/core/models/transaction.py
+from django.db import models
+import uuid
+
+
+class TransactionLine(models.Model):
+    """
+    Ligne d'écriture comptable (mouvement au débit ou au crédit d'un compte).
+
+    Le tenant, la date et la période fiscale de l'écriture sont recopiés sur
+    la ligne : les soldes se calculent sur cette seule table, sans jointure.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant_id = models.UUIDField(null=True, blank=True)  # ID du tenant pour isolation
+
+    entry = models.ForeignKey('core.JournalEntry', on_delete=models.CASCADE, related_name='lines')
+    account = models.ForeignKey('core.Account', on_delete=models.PROTECT, related_name='transaction_lines')
+    date = models.DateField()
+    fiscal_period = models.ForeignKey('core.FiscalPeriod', on_delete=models.PROTECT, related_name='transaction_lines')
+    description = models.CharField(max_length=255, blank=True, default='')
+
+    debit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Ligne d'écriture"
+        verbose_name_plural = "Lignes d'écriture"
+        ordering = ['date', 'created_at']
+        indexes = [
+            models.Index(fields=['tenant_id', 'account', 'date'], name='core_txline_tenant_acc_date'),
+            models.Index(fields=['tenant_id', 'fiscal_period', 'account'], name='core_txline_tenant_per_acc'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.account_id} D {self.debit} C {self.credit}"
+
+
+class AccountPeriodBalance(models.Model):
+    """
+    Solde d'un compte sur une période fiscale, maintenu à chaque passation
+    (voir services.period_balances).
+
+    Les montants suivent la convention débit - crédit : opening est le solde
+    cumulé avant la période, closing le solde cumulé à sa fin. Seuls les
+    couples compte/période ayant reçu des mouvements ont une ligne.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant_id = models.UUIDField(null=True, blank=True)  # ID du tenant pour isolation
+
+    account = models.ForeignKey('core.Account', on_delete=models.CASCADE, related_name='period_balances')
+    fiscal_period = models.ForeignKey('core.FiscalPeriod', on_delete=models.CASCADE, related_name='account_balances')
+    # Bornes de la période, recopiées pour combiner les soldes sans jointure
+    period_start = models.DateField()
+    period_end = models.DateField()
+
+    opening = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    debit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    closing = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Solde de compte par période"
+        verbose_name_plural = "Soldes de comptes par période"
+        ordering = ['period_start']
+        unique_together = [['account', 'fiscal_period']]
+        indexes = [
+            models.Index(fields=['tenant_id', 'account', 'period_start'], name='core_balance_tenant_acc_start'),
+        ]
+
+    def __str__(self):
+        return f"{self.account_id} {self.period_start} D {self.debit} C {self.credit}"
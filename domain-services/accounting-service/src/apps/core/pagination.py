@@ -0,0 +1,245 @@
+# apps/core/pagination.py
+"""
+Pagination des listes de l'API.
+
+KeysetPagination conserve par défaut le comportement de PageNumberPagination
+(?page=N, réponse count/next/previous/results) et ajoute une pagination par
+curseur, activée par ?pagination=cursor ou par la présence de ?cursor= :
+
+- les lignes sont triées sur l'ordre de la vue (?ordering, sinon
+  cursor_ordering ou ordering de la vue), complété par l'identifiant pour
+  départager les égalités ;
+- le curseur encode les valeurs de ces champs pour la dernière (ou la
+  première) ligne de la page, et la page suivante est lue par une
+  comparaison lexicographique sur ces valeurs (WHERE code > ... OR (code =
+  ... AND id > ...)) au lieu d'un OFFSET : la page 1000 coûte autant que la
+  première ;
+- aucun COUNT(*) n'est exécuté, sauf demande explicite.
+
+?count=exact|approximate|none choisit le calcul du total dans les deux modes
+(exact par défaut en mode page, none en mode curseur). approximate utilise
+l'estimation du planificateur de PostgreSQL (EXPLAIN) et un comptage exact
+sur les autres bases.
+"""
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+from functools import cached_property
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Page, Paginator as DjangoPaginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+COUNT_MODES = ('exact', 'approximate', 'none')
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Comme DjangoJSONEncoder, mais sans tronquer les microsecondes (la position doit être exacte)"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def estimate_count(queryset):
+    """
+    Nombre de lignes d'un queryset estimé par le planificateur (PostgreSQL),
+    sans parcourir la table ; comptage exact sur les autres bases
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ApproximateCountPaginator(DjangoPaginator):
+    """Paginator dont le total est estimé (voir estimate_count)"""
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+class UncountedPage(Page):
+    """Page dont l'existence de la suivante est connue sans compter les lignes"""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class KeysetPagination(PageNumberPagination):
+    """Pagination par numéro de page (par défaut) ou par curseur, sans COUNT(*) facultatif"""
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+    invalid_cursor_message = "Curseur invalide."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        params = request.query_params
+        self.cursor_mode = self.cursor_query_param in params or params.get(self.mode_query_param) == 'cursor'
+        self.count_mode = params.get(self.count_query_param) or ('none' if self.cursor_mode else 'exact')
+        if self.count_mode not in COUNT_MODES:
+            raise ValidationError({self.count_query_param: f"Valeurs possibles: {', '.join(COUNT_MODES)}"})
+
+        if self.cursor_mode:
+            return self.paginate_keyset(queryset, request, view, page_size)
+        if self.count_mode == 'none':
+            return self.paginate_uncounted(queryset, request, page_size)
+        if self.count_mode == 'approximate':
+            self.django_paginator_class = ApproximateCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    # Mode page sans total
+
+    def paginate_uncounted(self, queryset, request, page_size):
+        """Page N lue avec une ligne de plus que la taille de page pour savoir s'il en existe une suivante"""
+        number = request.query_params.get(self.page_query_param) or '1'
+        if not number.isdigit() or int(number) < 1:
+            raise NotFound(self.invalid_page_message)
+        number = int(number)
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.page = UncountedPage(rows[:page_size], number, DjangoPaginator(queryset, page_size),
+                                  len(rows) > page_size)
+        return list(self.page)
+
+    # Mode curseur
+
+    def get_keyset(self, queryset, request, view):
+        """
+        Champs de tri du curseur : ceux de ?ordering, sinon cursor_ordering ou ordering
+        de la vue, complétés par la clé primaire. Une relation est triée sur sa
+        colonne (fiscal_year -> fiscal_year_id).
+        """
+        ordering = None
+        if request.query_params.get('ordering') and queryset.query.order_by:
+            ordering = list(queryset.query.order_by)
+        if not ordering or not all(isinstance(field, str) for field in ordering):
+            ordering = list(
+                getattr(view, 'cursor_ordering', None) or getattr(view, 'ordering', None)
+                or queryset.model._meta.ordering
+            )
+
+        opts = queryset.model._meta
+        keyset = []
+        for field_name in ordering:
+            descending = field_name.startswith('-')
+            name = field_name.lstrip('-')
+            if name == 'pk':
+                name = opts.pk.attname
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                raise ValidationError({'ordering': f"Tri sur '{name}' incompatible avec la pagination par curseur"})
+            if field.null:
+                raise ValidationError({'ordering': f"Le champ '{name}' peut être vide : tri par curseur impossible"})
+            keyset.append(('-' if descending else '') + field.attname)
+        if opts.pk.attname not in [field.lstrip('-') for field in keyset]:
+            keyset.append(opts.pk.attname)
+        return keyset
+
+    def encode_cursor(self, keyset, row, reverse):
+        values = [row[field.lstrip('-')] if isinstance(row, dict) else getattr(row, field.lstrip('-'))
+                  for field in keyset]
+        payload = json.dumps({'o': keyset, 'v': values, 'r': reverse}, cls=CursorEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, value, keyset):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+            if payload['o'] != keyset or len(payload['v']) != len(keyset):
+                raise ValueError
+            return payload['v'], bool(payload['r'])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def after(order, values):
+        """Lignes situées après values dans l'ordre donné (comparaison lexicographique)"""
+        condition = None
+        equal = Q()
+        for field, value in zip(order, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            branch = equal & Q(**{f'{name}__{lookup}': value})
+            condition = branch if condition is None else condition | branch
+            equal &= Q(**{name: value})
+        # Borne redondante sur le premier champ : permet un parcours d'index par plage
+        first = order[0].lstrip('-')
+        return Q(**{f"{first}__{'lte' if order[0].startswith('-') else 'gte'}": values[0]}) & condition
+
+    def paginate_keyset(self, queryset, request, view, page_size):
+        keyset = self.get_keyset(queryset, request, view)
+        cursor = request.query_params.get(self.cursor_query_param)
+        values, reverse = self.decode_cursor(cursor, keyset) if cursor else (None, False)
+
+        # Vers l'arrière, l'ordre est inversé puis les lignes remises dans l'ordre de la vue
+        order = [field[1:] if field.startswith('-') else '-' + field for field in keyset] if reverse else keyset
+        page = queryset.order_by(*order)
+        if values is not None:
+            page = page.filter(self.after(order, values))
+        rows = list(page[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next, has_previous = (True, has_more) if reverse else (has_more, values is not None)
+        self.next_cursor = self.encode_cursor(keyset, rows[-1], False) if rows and has_next else None
+        self.previous_cursor = self.encode_cursor(keyset, rows[0], True) if rows and has_previous else None
+
+        self.count = None
+        if self.count_mode == 'exact':
+            self.count = queryset.count()
+        elif self.count_mode == 'approximate':
+            self.count = estimate_count(queryset)
+        return rows
+
+    def cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        if self.cursor_mode:
+            count = self.count
+            links = [('next', self.cursor_link(self.next_cursor)),
+                     ('previous', self.cursor_link(self.previous_cursor))]
+        else:
+            count = None if self.count_mode == 'none' else self.page.paginator.count
+            links = [('next', self.get_next_link()), ('previous', self.get_previous_link())]
+        fields = [('count', count)] if count is not None else []
+        return Response(OrderedDict(fields + links + [('results', data)]))
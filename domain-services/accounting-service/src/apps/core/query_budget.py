@@ -0,0 +1,83 @@
+# apps/core/query_budget.py
+"""
+Budgets de requêtes SQL des vues de l'API.
+
+Chaque vue déclare le nombre maximal de requêtes de ses actions, soit dans
+un dictionnaire query_budgets (actions standard d'un viewset, ou méthodes
+HTTP d'une APIView), soit avec le décorateur query_budget sur une action :
+
+    class AccountViewSet(viewsets.ModelViewSet):
+        query_budgets = {'list': 2, 'retrieve': 1}
+
+        @query_budget(2)
+        @action(detail=False, methods=['get'])
+        def tree(self, request): ...
+
+Un budget ne dépend pas du volume de données : une action dont le nombre de
+requêtes croît avec le nombre de lignes (N+1) le dépasse tôt ou tard. Les
+budgets sont vérifiés par tests/views/test_query_budgets.py, qui appelle
+chaque route du routeur avec deux volumes de données, et journalisés en
+développement par QueryBudgetMiddleware.
+"""
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+def query_budget(max_queries):
+    """Décorateur : nombre maximal de requêtes d'une action de viewset"""
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+def get_query_budget(view_class, action):
+    """
+    Budget d'une action (nom d'action d'un viewset ou méthode HTTP en minuscules).
+
+    Returns:
+        int: Nombre maximal de requêtes, None si aucun budget n'est déclaré
+    """
+    budget = getattr(getattr(view_class, action, None), 'query_budget', None)
+    if budget is None:
+        budget = (getattr(view_class, 'query_budgets', None) or {}).get(action)
+    return budget
+
+
+class QueryCounter:
+    """Nombre de requêtes exécutées, toutes bases confondues"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes exécutées dans le bloc (sur toutes les connexions)"""
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield counter
+
+
+def router_endpoints(router):
+    """
+    Routes GET d'un routeur DRF : liste, détail et actions supplémentaires.
+
+    Yields:
+        tuple: (viewset, action, detail, nom de l'URL sans namespace)
+    """
+    for prefix, viewset, basename in router.registry:
+        if hasattr(viewset, 'list'):
+            yield viewset, 'list', False, f'{basename}-list'
+        if hasattr(viewset, 'retrieve'):
+            yield viewset, 'retrieve', True, f'{basename}-detail'
+        for extra in viewset.get_extra_actions():
+            if 'get' in extra.mapping:
+                yield viewset, extra.__name__, extra.detail, f'{basename}-{extra.url_name}'
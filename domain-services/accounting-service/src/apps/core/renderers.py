@@ -0,0 +1,36 @@
+# apps/core/renderers.py
+"""
+Rendu JSON rapide pour l'API.
+
+FastJSONRenderer produit le même JSON compact que JSONRenderer, mais avec
+orjson lorsqu'il est installé (dépendance facultative) : l'encodage se fait
+en C, sans passer par JSONEncoder.default pour les UUID, dates et heures.
+Les dates et heures sont écrites comme le font les champs DateField et
+DateTimeField des sérialiseurs (ISO 8601, microsecondes, 'Z' pour UTC), ce
+qui permet de rendre directement les lignes d'un queryset .values() (voir
+views.mixins.ValuesListMixin).
+
+Sans orjson, ou si une indentation est demandée, le rendu est celui de
+JSONRenderer.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance facultative
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer encodé par orjson si disponible"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact or \
+                self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_UTC_Z)
+        # Mêmes échappements que JSONRenderer (JSON sous-ensemble strict de JavaScript)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
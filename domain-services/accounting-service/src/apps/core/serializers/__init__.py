@@ -1,11 +1,13 @@
 # Import des vues
 from .account_serializers import AccountClassSerializer, AccountCategorySerializer, AccountSerializer
 from .fiscal_year_serializers import FiscalYearSerializer, FiscalPeriodSerializer
+from .job_serializers import JobSerializer
 
 __all__ = [
     'AccountClassSerializer', 
     'AccountCategorySerializer', 
     'AccountSerializer',
     'FiscalYearSerializer', 
-    'FiscalPeriodSerializer'
+    'FiscalPeriodSerializer',
+    'JobSerializer'
 ]
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Sérialiseurs pour les jobs
+"""
+from rest_framework import serializers
+from ..models.job import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Sérialiseur (lecture seule) du statut et de l'avancement d'un job"""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'params', 'status', 'status_display', 'progress', 'message',
+            'result', 'error', 'attempts', 'tenant_id', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
@@ -4,6 +4,7 @@ Sérialiseurs pour les tiers
 from rest_framework import serializers
 from ..models.tiers import Tiers
 from ..models.account import Account
+from ..services.chart_cache import account_class_number, get_chart
 
 class TiersSerializer(serializers.ModelSerializer):
     """Sérialiseur pour le modèle Tiers"""
@@ -31,7 +32,11 @@ class TiersSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
         extra_kwargs = {
-            'account': {'required': False},  # Rendre account optionnel car on peut utiliser account_code_input
+            'account': {
+                'required': False,  # Rendre account optionnel car on peut utiliser account_code_input
+                # La classe du compte est contrôlée par validate_account et create
+                'queryset': Account.objects.select_related('account_class'),
+            },
         }
     
     def validate_account(self, value):
@@ -39,7 +44,7 @@ class TiersSerializer(serializers.ModelSerializer):
         if not value:
             return value
             
-        account_class = value.account_class.number
+        account_class = account_class_number(value)
         if account_class != 4:
             raise serializers.ValidationError(
                 f"Le compte doit être un compte de tiers (classe 4), "
@@ -163,12 +168,13 @@ class TiersSerializer(serializers.ModelSerializer):
         account_code = validated_data.pop('account_code_input', None)
         
         if not account and account_code:
-            try:
-                account = Account.objects.get(code=account_code, tenant_id=tenant_id)
-            except Account.DoesNotExist:
+            # Recherche par code dans le plan en cache, puis lecture du compte par clé primaire
+            row = get_chart(tenant_id).account(account_code)
+            if row is None:
                 raise serializers.ValidationError({
                     "account_code_input": f"Le compte avec le code {account_code} n'existe pas pour ce tenant."
                 })
+            account = Account.objects.select_related('account_class').get(pk=row['id'])
         
         if not account:
             raise serializers.ValidationError({
@@ -176,9 +182,10 @@ class TiersSerializer(serializers.ModelSerializer):
             })
             
         # Vérifier que le compte est bien un compte de tiers (classe 4)
-        if account.account_class.number != 4:
+        class_number = account_class_number(account)
+        if class_number != 4:
             raise serializers.ValidationError({
-                "account": f"Le compte doit être un compte de tiers (classe 4), pas un compte de classe {account.account_class.number}."
+                "account": f"Le compte doit être un compte de tiers (classe 4), pas un compte de classe {class_number}."
             })
         
         # Créer le tiers avec le compte trouvé
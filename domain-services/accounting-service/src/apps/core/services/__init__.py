@@ -0,0 +1,7 @@
+# apps/core/services/__init__.py
+"""
+Services métier de l'application comptable.
+
+Ce package regroupe la logique qui dépasse le cadre d'un seul modèle
+(provisionnement du plan comptable, imports en masse, etc.).
+"""
@@ -0,0 +1,237 @@
+# apps/core/services/account_hierarchy.py
+"""
+Index hiérarchique matérialisé du plan comptable.
+
+Chaque compte porte, en plus de son lien parent :
+
+- path : le chemin matérialisé, concaténation des identifiants (hexadécimal,
+  32 caractères suivis de '/') de ses ancêtres puis du sien. Les segments
+  ont une largeur fixe : l'ancêtre de profondeur k d'un compte est le préfixe
+  path[:SEGMENT_LENGTH * (k + 1)] ;
+- depth : la profondeur (0 pour un compte sans parent) ;
+- descendant_count : le nombre de comptes de son sous-arbre, lui exclu.
+
+Un sous-arbre est ainsi un préfixe de chemin (LIKE 'prefixe%' sur une
+colonne indexée) et les ancêtres d'un compte se lisent dans son chemin.
+
+Account.save() et Account.delete() maintiennent l'index en quelques
+requêtes, quelle que soit la taille du sous-arbre déplacé ; les écritures
+groupées (import, synchronisation, clonage, restauration) le recalculent
+ensuite en une passe avec rebuild_hierarchy.
+"""
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+
+SEGMENT_LENGTH = 33
+
+MAX_DEPTH = 30
+
+PATH_MAX_LENGTH = SEGMENT_LENGTH * MAX_DEPTH
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class HierarchyError(ValueError):
+    """Hiérarchie incohérente (cycle, profondeur excessive)"""
+
+
+def path_segment(pk):
+    """Segment de chemin d'un compte"""
+    return (pk if isinstance(pk, uuid.UUID) else uuid.UUID(str(pk))).hex + '/'
+
+
+def path_ancestor_ids(path):
+    """Identifiants des ancêtres d'un compte, de la racine au parent"""
+    return [uuid.UUID(path[start:start + 32]) for start in range(0, len(path) - SEGMENT_LENGTH, SEGMENT_LENGTH)]
+
+
+def compute_hierarchy(nodes):
+    """
+    Calcule chemins, profondeurs et nombres de descendants en temps linéaire.
+
+    Args:
+        nodes (iterable): Couples (id, parent_id) ; un parent absent des nœuds fait du compte une racine
+
+    Returns:
+        dict: id -> (path, depth, descendant_count)
+    """
+    parents = dict(nodes)
+    children = {}
+    roots = []
+    for pk, parent_id in parents.items():
+        if parent_id is None or parent_id not in parents:
+            roots.append(pk)
+        else:
+            children.setdefault(parent_id, []).append(pk)
+
+    # Parcours en largeur : chaque parent est traité avant ses enfants
+    order = []
+    paths = {}
+    depths = {}
+    for root in roots:
+        paths[root] = path_segment(root)
+        depths[root] = 0
+        order.append(root)
+    position = 0
+    while position < len(order):
+        pk = order[position]
+        position += 1
+        for child in children.get(pk, ()):
+            depth = depths[pk] + 1
+            if depth >= MAX_DEPTH:
+                raise HierarchyError(f"Hiérarchie trop profonde au compte {child} (maximum {MAX_DEPTH} niveaux)")
+            paths[child] = paths[pk] + path_segment(child)
+            depths[child] = depth
+            order.append(child)
+
+    if len(order) != len(parents):
+        unreached = next(pk for pk in parents if pk not in paths)
+        raise HierarchyError(f"Cycle dans la hiérarchie des comptes autour de {unreached}")
+
+    # Cumul des descendants en remontant l'ordre du parcours
+    counts = dict.fromkeys(order, 0)
+    for pk in reversed(order):
+        parent_id = parents[pk]
+        if parent_id in counts:
+            counts[parent_id] += counts[pk] + 1
+
+    return {pk: (paths[pk], depths[pk], counts[pk]) for pk in order}
+
+
+def assign_hierarchy(accounts):
+    """Renseigne l'index de comptes non sauvegardés dont le plan est complet en mémoire"""
+    accounts = list(accounts)
+    hierarchy = compute_hierarchy((account.id, account.parent_id) for account in accounts)
+    for account in accounts:
+        account.path, account.depth, account.descendant_count = hierarchy[account.id]
+
+
+def rebuild_hierarchy(tenant_id, batch_size=DEFAULT_BATCH_SIZE, model=None, using=None, dry_run=False):
+    """
+    Recalcule l'index hiérarchique des comptes d'un tenant : une lecture,
+    un calcul linéaire en mémoire, puis la mise à jour des seuls comptes modifiés.
+
+    Args:
+        tenant_id (UUID): Tenant à traiter
+        batch_size (int): Nombre de comptes mis à jour par requête
+        model: Modèle Account (le modèle historique dans une migration)
+        using (str, optional): Alias de la base (défaut: shard du tenant)
+        dry_run (bool): Compter les comptes à corriger sans rien écrire
+
+    Returns:
+        dict: Nombre de comptes analysés ('accounts') et corrigés ('updated')
+    """
+    if model is None:
+        from ..models.account import Account as model
+    if using is None:
+        from .tenant_sharding import shard_for_tenant
+        using = shard_for_tenant(tenant_id)
+
+    manager = model._base_manager.using(using)
+    rows = list(manager.filter(tenant_id=tenant_id).values_list(
+        'id', 'parent_id', 'path', 'depth', 'descendant_count'
+    ))
+    hierarchy = compute_hierarchy((pk, parent_id) for pk, parent_id, *_ in rows)
+
+    changed = []
+    for pk, parent_id, path, depth, descendant_count in rows:
+        expected = hierarchy[pk]
+        if expected != (path, depth, descendant_count):
+            changed.append(model(id=pk, path=expected[0], depth=expected[1], descendant_count=expected[2]))
+
+    if changed and not dry_run:
+        manager.bulk_update(changed, ['path', 'depth', 'descendant_count'], batch_size=batch_size)
+    return {'accounts': len(rows), 'updated': len(changed)}
+
+
+def _adjust_counts(model, ids, delta, using):
+    if ids and delta:
+        model._base_manager.using(using).filter(id__in=ids).update(descendant_count=F('descendant_count') + delta)
+
+
+def place_account(account, using=DEFAULT_DB_ALIAS):
+    """
+    Calcule le chemin et la profondeur d'un compte avant son enregistrement.
+
+    Returns:
+        tuple: (ancien chemin, ancienne profondeur, taille du sous-arbre) à passer à
+        account_saved ; ancien chemin vide pour un compte nouveau
+    """
+    model = type(account)
+    wanted = [account.pk] if account.parent_id is None else [account.pk, account.parent_id]
+    stored = {
+        pk: (path, depth, count) for pk, path, depth, count in model._base_manager.using(using).filter(
+            pk__in=wanted
+        ).values_list('pk', 'path', 'depth', 'descendant_count')
+    }
+
+    old_path, old_depth, descendant_count = stored.get(account.pk, ('', 0, 0))
+    if account.parent_id is None:
+        parent_path = ''
+    else:
+        if account.parent_id not in stored:
+            raise ValidationError({'parent': "Le compte parent n'existe pas"})
+        parent_path = stored[account.parent_id][0]
+        if old_path and parent_path.startswith(old_path):
+            raise ValidationError({'parent': "Un compte ne peut pas être rattaché à lui-même ou à l'un de ses descendants"})
+
+    account.path = parent_path + path_segment(account.pk)
+    account.depth = len(account.path) // SEGMENT_LENGTH - 1
+    account.descendant_count = descendant_count
+
+    height = 0
+    if descendant_count and old_path and old_path != account.path:
+        deepest = model._base_manager.using(using).filter(path__startswith=old_path).order_by(
+            '-depth').values_list('depth', flat=True).first()
+        height = deepest - old_depth
+    if account.depth + height >= MAX_DEPTH:
+        raise ValidationError({'parent': f"La hiérarchie ne peut pas dépasser {MAX_DEPTH} niveaux"})
+    return old_path, old_depth, descendant_count
+
+
+def account_saved(account, previous, using=DEFAULT_DB_ALIAS):
+    """Répercute l'enregistrement d'un compte sur ses ancêtres et son sous-arbre"""
+    model = type(account)
+    old_path, old_depth, descendant_count = previous
+    if old_path == account.path:
+        return
+
+    size = descendant_count + 1
+    new_ancestors = set(path_ancestor_ids(account.path))
+    if not old_path:
+        _adjust_counts(model, new_ancestors, size, using)
+        return
+
+    # Déplacement : le sous-arbre hérite du nouveau préfixe en une requête
+    if descendant_count:
+        model._base_manager.using(using).filter(path__startswith=old_path).exclude(pk=account.pk).update(
+            path=Concat(Value(account.path), Substr('path', len(old_path) + 1)),
+            depth=F('depth') + (account.depth - old_depth),
+        )
+    old_ancestors = set(path_ancestor_ids(old_path))
+    _adjust_counts(model, old_ancestors - new_ancestors, -size, using)
+    _adjust_counts(model, new_ancestors - old_ancestors, size, using)
+
+
+def detach_account(account, using=DEFAULT_DB_ALIAS):
+    """
+    Prépare la suppression d'un compte : ses enfants deviennent des racines
+    (comme le SET_NULL de la clé parent) et ses ancêtres perdent son sous-arbre.
+    """
+    model = type(account)
+    manager = model._base_manager.using(using)
+    stored = manager.filter(pk=account.pk).values_list('path', 'depth', 'descendant_count').first()
+    if stored is None or not stored[0]:
+        return
+    path, depth, descendant_count = stored
+
+    if descendant_count:
+        manager.filter(path__startswith=path).exclude(pk=account.pk).update(
+            path=Substr('path', len(path) + 1),
+            depth=F('depth') - (depth + 1),
+        )
+    _adjust_counts(model, path_ancestor_ids(path), -(descendant_count + 1), using)
@@ -0,0 +1,90 @@
+# apps/core/services/account_tree.py
+"""
+Arborescence du plan comptable d'un tenant pour l'API.
+
+Les comptes sont lus en une requête .values() (sans instancier de modèles)
+puis assemblés en une passe linéaire : chaque ligne devient un nœud indexé
+par son identifiant et est rattachée à son parent. Avec root, seul le
+sous-arbre du compte est lu (préfixe de son chemin matérialisé, voir
+account_hierarchy) ; depth limite le nombre de niveaux sous les racines.
+
+L'ETag d'une arborescence est dérivé de la version du plan du tenant
+(ChartVersion), incrémentée à chaque écriture : un plan inchangé se
+revalide sans lire la table des comptes.
+"""
+import hashlib
+
+from django.utils.http import parse_etags
+
+from ..models.account import Account
+
+# Champs de chaque nœud de l'arborescence
+TREE_FIELDS = ['id', 'parent', 'code', 'name', 'type', 'level', 'is_active', 'descendant_count']
+
+
+def build_tree(rows):
+    """
+    Assemble des lignes de comptes en arborescence, en temps linéaire.
+
+    Args:
+        rows (iterable): Dictionnaires contenant au moins 'id' et 'parent' ; l'ordre
+            des lignes est conservé entre frères
+
+    Returns:
+        list: Nœuds racines (comptes dont le parent est absent des lignes),
+        chacun avec sa liste 'children'
+    """
+    nodes = {}
+    for row in rows:
+        row['children'] = []
+        nodes[row['id']] = row
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node['parent'])
+        if parent is None:
+            roots.append(node)
+        else:
+            parent['children'].append(node)
+    return roots
+
+
+def account_tree(tenant_id, root=None, depth=None):
+    """
+    Arborescence des comptes d'un tenant, triée par code.
+
+    Args:
+        tenant_id (UUID): Tenant
+        root (UUID, optional): Compte racine du sous-arbre à renvoyer
+        depth (int, optional): Nombre de niveaux renvoyés sous les racines (0 = racines seules)
+
+    Returns:
+        tuple: (nœuds racines, nombre total de nœuds)
+
+    Raises:
+        Account.DoesNotExist: Si le compte racine n'appartient pas au tenant
+    """
+    accounts = Account.objects.filter(tenant_id=tenant_id)
+    min_depth = 0
+    if root is not None:
+        path, min_depth = accounts.filter(pk=root).values_list('path', 'depth').get()
+        accounts = accounts.filter(path__startswith=path)
+    if depth is not None:
+        accounts = accounts.filter(depth__lte=min_depth + depth)
+
+    rows = list(accounts.order_by('code').values(*TREE_FIELDS))
+    return build_tree(rows), len(rows)
+
+
+def tree_etag(tenant_id, version, root=None, depth=None):
+    """ETag fort d'une arborescence : version du plan et paramètres de la requête"""
+    key = f"{tenant_id}:{version}:{root or ''}:{'' if depth is None else depth}"
+    return f'"{version}-{hashlib.sha1(key.encode()).hexdigest()[:16]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Indique si l'en-tête If-None-Match désigne l'ETag (comparaison faible, RFC 9110)"""
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in [tag.removeprefix('W/') for tag in etags]
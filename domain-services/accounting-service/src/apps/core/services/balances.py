@@ -0,0 +1,129 @@
+# apps/core/services/balances.py
+"""
+Calcul ensembliste des soldes de comptes.
+
+Les totaux débit/crédit de n'importe quel nombre de comptes sont obtenus en
+une seule requête, union de deux agrégats groupés par compte :
+
+- les soldes par période (AccountPeriodBalance) des périodes entièrement
+  comprises dans la plage de dates ;
+- les lignes d'écriture des périodes partiellement couvertes (filtrées sur
+  tenant_id, compte et date, l'ordre de l'index des lignes).
+
+Le volume lu dépend ainsi du nombre de périodes et non du nombre de lignes
+passées. Le sens du solde est ensuite appliqué en mémoire :
+
+- d'après le solde normal du compte (normal_balance) quand il vaut DEBIT
+  ou CREDIT ;
+- sinon (non renseigné ou VARIABLE) d'après son type : débiteur pour
+  l'actif et les charges, créditeur pour les autres types.
+"""
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db.models import Q, QuerySet, Sum
+
+from ..models.account import AccountType
+from ..models.transaction import AccountPeriodBalance, TransactionLine
+
+ZERO = Decimal('0.00')
+
+DEBIT_TYPES = {AccountType.ASSET, AccountType.EXPENSE}
+
+
+class AccountBalance(namedtuple('AccountBalance', ['debit', 'credit', 'balance'])):
+    """Totaux débit et crédit d'un compte, et son solde dans le sens normal du compte"""
+    __slots__ = ()
+
+
+EMPTY_BALANCE = AccountBalance(ZERO, ZERO, ZERO)
+
+
+class Balances(dict):
+    """id du compte -> AccountBalance ; un compte sans mouvement a un solde nul"""
+
+    def __missing__(self, account_id):
+        return EMPTY_BALANCE
+
+
+def is_debit_normal(normal_balance, account_type):
+    """Indique si le solde d'un compte se lit au débit (débit - crédit)"""
+    if normal_balance in ('DEBIT', 'CREDIT'):
+        return normal_balance == 'DEBIT'
+    return account_type in DEBIT_TYPES
+
+
+def balances_for(accounts, start_date=None, end_date=None):
+    """
+    Soldes d'un ensemble de comptes sur une période, en une requête.
+
+    Args:
+        accounts: Queryset de comptes (utilisé en sous-requête, sans être évalué)
+            ou liste de comptes
+        start_date (date, optional): Première date incluse
+        end_date (date, optional): Dernière date incluse
+
+    Returns:
+        Balances: id du compte -> AccountBalance(debit, credit, balance)
+    """
+    if isinstance(accounts, QuerySet):
+        scope = {
+            'tenant_id__in': accounts.order_by().values('tenant_id'),
+            'account_id__in': accounts.order_by().values('pk'),
+        }
+        # Le sens du solde est lu avec les totaux, dans la même requête
+        group_by = ['account_id', 'account__normal_balance', 'account__type']
+        debit_normal = None
+    else:
+        accounts = list(accounts)
+        if not accounts:
+            return Balances()
+        scope = {
+            'tenant_id__in': {account.tenant_id for account in accounts},
+            'account_id__in': [account.pk for account in accounts],
+        }
+        group_by = ['account_id']
+        debit_normal = {
+            account.pk: is_debit_normal(account.normal_balance, account.type) for account in accounts
+        }
+
+    # Périodes entièrement comprises dans la plage : soldes par période
+    snapshots = AccountPeriodBalance.objects.filter(**scope)
+    whole = Q()
+    if start_date:
+        snapshots = snapshots.filter(period_start__gte=start_date)
+        whole &= Q(fiscal_period__start_date__gte=start_date)
+    if end_date:
+        snapshots = snapshots.filter(period_end__lte=end_date)
+        whole &= Q(fiscal_period__end_date__lte=end_date)
+    totals = snapshots.order_by().values(*group_by).annotate(debit_sum=Sum('debit'), credit_sum=Sum('credit'))
+
+    # Périodes partiellement couvertes : lignes de la plage
+    if start_date or end_date:
+        lines = TransactionLine.objects.filter(**scope).exclude(whole)
+        if start_date:
+            lines = lines.filter(date__gte=start_date)
+        if end_date:
+            lines = lines.filter(date__lte=end_date)
+        totals = totals.union(
+            lines.order_by().values(*group_by).annotate(debit_sum=Sum('debit'), credit_sum=Sum('credit')),
+            all=True
+        )
+
+    sums = {}
+    for row in totals:
+        account_id = row['account_id']
+        debit, credit = row['debit_sum'] or ZERO, row['credit_sum'] or ZERO
+        if account_id in sums:
+            previous = sums[account_id]
+            debit, credit = debit + previous[1], credit + previous[2]
+        sums[account_id] = (row, debit, credit)
+
+    balances = Balances()
+    for account_id, (row, debit, credit) in sums.items():
+        if debit_normal is None:
+            is_debit = is_debit_normal(row['account__normal_balance'], row['account__type'])
+        else:
+            is_debit = debit_normal[account_id]
+        balances[account_id] = AccountBalance(debit, credit, debit - credit if is_debit else credit - debit)
+    return balances
@@ -0,0 +1,241 @@
+# apps/core/services/chart_cache.py
+"""
+Cache en lecture du plan comptable de chaque tenant.
+
+Le plan (classes, catégories, comptes) change rarement mais est relu par
+chaque requête qui cherche un compte par code ou vérifie sa classe. Il est
+chargé une fois par version (trois requêtes .values()) puis servi depuis le
+cache tant que la version du plan du tenant (ChartVersion) n'a pas changé :
+chaque écriture sur les classes, catégories ou comptes, y compris les
+chemins en masse des imports, incrémente la version, et la lecture suivante
+recharge le plan. Une lecture coûte donc une requête (la version) au lieu
+des jointures ou des recherches par code.
+
+La version comprend la date de sa dernière incrémentation : un plan lu dans
+une transaction annulée n'est pas confondu avec celui d'une écriture
+ultérieure qui atteindrait le même numéro.
+
+Deux backends, choisis par le setting CHART_CACHE :
+
+- 'local' (défaut) : dictionnaire LRU en mémoire du processus, borné à
+  MAX_TENANTS plans ;
+- 'django' : cache Django CACHE_ALIAS, partagé entre processus ; les clés
+  incluent la version, les plans périmés expirent ou sont évincés par le
+  cache lui-même (TIMEOUT, MAX_ENTRIES).
+
+    CHART_CACHE = {'BACKEND': 'local', 'MAX_TENANTS': 256}
+
+Les compteurs (hits, misses, évictions) sont exposés par stats() et par
+GET /chart-cache/ pour dimensionner le cache.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from ..models.account import AccountClass, AccountCategory, Account, ChartVersion
+
+# Nombre de plans conservés par le backend local
+DEFAULT_MAX_TENANTS = 256
+
+ACCOUNT_FIELDS = ['id', 'code', 'name', 'account_class_id', 'category_id', 'parent_id', 'level', 'type', 'is_active']
+
+
+class Chart:
+    """Plan comptable d'un tenant à une version donnée, indexé par identifiant et par code"""
+
+    def __init__(self, tenant_id, version, classes, categories, accounts):
+        self.tenant_id = tenant_id
+        self.version = version
+        self.classes = {row['id']: row for row in classes}
+        self.categories = {row['id']: row for row in categories}
+        self.accounts = {row['id']: row for row in accounts}
+        self.accounts_by_code = {row['code']: row for row in accounts}
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def account(self, code):
+        """Compte du code donné (dictionnaire de ACCOUNT_FIELDS), None s'il n'existe pas"""
+        return self.accounts_by_code.get(code)
+
+    def class_number(self, account_id):
+        """Numéro de la classe d'un compte, None si le compte n'est pas dans le plan"""
+        account = self.accounts.get(account_id)
+        if account is None:
+            return None
+        return self.classes[account['account_class_id']]['number']
+
+
+def chart_version(tenant_id, using=None):
+    """Version du plan d'un tenant : (numéro, date de la dernière incrémentation)"""
+    row = ChartVersion.objects.using(using).for_tenant(tenant_id).values_list('version', 'updated_at').first()
+    return row or (0, None)
+
+
+def load_chart(tenant_id, version, using=None):
+    """Lit le plan d'un tenant en trois requêtes, sans instancier de modèles"""
+    return Chart(
+        tenant_id, version,
+        list(AccountClass.objects.using(using).for_tenant(tenant_id).values('id', 'number', 'name')),
+        list(AccountCategory.objects.using(using).for_tenant(tenant_id).values(
+            'id', 'code', 'name', 'account_class_id'
+        )),
+        list(Account.objects.using(using).for_tenant(tenant_id).values(*ACCOUNT_FIELDS)),
+    )
+
+
+class LocalMemoryBackend:
+    """Plans du processus, au plus max_tenants, le moins récemment utilisé évincé en premier"""
+
+    def __init__(self, max_tenants=DEFAULT_MAX_TENANTS):
+        self.max_tenants = max_tenants
+        self.charts = OrderedDict()
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key, version):
+        with self.lock:
+            chart = self.charts.get(key)
+            if chart is None or chart.version != version:
+                return None
+            self.charts.move_to_end(key)
+            return chart
+
+    def set(self, key, chart):
+        with self.lock:
+            self.charts[key] = chart
+            self.charts.move_to_end(key)
+            while len(self.charts) > self.max_tenants:
+                self.charts.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.charts.clear()
+            self.evictions = 0
+
+    def size(self):
+        return len(self.charts)
+
+
+class DjangoCacheBackend:
+    """Plans stockés dans un cache Django, sous une clé qui inclut la version"""
+
+    def __init__(self, alias='default', timeout=None):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def cache_key(self, key, version):
+        number, updated_at = version
+        return f"core:chart:{key}:{number}:{updated_at.timestamp() if updated_at else ''}"
+
+    def get(self, key, version):
+        return self.cache.get(self.cache_key(key, version))
+
+    def set(self, key, chart):
+        self.cache.set(self.cache_key(key, chart.version), chart, self.timeout)
+
+    def clear(self):
+        # Les clés versionnées deviennent inaccessibles d'elles-mêmes
+        pass
+
+    @property
+    def evictions(self):
+        return None
+
+    def size(self):
+        return None
+
+
+class ChartCache:
+    """Cache des plans comptables, lu à travers la version du plan de chaque tenant"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tenant_id, using=None):
+        """
+        Plan courant d'un tenant : une requête (la version) si le plan est en
+        cache, quatre sinon.
+        """
+        version = chart_version(tenant_id, using)
+        key = f"{using or 'default'}:{tenant_id}"
+        chart = self.backend.get(key, version)
+        if chart is not None:
+            self.hits += 1
+            return chart
+        self.misses += 1
+        chart = load_chart(tenant_id, version, using)
+        self.backend.set(key, chart)
+        return chart
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """Compteurs du cache (hit_ratio : part des lectures servies depuis le cache)"""
+        reads = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / reads, 4) if reads else None,
+            'evictions': self.backend.evictions,
+            'size': self.backend.size(),
+            'max_size': getattr(self.backend, 'max_tenants', None),
+        }
+
+
+def build_backend(options):
+    """Backend décrit par le setting CHART_CACHE"""
+    backend = options.get('BACKEND', 'local')
+    if backend == 'local':
+        return LocalMemoryBackend(options.get('MAX_TENANTS', DEFAULT_MAX_TENANTS))
+    if backend == 'django':
+        return DjangoCacheBackend(options.get('CACHE_ALIAS', 'default'), options.get('TIMEOUT'))
+    raise ValueError(f"CHART_CACHE['BACKEND'] doit être 'local' ou 'django', pas {backend!r}")
+
+
+_chart_cache = None
+
+
+def get_chart_cache():
+    """Cache des plans du processus, construit au premier appel"""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache(build_backend(getattr(settings, 'CHART_CACHE', None) or {}))
+    return _chart_cache
+
+
+@receiver(setting_changed)
+def reset_chart_cache(setting=None, **kwargs):
+    """Reconstruit le cache quand CHART_CACHE change (tests)"""
+    global _chart_cache
+    if setting in (None, 'CHART_CACHE'):
+        _chart_cache = None
+
+
+def get_chart(tenant_id, using=None):
+    """Plan courant d'un tenant (voir ChartCache.get)"""
+    return get_chart_cache().get(tenant_id, using)
+
+
+def account_class_number(account):
+    """
+    Numéro de la classe d'un compte : lu sur la classe si elle est déjà
+    chargée (select_related), sinon dans le plan en cache du tenant.
+    """
+    if Account.account_class.is_cached(account) or account.pk is None:
+        return account.account_class.number
+    number = get_chart(account.tenant_id, account._state.db).class_number(account.pk)
+    if number is None:
+        return account.account_class.number
+    return number
@@ -0,0 +1,285 @@
+# apps/core/services/chart_import.py
+"""
+Import en flux et par lots d'un plan comptable à plat (codes à 8 chiffres).
+
+Le fichier (tableau JSON ou NDJSON) est lu de manière incrémentale en une
+seule passe qui construit un ChartIndex (codes, libellés et hiérarchie) ; les
+objets JSON eux-mêmes ne sont jamais conservés. Les comptes sont ensuite
+écrits par lots avec un bulk_create(update_conflicts=True) sur
+(tenant_id, code), index hiérarchique (chemin, profondeur, descendants)
+compris : il est calculé en mémoire sur le plan fusionné (comptes existants et
+lignes du fichier).
+"""
+import json
+import time
+import uuid
+
+from .account_hierarchy import compute_hierarchy
+from .tenant_sharding import shard_for_tenant
+from ..models.account import AccountClass, AccountCategory, Account, ChartVersion
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Champs de l'index hiérarchique (voir account_hierarchy)
+HIERARCHY_FIELDS = ['path', 'depth', 'descendant_count']
+
+# Taille des blocs lus dans le fichier
+READ_CHUNK_SIZE = 64 * 1024
+
+# Séparateurs ignorés entre deux enregistrements (tableau JSON ou NDJSON)
+_SEPARATORS = ' \t\r\n,'
+
+
+def iter_json_records(file, chunk_size=READ_CHUNK_SIZE):
+    """
+    Lit de manière incrémentale les objets d'un tableau JSON ou d'un flux NDJSON.
+
+    Args:
+        file: Fichier texte ouvert
+        chunk_size (int): Taille des blocs lus dans le fichier
+
+    Yields:
+        dict: Un enregistrement à la fois
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    in_array = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+            if char == '[' and not in_array:
+                in_array = True
+                pos += 1
+                continue
+            if char == ']':
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Enregistrement incomplet : lire la suite du fichier
+                if eof:
+                    raise
+            else:
+                yield record
+                continue
+        elif eof:
+            return
+
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_chart_rows(file_path, chunk_size=READ_CHUNK_SIZE):
+    """
+    Itère sur les lignes {"code": ..., "libelle": ...} d'un fichier de plan comptable.
+
+    Args:
+        file_path (str): Chemin vers un fichier JSON (tableau) ou NDJSON
+        chunk_size (int): Taille des blocs lus dans le fichier
+
+    Yields:
+        dict: Une ligne du plan comptable à la fois
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        yield from iter_json_records(file, chunk_size)
+
+
+class ChartImporter:
+    """
+    Importe les comptes d'un ChartIndex pour un tenant, par lots.
+
+    Args:
+        tenant_id (UUID): Tenant cible
+        classify (callable): code -> dict des champs de classification du compte
+            (au minimum 'type', éventuellement 'ref_financial_statement',
+            'normal_balance', 'is_amortization_depreciation')
+        class_name (callable): numéro de classe -> libellé de la classe
+        batch_size (int): Nombre de lignes écrites par requête
+        log (callable, optional): Reçoit les messages de progression
+        using (str, optional): Alias de la base de données (défaut: shard du tenant)
+    """
+
+    def __init__(self, tenant_id, classify, class_name, batch_size=DEFAULT_BATCH_SIZE, log=None, using=None):
+        self.tenant_id = tenant_id
+        self.using = using or shard_for_tenant(tenant_id)
+        self.classify = classify
+        self.class_name = class_name
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+
+        self.class_ids = {}
+        self.category_ids = {}
+        self.account_ids = {}
+        self.account_index = {}  # id -> (parent_id, path, depth, descendant_count) en base
+        self.hierarchy = {}
+
+        self.pending_classes = []
+        self.pending_categories = []
+        self.pending_accounts = []
+        self.update_fields = None
+
+        self.stats = {'rows': 0, 'batches': 0, 'classes_created': 0, 'categories_created': 0}
+
+    def load_existing(self):
+        """Charge en une requête par modèle les identifiants existants du tenant"""
+        self.class_ids = dict(
+            AccountClass.objects.using(self.using).filter(tenant_id=self.tenant_id).values_list('number', 'id')
+        )
+        self.category_ids = dict(
+            AccountCategory.objects.using(self.using).filter(tenant_id=self.tenant_id).values_list('code', 'id')
+        )
+        self.account_ids = {}
+        self.account_index = {}
+        for pk, code, parent_id, *index in Account.objects.using(self.using).filter(tenant_id=self.tenant_id).values_list(
+                'id', 'code', 'parent_id', *HIERARCHY_FIELDS):
+            self.account_ids[code] = pk
+            self.account_index[pk] = (parent_id, *index)
+
+    def prepare_hierarchy(self, index):
+        """
+        Pré-assigne l'identifiant de chaque compte du fichier (un parent peut ainsi
+        être référencé quel que soit le lot dans lequel il est écrit) et calcule
+        l'index hiérarchique du plan fusionné.
+        """
+        for code in index.labels:
+            if code not in self.account_ids:
+                self.account_ids[code] = uuid.uuid4()
+
+        parents = {pk: row[0] for pk, row in self.account_index.items()}
+        for code, name, level, parent_code in index.entries():
+            parents[self.account_ids[code]] = self.account_ids[parent_code] if parent_code else None
+        self.hierarchy = compute_hierarchy(parents.items())
+
+    def stale_hierarchy(self, written_ids):
+        """Comptes absents du fichier dont l'index change (parent déplacé, descendants ajoutés)"""
+        stale = []
+        for pk, (parent_id, *stored) in self.account_index.items():
+            path, depth, descendant_count = self.hierarchy[pk]
+            if pk not in written_ids and tuple(stored) != (path, depth, descendant_count):
+                stale.append(Account(id=pk, path=path, depth=depth, descendant_count=descendant_count))
+        return stale
+
+    def run(self, index):
+        """
+        Importe tous les comptes d'un ChartIndex.
+
+        Returns:
+            dict: Statistiques (lignes, lots, classes et catégories créées, débit)
+        """
+        started = time.perf_counter()
+        self.load_existing()
+        self.prepare_hierarchy(index)
+
+        for code, name, level, parent_code in index.entries():
+            self.add_row(code, name, level, parent_code, index.category_labels[code[:2]])
+            if len(self.pending_accounts) >= self.batch_size:
+                self.flush()
+        self.flush()
+
+        stale = self.stale_hierarchy({self.account_ids[code] for code in index.labels})
+        if stale:
+            Account.objects.using(self.using).bulk_update(stale, HIERARCHY_FIELDS, batch_size=self.batch_size)
+        ChartVersion.bump([self.tenant_id], self.using)
+
+        elapsed = time.perf_counter() - started
+        self.stats['elapsed'] = elapsed
+        self.stats['rows_per_second'] = self.stats['rows'] / elapsed if elapsed else 0
+        return self.stats
+
+    def add_row(self, code, name, level, parent_code, category_name):
+        """Prépare un compte (et au besoin sa classe et sa catégorie) pour le prochain lot"""
+        self.stats['rows'] += 1
+        self.pending_accounts.append(self.build_account(code, name, level, parent_code, category_name))
+
+    def build_account(self, code, name, level, parent_code, category_name):
+        """
+        Construit le compte (non sauvegardé) correspondant à une ligne du plan ;
+        sa classe et sa catégorie sont mises en attente si elles n'existent pas.
+        """
+        # Déterminer la classe (premier chiffre)
+        class_number = int(code[0])
+        class_id = self.class_ids.get(class_number)
+        if class_id is None:
+            account_class = AccountClass(
+                tenant_id=self.tenant_id,
+                number=class_number,
+                name=self.class_name(class_number)
+            )
+            self.pending_classes.append(account_class)
+            class_id = self.class_ids[class_number] = account_class.id
+            self.log(f"Nouvelle classe: {class_number} - {account_class.name}")
+
+        # Déterminer la catégorie (2 premiers chiffres) ; son libellé est celui
+        # de la première ligne du fichier pour ce préfixe
+        category_code = code[:2]
+        category_id = self.category_ids.get(category_code)
+        if category_id is None:
+            category = AccountCategory(
+                tenant_id=self.tenant_id,
+                account_class_id=class_id,
+                code=category_code,
+                name=category_name
+            )
+            self.pending_categories.append(category)
+            category_id = self.category_ids[category_code] = category.id
+            self.log(f"Nouvelle catégorie: {category_code} - {category_name}")
+
+        parent_id = self.account_ids[parent_code] if parent_code else None
+
+        classification = self.classify(code)
+        account_id = self.account_ids[code]
+        path, depth, descendant_count = self.hierarchy[account_id]
+        account = Account(
+            id=account_id,
+            tenant_id=self.tenant_id,
+            code=code,
+            name=name,
+            account_class_id=class_id,
+            category_id=category_id,
+            parent_id=parent_id,
+            level=level,
+            path=path,
+            depth=depth,
+            descendant_count=descendant_count,
+            **classification
+        )
+        account.apply_accounting_format()
+
+        if self.update_fields is None:
+            self.update_fields = [
+                'name', 'account_class', 'category', 'parent', 'level', 'updated_at',
+                *HIERARCHY_FIELDS, *classification
+            ]
+
+        return account
+
+    def flush(self):
+        """Écrit le lot courant : classes et catégories nouvelles, puis upsert des comptes"""
+        if self.pending_classes:
+            AccountClass.objects.using(self.using).bulk_create(self.pending_classes)
+            self.stats['classes_created'] += len(self.pending_classes)
+            self.pending_classes = []
+
+        if self.pending_categories:
+            AccountCategory.objects.using(self.using).bulk_create(self.pending_categories)
+            self.stats['categories_created'] += len(self.pending_categories)
+            self.pending_categories = []
+
+        if self.pending_accounts:
+            Account.objects.using(self.using).bulk_create(
+                self.pending_accounts,
+                update_conflicts=True,
+                unique_fields=['tenant_id', 'code'],
+                update_fields=self.update_fields
+            )
+            self.stats['batches'] += 1
+            self.pending_accounts = []
+            self.log(f"Traitement: {self.stats['rows']} comptes...")
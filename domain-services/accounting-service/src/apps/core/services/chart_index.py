@@ -0,0 +1,139 @@
+# apps/core/services/chart_index.py
+"""
+Index en mémoire d'un plan comptable à plat (codes à 8 chiffres).
+
+Construit en une seule passe sur les lignes du fichier, il fournit :
+- code -> libellé pour chaque compte,
+- préfixe de catégorie (2 chiffres) -> premier libellé rencontré,
+- code -> code du parent et niveau, résolus sur les comptes réellement
+  présents (le parent de 10110000 est 10100000 s'il existe, sinon 10000000).
+
+La même structure sert à l'import, à la validation et aux simulations
+(--dry-run) sans relire le fichier.
+"""
+
+# Longueur du préfixe qui identifie une catégorie (ex: "10" pour 10110000)
+CATEGORY_PREFIX_LENGTH = 2
+
+
+class ChartIndex:
+    """Hiérarchie d'un plan comptable à plat, indexée par code"""
+
+    def __init__(self):
+        self.labels = {}
+        self.category_labels = {}
+        self.parents = {}
+        self.levels = {}
+        self.duplicates = []
+        self.invalid = []
+
+    @classmethod
+    def build(cls, rows):
+        """
+        Construit l'index à partir d'un itérable de lignes {"code", "libelle"}.
+
+        Les lignes sont consommées une seule fois ; seuls les codes et
+        libellés sont conservés.
+        """
+        index = cls()
+        labels = index.labels
+        category_labels = index.category_labels
+
+        for row in rows:
+            code = str(row.get('code', '')).strip()
+            if len(code) < CATEGORY_PREFIX_LENGTH or not code.isdigit():
+                index.invalid.append(row)
+                continue
+            if code in labels:
+                index.duplicates.append(code)
+            label = row.get('libelle', '')
+            labels[code] = label
+            category_labels.setdefault(code[:CATEGORY_PREFIX_LENGTH], label)
+
+        index.resolve_hierarchy()
+        return index
+
+    def resolve_hierarchy(self):
+        """Calcule le parent et le niveau de chaque code à partir des codes indexés"""
+        labels = self.labels
+        parents = self.parents
+
+        for code in labels:
+            parents[code] = self.find_parent(code)
+
+        levels = self.levels
+        for code in labels:
+            # Remonter jusqu'au premier ancêtre dont le niveau est connu
+            chain = []
+            current = code
+            while current is not None and current not in levels:
+                chain.append(current)
+                current = parents[current]
+            level = levels[current] if current is not None else 0
+            for ancestor in reversed(chain):
+                level += 1
+                levels[ancestor] = level
+
+    def find_parent(self, code):
+        """
+        Retourne le code indexé le plus proche parmi les préfixes significatifs du code.
+
+        Pour 10110000 on essaie 10100000 puis 10000000 ; un code de catégorie
+        (XX000000) n'a pas de parent.
+        """
+        significant = code.rstrip('0')
+        width = len(code)
+        for length in range(len(significant) - 1, CATEGORY_PREFIX_LENGTH - 1, -1):
+            candidate = significant[:length].ljust(width, '0')
+            if candidate in self.labels:
+                return candidate
+        return None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, code):
+        return code in self.labels
+
+    def entries(self):
+        """Itère sur (code, libellé, niveau, code parent) dans l'ordre du fichier"""
+        for code, label in self.labels.items():
+            yield code, label, self.levels[code], self.parents[code]
+
+    def children(self):
+        """Retourne le dictionnaire code parent -> liste des codes enfants"""
+        children = {}
+        for code, parent in self.parents.items():
+            children.setdefault(parent, []).append(code)
+        return children
+
+    def level_counts(self):
+        """Nombre de comptes par niveau hiérarchique"""
+        counts = {}
+        for level in self.levels.values():
+            counts[level] = counts.get(level, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def summary(self):
+        """Lignes de résumé lisibles (utilisées par les simulations --dry-run)"""
+        lines = [f"{len(self)} comptes, {len(self.category_labels)} catégories"]
+        for level, count in self.level_counts().items():
+            lines.append(f"Niveau {level}: {count} comptes")
+        return lines
+
+    def validate(self):
+        """
+        Contrôle la cohérence du plan.
+
+        Returns:
+            list: Messages décrivant les anomalies (vide si le plan est cohérent)
+        """
+        errors = []
+        for row in self.invalid:
+            errors.append(f"Code invalide: {row.get('code')!r}")
+        for code in self.duplicates:
+            errors.append(f"Code en double: {code}")
+        for code, parent in self.parents.items():
+            if parent is None and code.rstrip('0')[CATEGORY_PREFIX_LENGTH:]:
+                errors.append(f"Compte sans parent dans le plan: {code}")
+        return errors
@@ -0,0 +1,188 @@
+# apps/core/services/chart_provisioning.py
+"""
+Moteur de provisionnement du plan comptable OHADA pour un tenant.
+
+Le plan (JSON imbriqué classes > catégories > comptes) est d'abord parcouru
+entièrement en mémoire : les UUID et les liens parent/catégorie/classe sont
+pré-assignés sur des instances non sauvegardées. L'écriture se fait ensuite
+avec quelques bulk_create par niveau hiérarchique, de sorte que le nombre de
+requêtes ne dépend plus de la taille du plan.
+"""
+import re
+
+from django.db import transaction
+
+from .account_hierarchy import assign_hierarchy
+from .tenant_sharding import shard_for_tenant
+from ..models.account import AccountClass, AccountCategory, Account, ChartVersion
+
+# "1 - Comptes de ressources durables", "10 Capital", "101 Capital social", "1011"
+_CHART_KEY_PATTERN = re.compile(r'^\s*(\d+)\s*(?:-\s*)?(.*?)\s*$')
+
+
+def split_chart_key(key):
+    """
+    Sépare une clé du plan comptable en (code, libellé).
+
+    Args:
+        key (str): Clé telle qu'elle apparaît dans le JSON (ex: "101 Capital social")
+
+    Returns:
+        tuple: (code, libellé) ; le libellé vaut le code si la clé n'en contient pas
+    """
+    match = _CHART_KEY_PATTERN.match(key)
+    if not match:
+        return key, key
+    code, label = match.groups()
+    return code, label or code
+
+
+class ChartPlan:
+    """
+    Plan comptable d'un tenant construit en mémoire, prêt à être inséré.
+
+    Les comptes sont indexés par code (formaté) : un code rencontré plusieurs
+    fois dans le JSON est fusionné avec le compte existant au lieu de violer
+    la contrainte d'unicité (tenant_id, code).
+    """
+
+    def __init__(self, tenant_id):
+        self.tenant_id = tenant_id
+        self.classes = []
+        self.categories = []
+        self.accounts = {}
+
+    def add_account(self, code, name, account_class, category, parent, account_type, level):
+        """Ajoute un compte au plan (ou retourne celui qui porte déjà ce code)"""
+        account = Account(
+            tenant_id=self.tenant_id,
+            code=code,
+            name=name,
+            account_class=account_class,
+            category=category,
+            parent=parent,
+            type=account_type,
+            level=level
+        )
+        account.apply_accounting_format()
+        account.apply_classification()
+
+        existing = self.accounts.get(account.code)
+        if existing is not None:
+            return existing
+
+        self.accounts[account.code] = account
+        return account
+
+    def add_children(self, parent, data, level):
+        """Ajoute récursivement les sous-comptes d'un compte"""
+        for key, value in data.items():
+            if isinstance(value, dict):
+                # Sous-compte avec ses propres sous-comptes ("101 Capital social": {...})
+                code, name = split_chart_key(key)
+                sub_account = self.add_account(
+                    code, name, parent.account_class, parent.category, parent, parent.type, level
+                )
+                self.add_children(sub_account, value, sub_account.level + 1)
+            else:
+                # Compte terminal ("1011": "Capital souscrit, non appelé")
+                self.add_account(
+                    key, value, parent.account_class, parent.category, parent, parent.type, level
+                )
+
+    def accounts_by_level(self):
+        """Retourne les comptes groupés par niveau, du plus haut au plus profond"""
+        levels = {}
+        for account in self.accounts.values():
+            levels.setdefault(account.level, []).append(account)
+        return [levels[level] for level in sorted(levels)]
+
+
+def build_chart_plan(tenant_id, plan_comptable):
+    """
+    Construit en mémoire le plan comptable d'un tenant à partir du JSON imbriqué.
+
+    Args:
+        tenant_id (UUID): Tenant pour lequel le plan est construit
+        plan_comptable (dict): Contenu de plan_comptable_ohada.json
+
+    Returns:
+        ChartPlan: Instances non sauvegardées avec UUID et liens pré-assignés
+    """
+    plan = ChartPlan(tenant_id)
+
+    for class_key, class_data in plan_comptable.items():
+        class_code, class_name = split_chart_key(class_key)
+        class_number = int(class_code)
+
+        account_class = AccountClass(
+            tenant_id=tenant_id,
+            number=class_number,
+            name=class_name
+        )
+        plan.classes.append(account_class)
+
+        # Déterminer le type de compte en fonction de la classe
+        account_type = Account._get_account_type_for_class(class_number)
+
+        for category_key, category_data in class_data.items():
+            if not isinstance(category_data, dict):
+                # C'est un compte simple sans sous-comptes
+                plan.add_account(
+                    category_key, category_data, account_class, None, None, account_type, 1
+                )
+                continue
+
+            category_code, category_name = split_chart_key(category_key)
+
+            # Un compte déjà rencontré plus haut dans le plan : on complète ses sous-comptes
+            existing = plan.accounts.get(category_code)
+            if existing is not None:
+                plan.add_children(existing, category_data, existing.level + 1)
+                continue
+
+            category = AccountCategory(
+                tenant_id=tenant_id,
+                account_class=account_class,
+                code=category_code,
+                name=category_name
+            )
+            plan.categories.append(category)
+
+            # Compte principal de la catégorie
+            parent_account = plan.add_account(
+                category_code, category_name, account_class, category, None, account_type, 1
+            )
+            plan.add_children(parent_account, category_data, 2)
+
+    return plan
+
+
+def provision_chart(plan, batch_size=None, using=None):
+    """
+    Insère un plan construit par build_chart_plan en quelques requêtes.
+
+    Les classes et catégories sont insérées en un bulk_create chacune, puis
+    les comptes niveau par niveau pour que chaque parent existe avant ses
+    enfants.
+
+    Args:
+        plan (ChartPlan): Plan à insérer
+        batch_size (int, optional): Taille maximale des lots (limitée par le SGBD)
+        using (str, optional): Alias de la base de données (défaut: shard du tenant)
+
+    Returns:
+        dict: Comptes créés, indexés par code
+    """
+    # Le plan est complet en mémoire : l'index hiérarchique est calculé avant l'insertion
+    assign_hierarchy(plan.accounts.values())
+
+    using = using or shard_for_tenant(plan.tenant_id)
+    with transaction.atomic(using=using):
+        AccountClass.objects.using(using).bulk_create(plan.classes, batch_size=batch_size)
+        AccountCategory.objects.using(using).bulk_create(plan.categories, batch_size=batch_size)
+        for accounts in plan.accounts_by_level():
+            Account.objects.using(using).bulk_create(accounts, batch_size=batch_size)
+        ChartVersion.bump([plan.tenant_id], using)
+
+    return plan.accounts
@@ -0,0 +1,431 @@
+# apps/core/services/chart_snapshot.py
+"""
+Snapshot binaire précompilé d'un modèle de plan comptable.
+
+Un fichier JSON de plan (imbriqué comme plan_comptable_ohada.json, ou à plat
+comme plan_comptable_ohada_8chiffres.json) est compilé une fois, par la
+commande build_chart_snapshots, en un fichier ".chart" placé à côté :
+
+- un en-tête (version du format, empreinte de la source, somme de contrôle),
+- des tableaux plats d'entiers 32 bits (classes, catégories, comptes : code,
+  libellé, index du parent, niveau, type, référence, solde normal...),
+- une table de chaînes UTF-8 dédoublonnées.
+
+Le fichier est projeté en mémoire (mmap) et les tableaux sont lus sans copie.
+Le provisionnement et les imports consomment directement le snapshot ; ils ne
+reviennent au JSON que si le snapshot est absent, corrompu ou périmé (source
+ou règles de classification modifiées depuis la compilation).
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .chart_import import iter_chart_rows
+from .chart_index import ChartIndex, CATEGORY_PREFIX_LENGTH
+from .chart_provisioning import ChartPlan, build_chart_plan
+from .classification import CLASSIFICATION_RULES, classify, classification_fields
+from ..models.account import AccountClass, AccountCategory, Account
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'OHCS'
+FORMAT_VERSION = 1
+SNAPSHOT_EXTENSION = '.chart'
+
+# Plan imbriqué (classes > catégories > comptes) ou plan à plat (codes à 8 chiffres)
+KIND_NESTED = 1
+KIND_FLAT = 2
+
+# magic, version, type de plan, empreinte de la source, somme de contrôle,
+# nombre de classes, de catégories, de comptes, de chaînes, taille des chaînes
+_HEADER = struct.Struct('<4sHH32s32sIIIII')
+
+TABLES = {
+    'classes': ('number', 'name'),
+    'categories': ('code', 'name', 'account_class'),
+    'accounts': ('code', 'name', 'parent', 'level', 'account_class', 'category',
+                 'type', 'ref', 'normal_balance', 'is_amortization'),
+}
+
+# Colonnes stockées comme index dans la table de chaînes (-1 = None)
+TEXT_COLUMNS = {'code', 'name', 'type', 'ref', 'normal_balance'}
+
+
+class SnapshotError(Exception):
+    """Snapshot absent, corrompu ou périmé"""
+
+
+def snapshot_path_for(source_path):
+    """Chemin du snapshot associé à un fichier JSON de plan comptable"""
+    return os.path.splitext(source_path)[0] + SNAPSHOT_EXTENSION
+
+
+def source_digest(source_path):
+    """
+    Empreinte d'un fichier source : son contenu, la version du format et les
+    règles de classification utilisées pour calculer les colonnes dérivées.
+    """
+    digest = hashlib.sha256()
+    with open(source_path, 'rb') as file:
+        digest.update(file.read())
+    digest.update(str(FORMAT_VERSION).encode())
+    digest.update(repr(CLASSIFICATION_RULES).encode())
+    return digest.digest()
+
+
+class _StringTable:
+    """Table de chaînes dédoublonnées, référencées par index"""
+
+    def __init__(self):
+        self.indexes = {}
+        self.values = []
+
+    def add(self, value):
+        if value is None:
+            return -1
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def _serialize(kind, digest, tables):
+    """
+    Sérialise des tables de lignes (tuples dans l'ordre de TABLES) en snapshot.
+
+    Returns:
+        bytes: Contenu complet du fichier .chart
+    """
+    strings = _StringTable()
+    columns = []
+    for table, fields in TABLES.items():
+        rows = tables.get(table, [])
+        for position, field in enumerate(fields):
+            if field in TEXT_COLUMNS:
+                columns.append(array('i', (strings.add(row[position]) for row in rows)))
+            else:
+                columns.append(array('i', (row[position] for row in rows)))
+
+    encoded = [value.encode('utf-8') for value in strings.values]
+    offsets = array('i', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    blob = b''.join(encoded)
+    blob += b'\0' * (-len(blob) % 4)
+
+    if sys.byteorder != 'little':
+        for column in columns:
+            column.byteswap()
+        offsets.byteswap()
+
+    payload = b''.join(column.tobytes() for column in columns) + offsets.tobytes() + blob
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, kind, digest, hashlib.sha256(payload).digest(),
+        len(tables.get('classes', [])), len(tables.get('categories', [])),
+        len(tables.get('accounts', [])), len(strings.values), len(blob)
+    )
+    return header + payload
+
+
+def _plan_tables(plan):
+    """Lignes des tables d'un ChartPlan (plan imbriqué)"""
+    class_indexes = {id(account_class): i for i, account_class in enumerate(plan.classes)}
+    category_indexes = {id(category): i for i, category in enumerate(plan.categories)}
+    accounts = list(plan.accounts.values())
+    account_indexes = {id(account): i for i, account in enumerate(accounts)}
+
+    return {
+        'classes': [(account_class.number, account_class.name) for account_class in plan.classes],
+        'categories': [
+            (category.code, category.name, class_indexes[id(category.account_class)])
+            for category in plan.categories
+        ],
+        'accounts': [
+            (
+                account.code, account.name,
+                account_indexes[id(account.parent)] if account.parent is not None else -1,
+                account.level,
+                class_indexes[id(account.account_class)],
+                category_indexes[id(account.category)] if account.category is not None else -1,
+                account.type, account.ref_financial_statement, account.normal_balance,
+                int(account.is_amortization_depreciation),
+            )
+            for account in accounts
+        ],
+    }
+
+
+def _index_tables(index):
+    """Lignes des tables d'un ChartIndex (plan à plat) ; les libellés restent bruts"""
+    account_indexes = {code: i for i, code in enumerate(index.labels)}
+    category_indexes = {code: i for i, code in enumerate(index.category_labels)}
+
+    accounts = []
+    for code, label, level, parent in index.entries():
+        fields = classification_fields(classify(code))
+        accounts.append((
+            code, label,
+            account_indexes[parent] if parent is not None else -1,
+            level, -1, category_indexes[code[:CATEGORY_PREFIX_LENGTH]],
+            fields['type'], fields['ref_financial_statement'], fields['normal_balance'],
+            int(fields['is_amortization_depreciation']),
+        ))
+
+    return {
+        'categories': [(code, label, -1) for code, label in index.category_labels.items()],
+        'accounts': accounts,
+    }
+
+
+def compile_chart(source_path, destination=None):
+    """
+    Compile un fichier JSON de plan comptable en snapshot binaire.
+
+    Args:
+        source_path (str): Plan imbriqué (objet JSON) ou à plat (tableau JSON ou NDJSON)
+        destination (str, optional): Fichier produit (par défaut à côté de la source)
+
+    Returns:
+        tuple: (chemin du snapshot, type de plan, nombre de comptes)
+    """
+    destination = destination or snapshot_path_for(source_path)
+    digest = source_digest(source_path)
+
+    try:
+        with open(source_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except json.JSONDecodeError:
+        data = None  # NDJSON : lu en flux ci-dessous
+
+    if isinstance(data, dict) and 'code' not in data:
+        kind, tables = KIND_NESTED, _plan_tables(build_chart_plan(None, data))
+    else:
+        kind, tables = KIND_FLAT, _index_tables(ChartIndex.build(iter_chart_rows(source_path)))
+
+    content = _serialize(kind, digest, tables)
+    temporary = destination + '.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(content)
+    os.replace(temporary, destination)
+    return destination, kind, len(tables['accounts'])
+
+
+class ChartSnapshot:
+    """
+    Snapshot projeté en mémoire.
+
+    Les colonnes sont des memoryview d'entiers sur le fichier ; les chaînes
+    sont décodées une seule fois, au premier accès.
+    """
+
+    def __init__(self, path, buffer, header):
+        (_, self.version, self.kind, self.source_digest, _,
+         n_classes, n_categories, n_accounts, n_strings, blob_size) = header
+        self.path = path
+        self._buffer = buffer
+        self._strings = None
+
+        counts = {'classes': n_classes, 'categories': n_categories, 'accounts': n_accounts}
+        view = memoryview(buffer)
+        offset = _HEADER.size
+        self.columns = {}
+        for table, fields in TABLES.items():
+            for field in fields:
+                size = counts[table] * 4
+                self.columns[table, field] = view[offset:offset + size].cast('i')
+                offset += size
+        self.counts = counts
+
+        self._offsets = view[offset:offset + (n_strings + 1) * 4].cast('i')
+        offset += (n_strings + 1) * 4
+        self._blob = view[offset:offset + blob_size]
+
+    @classmethod
+    def open(cls, path, expected_digest=None):
+        """
+        Ouvre et valide un snapshot.
+
+        Args:
+            path (str): Fichier .chart
+            expected_digest (bytes, optional): Empreinte attendue de la source
+
+        Raises:
+            SnapshotError: Fichier absent, illisible, corrompu ou périmé
+        """
+        if sys.byteorder != 'little':
+            raise SnapshotError("Snapshot non utilisable sur une architecture big-endian")
+        try:
+            with open(path, 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Snapshot illisible {path}: {e}")
+
+        if len(buffer) < _HEADER.size:
+            raise SnapshotError(f"Snapshot tronqué: {path}")
+        header = _HEADER.unpack_from(buffer)
+        magic, version, _, digest, checksum = header[:5]
+        if magic != MAGIC:
+            raise SnapshotError(f"Fichier non reconnu comme snapshot: {path}")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Version de snapshot {version} non supportée (attendue: {FORMAT_VERSION})")
+        if hashlib.sha256(memoryview(buffer)[_HEADER.size:]).digest() != checksum:
+            raise SnapshotError(f"Somme de contrôle invalide: {path}")
+        if expected_digest is not None and digest != expected_digest:
+            raise SnapshotError(f"Snapshot périmé par rapport à sa source: {path}")
+
+        return cls(path, buffer, header)
+
+    def __len__(self):
+        return self.counts['accounts']
+
+    @property
+    def strings(self):
+        if self._strings is None:
+            offsets, blob = self._offsets, self._blob
+            self._strings = [
+                str(blob[offsets[i]:offsets[i + 1]], 'utf-8') for i in range(len(offsets) - 1)
+            ]
+        return self._strings
+
+    def column(self, table, field):
+        """Valeurs d'une colonne (chaînes décodées pour les colonnes texte)"""
+        values = self.columns[table, field]
+        if field in TEXT_COLUMNS:
+            strings = self.strings
+            return [strings[i] if i >= 0 else None for i in values]
+        return values.tolist()
+
+    def rows(self, table):
+        """Lignes d'une table sous forme de tuples, dans l'ordre de TABLES"""
+        return zip(*(self.column(table, field) for field in TABLES[table]))
+
+
+# Snapshots déjà ouverts dans ce processus : chemin -> (signature des fichiers, snapshot)
+_opened = {}
+
+
+def _signature(*paths):
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def load_snapshot(source_path):
+    """
+    Retourne le snapshot à jour d'un fichier de plan comptable, ou None.
+
+    None signifie que l'appelant doit se replier sur le JSON (snapshot absent,
+    corrompu ou périmé). Un snapshot validé est conservé pour les appels
+    suivants tant que ni lui ni sa source ne changent.
+    """
+    path = snapshot_path_for(source_path)
+    if not os.path.exists(path):
+        return None
+
+    has_source = os.path.exists(source_path)
+    try:
+        signature = _signature(path, source_path) if has_source else _signature(path)
+    except OSError:
+        return None
+
+    cached = _opened.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    try:
+        snapshot = ChartSnapshot.open(path, source_digest(source_path) if has_source else None)
+    except SnapshotError as e:
+        logger.warning("%s ; repli sur le fichier JSON", e)
+        _opened.pop(path, None)
+        return None
+
+    _opened[path] = (signature, snapshot)
+    return snapshot
+
+
+def chart_plan_from_snapshot(tenant_id, snapshot):
+    """
+    Construit le ChartPlan d'un tenant à partir d'un snapshot de plan imbriqué,
+    sans analyse JSON ni recalcul du formatage ou de la classification.
+    """
+    if snapshot.kind != KIND_NESTED:
+        raise SnapshotError(f"Le snapshot {snapshot.path} ne décrit pas un plan imbriqué")
+
+    plan = ChartPlan(tenant_id)
+    for number, name in snapshot.rows('classes'):
+        plan.classes.append(AccountClass(tenant_id=tenant_id, number=number, name=name))
+
+    for code, name, class_index in snapshot.rows('categories'):
+        plan.categories.append(AccountCategory(
+            tenant_id=tenant_id, account_class=plan.classes[class_index], code=code, name=name
+        ))
+
+    accounts = []
+    for (code, name, parent, level, class_index, category, account_type,
+         ref, normal_balance, is_amortization) in snapshot.rows('accounts'):
+        account = Account(
+            tenant_id=tenant_id,
+            code=code,
+            name=name,
+            account_class=plan.classes[class_index],
+            category=plan.categories[category] if category >= 0 else None,
+            parent=accounts[parent] if parent >= 0 else None,
+            type=account_type,
+            level=level,
+            ref_financial_statement=ref,
+            normal_balance=normal_balance,
+            is_amortization_depreciation=bool(is_amortization)
+        )
+        accounts.append(account)
+        plan.accounts[code] = account
+    return plan
+
+
+def chart_index_from_snapshot(snapshot):
+    """Construit un ChartIndex à partir d'un snapshot de plan à plat"""
+    if snapshot.kind != KIND_FLAT:
+        raise SnapshotError(f"Le snapshot {snapshot.path} ne décrit pas un plan à plat")
+
+    index = ChartIndex()
+    codes = snapshot.column('accounts', 'code')
+    for code, label, parent, level in zip(
+        codes,
+        snapshot.column('accounts', 'name'),
+        snapshot.column('accounts', 'parent'),
+        snapshot.column('accounts', 'level'),
+    ):
+        index.labels[code] = label
+        index.parents[code] = codes[parent] if parent >= 0 else None
+        index.levels[code] = level
+    for code, label, _ in snapshot.rows('categories'):
+        index.category_labels[code] = label
+    return index
+
+
+def load_chart_plan(tenant_id, source_path):
+    """ChartPlan d'un tenant depuis le snapshot, ou depuis le JSON imbriqué à défaut"""
+    snapshot = load_snapshot(source_path)
+    if snapshot is not None and snapshot.kind == KIND_NESTED:
+        return chart_plan_from_snapshot(tenant_id, snapshot)
+
+    with open(source_path, 'r', encoding='utf-8') as file:
+        return build_chart_plan(tenant_id, json.load(file))
+
+
+def load_chart_index(source_path, log=None):
+    """ChartIndex d'un plan à plat depuis le snapshot, ou depuis le JSON/NDJSON à défaut"""
+    snapshot = load_snapshot(source_path)
+    if snapshot is not None and snapshot.kind == KIND_FLAT:
+        if log:
+            log(f"Snapshot précompilé utilisé: {snapshot.path}")
+        return chart_index_from_snapshot(snapshot)
+
+    return ChartIndex.build(iter_chart_rows(source_path))
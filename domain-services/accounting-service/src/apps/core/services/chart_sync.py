@@ -0,0 +1,227 @@
+# apps/core/services/chart_sync.py
+"""
+Synchronisation d'un plan comptable à plat avec le plan existant d'un tenant.
+
+Au lieu de tout supprimer puis réimporter (--replace), le plan courant du
+tenant est chargé (une requête par modèle) et comparé, code par code, au plan
+du fichier :
+
+- les codes absents de la base sont insérés (bulk_create),
+- les comptes existants dont un champ diffère sont mis à jour, seulement sur
+  les champs modifiés (un bulk_update par combinaison de champs),
+- les comptes actifs absents du fichier sont désactivés (un UPDATE), ce qui
+  préserve les tiers et écritures qui y sont rattachés.
+
+L'index hiérarchique (chemin, profondeur, descendants) fait partie des champs
+comparés : il est recalculé en mémoire sur le plan fusionné.
+
+Un plan inchangé ne produit donc aucune écriture.
+"""
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .chart_import import ChartImporter, HIERARCHY_FIELDS
+from ..models.account import AccountClass, AccountCategory, Account, ChartVersion
+
+# Champs toujours comparés (attnames du modèle)
+COMPARED_FIELDS = ['name', 'account_class_id', 'category_id', 'parent_id', 'level', 'is_active', *HIERARCHY_FIELDS]
+
+# Champs de classification comparés lorsque la commande les renseigne
+CLASSIFICATION_FIELDS = ['type', 'ref_financial_statement', 'is_amortization_depreciation', 'normal_balance']
+
+
+class ChartDiff:
+    """Différences entre le plan du fichier et le plan d'un tenant"""
+
+    def __init__(self):
+        self.inserts = []
+        self.updates = {}  # tuple de champs modifiés -> comptes
+        self.deactivations = []
+        self.hierarchy_updates = []  # comptes absents du fichier dont l'index change
+        self.unchanged = 0
+        self.category_renames = []
+        self.new_classes = 0
+        self.new_categories = 0
+
+    @property
+    def updated(self):
+        return sum(len(accounts) for accounts in self.updates.values())
+
+    @property
+    def is_empty(self):
+        return not (self.inserts or self.updates or self.deactivations or self.category_renames
+                    or self.hierarchy_updates or self.new_classes or self.new_categories)
+
+    def field_counts(self):
+        """Nombre de comptes modifiés par champ"""
+        counts = {}
+        for fields, accounts in self.updates.items():
+            for field in fields:
+                counts[field] = counts.get(field, 0) + len(accounts)
+        return dict(sorted(counts.items()))
+
+
+class ChartSynchronizer(ChartImporter):
+    """
+    Synchronise les comptes d'un ChartIndex avec ceux d'un tenant.
+
+    Mêmes arguments que ChartImporter ; deactivate_missing désactive les
+    comptes du tenant absents du fichier.
+    """
+
+    def __init__(self, *args, deactivate_missing=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deactivate_missing = deactivate_missing
+        self.current = {}
+        self.category_names = {}
+
+    def load_existing(self):
+        """Charge le plan courant du tenant : une requête par modèle"""
+        self.class_ids = dict(
+            AccountClass.objects.using(self.using).filter(tenant_id=self.tenant_id).values_list('number', 'id')
+        )
+        self.category_ids = {}
+        self.category_names = {}
+        for category_id, code, name in AccountCategory.objects.using(self.using).filter(
+                tenant_id=self.tenant_id).values_list('id', 'code', 'name'):
+            self.category_ids[code] = category_id
+            self.category_names[code] = name
+        self.current = {
+            row['code']: row
+            for row in Account.objects.using(self.using).filter(tenant_id=self.tenant_id).values(
+                'id', 'code', *COMPARED_FIELDS, *CLASSIFICATION_FIELDS
+            )
+        }
+        self.account_ids = {code: row['id'] for code, row in self.current.items()}
+        self.account_index = {
+            row['id']: (row['parent_id'], *(row[field] for field in HIERARCHY_FIELDS)) for row in self.current.values()
+        }
+
+    def diff(self, index):
+        """
+        Calcule les différences sans rien écrire.
+
+        Returns:
+            ChartDiff: Insertions, mises à jour par champs modifiés, désactivations
+        """
+        self.load_existing()
+        self.prepare_hierarchy(index)
+
+        diff = ChartDiff()
+        compared = None
+        seen = set()
+
+        for code, name, level, parent_code in index.entries():
+            self.stats['rows'] += 1
+            account = self.build_account(code, name, level, parent_code, index.category_labels[code[:2]])
+            account.is_active = True
+            if compared is None:
+                compared = COMPARED_FIELDS + [f for f in CLASSIFICATION_FIELDS if f in self.update_fields]
+
+            seen.add(account.code)
+            current = self.current.get(account.code)
+            if current is None:
+                diff.inserts.append(account)
+                continue
+
+            changed = tuple(field for field in compared if getattr(account, field) != current[field])
+            if changed:
+                diff.updates.setdefault(changed, []).append(account)
+            else:
+                diff.unchanged += 1
+
+        if self.deactivate_missing:
+            diff.deactivations = [
+                row['id'] for code, row in self.current.items() if code not in seen and row['is_active']
+            ]
+        diff.hierarchy_updates = self.stale_hierarchy({self.account_ids[code] for code in index.labels})
+
+        for code, name in index.category_labels.items():
+            current_name = self.category_names.get(code)
+            if current_name is not None and current_name != name:
+                diff.category_renames.append(AccountCategory(id=self.category_ids[code], name=name))
+
+        diff.new_classes = len(self.pending_classes)
+        diff.new_categories = len(self.pending_categories)
+        return diff
+
+    def apply(self, diff):
+        """Applique un ChartDiff par opérations groupées (à appeler dans une transaction)"""
+        if self.pending_classes:
+            AccountClass.objects.using(self.using).bulk_create(self.pending_classes)
+            self.pending_classes = []
+
+        if self.pending_categories:
+            AccountCategory.objects.using(self.using).bulk_create(self.pending_categories, batch_size=self.batch_size)
+            self.pending_categories = []
+
+        if diff.category_renames:
+            AccountCategory.objects.using(self.using).bulk_update(diff.category_renames, ['name'], batch_size=self.batch_size)
+
+        if diff.inserts:
+            Account.objects.using(self.using).bulk_create(diff.inserts, batch_size=self.batch_size)
+
+        now = timezone.now()
+        for fields, accounts in diff.updates.items():
+            for account in accounts:
+                account.updated_at = now
+            names = [Account._meta.get_field(field).name for field in fields] + ['updated_at']
+            Account.objects.using(self.using).bulk_update(accounts, names, batch_size=self.batch_size)
+
+        if diff.deactivations:
+            for start in range(0, len(diff.deactivations), self.batch_size):
+                Account.objects.using(self.using).filter(id__in=diff.deactivations[start:start + self.batch_size]).update(
+                    is_active=False, updated_at=now
+                )
+
+        if diff.hierarchy_updates:
+            Account.objects.using(self.using).bulk_update(diff.hierarchy_updates, HIERARCHY_FIELDS, batch_size=self.batch_size)
+
+        ChartVersion.bump([self.tenant_id], self.using)
+
+    def run(self, index, dry_run=False):
+        """
+        Synchronise le tenant avec un ChartIndex.
+
+        Returns:
+            dict: Statistiques (insertions, mises à jour par champ, désactivations, durée)
+        """
+        started = time.perf_counter()
+        diff = self.diff(index)
+        if not dry_run and not diff.is_empty:
+            with transaction.atomic(using=self.using):
+                self.apply(diff)
+
+        elapsed = time.perf_counter() - started
+        self.stats.update({
+            'inserted': len(diff.inserts),
+            'updated': diff.updated,
+            'updated_fields': diff.field_counts(),
+            'deactivated': len(diff.deactivations),
+            'unchanged': diff.unchanged,
+            'categories_renamed': len(diff.category_renames),
+            'classes_created': diff.new_classes,
+            'categories_created': diff.new_categories,
+            'elapsed': elapsed,
+            'dry_run': dry_run,
+        })
+        return self.stats
+
+
+def sync_summary(stats):
+    """Lignes de résumé d'une synchronisation (communes aux commandes d'import)"""
+    prefix = "Simulation: " if stats['dry_run'] else ""
+    lines = [
+        f"{prefix}{stats['inserted']} comptes ajoutés, {stats['updated']} mis à jour, "
+        f"{stats['deactivated']} désactivés, {stats['unchanged']} inchangés",
+    ]
+    if stats['classes_created'] or stats['categories_created'] or stats['categories_renamed']:
+        lines.append(
+            f"{prefix}{stats['classes_created']} classes et {stats['categories_created']} catégories ajoutées, "
+            f"{stats['categories_renamed']} catégories renommées"
+        )
+    for field, count in stats['updated_fields'].items():
+        lines.append(f"  {field}: {count} comptes")
+    return lines
@@ -0,0 +1,224 @@
+# apps/core/services/classification.py
+"""
+Classification OHADA des comptes par recherche du plus long préfixe.
+
+Les règles sont décrites dans une table déclarative (préfixe -> type,
+catégorie, solde normal, référence des états financiers), compilée une seule
+fois en un trie. Classer un code revient à descendre le trie caractère par
+caractère : le coût est proportionnel à la longueur du code (et borné par la
+profondeur du trie), quel que soit le nombre de règles.
+"""
+from ..models.account import AccountType
+
+UNKNOWN = "INCONNU"
+BRUT = "BRUT"
+AMORTIZATION = "AMORTISSEMENT_DEPRECIATION"
+
+# Correspondance type OHADA -> AccountType
+OHADA_TYPE_TO_ACCOUNT_TYPE = {
+    'ACTIF': AccountType.ASSET,
+    'PASSIF': AccountType.LIABILITY,
+    'CHARGE': AccountType.EXPENSE,
+    'PRODUIT': AccountType.REVENUE,
+    'SPECIAL': AccountType.EQUITY  # Par défaut
+}
+
+_ACTIF_BRUT = ("ACTIF", BRUT, "DEBIT")
+_ACTIF_AMORT = ("ACTIF", AMORTIZATION, "DEBIT")
+_PASSIF = ("PASSIF", UNKNOWN, "CREDIT")
+_CHARGE = ("CHARGE", UNKNOWN, "DEBIT")
+_PRODUIT = ("PRODUIT", UNKNOWN, "CREDIT")
+_SPECIAL = ("SPECIAL", UNKNOWN, "VARIABLE")
+
+
+def _rules(prefixes, nature, ref=UNKNOWN):
+    return [(prefix, nature, ref) for prefix in prefixes.split()]
+
+
+# (préfixe, (type, catégorie, solde normal), référence) ; le préfixe le plus
+# long l'emporte, un code sans préfixe connu reste entièrement INCONNU
+CLASSIFICATION_RULES = [
+    # CLASSE 1: TYPE PASSIF
+    *_rules("1", _PASSIF),
+    *_rules("14", _PASSIF, "CL"),
+    *_rules("15", _PASSIF, "CM"),
+    *_rules("16", _PASSIF, "DA"),
+    *_rules("17", _PASSIF, "DB"),
+    *_rules("19", _PASSIF, "DC"),
+
+    # CLASSE 2: TYPE ACTIF (BRUT, sauf 28/29 en AMORTISSEMENT/DEPRECIATION)
+    *_rules("2", _ACTIF_BRUT),
+    *_rules("28 29", _ACTIF_AMORT),
+    *_rules("211 218 2191", _ACTIF_BRUT, "AE"),
+    *_rules("212 213 214 2193", _ACTIF_BRUT, "AF"),
+    *_rules("215 216", _ACTIF_BRUT, "AG"),
+    *_rules("217 2198", _ACTIF_BRUT, "AH"),
+    *_rules("22", _ACTIF_BRUT, "AJ"),
+    *_rules("231 232 233 237 2391 2392 2393", _ACTIF_BRUT, "AK"),
+    *_rules("234 235 238 2394 2395 2398", _ACTIF_BRUT, "AL"),
+    *_rules("24", _ACTIF_BRUT, "AM"),
+    *_rules("245 2495", _ACTIF_BRUT, "AN"),
+    *_rules("251 252", _ACTIF_BRUT, "AP"),
+    *_rules("26", _ACTIF_BRUT, "AR"),
+    *_rules("27", _ACTIF_BRUT, "AS"),
+
+    # CLASSE 3: TYPE ACTIF
+    *_rules("3", _ACTIF_BRUT),
+    *_rules("39", _ACTIF_AMORT),
+    *_rules("31 32 33 34 35 36 37 38", _ACTIF_BRUT, "BB"),
+
+    # CLASSE 4: TYPE ACTIF, avec les comptes de PASSIF
+    *_rules("4", _ACTIF_BRUT),
+    *_rules("49", _ACTIF_AMORT),
+    *_rules("41", _ACTIF_BRUT, "BI"),
+    *_rules("409", _ACTIF_BRUT, "BH"),
+    *_rules("485 488", _ACTIF_BRUT, "BA"),
+    *_rules("481 482 484 4998", _PASSIF, "DH"),
+    *_rules("419", _PASSIF, "DI"),
+    *_rules("40", _PASSIF, "DJ"),
+    *_rules("42 43 44", _PASSIF, "DK"),
+    *_rules("45 46 47", _PASSIF, "DM"),
+    *_rules("499", _PASSIF, "DN"),
+    *_rules("479", _PASSIF, "DV"),
+
+    # CLASSE 5: TYPE ACTIF, avec les comptes de PASSIF
+    *_rules("5", _ACTIF_BRUT),
+    *_rules("59", _ACTIF_AMORT),
+    *_rules("50", _ACTIF_BRUT, "BQ"),
+    *_rules("51", _ACTIF_BRUT, "BR"),
+    *_rules("55 57 581 582", _ACTIF_BRUT, "BS"),
+    *_rules("599", _PASSIF, "DN"),
+    *_rules("564 565", _PASSIF, "DQ"),
+    *_rules("52 53 54 561 566", _PASSIF, "DR"),
+
+    # CLASSE 6: TYPE CHARGE
+    *_rules("6", _CHARGE),
+    *_rules("601", _CHARGE, "RA"),
+    *_rules("6031", _CHARGE, "RB"),
+    *_rules("602", _CHARGE, "RC"),
+    *_rules("6032", _CHARGE, "RD"),
+    *_rules("604 605 608", _CHARGE, "RE"),
+    *_rules("6033", _CHARGE, "RF"),
+    *_rules("61", _CHARGE, "RG"),
+    *_rules("62 63", _CHARGE, "RH"),
+    *_rules("64", _CHARGE, "RI"),
+    *_rules("65", _CHARGE, "RJ"),
+    *_rules("66", _CHARGE, "RK"),
+    *_rules("681 691", _CHARGE, "RL"),
+    *_rules("67", _CHARGE, "RM"),
+    *_rules("697", _CHARGE, "RN"),
+
+    # CLASSE 7: TYPE PRODUIT
+    *_rules("7", _PRODUIT),
+    *_rules("701", _PRODUIT, "TA"),
+    *_rules("702 703 704", _PRODUIT, "TB"),
+    *_rules("705 706", _PRODUIT, "TC"),
+    *_rules("707", _PRODUIT, "TD"),
+    *_rules("73", _PRODUIT, "TE"),
+    *_rules("72", _PRODUIT, "TF"),
+    *_rules("71", _PRODUIT, "TG"),
+    *_rules("75", _PRODUIT, "TI"),
+    *_rules("791 798 799", _PRODUIT, "TJ"),
+    *_rules("77", _PRODUIT, "TK"),
+    *_rules("797", _PRODUIT, "TL"),
+    *_rules("787", _PRODUIT, "TM"),
+
+    # CLASSE 8: TYPE SPECIAL, produits et charges selon la sous-catégorie
+    *_rules("8", _SPECIAL),
+    *_rules("82 84 86 88", _PRODUIT),
+    *_rules("81 83 85 87 89", _CHARGE),
+]
+
+_UNKNOWN_RESULT = (UNKNOWN, UNKNOWN, UNKNOWN, UNKNOWN)
+
+
+class ClassificationTrie:
+    """
+    Trie compilé à partir d'une table de règles par préfixe.
+
+    Chaque nœud est une liste [enfants, résultat] ; le résultat est un tuple
+    (type, catégorie, référence, solde normal) ou None.
+    """
+
+    def __init__(self, rules):
+        self.root = [{}, None]
+        self.depth = 0
+        for prefix, (account_type, category, normal_balance), ref in rules:
+            node = self.root
+            for char in prefix:
+                node = node[0].setdefault(char, [{}, None])
+            if node[1] is not None:
+                raise ValueError(f"Préfixe défini deux fois dans les règles de classification: {prefix}")
+            node[1] = (account_type, category, ref, normal_balance)
+            self.depth = max(self.depth, len(prefix))
+
+    def lookup(self, code):
+        """Retourne le résultat du plus long préfixe connu du code"""
+        result = _UNKNOWN_RESULT
+        node = self.root
+        for char in code:
+            node = node[0].get(char)
+            if node is None:
+                break
+            if node[1] is not None:
+                result = node[1]
+        return result
+
+    def classify(self, code):
+        """
+        Détermine la classification complète d'un compte selon le plan comptable OHADA.
+
+        Args:
+            code (str): Code du compte (préférablement 8 chiffres)
+
+        Returns:
+            dict: Classification complète du compte
+                - type: ACTIF, PASSIF, CHARGE, PRODUIT, SPECIAL
+                - category: BRUT, AMORTISSEMENT_DEPRECIATION
+                - ref: Référence pour les états financiers
+                - normal_balance: Solde normal (DEBIT, CREDIT ou VARIABLE)
+        """
+        if not code or not isinstance(code, str):
+            account_type, category, ref, normal_balance = _UNKNOWN_RESULT
+        else:
+            account_type, category, ref, normal_balance = self.lookup(code.strip())
+        return {
+            "type": account_type,
+            "category": category,
+            "ref": ref,
+            "normal_balance": normal_balance
+        }
+
+    def classify_many(self, codes):
+        """Classe une série de codes ; retourne un dictionnaire code -> classification"""
+        classify = self.classify
+        return {code: classify(code) for code in codes}
+
+
+# Compilé une seule fois au chargement du module
+classifier = ClassificationTrie(CLASSIFICATION_RULES)
+
+
+def classify(code):
+    """Classification OHADA d'un code (voir ClassificationTrie.classify)"""
+    return classifier.classify(code)
+
+
+def classify_many(codes):
+    """Classification OHADA d'une série de codes, indexée par code"""
+    return classifier.classify_many(codes)
+
+
+def classification_fields(classification):
+    """
+    Convertit une classification OHADA en valeurs des champs du modèle Account.
+
+    Returns:
+        dict: type, ref_financial_statement, is_amortization_depreciation, normal_balance
+    """
+    return {
+        'type': OHADA_TYPE_TO_ACCOUNT_TYPE.get(classification['type'], AccountType.ASSET),
+        'ref_financial_statement': classification['ref'],
+        'is_amortization_depreciation': classification['category'] == AMORTIZATION,
+        'normal_balance': classification['normal_balance'],
+    }
@@ -0,0 +1,331 @@
+# apps/core/services/jobs.py
+"""
+File de jobs des tenants, tenue en base de données (sans broker).
+
+Les opérations longues d'un tenant ne sont plus exécutées dans la requête
+HTTP : la vue enregistre un Job avec enqueue() et répond 202 avec son
+identifiant, l'endpoint /jobs/<id>/ donne son statut et son avancement.
+Types de jobs (HANDLERS) :
+- provision_chart : plan comptable OHADA, ou copie d'un tenant modèle ;
+- create_default_tiers : tiers par défaut ;
+- create_periods : périodes d'un exercice.
+
+Les workers (commande run_workers) réservent les jobs en attente par lots,
+chacun dans son processus, et les exécutent pour leur tenant :
+
+    JOBS = {
+        'CONCURRENCY': 2,       # processus workers
+        'BATCH_SIZE': 10,       # jobs réservés par requête
+        'POLL_INTERVAL': 1.0,   # attente quand la file est vide (secondes)
+        'LEASE_SECONDS': 300,   # bail d'un job réservé, prolongé à chaque avancement
+        'MAX_ATTEMPTS': 3,      # réservations d'un job avant abandon
+        'MOVING_RETRY_SECONDS': 30,  # report d'un job dont le tenant change de shard
+    }
+
+Un tenant n'a qu'un job non échoué par clé (type et, pour les périodes,
+exercice) : une demande répétée renvoie le job existant, en attente, en
+cours ou terminé ; seul un job échoué peut être relancé. Une demande
+répétée avec d'autres paramètres (autre tenant modèle, autre découpage des
+périodes) est refusée (JobConflictError). Un job dont le bail
+expire (worker arrêté) est remis en attente, puis abandonné après
+MAX_ATTEMPTS réservations. Comme les requêtes, un job n'écrit pas dans un
+tenant en cours de déplacement (move_tenant) : il est remis en attente, sans
+compter de tentative, pour MOVING_RETRY_SECONDS.
+"""
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, close_old_connections, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models.job import ACTIVE_STATUSES, Job, JobStatus
+from ..tenant_context import tenant_context
+from .tenant_runner import init_worker, supports_parallel_writes
+from .tenant_sharding import get_shard_directory
+
+logger = logging.getLogger(__name__)
+
+# Base de la file, quel que soit le shard du tenant
+JOBS_ALIAS = DEFAULT_DB_ALIAS
+
+DEFAULT_OPTIONS = {
+    'CONCURRENCY': 2,
+    'BATCH_SIZE': 10,
+    'POLL_INTERVAL': 1.0,
+    'LEASE_SECONDS': 300,
+    'MAX_ATTEMPTS': 3,
+    'MOVING_RETRY_SECONDS': 30,
+}
+
+
+class JobError(Exception):
+    """Type de job inconnu"""
+
+
+class JobConflictError(Exception):
+    """Le tenant a déjà un job non échoué de même clé, avec d'autres paramètres"""
+
+    def __init__(self, job):
+        super().__init__(f"Un job {job.kind} existe déjà avec d'autres paramètres ({job.get_status_display()})")
+        self.job = job
+
+
+def job_options():
+    """Options JOBS des settings, complétées par les valeurs par défaut"""
+    return {**DEFAULT_OPTIONS, **(getattr(settings, 'JOBS', None) or {})}
+
+
+def _provision_chart(job, report):
+    from ..models.account import Account
+    from .tenant_clone import check_template_tenant, clone_tenant
+
+    template_tenant_id = job.params.get('template_tenant_id')
+    if template_tenant_id:
+        report(10, f"Copie du tenant modèle {template_tenant_id}")
+        stats = clone_tenant(check_template_tenant(template_tenant_id), job.tenant_id)
+        return {'accounts': stats['accounts'], 'copied': stats}
+
+    report(10, "Création du plan comptable OHADA")
+    accounts = Account.create_default_accounts_ohada(job.tenant_id)
+    return {'accounts': len(accounts)}
+
+
+def _create_default_tiers(job, report):
+    from ..models.tiers import Tiers
+
+    tiers = Tiers.create_default_tiers(job.tenant_id)
+    return {'created': len(tiers), 'codes': [row.code for row in tiers]}
+
+
+def _create_periods(job, report):
+    from ..models.fiscal_year import FiscalYear
+
+    fiscal_year = FiscalYear.objects.for_tenant(job.tenant_id).get(pk=job.params['fiscal_year_id'])
+    periods = fiscal_year.periods.order_by('number')
+    with transaction.atomic(using=fiscal_year._state.db):
+        existing = set(periods.values_list('pk', flat=True))
+        fiscal_year.create_periods(job.params.get('period_type', 'monthly'))
+        created = [period for period in periods if period.pk not in existing]
+    return {'created': len(created), 'codes': [period.code for period in created]}
+
+
+HANDLERS = {
+    'provision_chart': _provision_chart,
+    'create_default_tiers': _create_default_tiers,
+    'create_periods': _create_periods,
+}
+
+
+def enqueue(tenant_id, kind, params=None, key=None):
+    """
+    Enregistre un job, sauf si le tenant en a déjà un non échoué de même clé.
+
+    Args:
+        tenant_id (UUID): Tenant du job
+        kind (str): Type de job (voir HANDLERS)
+        params (dict, optional): Paramètres sérialisables en JSON
+        key (str, optional): Complément de la clé d'unicité (ex: exercice)
+
+    Returns:
+        tuple: (job, created)
+
+    Raises:
+        JobError: Si le type de job est inconnu
+        JobConflictError: Si le job existant a d'autres paramètres
+    """
+    if kind not in HANDLERS:
+        raise JobError(f"Type de job inconnu: {kind}")
+    tenant_id = uuid.UUID(str(tenant_id))
+    params = params or {}
+    dedupe_key = f"{kind}:{key}" if key else kind
+    existing = Job.objects.filter(tenant_id=tenant_id, dedupe_key=dedupe_key, status__in=ACTIVE_STATUSES)
+
+    job = existing.first()
+    if job is None:
+        try:
+            with transaction.atomic(using=JOBS_ALIAS):
+                return Job.objects.create(tenant_id=tenant_id, kind=kind, dedupe_key=dedupe_key, params=params), True
+        except IntegrityError:
+            # Demande concurrente : le job vient d'être enregistré par une autre requête
+            job = existing.get()
+    if job.params != params:
+        raise JobConflictError(job)
+    return job, False
+
+
+class JobWorker:
+    """
+    Worker de la file : réserve les jobs en attente par lots et les exécute.
+
+    Args:
+        batch_size (int, optional): Nombre de jobs réservés par requête (défaut: JOBS['BATCH_SIZE'])
+        lease_seconds (int, optional): Bail d'un job réservé (défaut: JOBS['LEASE_SECONDS'])
+        max_attempts (int, optional): Réservations d'un job avant abandon (défaut: JOBS['MAX_ATTEMPTS'])
+        name (str, optional): Nom du worker, enregistré sur les jobs qu'il réserve
+    """
+
+    def __init__(self, batch_size=None, lease_seconds=None, max_attempts=None, name=None):
+        options = job_options()
+        self.batch_size = batch_size or options['BATCH_SIZE']
+        self.lease_seconds = lease_seconds or options['LEASE_SECONDS']
+        self.max_attempts = max_attempts or options['MAX_ATTEMPTS']
+        self.moving_retry_seconds = options['MOVING_RETRY_SECONDS']
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+
+    def lease_end(self):
+        return timezone.now() + timedelta(seconds=self.lease_seconds)
+
+    def requeue_expired(self):
+        """Remet en attente les jobs dont le bail a expiré ; abandonne ceux réservés MAX_ATTEMPTS fois"""
+        now = timezone.now()
+        expired = Job.objects.filter(status=JobStatus.RUNNING, locked_until__lt=now)
+        abandoned = expired.filter(attempts__gte=self.max_attempts).update(
+            status=JobStatus.FAILED, error=f"Abandonné après {self.max_attempts} tentatives (bail expiré)",
+            locked_until=None, finished_at=now
+        )
+        requeued = expired.update(status=JobStatus.PENDING, worker='', locked_until=None)
+        return requeued + abandoned
+
+    def claim(self, limit=None):
+        """
+        Réserve les plus anciens jobs en attente.
+
+        Les lignes verrouillées par un autre worker sont sautées (SKIP LOCKED)
+        quand la base le permet ; sinon la mise à jour conditionnelle sur le
+        statut attribue chaque job à un seul worker.
+
+        Returns:
+            list: Jobs réservés, dans leur ordre d'arrivée
+        """
+        limit = min(limit or self.batch_size, self.batch_size)
+        now = timezone.now()
+        with transaction.atomic(using=JOBS_ALIAS):
+            # Un job en attente avec une échéance (tenant en déplacement) n'est pas réservé avant elle
+            pending = Job.objects.filter(
+                Q(locked_until__isnull=True) | Q(locked_until__lte=now), status=JobStatus.PENDING
+            ).order_by('created_at')
+            if connections[JOBS_ALIAS].features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            ids = list(pending.values_list('pk', flat=True)[:limit])
+            if not ids:
+                return []
+            Job.objects.filter(pk__in=ids, status=JobStatus.PENDING).update(
+                status=JobStatus.RUNNING, worker=self.name, attempts=F('attempts') + 1,
+                started_at=now, locked_until=self.lease_end()
+            )
+        return list(Job.objects.filter(pk__in=ids, status=JobStatus.RUNNING, worker=self.name).order_by('created_at'))
+
+    def run(self, job):
+        """
+        Exécute un job réservé pour son tenant.
+
+        Returns:
+            str: Statut final, PENDING si le job est reporté (tenant en cours de
+            déplacement), None si le job a été repris par un autre worker
+        """
+        # Le bail court depuis la réservation du lot : il est renouvelé au démarrage
+        if not Job.objects.filter(pk=job.pk, status=JobStatus.RUNNING, worker=self.name).update(
+                locked_until=self.lease_end()):
+            return None
+
+        if not get_shard_directory().get(job.tenant_id).accepts_writes:
+            # Écritures gelées pendant move_tenant : les données écrites sur le shard source seraient perdues
+            Job.objects.filter(pk=job.pk, worker=self.name).update(
+                status=JobStatus.PENDING, worker='', attempts=F('attempts') - 1, started_at=None,
+                locked_until=timezone.now() + timedelta(seconds=self.moving_retry_seconds),
+                message="Tenant en cours de déplacement"
+            )
+            logger.info("Job %s (%s) reporté : tenant %s en cours de déplacement", job.pk, job.kind, job.tenant_id)
+            return JobStatus.PENDING
+
+        def report(progress, message=''):
+            job.report(progress, message, self.lease_seconds)
+
+        started = time.perf_counter()
+        try:
+            with tenant_context(job.tenant_id):
+                result = HANDLERS[job.kind](job, report)
+        except Exception as e:
+            logger.exception("Job %s (%s) du tenant %s en échec", job.pk, job.kind, job.tenant_id)
+            fields = {'status': JobStatus.FAILED, 'error': f"{type(e).__name__}: {e}"}
+        else:
+            fields = {'status': JobStatus.SUCCEEDED, 'result': result, 'progress': 100, 'message': ''}
+            logger.info("Job %s (%s) du tenant %s terminé en %.2fs",
+                        job.pk, job.kind, job.tenant_id, time.perf_counter() - started)
+        Job.objects.filter(pk=job.pk, worker=self.name).update(
+            locked_until=None, finished_at=timezone.now(), **fields
+        )
+        return fields['status']
+
+    def work(self, once=False, max_jobs=None, poll_interval=None, sleep=time.sleep):
+        """
+        Boucle du worker : réserve et exécute les jobs, attend quand la file est vide.
+
+        Args:
+            once (bool): S'arrêter dès que la file est vide
+            max_jobs (int, optional): S'arrêter après ce nombre de jobs
+            poll_interval (float, optional): Attente quand la file est vide (défaut: JOBS['POLL_INTERVAL'])
+
+        Returns:
+            dict: Nombre de jobs par statut final
+        """
+        if poll_interval is None:
+            poll_interval = job_options()['POLL_INTERVAL']
+        counts = Counter()
+        while max_jobs is None or sum(counts.values()) < max_jobs:
+            # Connexions expirées (CONN_MAX_AGE) fermées comme entre deux requêtes
+            close_old_connections()
+            self.requeue_expired()
+            jobs = self.claim(None if max_jobs is None else max_jobs - sum(counts.values()))
+            if not jobs:
+                if once:
+                    break
+                sleep(poll_interval)
+                continue
+            for job in jobs:
+                counts[self.run(job) or 'lost'] += 1
+        return dict(counts)
+
+
+def run_worker(options):
+    """Processus worker de run_workers (options : batch_size, once, max_jobs, poll_interval)"""
+    worker = JobWorker(batch_size=options.get('batch_size'))
+    return worker.work(once=options.get('once', False), max_jobs=options.get('max_jobs'),
+                       poll_interval=options.get('poll_interval'))
+
+
+def run_workers(concurrency=None, **options):
+    """
+    Lance des workers, chacun dans son processus.
+
+    Args:
+        concurrency (int, optional): Nombre de processus (défaut: JOBS['CONCURRENCY']) ; 1, ou une
+            base SQLite, exécute un seul worker dans le processus courant
+        **options: Options de chaque worker (voir run_worker)
+
+    Returns:
+        dict: Nombre de jobs par statut final, tous workers confondus
+    """
+    concurrency = max(1, concurrency or job_options()['CONCURRENCY'])
+    if concurrency == 1 or not supports_parallel_writes():
+        return run_worker(options)
+
+    # Les connexions du processus principal ne doivent pas être héritées
+    connections.close_all()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    counts = Counter()
+    with ProcessPoolExecutor(max_workers=concurrency, mp_context=context, initializer=init_worker) as pool:
+        futures = [pool.submit(run_worker, options) for _ in range(concurrency)]
+        for future in as_completed(futures):
+            counts.update(future.result())
+    return dict(counts)
@@ -0,0 +1,338 @@
+# apps/core/services/ledger_posting.py
+"""
+Passation par lots des écritures comptables.
+
+Les écritures sont décrites par des dictionnaires :
+
+    {
+        "journal": "OD",                  # code du journal
+        "date": "2025-01-31",             # date ou chaîne ISO
+        "reference": "FAC-001",           # optionnel
+        "description": "...",             # optionnel
+        "lines": [
+            {"account": "601100", "debit": "1000.00"},
+            {"account": "401100", "credit": "1000.00", "description": "..."},
+        ],
+    }
+
+Un compte est désigné par son code ("account") ou son identifiant
+("account_id"). Toutes les écritures sont validées en mémoire avant la
+moindre écriture en base : comptes, journaux et périodes fiscales du tenant
+sont chargés en une requête chacun, puis chaque écriture est contrôlée
+(montants positifs à deux décimales, une ligne au débit ou au crédit,
+équilibre des débits et des crédits, période ouverte). Les erreurs sont
+toutes collectées ; s'il n'y en a aucune, les en-têtes puis les lignes sont
+insérés par bulk_create dans une seule transaction, qui reporte aussi les
+lignes sur les soldes par période (voir period_balances).
+
+Une écriture passée n'est pas supprimée mais extournée (reverse_entries) :
+l'écriture miroir est passée par le même chemin et pointe vers l'écriture
+extournée (reversal_of, unique), qui ne peut donc l'être qu'une fois.
+"""
+import bisect
+import datetime
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from ..models.account import Account
+from ..models.fiscal_year import FiscalPeriod
+from ..models.journal import Journal, JournalEntry
+from ..models.transaction import TransactionLine
+from .period_balances import apply_line_deltas
+from .tenant_sharding import shard_for_tenant
+
+DEFAULT_BATCH_SIZE = 2000
+
+AMOUNT_QUANTUM = Decimal('0.01')
+
+ZERO = Decimal('0.00')
+
+# Nombre maximal d'erreurs rapportées par PostingError
+MAX_REPORTED_ERRORS = 20
+
+
+class PostingError(Exception):
+    """
+    Écritures invalides : rien n'a été inséré.
+
+    Attributes:
+        errors (list): Couples (indice de l'écriture, message)
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = '; '.join(f"écriture {index}: {message}" for index, message in errors[:MAX_REPORTED_ERRORS])
+        more = f" (et {len(errors) - MAX_REPORTED_ERRORS} autres)" if len(errors) > MAX_REPORTED_ERRORS else ''
+        super().__init__(f"{len(errors)} erreurs: {details}{more}")
+
+
+def parse_amount(value):
+    """Montant positif ou nul à deux décimales au plus ; ValueError sinon"""
+    if value is None or value == '':
+        return ZERO
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"montant invalide: {value!r}")
+    if not amount.is_finite() or amount < 0:
+        raise ValueError(f"montant invalide: {value!r}")
+    quantized = amount.quantize(AMOUNT_QUANTUM)
+    if quantized != amount:
+        raise ValueError(f"montant avec plus de deux décimales: {value!r}")
+    return quantized
+
+
+def parse_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"date invalide: {value!r}")
+
+
+class _PeriodCalendar:
+    """Recherche en mémoire (dichotomie) de la période fiscale d'une date"""
+
+    def __init__(self, periods):
+        self.periods = sorted(periods, key=lambda period: period['start_date'])
+        self.starts = [period['start_date'] for period in self.periods]
+
+    def find(self, day):
+        position = bisect.bisect_right(self.starts, day) - 1
+        if position >= 0 and day <= self.periods[position]['end_date']:
+            return self.periods[position]
+        return None
+
+
+class LedgerPoster:
+    """
+    Valide et insère des écritures pour un tenant.
+
+    Args:
+        tenant_id (UUID): Tenant
+        batch_size (int): Nombre de lignes insérées par requête
+        using (str, optional): Alias de la base de données (défaut: shard du tenant)
+    """
+
+    def __init__(self, tenant_id, batch_size=DEFAULT_BATCH_SIZE, using=None):
+        self.tenant_id = tenant_id
+        self.batch_size = batch_size
+        self.using = using or shard_for_tenant(tenant_id)
+        self.accounts_by_code = {}
+        self.accounts_by_id = {}
+        self.journals = {}
+        self.calendar = None
+        self.entries = []
+        self.lines = []
+
+    def load_references(self):
+        """Charge comptes, journaux et périodes du tenant (une requête chacun)"""
+        for pk, code, is_active in Account.objects.using(self.using).filter(
+                tenant_id=self.tenant_id).values_list('id', 'code', 'is_active'):
+            self.accounts_by_code[code] = (pk, is_active)
+            self.accounts_by_id[pk] = (pk, is_active)
+        self.journals = dict(
+            Journal.objects.using(self.using).filter(
+                tenant_id=self.tenant_id, is_active=True
+            ).values_list('code', 'id')
+        )
+        self.calendar = _PeriodCalendar(
+            FiscalPeriod.objects.using(self.using).filter(tenant_id=self.tenant_id).values(
+                'id', 'code', 'start_date', 'end_date', 'is_closed', 'is_locked',
+                'fiscal_year__is_closed', 'fiscal_year__is_locked'
+            )
+        )
+
+    def resolve_account(self, line):
+        if line.get('account_id'):
+            try:
+                account = self.accounts_by_id.get(uuid.UUID(str(line['account_id'])))
+            except ValueError:
+                account = None
+            label = line['account_id']
+        else:
+            account = self.accounts_by_code.get(str(line.get('account', '')))
+            label = line.get('account')
+        if account is None:
+            raise ValueError(f"compte inconnu: {label}")
+        if not account[1]:
+            raise ValueError(f"compte inactif: {label}")
+        return account[0]
+
+    def resolve_period(self, day):
+        period = self.calendar.find(day)
+        if period is None:
+            raise ValueError(f"aucune période fiscale ne couvre le {day}")
+        if period['is_closed'] or period['is_locked'] or \
+                period['fiscal_year__is_closed'] or period['fiscal_year__is_locked']:
+            raise ValueError(f"la période {period['code']} est clôturée ou verrouillée")
+        return period['id']
+
+    def build_entry(self, data):
+        """Construit l'en-tête et les lignes (non sauvegardés) d'une écriture ; ValueError si invalide"""
+        journal_id = self.journals.get(data.get('journal'))
+        if journal_id is None:
+            raise ValueError(f"journal inconnu ou inactif: {data.get('journal')}")
+        day = parse_date(data.get('date'))
+        period_id = self.resolve_period(day)
+
+        raw_lines = data.get('lines') or []
+        if len(raw_lines) < 2:
+            raise ValueError("une écriture comporte au moins deux lignes")
+
+        entry = JournalEntry(
+            tenant_id=self.tenant_id, journal_id=journal_id, fiscal_period_id=period_id, date=day,
+            reference=data.get('reference') or '', description=data.get('description') or '',
+            reversal_of_id=data.get('reversal_of')
+        )
+        lines = []
+        total_debit = total_credit = ZERO
+        for number, line in enumerate(raw_lines, 1):
+            try:
+                debit = parse_amount(line.get('debit'))
+                credit = parse_amount(line.get('credit'))
+                if (debit == ZERO) == (credit == ZERO):
+                    raise ValueError("une ligne est soit au débit, soit au crédit")
+                account_id = self.resolve_account(line)
+            except ValueError as e:
+                raise ValueError(f"ligne {number}: {str(e)}")
+            total_debit += debit
+            total_credit += credit
+            lines.append(TransactionLine(
+                tenant_id=self.tenant_id, entry_id=entry.id, account_id=account_id, date=day,
+                fiscal_period_id=period_id, debit=debit, credit=credit,
+                description=line.get('description') or ''
+            ))
+
+        if total_debit != total_credit:
+            raise ValueError(f"écriture déséquilibrée: débit {total_debit}, crédit {total_credit}")
+        return entry, lines
+
+    def prepare(self, entries):
+        """
+        Valide toutes les écritures en mémoire.
+
+        Raises:
+            PostingError: Si au moins une écriture est invalide
+        """
+        if self.calendar is None:
+            self.load_references()
+        errors = []
+        self.entries = []
+        self.lines = []
+        for index, data in enumerate(entries):
+            try:
+                entry, lines = self.build_entry(data)
+            except ValueError as e:
+                errors.append((index, str(e)))
+                continue
+            self.entries.append(entry)
+            self.lines.extend(lines)
+        if errors:
+            raise PostingError(errors)
+
+    def insert(self):
+        """
+        Insère en-têtes puis lignes par lots et reporte les lignes sur les soldes
+        par période (à appeler dans une transaction)
+        """
+        JournalEntry.objects.using(self.using).bulk_create(self.entries, batch_size=self.batch_size)
+        TransactionLine.objects.using(self.using).bulk_create(self.lines, batch_size=self.batch_size)
+        periods = {period['id']: (period['start_date'], period['end_date']) for period in self.calendar.periods}
+        apply_line_deltas(self.lines, periods, using=self.using)
+
+    def post(self, entries):
+        """
+        Valide puis insère des écritures dans une seule transaction.
+
+        Returns:
+            dict: Nombre d'écritures et de lignes, durée et débit en lignes par seconde
+        """
+        started = time.perf_counter()
+        self.prepare(entries)
+        with transaction.atomic(using=self.using):
+            self.insert()
+        elapsed = time.perf_counter() - started
+        return {
+            'entries': len(self.entries),
+            'lines': len(self.lines),
+            'elapsed': elapsed,
+            'lines_per_second': len(self.lines) / elapsed if elapsed else 0,
+        }
+
+    def reverse(self, entry_ids, day=None):
+        """
+        Extourne des écritures : passe des écritures miroir (débits et crédits
+        inversés), à la date d'origine ou à la date donnée, qui annulent leur
+        effet sur les soldes.
+
+        Raises:
+            PostingError: Identifiant invalide, écriture introuvable ou déjà extournée
+
+        Returns:
+            dict: Statistiques de la passation des extournes (voir post)
+        """
+        errors = []
+        ids = []
+        for index, entry_id in enumerate(entry_ids):
+            try:
+                ids.append(uuid.UUID(str(entry_id)))
+            except ValueError:
+                errors.append((index, f"identifiant d'écriture invalide: {entry_id}"))
+        if errors:
+            raise PostingError(errors)
+
+        journal_codes = dict(
+            Journal.objects.using(self.using).filter(tenant_id=self.tenant_id).values_list('id', 'code')
+        )
+        reversed_ids = set(
+            JournalEntry.objects.using(self.using).filter(
+                tenant_id=self.tenant_id, reversal_of_id__in=ids
+            ).values_list('reversal_of_id', flat=True)
+        )
+        reversals = {}
+        lines = TransactionLine.objects.using(self.using).filter(
+            tenant_id=self.tenant_id, entry_id__in=ids
+        ).order_by('entry__date', 'entry_id').values_list(
+            'entry_id', 'entry__journal_id', 'entry__date', 'entry__reference', 'account_id', 'debit', 'credit',
+            'description'
+        )
+        for entry_id, journal_id, entry_date, reference, account_id, debit, credit, description in lines:
+            reversal = reversals.get(entry_id)
+            if reversal is None:
+                reversal = reversals[entry_id] = {
+                    'journal': journal_codes[journal_id],
+                    'date': day or entry_date,
+                    'reference': f"EXT-{reference}"[:50] if reference else '',
+                    'description': f"Extourne de l'écriture {entry_id}",
+                    'reversal_of': entry_id,
+                    'lines': [],
+                }
+            reversal['lines'].append(
+                {'account_id': account_id, 'debit': credit, 'credit': debit, 'description': description}
+            )
+
+        for index, entry_id in enumerate(ids):
+            if entry_id in reversed_ids:
+                errors.append((index, f"écriture déjà extournée: {entry_id}"))
+            elif entry_id not in reversals:
+                errors.append((index, f"écriture introuvable: {entry_id}"))
+        if errors:
+            raise PostingError(errors)
+        return self.post(list(reversals.values()))
+
+
+def post_entries(tenant_id, entries, batch_size=DEFAULT_BATCH_SIZE, using=None):
+    """Raccourci : valide et insère des écritures pour un tenant (voir LedgerPoster)"""
+    return LedgerPoster(tenant_id, batch_size=batch_size, using=using).post(entries)
+
+
+def reverse_entries(tenant_id, entry_ids, day=None, using=None):
+    """Raccourci : extourne des écritures d'un tenant (voir LedgerPoster.reverse)"""
+    return LedgerPoster(tenant_id, using=using).reverse(entry_ids, day)
@@ -0,0 +1,218 @@
+# apps/core/services/period_balances.py
+"""
+Soldes des comptes par période fiscale (AccountPeriodBalance).
+
+La table est maintenue de manière incrémentale : chaque passation (ou
+extourne) applique ses totaux débit/crédit par compte et par période dans la
+transaction qui insère les lignes, puis recalcule les soldes d'ouverture et
+de clôture cumulés des seuls comptes touchés. Le coût dépend du nombre de
+comptes mouvementés, pas du volume de lignes déjà passées.
+
+Le calcul d'un solde sur une plage de dates (services.balances) combine les
+soldes des périodes entièrement comprises dans la plage et un parcours des
+seules lignes des périodes partiellement couvertes.
+
+rebuild_period_balances recalcule la table depuis les lignes, par exemple
+après des écritures SQL directes ; dry_run permet de vérifier qu'elle est à
+jour.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction, DEFAULT_DB_ALIAS
+from django.db.models import Sum
+from django.utils import timezone
+
+from ..models.fiscal_year import FiscalPeriod
+from ..models.transaction import AccountPeriodBalance, TransactionLine
+from .tenant_sharding import shard_for_tenant
+
+DEFAULT_BATCH_SIZE = 1000
+
+ZERO = Decimal('0.00')
+
+AMOUNT_FIELDS = ['opening', 'debit', 'credit', 'closing']
+
+
+def period_bounds(period_ids, using=DEFAULT_DB_ALIAS):
+    """id de période -> (début, fin), en une requête"""
+    return {
+        pk: (start, end) for pk, start, end in FiscalPeriod.objects.using(using).filter(
+            pk__in=period_ids
+        ).values_list('id', 'start_date', 'end_date')
+    }
+
+
+def roll_forward(rows):
+    """
+    Recalcule opening/closing des soldes d'un compte, triés par période.
+
+    Returns:
+        list: Soldes dont opening ou closing a changé
+    """
+    changed = []
+    running = ZERO
+    for row in sorted(rows, key=lambda row: row.period_start):
+        closing = running + row.debit - row.credit
+        if row.opening != running or row.closing != closing:
+            row.opening, row.closing = running, closing
+            changed.append(row)
+        running = closing
+    return changed
+
+
+def apply_line_deltas(lines, periods=None, batch_size=DEFAULT_BATCH_SIZE, using=DEFAULT_DB_ALIAS):
+    """
+    Reporte des lignes nouvellement insérées sur les soldes par période (à appeler
+    dans la transaction qui insère les lignes).
+
+    Args:
+        lines (list): TransactionLine insérées
+        periods (dict, optional): id de période -> (début, fin), lu en base à défaut
+        batch_size (int): Nombre de soldes écrits par requête
+
+    Returns:
+        int: Nombre de soldes créés ou modifiés
+    """
+    deltas = defaultdict(lambda: [ZERO, ZERO])
+    tenants = {}
+    for line in lines:
+        delta = deltas[(line.account_id, line.fiscal_period_id)]
+        delta[0] += line.debit
+        delta[1] += line.credit
+        tenants[line.account_id] = line.tenant_id
+    if not deltas:
+        return 0
+
+    period_ids = {period_id for _, period_id in deltas}
+    if periods is None or not period_ids <= periods.keys():
+        periods = period_bounds(period_ids, using)
+
+    manager = AccountPeriodBalance.objects.using(using)
+    # Créer à zéro les soldes manquants, puis verrouiller tous les soldes des comptes touchés
+    manager.bulk_create([
+        AccountPeriodBalance(
+            tenant_id=tenants[account_id], account_id=account_id, fiscal_period_id=period_id,
+            period_start=periods[period_id][0], period_end=periods[period_id][1]
+        ) for account_id, period_id in deltas
+    ], batch_size=batch_size, ignore_conflicts=True)
+
+    by_account = defaultdict(list)
+    account_ids = list(tenants)
+    for start in range(0, len(account_ids), batch_size):
+        for row in manager.select_for_update().filter(account_id__in=account_ids[start:start + batch_size]):
+            by_account[row.account_id].append(row)
+
+    changed = {}
+    for account_id, rows in by_account.items():
+        for row in rows:
+            delta = deltas.get((account_id, row.fiscal_period_id))
+            if delta is not None:
+                row.debit += delta[0]
+                row.credit += delta[1]
+                changed[row.pk] = row
+        for row in roll_forward(rows):
+            changed[row.pk] = row
+
+    write_balances(manager, list(changed.values()), batch_size)
+    return len(changed)
+
+
+def write_balances(manager, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Écrit des soldes calculés en mémoire par un upsert sur (compte, période) : une
+    requête par lot, là où un bulk_update génère des CASE dont le coût croît
+    avec la taille du lot.
+    """
+    now = timezone.now()
+    for row in rows:
+        row.updated_at = now
+    manager.bulk_create(
+        rows, batch_size=batch_size, update_conflicts=True,
+        unique_fields=['account', 'fiscal_period'], update_fields=AMOUNT_FIELDS + ['updated_at']
+    )
+
+
+def rebuild_period_balances(tenant_id, fiscal_year=None, batch_size=DEFAULT_BATCH_SIZE,
+                            using=None, dry_run=False):
+    """
+    Recalcule depuis les lignes les soldes par période d'un tenant : une requête
+    groupée sur les lignes, la comparaison en mémoire avec les soldes existants,
+    puis l'écriture des seules différences.
+
+    Args:
+        tenant_id (UUID): Tenant à traiter
+        fiscal_year (FiscalYear, optional): Limiter le recalcul des mouvements à cet exercice
+            (les soldes cumulés des exercices suivants sont mis à jour)
+        using (str, optional): Alias de la base (défaut: shard du tenant)
+        dry_run (bool): Compter les soldes à corriger sans rien écrire
+
+    Returns:
+        dict: Soldes analysés ('balances'), créés, modifiés et supprimés
+    """
+    using = using or shard_for_tenant(tenant_id)
+    lines = TransactionLine.objects.using(using).filter(tenant_id=tenant_id)
+    balances = AccountPeriodBalance.objects.using(using).filter(tenant_id=tenant_id)
+    if fiscal_year is not None:
+        lines = lines.filter(fiscal_period__fiscal_year=fiscal_year)
+    scope = set(
+        FiscalPeriod.objects.using(using).filter(
+            tenant_id=tenant_id, **({'fiscal_year': fiscal_year} if fiscal_year is not None else {})
+        ).values_list('id', flat=True)
+    )
+
+    totals = {
+        (row['account_id'], row['fiscal_period_id']): row for row in lines.order_by().values(
+            'account_id', 'fiscal_period_id', 'fiscal_period__start_date', 'fiscal_period__end_date'
+        ).annotate(debit_sum=Sum('debit'), credit_sum=Sum('credit'))
+    }
+
+    by_account = defaultdict(list)
+    existing = {}
+    stale = []
+    for row in balances:
+        key = (row.account_id, row.fiscal_period_id)
+        if row.fiscal_period_id in scope and key not in totals:
+            stale.append(row.pk)
+            continue
+        existing[key] = row
+        by_account[row.account_id].append(row)
+
+    created = []
+    changed = {}
+    for key, total in totals.items():
+        debit, credit = total['debit_sum'] or ZERO, total['credit_sum'] or ZERO
+        row = existing.get(key)
+        if row is None:
+            row = AccountPeriodBalance(
+                tenant_id=tenant_id, account_id=key[0], fiscal_period_id=key[1],
+                period_start=total['fiscal_period__start_date'], period_end=total['fiscal_period__end_date'],
+                debit=debit, credit=credit
+            )
+            created.append(row)
+            by_account[key[0]].append(row)
+        elif (row.debit, row.credit) != (debit, credit):
+            row.debit, row.credit = debit, credit
+            changed[row.pk] = row
+
+    created_ids = {row.pk for row in created}
+    for rows in by_account.values():
+        for row in roll_forward(rows):
+            if row.pk not in created_ids:
+                changed[row.pk] = row
+
+    stats = {
+        'balances': len(existing) + len(stale),
+        'created': len(created),
+        'updated': len(changed),
+        'deleted': len(stale),
+    }
+    if dry_run:
+        return stats
+
+    with transaction.atomic(using=using):
+        manager = AccountPeriodBalance.objects.using(using)
+        for start in range(0, len(stale), batch_size):
+            manager.filter(pk__in=stale[start:start + batch_size]).delete()
+        write_balances(manager, created + list(changed.values()), batch_size)
+    return stats
@@ -0,0 +1,217 @@
+# apps/core/services/read_replicas.py
+"""
+Lectures sur les réplicas en lecture seule.
+
+Chaque base primaire (default ou un shard, voir tenant_sharding) peut avoir
+des réplicas, déclarés dans DATABASES et associés à leur primaire :
+
+    READ_REPLICAS = {
+        'REPLICAS': {'default': ['default_replica']},
+        'STICKINESS': 'cookie',     # ou 'process'
+        'STICKY_SECONDS': 5,
+        'COOKIE_NAME': 'accounting_primary',
+        'RETRY_SECONDS': 30,
+    }
+
+Les lectures ne vont sur un réplica que pendant une action sûre d'une vue
+(GET, HEAD, OPTIONS : list, retrieve...), ouverte par ReadReplicaMiddleware
+avec replica_reads(). Elles restent sur le primaire :
+- après la première écriture de la requête (select_for_update() compris) ;
+- pendant STICKY_SECONDS après une écriture du tenant (lecture de ses propres
+  écritures malgré le retard de réplication), suivies par un cookie du
+  client ('cookie') ou par tenant dans la mémoire du processus ('process') ;
+- quand aucun réplica n'est joignable : un réplica injoignable est écarté
+  RETRY_SECONDS secondes.
+"""
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import DatabaseError, connections
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+STICKINESS_MODES = ('cookie', 'process')
+DEFAULT_STICKY_SECONDS = 5
+DEFAULT_COOKIE_NAME = 'accounting_primary'
+DEFAULT_RETRY_SECONDS = 30
+PINNED_MAX_SIZE = 10000
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(allowed=True):
+    """Bloc dont les lectures peuvent aller sur un réplica"""
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads_allowed():
+    return _replica_reads.get()
+
+
+def start_replica_reads():
+    """Ouvre les lectures sur réplica pour la suite du bloc courant (action sûre d'une vue)"""
+    _replica_reads.set(True)
+
+
+def stop_replica_reads():
+    """Renvoie les lectures suivantes du bloc courant vers le primaire (après une écriture)"""
+    if _replica_reads.get():
+        _replica_reads.set(False)
+
+
+class ReplicaSelector:
+    """
+    Choix d'un réplica joignable pour une base primaire, à tour de rôle.
+
+    Args:
+        replicas (dict): Alias primaire -> liste des alias de ses réplicas
+        retry_seconds (float): Durée pendant laquelle un réplica injoignable est écarté
+        clock (callable): Horloge (tests)
+    """
+
+    def __init__(self, replicas, retry_seconds=DEFAULT_RETRY_SECONDS, clock=time.monotonic):
+        self.replicas = {primary: tuple(aliases) for primary, aliases in replicas.items() if aliases}
+        self.primaries = {alias: primary for primary, aliases in self.replicas.items() for alias in aliases}
+        self.retry_seconds = retry_seconds
+        self.clock = clock
+        self.counter = itertools.count()
+        self.down_until = {}
+
+    def primary_of(self, alias):
+        """Base primaire d'un alias (l'alias lui-même s'il n'est pas un réplica)"""
+        return self.primaries.get(alias, alias)
+
+    def is_replica(self, alias):
+        return alias in self.primaries
+
+    def read_alias(self, primary):
+        """Réplica joignable de la base primaire, à défaut la base primaire"""
+        replicas = self.replicas.get(primary)
+        if not replicas:
+            return primary
+        now = self.clock()
+        start = next(self.counter)
+        for offset in range(len(replicas)):
+            alias = replicas[(start + offset) % len(replicas)]
+            if self.down_until.get(alias, 0) > now:
+                continue
+            try:
+                connections[alias].ensure_connection()
+            except DatabaseError as e:
+                logger.warning("Réplica %s injoignable, lectures sur %s : %s", alias, primary, e)
+                self.down_until[alias] = now + self.retry_seconds
+                continue
+            return alias
+        return primary
+
+
+class PinnedTenants:
+    """
+    Tenants dont les lectures restent sur le primaire après une écriture, dans
+    la mémoire du processus.
+
+    Args:
+        seconds (float): Durée de l'épinglage après la dernière écriture
+        clock (callable): Horloge (tests)
+    """
+
+    def __init__(self, seconds=DEFAULT_STICKY_SECONDS, clock=time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.until = OrderedDict()
+        self.lock = threading.Lock()
+
+    def pin(self, tenant_id):
+        with self.lock:
+            self.until[tenant_id] = self.clock() + self.seconds
+            self.until.move_to_end(tenant_id)
+            while len(self.until) > PINNED_MAX_SIZE:
+                self.until.popitem(last=False)
+
+    def is_pinned(self, tenant_id):
+        with self.lock:
+            until = self.until.get(tenant_id)
+            if until is None:
+                return False
+            if until > self.clock():
+                return True
+            del self.until[tenant_id]
+            return False
+
+
+class ReadReplicas:
+    """Configuration READ_REPLICAS du processus : choix des réplicas et épinglage"""
+
+    def __init__(self, options):
+        unknown = {
+            alias for primary, aliases in options.get('REPLICAS', {}).items() for alias in [primary, *aliases]
+        } - set(settings.DATABASES)
+        if unknown:
+            raise ImproperlyConfigured(f"READ_REPLICAS : alias absents de DATABASES : {', '.join(sorted(unknown))}")
+        self.stickiness = options.get('STICKINESS', 'cookie')
+        if self.stickiness not in STICKINESS_MODES:
+            raise ImproperlyConfigured(f"READ_REPLICAS : STICKINESS doit valoir {' ou '.join(STICKINESS_MODES)}")
+        self.sticky_seconds = options.get('STICKY_SECONDS', DEFAULT_STICKY_SECONDS)
+        self.cookie_name = options.get('COOKIE_NAME', DEFAULT_COOKIE_NAME)
+        self.selector = ReplicaSelector(
+            options.get('REPLICAS', {}), options.get('RETRY_SECONDS', DEFAULT_RETRY_SECONDS)
+        )
+        self.pinned = PinnedTenants(self.sticky_seconds)
+
+    @property
+    def enabled(self):
+        return bool(self.selector.replicas)
+
+    def is_pinned(self, request):
+        """Vrai si les lectures de la requête doivent rester sur le primaire"""
+        if self.stickiness == 'cookie':
+            return request.COOKIES.get(self.cookie_name) == pin_key(request)
+        return self.pinned.is_pinned(pin_key(request))
+
+    def pin(self, request, response):
+        """Épingle le client ('cookie') ou le tenant ('process') au primaire après une écriture"""
+        if self.stickiness == 'cookie':
+            response.set_cookie(
+                self.cookie_name, pin_key(request), max_age=self.sticky_seconds,
+                secure=request.is_secure(), httponly=True, samesite='Lax'
+            )
+        else:
+            self.pinned.pin(pin_key(request))
+
+
+def pin_key(request):
+    """Clé d'épinglage : le tenant de la requête, '-' hors tenant"""
+    return getattr(request, 'tenant_id', None) or '-'
+
+
+_read_replicas = None
+
+
+def get_read_replicas():
+    """Configuration des réplicas du processus, construite au premier appel"""
+    global _read_replicas
+    if _read_replicas is None:
+        _read_replicas = ReadReplicas(getattr(settings, 'READ_REPLICAS', None) or {})
+    return _read_replicas
+
+
+@receiver(setting_changed)
+def reset_read_replicas(setting=None, **kwargs):
+    """Reconstruit la configuration quand READ_REPLICAS ou DATABASES change (tests)"""
+    global _read_replicas
+    if setting in (None, 'READ_REPLICAS', 'DATABASES'):
+        _read_replicas = None
@@ -0,0 +1,351 @@
+# apps/core/services/tenant_backup.py
+"""
+Sauvegarde et restauration rapides des données de référence des tenants
+(plan comptable, tiers, exercices fiscaux).
+
+Les fichiers utilisent le format d'enregistrement de dumpdata
+({"model": ..., "pk": ..., "fields": {...}}), soit dans un tableau JSON (format
+historique, ex. accounts_backup.json), soit en NDJSON, compressé ou non
+(.ndjson.gz).
+
+La restauration lit le fichier de manière incrémentale, ordonne les lignes
+selon les dépendances entre modèles (classes, catégories, comptes par
+profondeur dans la hiérarchie, tiers, exercices, périodes), vérifie que
+toutes les clés étrangères sont résolues, puis insère les lignes par lots
+dans la base (shard) de chaque tenant, une transaction par shard ouverte
+pour toute la durée de la restauration. Comme loaddata, l'insertion est brute : ni
+save(), ni signaux : les lignes sont insérées telles que sauvegardées, dates de
+création et de modification comprises (un champ absent du fichier prend sa
+valeur par défaut).
+"""
+import codecs
+import datetime
+import gzip
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+
+from .account_hierarchy import rebuild_hierarchy
+from .chart_import import READ_CHUNK_SIZE, iter_json_records
+from .tenant_sharding import shard_for_tenant
+from ..models.account import AccountClass, AccountCategory, Account, ChartVersion
+from ..models.fiscal_year import FiscalYear, FiscalPeriod
+from ..models.tiers import Tiers
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Modèles sauvegardés, dans l'ordre des dépendances
+MODELS = [AccountClass, AccountCategory, Account, Tiers, FiscalYear, FiscalPeriod]
+
+# Encodage de repli des anciennes sauvegardes produites sous Windows
+LEGACY_ENCODING = 'cp1252'
+
+
+class BackupJSONEncoder(DjangoJSONEncoder):
+    """Comme dumpdata, mais sans tronquer les dates aux millisecondes"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            value = o.isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+        return super().default(o)
+
+
+class TenantBackupError(Exception):
+    """Sauvegarde illisible ou incohérente (clé étrangère non résolue...)"""
+
+
+def is_ndjson(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    return name.endswith(('.ndjson', '.jsonl'))
+
+
+def _open_binary(path, mode='rb'):
+    return gzip.open(path, mode) if path.endswith('.gz') else open(path, mode)
+
+
+def detect_encoding(path):
+    """UTF-8 si tout le fichier se décode, sinon l'encodage des anciennes sauvegardes"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with _open_binary(path) as file:
+        try:
+            while True:
+                chunk = file.read(READ_CHUNK_SIZE)
+                decoder.decode(chunk, final=not chunk)
+                if not chunk:
+                    return 'utf-8'
+        except UnicodeDecodeError:
+            return LEGACY_ENCODING
+
+
+def iter_backup_records(path):
+    """
+    Lit les enregistrements d'une sauvegarde (tableau JSON ou NDJSON, éventuellement gzip).
+
+    Yields:
+        dict: Un enregistrement {"model", "pk", "fields"} à la fois
+    """
+    encoding = detect_encoding(path)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding=encoding) as file:
+        yield from iter_json_records(file)
+
+
+class _ModelRows:
+    """Conversion des champs d'un enregistrement en instance du modèle"""
+
+    def __init__(self, model):
+        self.model = model
+        self.converters = {}
+        self.foreign_keys = []
+        for field in model._meta.concrete_fields:
+            if field.primary_key:
+                continue
+            if field.is_relation:
+                self.converters[field.name] = (field.attname, field.target_field.to_python)
+                self.foreign_keys.append(field)
+            else:
+                self.converters[field.name] = (field.attname, field.to_python)
+        self.to_pk = model._meta.pk.to_python
+        self.objects = []
+
+    def add(self, record):
+        values = {}
+        for name, value in record.get('fields', {}).items():
+            converter = self.converters.get(name)
+            if converter is not None:  # champ supprimé depuis la sauvegarde
+                attname, to_python = converter
+                values[attname] = None if value is None else to_python(value)
+        obj = self.model(pk=self.to_pk(record['pk']), **values)
+        self.objects.append(obj)
+        return obj
+
+
+def account_depths(accounts):
+    """Profondeur de chaque compte dans la hiérarchie de la sauvegarde (0 = sans parent sauvegardé)"""
+    parents = {account.pk: account.parent_id for account in accounts}
+    depths = {}
+    for pk in parents:
+        chain = []
+        current = pk
+        while current in parents and current not in depths:
+            chain.append(current)
+            current = parents[current]
+            if current in chain:
+                raise TenantBackupError(f"Cycle dans la hiérarchie des comptes autour de {current}")
+        depth = depths.get(current, -1) if current in parents else -1
+        for node in reversed(chain):
+            depth += 1
+            depths[node] = depth
+    return depths
+
+
+class TenantRestorer:
+    """
+    Restaure une ou plusieurs sauvegardes.
+
+    Args:
+        batch_size (int): Nombre de lignes insérées par requête
+        replace (bool): Supprimer au préalable les données des tenants présents dans la sauvegarde
+        using (str, optional): Alias de la base de données (défaut: shard de chaque tenant)
+        log (callable, optional): Reçoit les messages de progression
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, replace=False, using=None, log=None):
+        self.batch_size = batch_size
+        self.replace = replace
+        self.using = using
+        self.log = log or (lambda message: None)
+        self.rows = {model: _ModelRows(model) for model in MODELS}
+        self.labels = {model._meta.label_lower: self.rows[model] for model in MODELS}
+        self.ignored = defaultdict(int)
+
+    def read(self, path):
+        """Charge les enregistrements d'un fichier, sans rien écrire"""
+        for record in iter_backup_records(path):
+            rows = self.labels.get(record.get('model'))
+            if rows is None:
+                self.ignored[record.get('model')] += 1
+                continue
+            rows.add(record)
+
+    @property
+    def tenant_ids(self):
+        return {obj.tenant_id for rows in self.rows.values() for obj in rows.objects}
+
+    def shards(self):
+        """Tenants de la sauvegarde regroupés par alias de la base qui porte leurs données"""
+        shards = defaultdict(set)
+        for tenant_id in self.tenant_ids:
+            shards[self.using or shard_for_tenant(tenant_id)].add(tenant_id)
+        return shards
+
+    def objects(self, model, tenant_ids):
+        """Lignes de la sauvegarde d'un modèle pour les tenants donnés"""
+        return [obj for obj in self.rows[model].objects if obj.tenant_id in tenant_ids]
+
+    def counts(self):
+        return {model._meta.model_name: len(rows.objects) for model, rows in self.rows.items()}
+
+    def check_references(self, using, tenant_ids):
+        """
+        Vérifie que chaque clé étrangère des tenants d'un shard désigne une
+        ligne de la sauvegarde ou de ce shard
+        """
+        objects = {model: self.objects(model, tenant_ids) for model in MODELS}
+        pks = {model: {obj.pk for obj in rows} for model, rows in objects.items()}
+        # Avec replace, les lignes existantes des tenants restaurés vont disparaître
+        exclude_tenants = tenant_ids if self.replace else None
+        for model, rows in self.rows.items():
+            for field in rows.foreign_keys:
+                target = field.related_model
+                wanted = {getattr(obj, field.attname) for obj in objects[model]} - {None} - pks[target]
+                if not wanted:
+                    continue
+                missing = wanted - self.existing_pks(target, wanted, using, exclude_tenants)
+                if missing:
+                    raise TenantBackupError(
+                        f"{len(missing)} {model._meta.model_name} référencent un(e) {target._meta.model_name} "
+                        f"absent(e) de la sauvegarde et de la base (ex: {next(iter(missing))})"
+                    )
+
+    def existing_pks(self, model, pks, using, exclude_tenants=None):
+        queryset = model._base_manager.using(using)
+        if exclude_tenants:
+            queryset = queryset.exclude(tenant_id__in=exclude_tenants)
+        pks = list(pks)
+        found = set()
+        for start in range(0, len(pks), self.batch_size):
+            found.update(queryset.filter(pk__in=pks[start:start + self.batch_size]).values_list('pk', flat=True))
+        return found
+
+    def delete_existing(self, using, tenant_ids):
+        """Supprime les données des tenants restaurés d'un shard, dépendances d'abord"""
+        tenant_ids = list(tenant_ids)
+        for model in reversed(MODELS):
+            if model is Account:
+                # Détacher la hiérarchie évite un SET NULL ligne par ligne
+                Account._base_manager.using(using).filter(tenant_id__in=tenant_ids).update(parent=None)
+            deleted, _ = model._base_manager.using(using).filter(tenant_id__in=tenant_ids).delete()
+            if deleted:
+                self.log(f"{model._meta.model_name}: {deleted} lignes supprimées")
+
+    def insert(self, model, objects, using):
+        """INSERT brut par lots : valeurs du fichier conservées, sans save() ni signaux"""
+        if not objects:
+            return
+        fields = model._meta.concrete_fields
+        batch_size = max(1, min(self.batch_size, connections[using].ops.bulk_batch_size(fields, objects)))
+        manager = model._base_manager
+        for start in range(0, len(objects), batch_size):
+            manager._insert(objects[start:start + batch_size], fields=fields, raw=True, using=using)
+
+    def ordered(self, tenant_ids):
+        """(modèle, lignes des tenants) dans l'ordre d'insertion ; les comptes par profondeur croissante"""
+        for model in MODELS:
+            objects = self.objects(model, tenant_ids)
+            if model is Account:
+                depths = account_depths(objects)
+                yield model, sorted(objects, key=lambda obj: depths[obj.pk])
+            else:
+                yield model, objects
+
+    def restore_shard(self, using, tenant_ids, dry_run=False):
+        """Vérifie puis restaure les tenants d'un shard (dans la transaction de ce shard)"""
+        self.check_references(using, tenant_ids)
+        if dry_run:
+            return
+        if self.replace:
+            self.delete_existing(using, tenant_ids)
+        for model, objects in self.ordered(tenant_ids):
+            self.insert(model, objects, using)
+        # Index hiérarchique absent des anciennes sauvegardes, ou partiel
+        for tenant_id in tenant_ids:
+            rebuild_hierarchy(tenant_id, self.batch_size, using=using)
+        ChartVersion.bump(tenant_ids, using)
+
+    def restore(self, paths, dry_run=False):
+        """
+        Restaure les fichiers donnés, dans une transaction par shard : les
+        transactions restent ouvertes jusqu'à la fin, une erreur sur un shard
+        annule donc la restauration sur tous.
+
+        Returns:
+            dict: Nombre de lignes par modèle, enregistrements ignorés, durée
+        """
+        started = time.perf_counter()
+        for path in paths:
+            self.read(path)
+        for label, count in self.ignored.items():
+            self.log(f"{count} enregistrements {label} ignorés (modèle non pris en charge)")
+
+        shards = self.shards()
+        with ExitStack() as stack:
+            for using in sorted(shards):
+                stack.enter_context(transaction.atomic(using=using))
+            for using in sorted(shards):
+                self.restore_shard(using, shards[using], dry_run)
+
+        return {
+            'counts': self.counts(),
+            'tenants': len(self.tenant_ids),
+            'shards': len(shards),
+            'ignored': dict(self.ignored),
+            'elapsed': time.perf_counter() - started,
+            'dry_run': dry_run,
+        }
+
+
+def restore_backup(paths, batch_size=DEFAULT_BATCH_SIZE, replace=False, dry_run=False, log=None):
+    """Restaure une ou plusieurs sauvegardes (voir TenantRestorer)"""
+    return TenantRestorer(batch_size=batch_size, replace=replace, log=log).restore(paths, dry_run=dry_run)
+
+
+def iter_tenant_records(tenant_id, chunk_size=DEFAULT_BATCH_SIZE, using=None):
+    """
+    Enregistrements d'un tenant au format dumpdata, modèle par modèle, sans charger de modèles Django.
+
+    Yields:
+        dict: {"model", "pk", "fields"} avec les clés étrangères exprimées par leur clé primaire
+    """
+    using = using or shard_for_tenant(tenant_id)
+    for model in MODELS:
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        names = [field.name for field in fields]
+        label = model._meta.label_lower
+        queryset = model._base_manager.using(using).filter(tenant_id=tenant_id)
+        order = ('level', 'code') if model is Account else ('pk',)
+        for row in queryset.order_by(*order).values_list('pk', *[f.attname for f in fields]).iterator(chunk_size):
+            yield {'model': label, 'pk': row[0], 'fields': dict(zip(names, row[1:]))}
+
+
+def dump_tenants(tenant_ids, path, chunk_size=DEFAULT_BATCH_SIZE):
+    """
+    Écrit les données des tenants dans un fichier, en flux.
+
+    Le format dépend de l'extension : .ndjson/.jsonl (une ligne par
+    enregistrement) ou tableau JSON (format historique), compressé si .gz.
+
+    Returns:
+        int: Nombre d'enregistrements écrits
+    """
+    ndjson = is_ndjson(path)
+    encoder = BackupJSONEncoder(ensure_ascii=False)
+    count = 0
+    with _open_binary(path, 'wb') as binary:
+        with codecs.getwriter('utf-8')(binary) as file:
+            if not ndjson:
+                file.write('[')
+            for tenant_id in tenant_ids:
+                for record in iter_tenant_records(tenant_id, chunk_size):
+                    if ndjson:
+                        file.write(encoder.encode(record) + '\n')
+                    else:
+                        file.write((',\n' if count else '\n') + encoder.encode(record))
+                    count += 1
+            if not ndjson:
+                file.write('\n]\n')
+    return count
@@ -0,0 +1,295 @@
+# apps/core/services/tenant_clone.py
+"""
+Clonage d'un tenant à partir d'un tenant modèle, entièrement côté base.
+
+Chaque table est copiée par un seul INSERT ... SELECT : les nouveaux UUID
+sont générés par la base et les clés étrangères (classe, catégorie, exercice,
+compte) sont remappées par jointure sur les clés naturelles du tenant cible
+(numéro de classe, code de catégorie, code de compte, code d'exercice). Le
+parent des comptes est ensuite rattaché par un UPDATE corrélé sur les codes.
+
+L'onboarding coûte ainsi une poignée de requêtes, quelle que soit la taille
+du plan, sans qu'aucune ligne ne transite par Python. La profondeur et le
+nombre de descendants de l'index hiérarchique sont copiés du modèle ; les
+chemins matérialisés sont recalculés par une CTE récursive.
+
+Seuls les tiers par défaut du modèle (Tiers.DEFAULT_TIERS) sont copiés. Par
+l'API, seuls les tenants modèles désignés par les settings
+(TEMPLATE_TENANT_ID, TEMPLATE_TENANT_IDS) peuvent être copiés.
+"""
+import uuid
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from ..models.account import AccountClass, AccountCategory, Account, ChartVersion
+from ..models.fiscal_year import FiscalYear, FiscalPeriod
+from ..models.tiers import Tiers
+from .tenant_sharding import shard_for_tenant
+
+# Expression SQL générant un UUID au format attendu par UUIDField, par moteur
+_UUID_EXPRESSIONS = {
+    'postgresql': 'gen_random_uuid()',
+    'sqlite': 'lower(hex(randomblob(16)))',
+    'mysql': "REPLACE(UUID(), '-', '')",
+}
+
+# Chemin matérialisé d'un compte (voir account_hierarchy) : chemin du parent,
+# identifiant en hexadécimal sans tirets puis '/', par moteur
+_PATH_EXPRESSIONS = {
+    'postgresql': "{parent} || replace(CAST({id} AS text), '-', '') || '/'",
+    'sqlite': "{parent} || {id} || '/'",
+    'mysql': "CONCAT({parent}, {id}, '/')",
+}
+
+# Champs remis à leur valeur initiale dans le tenant cloné
+_RESET_FIELDS = {
+    FiscalYear: {'is_closed': False, 'closed_date': None, 'closed_by': None, 'is_locked': False},
+    FiscalPeriod: {'is_closed': False, 'is_locked': False},
+}
+
+
+class TenantCloneError(Exception):
+    """Clonage impossible (tenant modèle vide, tenant cible déjà provisionné...)"""
+
+
+def template_tenant_ids():
+    """Tenants modèles désignés par les settings : TEMPLATE_TENANT_ID et TEMPLATE_TENANT_IDS"""
+    values = [settings.TEMPLATE_TENANT_ID, *(getattr(settings, 'TEMPLATE_TENANT_IDS', None) or [])]
+    return {uuid.UUID(str(value)) for value in values if value}
+
+
+def check_template_tenant(template_tenant_id):
+    """
+    Vérifie qu'un tenant est un tenant modèle désigné.
+
+    Returns:
+        UUID: Le tenant modèle
+
+    Raises:
+        TenantCloneError: Si le tenant n'est pas un tenant modèle désigné
+    """
+    template_uuid = uuid.UUID(str(template_tenant_id))
+    if template_uuid not in template_tenant_ids():
+        raise TenantCloneError(f"{template_uuid} n'est pas un tenant modèle")
+    return template_uuid
+
+
+class TenantCloner:
+    """
+    Copie le plan comptable, les exercices fiscaux et les tiers d'un tenant modèle.
+
+    Args:
+        template_tenant_id (UUID): Tenant modèle
+        tenant_id (UUID): Tenant à provisionner (sans plan comptable)
+        using (str, optional): Alias de la base de données (défaut: shard du tenant)
+
+    Raises:
+        TenantCloneError: Si le tenant modèle n'est pas sur le même shard
+    """
+
+    def __init__(self, template_tenant_id, tenant_id, using=None):
+        self.template_tenant_id = template_tenant_id
+        self.tenant_id = tenant_id
+        self.using = using or shard_for_tenant(tenant_id)
+        # La copie est une requête INSERT ... SELECT : les deux tenants doivent partager leur base
+        template_alias = shard_for_tenant(template_tenant_id)
+        if template_alias != self.using:
+            raise TenantCloneError(
+                f"Le tenant modèle {template_tenant_id} est sur le shard '{template_alias}', "
+                f"le tenant {tenant_id} sur '{self.using}'"
+            )
+        self.connection = connections[self.using]
+
+        vendor = self.connection.vendor
+        if vendor not in _UUID_EXPRESSIONS:
+            raise TenantCloneError(f"Clonage de tenant non supporté pour la base '{vendor}'")
+        self.uuid_expression = _UUID_EXPRESSIONS[vendor]
+        self.now = timezone.now()
+
+    def quote(self, name):
+        return self.connection.ops.quote_name(name)
+
+    def prep(self, model, field_name, value):
+        """Adapte une valeur Python au format de la colonne (UUID, date...)"""
+        field = model._meta.get_field(field_name)
+        return field.get_db_prep_value(value, self.connection)
+
+    def insert_select(self, model, overrides=None, joins=None, where=None):
+        """
+        Copie les lignes du tenant modèle d'une table par INSERT ... SELECT.
+
+        Args:
+            model: Modèle à copier
+            overrides (dict): colonne -> expression SQL remplaçant la valeur copiée
+            joins (list): (clause JOIN, paramètres) nécessaires aux expressions
+            where (tuple, optional): (condition SQL sur les lignes t du modèle, paramètres)
+
+        Returns:
+            int: Nombre de lignes insérées
+        """
+        overrides = overrides or {}
+        resets = _RESET_FIELDS.get(model, {})
+
+        columns = []
+        values = []
+        params = []
+        for field in model._meta.concrete_fields:
+            column = field.column
+            columns.append(self.quote(column))
+            if field.primary_key:
+                values.append(self.uuid_expression)
+            elif column == 'tenant_id':
+                values.append('%s')
+                params.append(self.prep(model, 'tenant_id', self.tenant_id))
+            elif field.name in ('created_at', 'updated_at'):
+                values.append('%s')
+                params.append(self.prep(model, field.name, self.now))
+            elif column in overrides:
+                values.append(overrides[column])
+            elif field.name in resets:
+                values.append('%s')
+                params.append(self.prep(model, field.name, resets[field.name]))
+            else:
+                values.append(f"t.{self.quote(column)}")
+
+        join_sql = []
+        for clause, join_params in joins or []:
+            join_sql.append(clause)
+            params.extend(join_params)
+        params.append(self.prep(model, 'tenant_id', self.template_tenant_id))
+        condition = f"t.{self.quote('tenant_id')} = %s"
+        if where:
+            condition = f"{condition} AND ({where[0]})"
+            params.extend(where[1])
+
+        sql = (
+            f"INSERT INTO {self.quote(model._meta.db_table)} ({', '.join(columns)}) "
+            f"SELECT {', '.join(values)} FROM {self.quote(model._meta.db_table)} t "
+            f"{' '.join(join_sql)} WHERE {condition}"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def remap_join(self, alias, model, fk_column, key_column, outer=False):
+        """
+        Jointure qui retrouve, dans le tenant cible, l'équivalent d'une ligne
+        référencée par le tenant modèle (même valeur de clé naturelle).
+
+        Returns:
+            tuple: (clause JOIN, paramètres)
+        """
+        table = self.quote(model._meta.db_table)
+        key = self.quote(key_column)
+        join = 'LEFT JOIN' if outer else 'JOIN'
+        clause = (
+            f"{join} {table} {alias}_t ON {alias}_t.{self.quote('id')} = t.{self.quote(fk_column)} "
+            f"{join} {table} {alias}_n ON {alias}_n.{self.quote('tenant_id')} = %s "
+            f"AND {alias}_n.{key} = {alias}_t.{key}"
+        )
+        return clause, [self.prep(model, 'tenant_id', self.tenant_id)]
+
+    def default_tiers_condition(self):
+        """Condition limitant la copie aux tiers par défaut du modèle (ni clients ni fournisseurs réels)"""
+        keys = Tiers.default_tiers_keys()
+        type_, name = self.quote('type'), self.quote('name')
+        sql = ' OR '.join(f"(t.{type_} = %s AND t.{name} = %s)" for _ in keys)
+        return sql, [value for key in keys for value in key]
+
+    def link_parents(self):
+        """Rattache chaque compte cloné au clone de son parent, en une requête"""
+        table = self.quote(Account._meta.db_table)
+        id_, code, tenant, parent = (self.quote(c) for c in ('id', 'code', 'tenant_id', 'parent_id'))
+        sql = (
+            f"UPDATE {table} SET {parent} = ("
+            f"SELECT np.{id_} FROM {table} ta "
+            f"JOIN {table} tp ON tp.{id_} = ta.{parent} "
+            f"JOIN {table} np ON np.{tenant} = %s AND np.{code} = tp.{code} "
+            f"WHERE ta.{tenant} = %s AND ta.{code} = {table}.{code}"
+            f") WHERE {tenant} = %s"
+        )
+        tenant_id = self.prep(Account, 'tenant_id', self.tenant_id)
+        template_id = self.prep(Account, 'tenant_id', self.template_tenant_id)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [tenant_id, template_id, tenant_id])
+
+    def link_paths(self):
+        """Recalcule en une requête (CTE récursive) le chemin matérialisé des comptes clonés"""
+        table = self.quote(Account._meta.db_table)
+        id_, tenant, parent, path = (self.quote(c) for c in ('id', 'tenant_id', 'parent_id', 'path'))
+        expression = _PATH_EXPRESSIONS[self.connection.vendor]
+        root_path = expression.format(parent="''", id=f"a.{id_}")
+        child_path = expression.format(parent="tree.path", id=f"a.{id_}")
+        sql = (
+            f"WITH RECURSIVE tree (id, path) AS ("
+            f"SELECT a.{id_}, {root_path} FROM {table} a WHERE a.{tenant} = %s AND a.{parent} IS NULL "
+            f"UNION ALL "
+            f"SELECT a.{id_}, {child_path} FROM {table} a JOIN tree ON a.{parent} = tree.id"
+            f") UPDATE {table} SET {path} = (SELECT tree.path FROM tree WHERE tree.id = {table}.{id_}) "
+            f"WHERE {tenant} = %s"
+        )
+        tenant_id = self.prep(Account, 'tenant_id', self.tenant_id)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [tenant_id, tenant_id])
+
+    def clone(self, include_fiscal=True, include_tiers=True):
+        """
+        Effectue le clonage dans une transaction.
+
+        Returns:
+            dict: Nombre de lignes copiées par modèle
+        """
+        accounts = Account.objects.using(self.using)
+        if not accounts.filter(tenant_id=self.template_tenant_id).exists():
+            raise TenantCloneError(f"Le tenant modèle {self.template_tenant_id} n'a pas de plan comptable")
+        if accounts.filter(tenant_id=self.tenant_id).exists() or \
+                AccountClass.objects.using(self.using).filter(tenant_id=self.tenant_id).exists():
+            raise TenantCloneError(f"Le tenant {self.tenant_id} possède déjà un plan comptable")
+
+        stats = {}
+        with transaction.atomic(using=self.using):
+            stats['classes'] = self.insert_select(AccountClass)
+
+            stats['categories'] = self.insert_select(
+                AccountCategory,
+                overrides={'account_class_id': 'cls_n.id'},
+                joins=[self.remap_join('cls', AccountClass, 'account_class_id', 'number')]
+            )
+
+            stats['accounts'] = self.insert_select(
+                Account,
+                overrides={'account_class_id': 'cls_n.id', 'category_id': 'cat_n.id', 'parent_id': 'NULL'},
+                joins=[
+                    self.remap_join('cls', AccountClass, 'account_class_id', 'number'),
+                    self.remap_join('cat', AccountCategory, 'category_id', 'code', outer=True),
+                ]
+            )
+            self.link_parents()
+            self.link_paths()
+            ChartVersion.bump([self.tenant_id], self.using)
+
+            if include_fiscal:
+                stats['fiscal_years'] = self.insert_select(FiscalYear)
+                stats['fiscal_periods'] = self.insert_select(
+                    FiscalPeriod,
+                    overrides={'fiscal_year_id': 'fy_n.id'},
+                    joins=[self.remap_join('fy', FiscalYear, 'fiscal_year_id', 'code')]
+                )
+
+            if include_tiers:
+                stats['tiers'] = self.insert_select(
+                    Tiers,
+                    overrides={'account_id': 'acc_n.id'},
+                    joins=[self.remap_join('acc', Account, 'account_id', 'code')],
+                    where=self.default_tiers_condition()
+                )
+
+        return stats
+
+
+def clone_tenant(template_tenant_id, tenant_id, include_fiscal=True, include_tiers=True, using=None):
+    """Raccourci : clone un tenant modèle (voir TenantCloner)"""
+    cloner = TenantCloner(template_tenant_id, tenant_id, using=using)
+    return cloner.clone(include_fiscal=include_fiscal, include_tiers=include_tiers)
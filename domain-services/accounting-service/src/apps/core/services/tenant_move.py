@@ -0,0 +1,254 @@
+# apps/core/services/tenant_move.py
+"""
+Déplacement en ligne d'un tenant vers un autre shard (voir tenant_sharding).
+
+Le tenant reste servi pendant la copie, quelle que soit sa taille :
+
+1. copie : les lignes du tenant sont lues par lots sur le shard source et
+   insérées telles quelles (INSERT brut, clés primaires et dates conservées)
+   sur le shard cible, dans une transaction de la cible ;
+2. gel : l'annuaire passe le tenant en MOVING et TenantMiddleware refuse ses
+   écritures (503) ; le déplacement attend que chaque processus ait relu
+   l'annuaire et que les requêtes en cours soient terminées ;
+3. rattrapage : chaque table est comparée ligne à ligne entre les deux
+   shards, par empreinte, en parcourant les deux côtés par clé primaire
+   croissante ; les écarts dus aux écritures pendant la copie sont reportés
+   sur la cible, puis une dernière comparaison doit être vide ;
+4. bascule : l'annuaire désigne le shard cible, les écritures reprennent ;
+5. nettoyage : après un nouveau délai de propagation (processus qui lisent
+   encore l'ancien shard), les lignes du shard source sont supprimées.
+
+En cas d'échec avant la bascule, la copie est supprimée et le tenant
+réactivé sur son shard d'origine.
+"""
+import hashlib
+import json
+import time
+
+from django.db import connections, transaction
+
+from .tenant_sharding import TenantShardingError, get_shard_directory
+from ..models.account import AccountClass, AccountCategory, Account, ChartVersion
+from ..models.fiscal_year import FiscalYear, FiscalPeriod
+from ..models.journal import Journal, JournalEntry
+from ..models.tenant import TenantShardStatus
+from ..models.tiers import Tiers
+from ..models.transaction import TransactionLine, AccountPeriodBalance
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Durée maximale d'une requête en cours au moment du gel, en secondes
+REQUEST_GRACE = 5
+
+# Modèles déplacés, dans l'ordre des dépendances : toutes les données d'un tenant
+MODELS = [
+    AccountClass, AccountCategory, Account, Tiers, FiscalYear, FiscalPeriod,
+    Journal, JournalEntry, TransactionLine, AccountPeriodBalance, ChartVersion,
+]
+
+
+class TenantMoveError(Exception):
+    """Déplacement impossible (shard inconnu, cible déjà occupée, écarts persistants...)"""
+
+
+def row_digest(row):
+    """Empreinte d'une ligne, indépendante du moteur de base (valeurs en texte, JSON trié)"""
+    return hashlib.blake2b(json.dumps(row, sort_keys=True, default=str).encode(), digest_size=16).digest()
+
+
+class TenantMover:
+    """
+    Déplace toutes les données d'un tenant vers un autre shard.
+
+    Args:
+        tenant_id (UUID): Tenant à déplacer
+        target (str): Alias du shard cible
+        batch_size (int): Nombre de lignes lues ou insérées par requête
+        wait (float, optional): Délai de propagation du gel et de la bascule,
+            en secondes (défaut: DIRECTORY_TTL + REQUEST_GRACE)
+        replace (bool): Supprimer les lignes du tenant déjà présentes sur la cible
+        keep_source (bool): Conserver les lignes du shard source
+        log (callable, optional): Reçoit les messages de progression
+        sleep (callable): Attente (tests)
+    """
+
+    def __init__(self, tenant_id, target, batch_size=DEFAULT_BATCH_SIZE, wait=None, replace=False,
+                 keep_source=False, log=None, sleep=time.sleep):
+        self.directory = get_shard_directory()
+        if target not in self.directory.shards:
+            raise TenantMoveError(f"Shard '{target}' absent de SHARDS ({', '.join(self.directory.shards)})")
+        self.directory.invalidate(tenant_id)
+        try:
+            self.source = self.directory.alias_for(tenant_id)
+        except TenantShardingError as e:
+            raise TenantMoveError(str(e))
+        if self.source == target:
+            raise TenantMoveError(f"Le tenant {tenant_id} est déjà sur le shard '{target}'")
+
+        self.tenant_id = tenant_id
+        self.target = target
+        self.batch_size = batch_size
+        self.wait = self.directory.ttl + REQUEST_GRACE if wait is None else wait
+        self.replace = replace
+        self.keep_source = keep_source
+        self.log = log or (lambda message: None)
+        self.sleep = sleep
+
+    def queryset(self, model, alias):
+        return model._base_manager.using(alias).filter(tenant_id=self.tenant_id)
+
+    def insert(self, model, objects):
+        """INSERT brut par lots sur la cible, sans save() ni signaux"""
+        fields = model._meta.concrete_fields
+        batch_size = max(1, min(self.batch_size, connections[self.target].ops.bulk_batch_size(fields, objects)))
+        for start in range(0, len(objects), batch_size):
+            model._base_manager._insert(objects[start:start + batch_size], fields=fields, raw=True, using=self.target)
+
+    def copy(self, model):
+        """Copie les lignes d'une table vers la cible ; renvoie leur nombre"""
+        count = 0
+        batch = []
+        for obj in self.queryset(model, self.source).order_by('pk').iterator(self.batch_size):
+            batch.append(obj)
+            if len(batch) == self.batch_size:
+                self.insert(model, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.insert(model, batch)
+            count += len(batch)
+        return count
+
+    def rows(self, model, alias):
+        """(clé primaire, empreinte) de chaque ligne d'une table, par clé primaire croissante"""
+        names = ['pk'] + [field.attname for field in model._meta.concrete_fields if not field.primary_key]
+        queryset = self.queryset(model, alias).order_by('pk').values_list(*names)
+        for row in queryset.iterator(self.batch_size):
+            yield row[0], row_digest(row)
+
+    def compare(self, model):
+        """
+        Compare une table entre la source et la cible, en un parcours des deux côtés.
+
+        Returns:
+            tuple: Clés primaires absentes de la cible, modifiées, en trop sur la cible
+        """
+        missing, changed, extra = [], [], []
+        source_rows = self.rows(model, self.source)
+        target_rows = self.rows(model, self.target)
+        source = next(source_rows, None)
+        target = next(target_rows, None)
+        while source is not None or target is not None:
+            if target is None or (source is not None and source[0] < target[0]):
+                missing.append(source[0])
+                source = next(source_rows, None)
+            elif source is None or target[0] < source[0]:
+                extra.append(target[0])
+                target = next(target_rows, None)
+            else:
+                if source[1] != target[1]:
+                    changed.append(source[0])
+                source = next(source_rows, None)
+                target = next(target_rows, None)
+        return missing, changed, extra
+
+    def source_objects(self, model, pks):
+        for start in range(0, len(pks), self.batch_size):
+            yield list(self.queryset(model, self.source).filter(pk__in=pks[start:start + self.batch_size]))
+
+    def synchronize(self):
+        """Reporte sur la cible les écarts avec la source ; renvoie le nombre de lignes reportées"""
+        extras = {}
+        count = 0
+        for model in MODELS:
+            missing, changed, extra = self.compare(model)
+            for objects in self.source_objects(model, missing):
+                self.insert(model, objects)
+            fields = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+            for objects in self.source_objects(model, changed):
+                model._base_manager.using(self.target).bulk_update(objects, fields)
+            extras[model] = extra
+            count += len(missing) + len(changed) + len(extra)
+        # Suppressions des dépendances d'abord
+        for model in reversed(MODELS):
+            for start in range(0, len(extras[model]), self.batch_size):
+                self.queryset(model, self.target).filter(pk__in=extras[model][start:start + self.batch_size]).delete()
+        return count
+
+    def verify(self):
+        """Vérifie que chaque table est identique sur les deux shards"""
+        for model in MODELS:
+            missing, changed, extra = self.compare(model)
+            if missing or changed or extra:
+                raise TenantMoveError(
+                    f"{model._meta.model_name} : {len(missing)} lignes absentes de '{self.target}', "
+                    f"{len(changed)} différentes, {len(extra)} en trop"
+                )
+
+    def delete_tenant(self, alias):
+        """Supprime les lignes du tenant d'un shard, dépendances d'abord"""
+        with transaction.atomic(using=alias):
+            for model in reversed(MODELS):
+                if model is Account:
+                    # Détacher la hiérarchie évite un SET NULL ligne par ligne
+                    self.queryset(Account, alias).update(parent=None)
+                self.queryset(model, alias).delete()
+
+    def move(self):
+        """
+        Déplace le tenant (voir le déroulement en tête du module).
+
+        Returns:
+            dict: Lignes copiées par modèle, lignes rattrapées après le gel, durée
+        """
+        started = time.perf_counter()
+        occupied = [model._meta.model_name for model in MODELS if self.queryset(model, self.target).exists()]
+        if occupied:
+            if not self.replace:
+                raise TenantMoveError(
+                    f"Le shard '{self.target}' contient déjà des données du tenant ({', '.join(occupied)}) : "
+                    f"utiliser replace pour les supprimer"
+                )
+            self.delete_tenant(self.target)
+
+        counts = {}
+        try:
+            with transaction.atomic(using=self.target):
+                for model in MODELS:
+                    counts[model._meta.model_name] = self.copy(model)
+            self.log(f"Copie de '{self.source}' vers '{self.target}' : {sum(counts.values())} lignes")
+
+            self.directory.assign(self.tenant_id, self.source, TenantShardStatus.MOVING)
+            self.log(f"Écritures suspendues, attente de {self.wait}s")
+            self.sleep(self.wait)
+            with transaction.atomic(using=self.target):
+                resynced = self.synchronize()
+                self.verify()
+            self.log(f"Rattrapage : {resynced} lignes, vérification terminée")
+        except BaseException:
+            self.delete_tenant(self.target)
+            self.directory.assign(self.tenant_id, self.source)
+            raise
+
+        self.directory.assign(self.tenant_id, self.target)
+        self.log(f"Tenant {self.tenant_id} servi par '{self.target}'")
+        if not self.keep_source:
+            self.sleep(self.wait)
+            self.delete_tenant(self.source)
+            self.log(f"Données supprimées de '{self.source}'")
+
+        return {
+            'counts': counts,
+            'resynced': resynced,
+            'source': self.source,
+            'target': self.target,
+            'elapsed': time.perf_counter() - started,
+        }
+
+
+def move_tenant(tenant_id, target, batch_size=DEFAULT_BATCH_SIZE, wait=None, replace=False, keep_source=False,
+                log=None):
+    """Déplace un tenant vers un autre shard (voir TenantMover)"""
+    return TenantMover(
+        tenant_id, target, batch_size=batch_size, wait=wait, replace=replace, keep_source=keep_source, log=log
+    ).move()
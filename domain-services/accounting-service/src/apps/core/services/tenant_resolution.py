@@ -0,0 +1,199 @@
+# apps/core/services/tenant_resolution.py
+"""
+Résolution des tenants pour TenantMiddleware.
+
+Le statut et les paramètres d'un tenant sont fournis par un resolver :
+
+- 'table' : table Tenant du service (une requête par résolution) ;
+- 'static' : tenants décrits dans les settings, en remplacement local du
+  tenant-service (développement, tests, benchmarks) ; LATENCY simule le
+  temps d'un appel réseau.
+
+Les résolutions passent par TenantCache, un cache en mémoire du processus :
+
+- chaque tenant est conservé TTL secondes (NEGATIVE_TTL pour un tenant
+  inconnu), au plus MAX_SIZE tenants, le moins récemment utilisé évincé en
+  premier ; une fois le cache chaud, une requête HTTP ne coûte aucune
+  requête SQL ;
+- un seul thread rafraîchit un tenant expiré (single-flight) : pendant ce
+  temps, les autres reçoivent la valeur expirée s'il y en a une, sinon
+  attendent le résultat ; si le resolver échoue, la valeur expirée reste
+  servie.
+
+    TENANT_RESOLUTION = {'RESOLVER': 'table', 'TTL': 60, 'NEGATIVE_TTL': 5, 'MAX_SIZE': 10000}
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from ..models.tenant import Tenant, TenantStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60
+DEFAULT_NEGATIVE_TTL = 5
+DEFAULT_MAX_SIZE = 10000
+
+
+class TenantInfo(namedtuple('TenantInfo', ['id', 'name', 'status', 'settings'])):
+    """Tenant résolu : identifiant, nom, statut (TenantStatus) et paramètres"""
+    __slots__ = ()
+
+    @property
+    def is_active(self):
+        return self.status == TenantStatus.ACTIVE
+
+
+class TableTenantResolver:
+    """Tenants de la table Tenant"""
+
+    def resolve(self, tenant_id):
+        row = Tenant.objects.filter(pk=tenant_id).values('id', 'name', 'status', 'settings').first()
+        return TenantInfo(**row) if row else None
+
+
+class StaticTenantResolver:
+    """
+    Remplaçant local du tenant-service : tenants décrits par un dictionnaire
+    {identifiant: {'name', 'status', 'settings'}}.
+    """
+
+    def __init__(self, tenants=None, latency=0):
+        self.latency = latency
+        self.tenants = {}
+        for tenant_id, tenant in (tenants or {}).items():
+            tenant_id = uuid.UUID(str(tenant_id))
+            self.tenants[tenant_id] = TenantInfo(
+                tenant_id, tenant.get('name', str(tenant_id)), tenant.get('status', TenantStatus.ACTIVE),
+                tenant.get('settings') or {}
+            )
+
+    def resolve(self, tenant_id):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.tenants.get(tenant_id)
+
+
+class TenantCache:
+    """Cache LRU à durée de vie des tenants résolus, avec rafraîchissement single-flight"""
+
+    def __init__(self, resolver, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL, max_size=DEFAULT_MAX_SIZE,
+                 clock=time.monotonic):
+        self.resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.clock = clock
+        # identifiant -> (date d'expiration, TenantInfo ou None)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.refreshing = {}
+        self.hits = self.misses = self.stale = self.evictions = 0
+
+    def get(self, tenant_id):
+        """
+        Tenant d'identifiant donné, None s'il est inconnu.
+
+        Raises:
+            Exception: Erreur du resolver, si aucune valeur expirée ne peut être servie
+        """
+        with self.lock:
+            entry = self.entries.get(tenant_id)
+            if entry is not None:
+                self.entries.move_to_end(tenant_id)
+                if entry[0] > self.clock():
+                    self.hits += 1
+                    return entry[1]
+            refresh = self.refreshing.get(tenant_id)
+            if refresh is None:
+                refresh = self.refreshing[tenant_id] = threading.Lock()
+
+        # Un seul rafraîchissement par tenant ; les autres threads servent la
+        # valeur expirée, ou attendent s'il n'y en a pas
+        if not refresh.acquire(blocking=entry is None):
+            self.stale += 1
+            return entry[1]
+        try:
+            with self.lock:
+                current = self.entries.get(tenant_id)
+            if current is not None and current is not entry and current[0] > self.clock():
+                self.hits += 1
+                return current[1]
+            self.misses += 1
+            try:
+                info = self.resolver.resolve(tenant_id)
+            except Exception:
+                if entry is None:
+                    raise
+                logger.exception("Résolution du tenant %s impossible, valeur expirée conservée", tenant_id)
+                self.stale += 1
+                return entry[1]
+            self.store(tenant_id, info)
+            return info
+        finally:
+            with self.lock:
+                self.refreshing.pop(tenant_id, None)
+            refresh.release()
+
+    def store(self, tenant_id, info):
+        ttl = self.ttl if info is not None else self.negative_ttl
+        with self.lock:
+            self.entries[tenant_id] = (self.clock() + ttl, info)
+            self.entries.move_to_end(tenant_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tenant_id=None):
+        """Oublie un tenant (tous si tenant_id est None)"""
+        with self.lock:
+            if tenant_id is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(tenant_id, None)
+
+    def stats(self):
+        """Compteurs du cache (stale : valeurs expirées servies pendant un rafraîchissement)"""
+        return {
+            'hits': self.hits, 'misses': self.misses, 'stale': self.stale, 'evictions': self.evictions,
+            'size': len(self.entries), 'max_size': self.max_size,
+        }
+
+
+def build_resolver(options):
+    """Resolver décrit par le setting TENANT_RESOLUTION"""
+    resolver = options.get('RESOLVER', 'table')
+    if resolver == 'table':
+        return TableTenantResolver()
+    if resolver == 'static':
+        return StaticTenantResolver(options.get('TENANTS'), options.get('LATENCY', 0))
+    raise ValueError(f"TENANT_RESOLUTION['RESOLVER'] doit être 'table' ou 'static', pas {resolver!r}")
+
+
+_tenant_cache = None
+
+
+def get_tenant_cache():
+    """Cache des tenants du processus, construit au premier appel"""
+    global _tenant_cache
+    if _tenant_cache is None:
+        options = getattr(settings, 'TENANT_RESOLUTION', None) or {}
+        _tenant_cache = TenantCache(
+            build_resolver(options), options.get('TTL', DEFAULT_TTL),
+            options.get('NEGATIVE_TTL', DEFAULT_NEGATIVE_TTL), options.get('MAX_SIZE', DEFAULT_MAX_SIZE)
+        )
+    return _tenant_cache
+
+
+@receiver(setting_changed)
+def reset_tenant_cache(setting=None, **kwargs):
+    """Reconstruit le cache quand TENANT_RESOLUTION change (tests)"""
+    global _tenant_cache
+    if setting in (None, 'TENANT_RESOLUTION'):
+        _tenant_cache = None
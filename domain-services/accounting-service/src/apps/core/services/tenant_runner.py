@@ -0,0 +1,247 @@
+# apps/core/services/tenant_runner.py
+"""
+Exécution d'une opération de plan comptable (import, synchronisation,
+reclassification) sur une liste de tenants, répartie sur un pool de processus.
+
+Chaque tenant est traité dans sa propre transaction, sur son shard, par un
+processus qui ouvre ses propres connexions à la base. Le processus principal collecte les
+résultats au fil de l'eau et les ajoute à un fichier de reprise (une ligne
+JSON par tenant) : une exécution relancée avec le même fichier ignore les
+tenants déjà traités avec succès (les simulations --dry-run ne comptent que
+pour une simulation).
+"""
+import io
+import json
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+
+from ..tenant_context import tenant_context
+
+ACTIONS = ('import', 'sync', 'reclassify')
+
+# Commandes d'import utilisables pour les actions import et sync
+IMPORT_COMMANDS = ('import_ohada_avec_classification', 'import_ohada_8chiffres')
+
+DEFAULT_CHART_FILE = 'plan_comptable_ohada_8chiffres.json'
+
+# Index du plan par fichier, construit une fois par processus
+_indexes = {}
+
+
+def init_worker():
+    """Initialise un processus du pool : Django prêt et aucune connexion héritée"""
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def _chart_index(path):
+    from .chart_snapshot import load_chart_index
+
+    if path not in _indexes:
+        _indexes[path] = load_chart_index(path)
+    return _indexes[path]
+
+
+def _command(name):
+    """Instancie une commande de gestion dont la sortie est ignorée"""
+    module = import_module(f'apps.core.management.commands.{name}')
+    return module.Command(stdout=io.StringIO(), stderr=io.StringIO())
+
+
+def _run_import(tenant_id, task):
+    command = _command(task['command'])
+    return command.import_accounts(_chart_index(task['file']), tenant_id, task['batch_size'])
+
+
+def _run_sync(tenant_id, task):
+    command = _command(task['command'])
+    return command.sync_accounts(_chart_index(task['file']), tenant_id, task['batch_size'], task['dry_run'])
+
+
+def _run_reclassify(tenant_id, task):
+    from ..models.account import Account
+    from .tenant_sharding import shard_for_tenant
+
+    command = _command('reclassify_accounts')
+    stats = command.reclassify_accounts(
+        Account.objects.using(shard_for_tenant(tenant_id)).filter(tenant_id=tenant_id), task['batch_size'], task.get('with_type', False), task['dry_run']
+    )
+    stats['rows'] = stats['scanned']
+    return stats
+
+
+_HANDLERS = {
+    'import': _run_import,
+    'sync': _run_sync,
+    'reclassify': _run_reclassify,
+}
+
+
+def run_tenant(task):
+    """
+    Traite un tenant dans sa propre transaction, sur son shard (tenant courant
+    défini pour le routage des requêtes).
+
+    Args:
+        task (dict): action, tenant_id et options (command, file, batch_size, dry_run...)
+
+    Returns:
+        dict: tenant_id, status ('ok' ou 'error'), rows, elapsed et error le cas échéant
+    """
+    from .tenant_sharding import shard_for_tenant
+
+    started = time.perf_counter()
+    result = {'tenant_id': task['tenant_id'], 'action': task['action'], 'dry_run': bool(task.get('dry_run'))}
+    tenant_id = uuid.UUID(task['tenant_id'])
+    try:
+        with tenant_context(tenant_id), transaction.atomic(using=shard_for_tenant(tenant_id)):
+            stats = _HANDLERS[task['action']](tenant_id, task)
+    except Exception as e:
+        result.update(status='error', rows=0, error=f"{type(e).__name__}: {e}")
+    else:
+        result.update(status='ok', rows=stats.get('rows', 0), details={
+            key: value for key, value in stats.items()
+            if isinstance(value, (int, float, str, bool)) and key not in ('rows', 'elapsed')
+        })
+    result['elapsed'] = time.perf_counter() - started
+    return result
+
+
+def default_chart_file():
+    return os.path.join(settings.BASE_DIR, 'data', DEFAULT_CHART_FILE)
+
+
+def read_checkpoint(path, action=None, dry_run=False):
+    """
+    Tenants déjà traités avec succès d'après un fichier de reprise (pour une
+    action donnée). Une simulation ne compte que pour une simulation : une
+    exécution réelle ne saute pas les tenants seulement simulés.
+    """
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # ligne tronquée par une interruption
+            if record.get('status') == 'ok' and action in (None, record.get('action')) \
+                    and bool(record.get('dry_run')) == dry_run:
+                done.add(record['tenant_id'])
+    return done
+
+
+def supports_parallel_writes(aliases=None):
+    """
+    SQLite n'accepte qu'un écrivain à la fois (et une base en mémoire n'est
+    pas partagée) : vrai si aucune des bases écrites n'est SQLite.
+
+    Args:
+        aliases (iterable, optional): Bases écrites (défaut: toutes les bases des shards)
+    """
+    from .tenant_sharding import get_shard_directory
+
+    aliases = aliases or get_shard_directory().shards
+    return all(connections[alias].vendor != 'sqlite' for alias in aliases)
+
+
+class TenantRunner:
+    """
+    Répartit des tâches par tenant sur un pool de processus.
+
+    Args:
+        tasks (list): Tâches (voir run_tenant), une par tenant
+        workers (int): Nombre de processus ; 1 (ou une base SQLite) exécute les tâches
+            dans le processus courant
+        checkpoint (str, optional): Fichier de reprise (JSON lines)
+        on_result (callable, optional): Appelé pour chaque résultat dès sa réception
+    """
+
+    def __init__(self, tasks, workers=1, checkpoint=None, on_result=None):
+        self.tasks = tasks
+        self.workers = max(1, workers)
+        self.checkpoint = checkpoint
+        self.on_result = on_result or (lambda result: None)
+
+    def pending_tasks(self):
+        done = {}
+        for task in self.tasks:
+            key = (task['action'], bool(task.get('dry_run')))
+            if key not in done:
+                done[key] = read_checkpoint(self.checkpoint, *key)
+        return [
+            task for task in self.tasks
+            if task['tenant_id'] not in done[(task['action'], bool(task.get('dry_run')))]
+        ]
+
+    def aliases(self, tasks):
+        """Bases (shards) écrites par les tâches"""
+        from .tenant_sharding import shard_for_tenant
+
+        return {shard_for_tenant(uuid.UUID(task['tenant_id'])) for task in tasks}
+
+    def results(self, tasks):
+        if self.workers == 1 or not supports_parallel_writes(self.aliases(tasks)):
+            for task in tasks:
+                yield run_tenant(task)
+            return
+
+        # Les connexions du processus principal ne doivent pas être héritées
+        connections.close_all()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=init_worker) as pool:
+            futures = [pool.submit(run_tenant, task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self):
+        """
+        Exécute les tâches restantes.
+
+        Returns:
+            dict: Résumé (ok, failed, skipped, rows, elapsed, débits) et liste des échecs
+        """
+        started = time.perf_counter()
+        tasks = self.pending_tasks()
+        summary = {'ok': 0, 'failed': 0, 'skipped': len(self.tasks) - len(tasks), 'rows': 0, 'failures': []}
+
+        checkpoint = open(self.checkpoint, 'a', encoding='utf-8') if self.checkpoint else None
+        try:
+            for result in self.results(tasks):
+                if result['status'] == 'ok':
+                    summary['ok'] += 1
+                    summary['rows'] += result['rows']
+                else:
+                    summary['failed'] += 1
+                    summary['failures'].append(result)
+                if checkpoint:
+                    checkpoint.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    checkpoint.flush()
+                self.on_result(result)
+        finally:
+            if checkpoint:
+                checkpoint.close()
+
+        elapsed = time.perf_counter() - started
+        processed = summary['ok'] + summary['failed']
+        summary.update(
+            elapsed=elapsed,
+            tenants_per_second=processed / elapsed if elapsed else 0,
+            rows_per_second=summary['rows'] / elapsed if elapsed else 0,
+        )
+        return summary
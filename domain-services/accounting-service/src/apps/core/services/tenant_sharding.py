@@ -0,0 +1,174 @@
+# apps/core/services/tenant_sharding.py
+"""
+Répartition des tenants entre plusieurs bases de données (shards).
+
+Toutes les données d'un tenant (plan comptable, tiers, exercices, journaux,
+écritures, soldes) sont dans une seule base : son shard. L'annuaire (table
+TenantShard, toujours dans la base 'default') associe un tenant à l'alias
+de son shard ; un tenant absent de l'annuaire est sur DEFAULT_SHARD.
+
+    TENANT_SHARDING = {'SHARDS': ['default', 'shard_1'], 'DEFAULT_SHARD': 'default', 'DIRECTORY_TTL': 10}
+
+TenantShardRouter (apps.core.db_routers) envoie les requêtes des modèles
+multi-tenants au shard de leur tenant. Les entrées de l'annuaire sont
+gardées en mémoire DIRECTORY_TTL secondes par ShardDirectory : une fois le
+cache chaud, le routage ne coûte aucune requête. Avec un seul shard,
+l'annuaire n'est jamais lu.
+
+Un tenant change de shard avec la commande move_tenant (voir
+services.tenant_move).
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS
+from django.dispatch import receiver
+
+from ..models.tenant import TenantShard, TenantShardStatus
+
+# Base de l'annuaire des shards
+DIRECTORY_ALIAS = DEFAULT_DB_ALIAS
+
+DEFAULT_DIRECTORY_TTL = 10
+DIRECTORY_MAX_SIZE = 10000
+
+# Modèles de l'application dont les lignes appartiennent à un tenant sans être des données du tenant
+_UNSHARDED_MODELS = {'core.tenantshard', 'core.job'}
+_tenant_models = {}
+
+
+class TenantShardingError(Exception):
+    """Shard inconnu ou annuaire incohérent avec DATABASES"""
+
+
+class ShardInfo(namedtuple('ShardInfo', ['alias', 'status'])):
+    """Shard d'un tenant : alias de la base et statut (TenantShardStatus)"""
+    __slots__ = ()
+
+    @property
+    def accepts_writes(self):
+        return self.status == TenantShardStatus.ACTIVE
+
+
+def is_tenant_model(model):
+    """Vrai pour les modèles de core dont chaque ligne appartient à un tenant (champ tenant_id)"""
+    label = model._meta.label_lower
+    result = _tenant_models.get(label)
+    if result is None:
+        result = _tenant_models[label] = (
+            model._meta.app_label == 'core' and label not in _UNSHARDED_MODELS
+            and any(field.attname == 'tenant_id' for field in model._meta.concrete_fields)
+        )
+    return result
+
+
+class ShardDirectory:
+    """
+    Annuaire des shards, avec un cache en mémoire du processus.
+
+    Args:
+        shards (list): Alias des bases qui portent des données de tenants
+        default_shard (str): Shard des tenants absents de l'annuaire
+        ttl (float): Durée de vie d'une entrée en cache, en secondes
+        clock (callable): Horloge (tests)
+    """
+
+    def __init__(self, shards, default_shard=DEFAULT_DB_ALIAS, ttl=DEFAULT_DIRECTORY_TTL, clock=time.monotonic):
+        self.shards = tuple(shards)
+        if default_shard not in self.shards:
+            raise TenantShardingError(f"Le shard par défaut '{default_shard}' n'est pas dans SHARDS")
+        unknown = set(self.shards) - set(settings.DATABASES)
+        if unknown:
+            raise TenantShardingError(f"Shards absents de DATABASES : {', '.join(sorted(unknown))}")
+        self.default = ShardInfo(default_shard, TenantShardStatus.ACTIVE)
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def is_sharded(self):
+        return len(self.shards) > 1
+
+    def get(self, tenant_id):
+        """Shard du tenant (ShardInfo), lu dans l'annuaire au plus une fois par durée de vie"""
+        if not self.is_sharded:
+            return self.default
+        if not isinstance(tenant_id, uuid.UUID):
+            tenant_id = uuid.UUID(str(tenant_id))
+
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.get(tenant_id)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(tenant_id)
+                return entry[1]
+
+        row = TenantShard.objects.using(DIRECTORY_ALIAS).filter(tenant_id=tenant_id).values_list(
+            'alias', 'status'
+        ).first()
+        info = ShardInfo(*row) if row else self.default
+        if info.alias not in self.shards:
+            raise TenantShardingError(f"Tenant {tenant_id} : shard '{info.alias}' absent de SHARDS")
+
+        with self.lock:
+            self.entries[tenant_id] = (now + self.ttl, info)
+            self.entries.move_to_end(tenant_id)
+            while len(self.entries) > DIRECTORY_MAX_SIZE:
+                self.entries.popitem(last=False)
+        return info
+
+    def alias_for(self, tenant_id):
+        """Alias de la base du tenant"""
+        return self.get(tenant_id).alias
+
+    def assign(self, tenant_id, alias, status=TenantShardStatus.ACTIVE):
+        """Enregistre le shard et le statut d'un tenant dans l'annuaire"""
+        if alias not in self.shards:
+            raise TenantShardingError(f"Shard '{alias}' absent de SHARDS ({', '.join(self.shards)})")
+        directory = TenantShard.objects.using(DIRECTORY_ALIAS)
+        if alias == self.default.alias and status == TenantShardStatus.ACTIVE:
+            directory.filter(tenant_id=tenant_id).delete()
+        else:
+            directory.update_or_create(tenant_id=tenant_id, defaults={'alias': alias, 'status': status})
+        self.invalidate(tenant_id)
+
+    def invalidate(self, tenant_id=None):
+        """Oublie un tenant, ou tout l'annuaire"""
+        with self.lock:
+            if tenant_id is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(uuid.UUID(str(tenant_id)), None)
+
+
+_shard_directory = None
+
+
+def get_shard_directory():
+    """Annuaire des shards du processus, construit au premier appel"""
+    global _shard_directory
+    if _shard_directory is None:
+        options = getattr(settings, 'TENANT_SHARDING', None) or {}
+        _shard_directory = ShardDirectory(
+            options.get('SHARDS', [DEFAULT_DB_ALIAS]), options.get('DEFAULT_SHARD', DEFAULT_DB_ALIAS),
+            options.get('DIRECTORY_TTL', DEFAULT_DIRECTORY_TTL)
+        )
+    return _shard_directory
+
+
+def shard_for_tenant(tenant_id):
+    """Alias de la base qui porte les données du tenant"""
+    return get_shard_directory().alias_for(tenant_id)
+
+
+@receiver(setting_changed)
+def reset_shard_directory(setting=None, **kwargs):
+    """Reconstruit l'annuaire quand TENANT_SHARDING ou DATABASES change (tests)"""
+    global _shard_directory
+    if setting in (None, 'TENANT_SHARDING', 'DATABASES'):
+        _shard_directory = None
@@ -0,0 +1,184 @@
+# apps/core/services/trial_balance.py
+"""
+Balance générale d'un tenant.
+
+Les totaux de tous les comptes sont lus en une requête groupée sur les
+soldes par période (AccountPeriodBalance) : sommes conditionnelles des
+périodes antérieures à la plage (à-nouveaux) et des périodes de la plage
+(mouvements). Les bornes étant toujours celles de périodes fiscales, aucune
+ligne d'écriture n'est parcourue.
+
+Les montants sont ensuite cumulés en mémoire le long de la hiérarchie, des
+comptes les plus profonds vers les racines : un compte de regroupement
+présente la somme de son sous-arbre. Les lignes de la balance sont
+produites à la demande (TrialBalance.rows), ce qui permet de les écrire
+en flux sans construire la réponse complète.
+
+Les à-nouveaux cumulent tous les mouvements antérieurs à la plage : les
+comptes de gestion (classes 6 à 8) reprennent à zéro une fois les écritures
+de clôture et de réouverture passées.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Q, Sum
+
+from ..models.account import Account
+from ..models.transaction import AccountPeriodBalance
+
+ZERO = Decimal('0.00')
+
+CENT = Decimal('0.01')
+
+# Colonnes d'une ligne de la balance
+ROW_FIELDS = [
+    'code', 'name', 'level', 'account_class',
+    'opening_debit', 'opening_credit', 'debit', 'credit', 'closing_debit', 'closing_credit',
+]
+
+# Indices des montants cumulés : à-nouveaux (débit, crédit) et mouvements (débit, crédit)
+OPENING_DEBIT, OPENING_CREDIT, DEBIT, CREDIT = range(4)
+
+
+def period_totals(tenant_id, start_date, end_date):
+    """
+    Montants de chaque compte mouvementé, en une requête.
+
+    Args:
+        start_date (date): Début de la première période de la plage
+        end_date (date): Fin de la dernière période de la plage
+
+    Returns:
+        dict: id du compte -> [à-nouveaux débit, à-nouveaux crédit, débit, crédit]
+    """
+    before = Q(period_start__lt=start_date)
+    within = Q(period_start__gte=start_date)
+    rows = AccountPeriodBalance.objects.filter(
+        tenant_id=tenant_id, period_end__lte=end_date
+    ).order_by().values('account_id').annotate(
+        opening_debit=Sum('debit', filter=before),
+        opening_credit=Sum('credit', filter=before),
+        debit_sum=Sum('debit', filter=within),
+        credit_sum=Sum('credit', filter=within),
+    )
+    return {
+        row['account_id']: [
+            row['opening_debit'] or ZERO, row['opening_credit'] or ZERO,
+            row['debit_sum'] or ZERO, row['credit_sum'] or ZERO,
+        ] for row in rows
+    }
+
+
+def roll_up(accounts, totals):
+    """
+    Cumule les montants des comptes sur leurs ancêtres, en temps linéaire.
+
+    Args:
+        accounts (list): Tuples (id, parent_id, depth, ...) ; un compte dont le parent
+            est absent de la liste est une racine
+        totals (dict): id -> montants propres du compte (voir period_totals)
+
+    Returns:
+        dict: id -> montants du sous-arbre du compte (comptes sans montant exclus)
+    """
+    by_depth = defaultdict(list)
+    for account in accounts:
+        by_depth[account[2]].append(account)
+
+    rolled = {account[0]: list(totals[account[0]]) for account in accounts if account[0] in totals}
+    ids = {account[0] for account in accounts}
+    for depth in sorted(by_depth, reverse=True):
+        for account_id, parent_id, *_ in by_depth[depth]:
+            amounts = rolled.get(account_id)
+            if amounts is None or parent_id not in ids:
+                continue
+            parent = rolled.setdefault(parent_id, [ZERO, ZERO, ZERO, ZERO])
+            for index in range(4):
+                parent[index] += amounts[index]
+    return rolled
+
+
+def split(amount):
+    """Solde net -> (côté débit, côté crédit)"""
+    return (amount, ZERO) if amount >= 0 else (ZERO, -amount)
+
+
+def make_row(code, name, level, account_class, amounts):
+    # Les sommes lues en base n'ont pas toujours deux décimales (SQLite)
+    amounts = [amount.quantize(CENT) for amount in amounts]
+    opening_debit, opening_credit = split(amounts[OPENING_DEBIT] - amounts[OPENING_CREDIT])
+    closing_debit, closing_credit = split(
+        amounts[OPENING_DEBIT] + amounts[DEBIT] - amounts[OPENING_CREDIT] - amounts[CREDIT]
+    )
+    return {
+        'code': code,
+        'name': name,
+        'level': level,
+        'account_class': account_class,
+        'opening_debit': opening_debit,
+        'opening_credit': opening_credit,
+        'debit': amounts[DEBIT],
+        'credit': amounts[CREDIT],
+        'closing_debit': closing_debit,
+        'closing_credit': closing_credit,
+    }
+
+
+class TrialBalance:
+    """
+    Balance générale d'un tenant sur une plage de périodes fiscales.
+
+    Args:
+        tenant_id (UUID): Tenant
+        start_date (date): Début de la première période
+        end_date (date): Fin de la dernière période
+        max_level (int, optional): Niveau le plus profond affiché (1 = comptes racines) ;
+            les sous-comptes masqués restent cumulés sur leurs ancêtres
+        account_class (int, optional): Numéro de la classe de comptes affichée
+        include_empty (bool): Afficher aussi les comptes sans montant
+    """
+
+    def __init__(self, tenant_id, start_date, end_date, max_level=None, account_class=None,
+                 include_empty=False):
+        self.tenant_id = tenant_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.max_level = max_level
+        self.account_class = account_class
+        self.include_empty = include_empty
+        self.accounts = []
+        self.amounts = {}
+
+    def load(self):
+        """Lit les comptes puis les montants (une requête chacun) et les cumule"""
+        accounts = Account.objects.filter(tenant_id=self.tenant_id)
+        if self.account_class is not None:
+            accounts = accounts.filter(account_class__number=self.account_class)
+        self.accounts = list(accounts.order_by('code').values_list(
+            'id', 'parent_id', 'depth', 'code', 'name', 'account_class__number'
+        ))
+        self.amounts = roll_up(self.accounts, period_totals(self.tenant_id, self.start_date, self.end_date))
+        return self
+
+    def rows(self):
+        """Lignes de la balance, triées par code (générateur)"""
+        empty = [ZERO, ZERO, ZERO, ZERO]
+        for account_id, _, depth, code, name, account_class in self.accounts:
+            if self.max_level is not None and depth >= self.max_level:
+                continue
+            amounts = self.amounts.get(account_id)
+            if amounts is None:
+                if not self.include_empty:
+                    continue
+                amounts = empty
+            yield make_row(code, name, depth + 1, account_class, amounts)
+
+    def totals(self):
+        """Ligne de total : somme des comptes racines du périmètre"""
+        ids = {account[0] for account in self.accounts}
+        total = [ZERO, ZERO, ZERO, ZERO]
+        for account_id, parent_id, *_ in self.accounts:
+            if parent_id not in ids:
+                for index, amount in enumerate(self.amounts.get(account_id, ())):
+                    total[index] += amount
+        return make_row(None, "Total", None, self.account_class, total)
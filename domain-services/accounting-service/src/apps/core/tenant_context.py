@@ -0,0 +1,64 @@
+# apps/core/tenant_context.py
+"""
+Tenant courant de la requête (ou de la tâche) en cours.
+
+TenantMiddleware le définit pour la durée de chaque requête ; les commandes
+et tâches qui travaillent pour un tenant l'ouvrent avec tenant_context().
+Les managers tenant_objects des modèles (voir models.tenant.TenantManager)
+s'en servent pour filtrer leurs requêtes.
+
+La valeur est portée par une ContextVar : elle est propre à chaque thread
+et à chaque tâche asyncio.
+"""
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_tenant_id = ContextVar('current_tenant_id', default=None)
+
+
+class TenantNotSetError(RuntimeError):
+    """Requête sur un modèle multi-tenant sans tenant courant"""
+
+
+def get_current_tenant_id():
+    """Tenant courant (UUID), None hors de toute requête ou tâche de tenant"""
+    return _current_tenant_id.get()
+
+
+def set_current_tenant_id(tenant_id):
+    """Définit le tenant courant ; renvoie le jeton à passer à reset_current_tenant_id()"""
+    if tenant_id is not None and not isinstance(tenant_id, uuid.UUID):
+        tenant_id = uuid.UUID(str(tenant_id))
+    return _current_tenant_id.set(tenant_id)
+
+
+def reset_current_tenant_id(token):
+    """Rétablit le tenant courant précédent"""
+    _current_tenant_id.reset(token)
+
+
+@contextmanager
+def tenant_context(tenant_id):
+    """Bloc exécuté pour un tenant donné"""
+    token = set_current_tenant_id(tenant_id)
+    try:
+        yield
+    finally:
+        reset_current_tenant_id(token)
+
+
+def require_current_tenant_id():
+    """
+    Tenant courant.
+
+    Raises:
+        TenantNotSetError: Si aucun tenant n'est défini
+    """
+    tenant_id = _current_tenant_id.get()
+    if tenant_id is None:
+        raise TenantNotSetError(
+            "Aucun tenant courant : la requête doit passer par TenantMiddleware, "
+            "ou le code s'exécuter dans tenant_context()"
+        )
+    return tenant_id
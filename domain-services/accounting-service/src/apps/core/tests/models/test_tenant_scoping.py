@@ -0,0 +1,100 @@
+from django.db import connection
+from django.test import TestCase
+from datetime import date
+import unittest
+import uuid
+
+from apps.core.models.account import AccountClass, Account, AccountType
+from apps.core.models.fiscal_year import FiscalYear, FiscalPeriod
+from apps.core.models.tiers import Tiers
+from apps.core.tenant_context import TenantNotSetError, get_current_tenant_id, tenant_context
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+
+class TenantScopingTestCase(TestCase):
+    """Tests pour les managers limités au tenant courant"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.other_tenant_id = uuid.uuid4()
+        for tenant_id in (TENANT_ID, cls.other_tenant_id):
+            account_class = AccountClass.objects.create(tenant_id=tenant_id, number=4, name="Tiers")
+            parent = Account.objects.create(
+                tenant_id=tenant_id, code="40", name="Fournisseurs", account_class=account_class,
+                type=AccountType.LIABILITY
+            )
+            Account.objects.create(
+                tenant_id=tenant_id, code="401", name="Fournisseurs, dettes", account_class=account_class,
+                parent=parent, type=AccountType.LIABILITY
+            )
+
+    def test_manager_requires_a_tenant(self):
+        """Tester qu'une requête sans tenant courant échoue"""
+        self.assertIsNone(get_current_tenant_id())
+        with self.assertRaises(TenantNotSetError):
+            Account.tenant_objects.all()
+        with self.assertRaises(TenantNotSetError):
+            Tiers.tenant_objects.filter(type='CUSTOMER')
+
+    def test_manager_is_scoped_to_the_current_tenant(self):
+        """Tester le filtrage par le tenant courant, méthodes du queryset comprises"""
+        with tenant_context(self.other_tenant_id):
+            self.assertEqual(Account.tenant_objects.count(), 2)
+            self.assertEqual({account.tenant_id for account in Account.tenant_objects.all()}, {self.other_tenant_id})
+            parent = Account.tenant_objects.get(code="40")
+            self.assertEqual([account.code for account in Account.tenant_objects.descendants(parent)], ["401"])
+        self.assertIsNone(get_current_tenant_id())
+        self.assertEqual(Account.objects.count(), 4)
+        self.assertEqual(Account.objects.for_tenant(TENANT_ID).count(), 2)
+
+    def test_requests_run_in_their_tenant_context(self):
+        """Tester que l'API ne lit que le tenant de la requête, puis rétablit le contexte"""
+        response = self.client.get('/api/accounting/accounts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row['tenant_id'] for row in response.json()['results']}, {str(TENANT_ID)})
+        self.assertIsNone(get_current_tenant_id())
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "EXPLAIN vérifié sur PostgreSQL")
+class TenantIndexTestCase(TestCase):
+    """Tests pour les index composites dont le tenant est la première colonne"""
+
+    @classmethod
+    def setUpTestData(cls):
+        account_class = AccountClass.objects.create(tenant_id=TENANT_ID, number=4, name="Tiers")
+        cls.account = Account.objects.create(
+            tenant_id=TENANT_ID, code="401", name="Fournisseurs", account_class=account_class,
+            type=AccountType.LIABILITY
+        )
+        FiscalYear.objects.create(
+            tenant_id=TENANT_ID, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        ).create_periods()
+
+    def assertUsesIndex(self, queryset, index_name):
+        # Tables presque vides : sans ce réglage, PostgreSQL préfère le parcours séquentiel
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        # Sans tri : le tri par code peut passer par l'index unique (tenant_id, code)
+        plan = queryset.order_by().explain()
+        self.assertIn(index_name, plan)
+
+    def test_index_use(self):
+        """Tester l'utilisation des index pour les filtres de l'API"""
+        today = date(2025, 6, 15)
+        with tenant_context(TENANT_ID):
+            self.assertUsesIndex(Account.tenant_objects.filter(parent__isnull=True), 'core_account_tenant_parent')
+            self.assertUsesIndex(
+                Account.tenant_objects.filter(type=AccountType.LIABILITY, is_active=True),
+                'core_account_tenant_type_act'
+            )
+            self.assertUsesIndex(Tiers.tenant_objects.filter(account=self.account), 'core_tiers_tenant_account')
+            self.assertUsesIndex(
+                FiscalYear.tenant_objects.filter(start_date__lte=today, end_date__gte=today), 'core_fy_tenant_dates'
+            )
+            self.assertUsesIndex(
+                FiscalPeriod.tenant_objects.filter(start_date__lte=today, end_date__gte=today),
+                'core_period_tenant_dates'
+            )
@@ -0,0 +1,163 @@
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Q
+from django.test import TestCase
+import io
+import uuid
+
+from apps.core.models.account import AccountClass, Account, AccountType
+from apps.core.services.account_hierarchy import HierarchyError, compute_hierarchy, rebuild_hierarchy
+from apps.core.services.tenant_clone import clone_tenant
+
+
+class AccountHierarchyTestCase(TestCase):
+    """Tests pour l'index hiérarchique matérialisé des comptes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant_id = uuid.uuid4()
+        Account.create_default_accounts_ohada(cls.tenant_id)
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.accounts = Account.objects.filter(tenant_id=self.tenant_id)
+        self.account_class = AccountClass.objects.get(tenant_id=self.tenant_id, number=4)
+
+    def assertIndexConsistent(self, tenant_id=None):
+        stats = rebuild_hierarchy(tenant_id or self.tenant_id, dry_run=True)
+        self.assertEqual(stats['updated'], 0)
+
+    def descendants_by_parent_links(self, account):
+        """Sous-arbre calculé en suivant les liens parent (référence)"""
+        children = {}
+        for pk, parent_id in self.accounts.values_list('id', 'parent_id'):
+            children.setdefault(parent_id, []).append(pk)
+        found, stack = set(), [account.pk]
+        while stack:
+            for child in children.get(stack.pop(), []):
+                found.add(child)
+                stack.append(child)
+        return found
+
+    def create(self, code, parent=None):
+        return Account.objects.create(
+            tenant_id=self.tenant_id, code=code, name=f"Compte {code}",
+            account_class=self.account_class, parent=parent, type=AccountType.LIABILITY
+        )
+
+    def test_provisioned_chart_is_indexed(self):
+        """Tester que le plan provisionné a un index correct et des requêtes en une passe"""
+        self.assertIndexConsistent()
+        account = self.accounts.get(code="41")
+
+        with self.assertNumQueries(1):
+            descendants = set(self.accounts.descendants(account).values_list('id', flat=True))
+        self.assertEqual(descendants, self.descendants_by_parent_links(account))
+        self.assertEqual(account.descendant_count, len(descendants))
+
+        leaf = self.accounts.filter(parent__isnull=False, descendant_count=0).order_by('-depth').first()
+        with self.assertNumQueries(1):
+            ancestors = list(leaf.get_ancestors())
+        self.assertEqual(len(ancestors), leaf.depth)
+        self.assertEqual(ancestors[-1].pk, leaf.parent_id)
+        self.assertIsNone(ancestors[0].parent_id)
+
+    def test_subtree_rollup(self):
+        """Tester l'agrégation par sous-arbre en une requête groupée"""
+        with self.assertNumQueries(1):
+            rollup = self.accounts.subtree_rollup(
+                accounts=Count('pk'), inactive=Count('pk', filter=Q(is_active=False))
+            )
+
+        roots = dict(self.accounts.filter(depth=0).values_list('id', 'descendant_count'))
+        self.assertEqual(set(rollup), set(roots))
+        for pk, count in roots.items():
+            self.assertEqual(rollup[pk], {'accounts': count + 1, 'inactive': 0})
+
+        account = self.accounts.get(code="41")
+        children = self.accounts.descendants(account).subtree_rollup(depth=account.depth + 1)
+        self.assertEqual(set(children), set(self.accounts.filter(parent=account).values_list('id', flat=True)))
+
+    def test_insert_move_delete(self):
+        """Tester la maintenance de l'index à l'ajout, au déplacement et à la suppression"""
+        root = self.create("4990")
+        child = self.create("49901", parent=root)
+        grandchild = self.create("499011", parent=child)
+        root.refresh_from_db()
+        self.assertEqual((root.depth, root.descendant_count), (0, 2))
+        self.assertEqual(grandchild.depth, 2)
+        self.assertIndexConsistent()
+
+        # Déplacement du sous-arbre sous un compte existant
+        target = self.accounts.get(code="41")
+        count = target.descendant_count
+        child.parent = target
+        child.save()
+        grandchild.refresh_from_db()
+        target.refresh_from_db()
+        self.assertTrue(grandchild.path.startswith(target.path))
+        self.assertEqual(grandchild.depth, target.depth + 2)
+        self.assertEqual(target.descendant_count, count + 2)
+        self.assertIndexConsistent()
+
+        # Suppression : les enfants deviennent des racines
+        child.delete()
+        grandchild.refresh_from_db()
+        target.refresh_from_db()
+        self.assertIsNone(grandchild.parent_id)
+        self.assertEqual(grandchild.depth, 0)
+        self.assertEqual(target.descendant_count, count)
+        self.assertIndexConsistent()
+
+    def test_save_without_parent_change(self):
+        """Tester qu'un enregistrement sans changement de parent ne réécrit ni le parent ni l'index"""
+        root = self.create("4990")
+        child = self.create("49901", parent=root)
+        stale = self.accounts.get(pk=child.pk)
+        target = self.accounts.get(code="41")
+        root.parent = target
+        root.save()
+
+        stale.name = "Compte renommé"
+        with self.assertNumQueries(3):  # UPDATE du compte, puis version du plan
+            stale.save()
+        child.refresh_from_db()
+        self.assertEqual(child.name, "Compte Renommé")
+        self.assertTrue(child.path.startswith(target.path))
+        self.assertIndexConsistent()
+
+    def test_save_deleted_account_inserts_it(self):
+        """Tester qu'un compte supprimé depuis sa lecture est réinséré, avec son index"""
+        account = self.create("4990")
+        self.accounts.filter(pk=account.pk).delete()
+        account.name = "Compte recréé"
+        account.save()
+        self.assertEqual(self.accounts.get(pk=account.pk).path, account.path)
+        self.assertIndexConsistent()
+
+    def test_move_under_descendant_is_rejected(self):
+        """Tester qu'un compte ne peut pas être rattaché à l'un de ses descendants"""
+        root = self.create("4990")
+        child = self.create("49901", parent=root)
+        root.parent = child
+        with self.assertRaises(ValidationError):
+            root.save()
+        with self.assertRaises(HierarchyError):
+            compute_hierarchy([(1, 2), (2, 1)])
+
+    def test_bulk_writers_keep_index(self):
+        """Tester l'index après un clonage et une restauration d'index corrompu"""
+        tenant_id = uuid.uuid4()
+        clone_tenant(self.tenant_id, tenant_id)
+        self.assertIndexConsistent(tenant_id)
+        clone = Account.objects.get(tenant_id=tenant_id, code="41")
+        self.assertEqual(Account.objects.descendants(clone).count(), clone.descendant_count)
+
+        self.accounts.update(path='', depth=0, descendant_count=0)
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_account_hierarchy', '--check', stdout=out)
+        call_command('rebuild_account_hierarchy', '--tenant-id', str(self.tenant_id), stdout=out)
+        self.assertIn("comptes corrigés", out.getvalue())
+        self.assertIndexConsistent()
@@ -0,0 +1,104 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+import uuid
+
+from apps.core.models.account import AccountClass, AccountCategory, Account, AccountType, ChartVersion
+from apps.core.models.tiers import Tiers
+from apps.core.services.chart_cache import get_chart, get_chart_cache
+
+
+class ChartCacheTestCase(TestCase):
+    """Tests pour le cache des plans comptables par tenant"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant_id = uuid.uuid4()
+        cls.other_tenant_id = uuid.uuid4()
+        for tenant_id in (cls.tenant_id, cls.other_tenant_id):
+            account_class = AccountClass.objects.create(tenant_id=tenant_id, number=4, name="Comptes de tiers")
+            category = AccountCategory.objects.create(
+                tenant_id=tenant_id, account_class=account_class, code="41", name="Clients"
+            )
+            Account.objects.create(
+                tenant_id=tenant_id, code="411", name="Clients", account_class=account_class,
+                category=category, type=AccountType.ASSET
+            )
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        get_chart_cache().clear()
+
+    def test_cached_chart_costs_one_query(self):
+        """Tester qu'un plan en cache est servi avec la seule lecture de sa version"""
+        with self.assertNumQueries(4):
+            chart = get_chart(self.tenant_id)
+        with self.assertNumQueries(1):
+            self.assertIs(get_chart(self.tenant_id), chart)
+
+        self.assertEqual(chart.account("411")['name'], "Clients")
+        self.assertIsNone(chart.account("401"))
+        self.assertEqual(chart.class_number(chart.account("411")['id']), 4)
+        stats = get_chart_cache().stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_ratio'], stats['size']), (1, 1, 0.5, 1))
+
+    def test_writes_invalidate_the_chart(self):
+        """Tester que les écritures et les chemins en masse rechargent le plan"""
+        account_class = AccountClass.objects.get(tenant_id=self.tenant_id)
+        get_chart(self.tenant_id)
+
+        Account.objects.create(
+            tenant_id=self.tenant_id, code="401", name="Fournisseurs", account_class=account_class,
+            type=AccountType.LIABILITY
+        )
+        self.assertEqual(get_chart(self.tenant_id).account("401")['name'], "Fournisseurs")
+
+        Account.objects.filter(tenant_id=self.tenant_id, code="401").update(name="Fournisseurs divers")
+        self.assertEqual(get_chart(self.tenant_id).account("401")['name'], "Fournisseurs")
+        ChartVersion.bump([self.tenant_id])
+        self.assertEqual(get_chart(self.tenant_id).account("401")['name'], "Fournisseurs divers")
+
+        Account.objects.get(tenant_id=self.tenant_id, code="401").delete()
+        self.assertIsNone(get_chart(self.tenant_id).account("401"))
+        self.assertEqual(get_chart_cache().stats()['misses'], 4)
+
+    @override_settings(CHART_CACHE={'BACKEND': 'local', 'MAX_TENANTS': 1})
+    def test_least_recently_used_chart_is_evicted(self):
+        """Tester la borne du nombre de plans en cache"""
+        get_chart(self.tenant_id)
+        get_chart(self.other_tenant_id)
+        with self.assertNumQueries(4):
+            get_chart(self.tenant_id)
+
+        stats = get_chart_cache().stats()
+        self.assertEqual((stats['size'], stats['max_size'], stats['evictions'], stats['misses']), (1, 1, 2, 3))
+
+    @override_settings(CHART_CACHE={'BACKEND': 'django', 'CACHE_ALIAS': 'default'})
+    def test_django_cache_backend(self):
+        """Tester le backend qui stocke les plans dans le cache Django"""
+        chart = get_chart(self.tenant_id)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_chart(self.tenant_id).accounts, chart.accounts)
+        self.assertEqual(get_chart_cache().stats()['backend'], 'DjangoCacheBackend')
+
+    def test_tiers_validation_reads_the_cached_chart(self):
+        """Tester la vérification de la classe du compte d'un tiers via le plan en cache"""
+        account = Account.objects.get(tenant_id=self.tenant_id, code="411")
+        Tiers.objects.create(tenant_id=self.tenant_id, code="411DUP", name="Dupont", account=account, type='CUSTOMER')
+
+        equity = AccountClass.objects.create(tenant_id=self.tenant_id, number=1, name="Capitaux")
+        capital = Account.objects.create(
+            tenant_id=self.tenant_id, code="101", name="Capital", account_class=equity, type=AccountType.EQUITY
+        )
+        with self.assertRaisesMessage(ValidationError, "pas un compte de classe 1"):
+            Tiers.objects.create(
+                tenant_id=self.tenant_id, code="411MAR", name="Martin",
+                account=Account.objects.get(pk=capital.pk), type='CUSTOMER'
+            )
+
+    def test_stats_endpoint(self):
+        """Tester l'exposition des compteurs du cache"""
+        get_chart(self.tenant_id)
+        response = self.client.get(reverse('chart-cache'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['misses'], 1)
@@ -0,0 +1,108 @@
+from django.core.management import call_command
+from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+import uuid
+
+from apps.core.models.account import AccountClass, AccountCategory, Account, AccountType
+from apps.core.services.chart_import import iter_json_records
+
+
+ROWS = [
+    {"code": "10000000", "libelle": "Capital"},
+    {"code": "10100000", "libelle": "Capital social"},
+    {"code": "10110000", "libelle": "Capital souscrit, non appelé"},
+    {"code": "28100000", "libelle": "Amortissements des immobilisations incorporelles"},
+    {"code": "41100000", "libelle": "Clients"},
+]
+
+
+class IterJsonRecordsTestCase(TestCase):
+    """Tests pour le lecteur JSON incrémental"""
+
+    def test_json_array_small_chunks(self):
+        """Tester la lecture d'un tableau JSON découpé en tout petits blocs"""
+        content = json.dumps(ROWS, indent=2, ensure_ascii=False)
+        records = list(iter_json_records(io.StringIO(content), chunk_size=7))
+        self.assertEqual(records, ROWS)
+
+    def test_ndjson(self):
+        """Tester la lecture d'un flux NDJSON"""
+        content = "\n".join(json.dumps(row) for row in ROWS) + "\n"
+        records = list(iter_json_records(io.StringIO(content), chunk_size=16))
+        self.assertEqual(records, ROWS)
+
+    def test_truncated_file_raises(self):
+        """Tester qu'un fichier tronqué lève une erreur"""
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_records(io.StringIO('[{"code": "10"'), chunk_size=4))
+
+
+class ImportCommandsTestCase(TestCase):
+    """Tests pour les commandes d'import par lots"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        handle, self.file_path = tempfile.mkstemp(suffix='.ndjson')
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            for row in ROWS:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def call(self, command, *args):
+        call_command(command, '--tenant-id', str(self.tenant_id), '--file', self.file_path,
+                     *args, stdout=io.StringIO())
+
+    def test_import_8chiffres(self):
+        """Tester l'import par petits lots avec résolution des parents"""
+        self.call('import_ohada_8chiffres', '--batch-size', '2')
+
+        self.assertEqual(Account.objects.filter(tenant_id=self.tenant_id).count(), len(ROWS))
+        self.assertEqual(AccountClass.objects.filter(tenant_id=self.tenant_id).count(), 3)
+        category = AccountCategory.objects.get(tenant_id=self.tenant_id, code="10")
+        self.assertEqual(category.name, "Capital")
+
+        account = Account.objects.get(tenant_id=self.tenant_id, code="10110000")
+        self.assertEqual(account.parent.code, "10100000")
+        self.assertEqual(account.level, 3)
+        self.assertEqual(account.name, "Capital Souscrit, Non Appelé")
+        self.assertEqual(account.type, AccountType.LIABILITY)
+
+    def test_reimport_updates_in_place(self):
+        """Tester qu'un second import met à jour les comptes sans les dupliquer"""
+        self.call('import_ohada_8chiffres')
+        first_ids = dict(Account.objects.filter(tenant_id=self.tenant_id).values_list('code', 'id'))
+
+        Account.objects.filter(tenant_id=self.tenant_id, code="41100000").update(name="Autre")
+        self.call('import_ohada_8chiffres', '--batch-size', '3')
+
+        second_ids = dict(Account.objects.filter(tenant_id=self.tenant_id).values_list('code', 'id'))
+        self.assertEqual(first_ids, second_ids)
+        self.assertEqual(Account.objects.get(tenant_id=self.tenant_id, code="41100000").name, "Clients")
+
+    def test_dry_run_writes_nothing(self):
+        """Tester que --dry-run n'écrit rien en base"""
+        out = io.StringIO()
+        call_command('import_ohada_8chiffres', '--tenant-id', str(self.tenant_id), '--file', self.file_path,
+                     '--dry-run', stdout=out)
+
+        self.assertIn("5 comptes, 3 catégories", out.getvalue())
+        self.assertFalse(Account.objects.filter(tenant_id=self.tenant_id).exists())
+        self.assertFalse(AccountClass.objects.filter(tenant_id=self.tenant_id).exists())
+
+    def test_import_avec_classification(self):
+        """Tester que la classification détaillée est écrite par l'upsert"""
+        self.call('import_ohada_avec_classification', '--batch-size', '2')
+
+        account = Account.objects.get(tenant_id=self.tenant_id, code="28100000")
+        self.assertEqual(account.type, AccountType.ASSET)
+        self.assertTrue(account.is_amortization_depreciation)
+        self.assertEqual(account.normal_balance, "DEBIT")
+
+        client = Account.objects.get(tenant_id=self.tenant_id, code="41100000")
+        self.assertEqual(client.ref_financial_statement, "BI")
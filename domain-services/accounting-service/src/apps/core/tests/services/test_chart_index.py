@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+import os
+
+from apps.core.services.chart_import import iter_chart_rows
+from apps.core.services.chart_index import ChartIndex
+
+
+class ChartIndexTestCase(SimpleTestCase):
+    """Tests pour l'index en mémoire d'un plan comptable à plat"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.index = ChartIndex.build([
+            {"code": "10000000", "libelle": "Capital"},
+            {"code": "10100000", "libelle": "Capital social"},
+            {"code": "10110000", "libelle": "Capital souscrit, non appelé"},
+            {"code": "10300000", "libelle": "Capital personnel"},
+            {"code": "28120000", "libelle": "Amortissements des brevets"},
+            {"code": "28100000", "libelle": "Amortissements des immobilisations incorporelles"},
+        ])
+
+    def test_parent_resolution(self):
+        """Tester la résolution du parent sur le préfixe indexé le plus proche"""
+        self.assertIsNone(self.index.parents["10000000"])
+        self.assertEqual(self.index.parents["10100000"], "10000000")
+        self.assertEqual(self.index.parents["10110000"], "10100000")
+        self.assertEqual(self.index.parents["10300000"], "10000000")
+
+    def test_parent_listed_after_child(self):
+        """Tester qu'un parent présent plus loin dans le fichier est bien trouvé"""
+        self.assertEqual(self.index.parents["28120000"], "28100000")
+        self.assertEqual(self.index.levels["28120000"], 2)
+        self.assertEqual(self.index.levels["28100000"], 1)
+
+    def test_levels_and_categories(self):
+        """Tester les niveaux et le premier libellé par catégorie"""
+        self.assertEqual(self.index.levels["10110000"], 3)
+        self.assertEqual(self.index.level_counts(), {1: 2, 2: 3, 3: 1})
+        self.assertEqual(self.index.category_labels["10"], "Capital")
+        self.assertEqual(self.index.category_labels["28"], "Amortissements des brevets")
+        self.assertEqual(self.index.children()["10000000"], ["10100000", "10300000"])
+
+    def test_validate(self):
+        """Tester la détection des codes invalides, doublons et orphelins"""
+        index = ChartIndex.build([
+            {"code": "10000000", "libelle": "Capital"},
+            {"code": "10000000", "libelle": "Capital bis"},
+            {"code": "ABC", "libelle": "Invalide"},
+            {"code": "45110000", "libelle": "Orphelin"},
+        ])
+
+        self.assertEqual(index.validate(), [
+            "Code invalide: 'ABC'",
+            "Code en double: 10000000",
+            "Compte sans parent dans le plan: 45110000",
+        ])
+        self.assertEqual(index.labels["10000000"], "Capital bis")
+
+    def test_bundled_chart_is_consistent(self):
+        """Tester que le plan à 8 chiffres fourni est cohérent"""
+        file_path = os.path.join(settings.BASE_DIR, 'data', 'plan_comptable_ohada_8chiffres.json')
+        index = ChartIndex.build(iter_chart_rows(file_path))
+
+        self.assertEqual(len(index), 1303)
+        self.assertEqual(index.validate(), [])
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+import uuid
+
+from apps.core.models.account import AccountClass, AccountCategory, Account
+from apps.core.services.chart_provisioning import build_chart_plan, provision_chart, split_chart_key
+
+
+class SplitChartKeyTestCase(TestCase):
+    """Tests pour le découpage des clés du plan comptable"""
+
+    def test_split_chart_key(self):
+        """Tester le découpage code / libellé des différentes formes de clés"""
+        self.assertEqual(split_chart_key("1 - Comptes de ressources durables"), ("1", "Comptes de ressources durables"))
+        self.assertEqual(split_chart_key("10 Capital"), ("10", "Capital"))
+        self.assertEqual(split_chart_key("1011"), ("1011", "1011"))
+
+
+class ChartProvisioningTestCase(TestCase):
+    """Tests pour le provisionnement en masse du plan comptable"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+
+    def test_build_chart_plan_hierarchy(self):
+        """Tester la construction en mémoire de la hiérarchie"""
+        plan = build_chart_plan(self.tenant_id, {
+            "1 - Comptes de capitaux": {
+                "10 Capital": {
+                    "101 Capital social": {
+                        "1011": "Capital souscrit, non appelé"
+                    },
+                    "103": "Capital personnel"
+                }
+            }
+        })
+
+        self.assertEqual(len(plan.classes), 1)
+        self.assertEqual(len(plan.categories), 1)
+        self.assertEqual(list(plan.accounts), ["10", "101", "1011", "103"])
+        self.assertEqual(plan.accounts["101"].name, "Capital Social")
+        self.assertIs(plan.accounts["1011"].parent, plan.accounts["101"])
+        self.assertEqual(plan.accounts["1011"].level, 3)
+        self.assertIs(plan.accounts["1011"].category, plan.categories[0])
+
+    def test_duplicate_code_is_merged(self):
+        """Tester qu'un code répété dans le JSON complète le compte existant"""
+        plan = build_chart_plan(self.tenant_id, {
+            "2 - Comptes d'actif immobilisé": {
+                "24 Matériel": {
+                    "245 Matériel de transport": {"2451": "Matériel automobile"}
+                },
+                "245 Matériel de transport": {"2453": "Matériel fluvial"}
+            }
+        })
+
+        self.assertEqual(len(plan.categories), 1)
+        self.assertIs(plan.accounts["2453"].parent, plan.accounts["245"])
+        self.assertEqual(plan.accounts["2453"].level, 3)
+
+    def test_full_chart_bounded_queries(self):
+        """Tester que le plan OHADA complet est inséré en un nombre borné de requêtes"""
+        with CaptureQueriesContext(connection) as queries:
+            accounts = Account.create_default_accounts_ohada(self.tenant_id)
+
+        self.assertGreater(len(accounts), 1000)
+        self.assertLess(len(queries), 50)
+        self.assertEqual(Account.objects.filter(tenant_id=self.tenant_id).count(), len(accounts))
+        self.assertEqual(AccountClass.objects.filter(tenant_id=self.tenant_id).count(), 9)
+        self.assertTrue(AccountCategory.objects.filter(tenant_id=self.tenant_id, code="10").exists())
+
+        account = Account.objects.select_related('parent').get(tenant_id=self.tenant_id, code="1011")
+        self.assertEqual(account.parent.code, "101")
+        self.assertEqual(account.level, 3)
+
+    def test_provision_chart_batch_size(self):
+        """Tester que la taille des lots ne change pas le résultat"""
+        plan = build_chart_plan(self.tenant_id, {
+            "6 - Comptes de charges": {
+                "60 Achats": {"601": "Achats de marchandises", "602": "Achats de matières premières"}
+            }
+        })
+        provision_chart(plan, batch_size=1)
+
+        codes = list(Account.objects.filter(tenant_id=self.tenant_id).values_list('code', flat=True))
+        self.assertEqual(codes, ["60", "601", "602"])
@@ -0,0 +1,127 @@
+from django.core.management import call_command
+from django.test import TestCase
+from unittest.mock import patch
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+from apps.core.models.account import Account
+from apps.core.services.chart_index import ChartIndex
+from apps.core.services.chart_import import iter_chart_rows
+from apps.core.services.chart_provisioning import build_chart_plan
+from apps.core.services.chart_snapshot import (
+    KIND_FLAT, KIND_NESTED, ChartSnapshot, SnapshotError, chart_plan_from_snapshot,
+    compile_chart, load_chart_index, load_snapshot, snapshot_path_for
+)
+
+NESTED_CHART = {
+    "1 - Comptes de ressources durables": {
+        "10 Capital": {
+            "101 Capital social": {"1011": "Capital souscrit, non appelé"},
+            "103": "Capital personnel"
+        }
+    },
+    "2 - Comptes d'actif immobilisé": {
+        "28 Amortissements": {"281": "Amortissements des immobilisations incorporelles"}
+    }
+}
+
+FLAT_ROWS = [
+    {"code": "10000000", "libelle": "Capital"},
+    {"code": "10100000", "libelle": "Capital social"},
+    {"code": "10110000", "libelle": "Capital souscrit, non appelé"},
+    {"code": "41100000", "libelle": "Clients"},
+]
+
+
+def plan_rows(plan):
+    return [
+        (account.code, account.name, account.parent.code if account.parent else None, account.level,
+         account.account_class.number, account.category.code if account.category else None,
+         account.type, account.ref_financial_statement, account.normal_balance,
+         account.is_amortization_depreciation)
+        for account in plan.accounts.values()
+    ]
+
+
+class ChartSnapshotTestCase(TestCase):
+    """Tests pour les snapshots binaires du plan comptable"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.directory = tempfile.mkdtemp()
+        self.nested_path = os.path.join(self.directory, 'plan.json')
+        with open(self.nested_path, 'w', encoding='utf-8') as file:
+            json.dump(NESTED_CHART, file, ensure_ascii=False)
+        self.flat_path = os.path.join(self.directory, 'plan_8chiffres.ndjson')
+        with open(self.flat_path, 'w', encoding='utf-8') as file:
+            for row in FLAT_ROWS:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_nested_round_trip(self):
+        """Tester qu'un plan imbriqué relu depuis le snapshot est identique au plan JSON"""
+        path, kind, count = compile_chart(self.nested_path)
+
+        self.assertEqual(path, snapshot_path_for(self.nested_path))
+        self.assertEqual((kind, count), (KIND_NESTED, 6))
+        snapshot = load_snapshot(self.nested_path)
+        plan = chart_plan_from_snapshot(uuid.uuid4(), snapshot)
+        self.assertEqual(plan_rows(plan), plan_rows(build_chart_plan(None, NESTED_CHART)))
+        self.assertTrue(plan.accounts["281"].is_amortization_depreciation)
+        self.assertIs(plan.accounts["1011"].parent, plan.accounts["101"])
+
+    def test_flat_round_trip(self):
+        """Tester qu'un plan à plat relu depuis le snapshot donne le même ChartIndex"""
+        compile_chart(self.flat_path)
+
+        index = load_chart_index(self.flat_path)
+        expected = ChartIndex.build(iter_chart_rows(self.flat_path))
+        self.assertEqual(load_snapshot(self.flat_path).kind, KIND_FLAT)
+        self.assertEqual(index.labels, expected.labels)
+        self.assertEqual(index.parents, expected.parents)
+        self.assertEqual(index.levels, expected.levels)
+        self.assertEqual(index.category_labels, expected.category_labels)
+
+    def test_stale_snapshot_falls_back_to_json(self):
+        """Tester qu'un snapshot périmé est ignoré au profit du JSON"""
+        compile_chart(self.flat_path)
+        with open(self.flat_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({"code": "41110000", "libelle": "Clients locaux"}) + "\n")
+
+        self.assertIsNone(load_snapshot(self.flat_path))
+        self.assertIn("41110000", load_chart_index(self.flat_path))
+
+    def test_corrupted_snapshot_rejected(self):
+        """Tester que la somme de contrôle détecte un snapshot altéré"""
+        path, _, _ = compile_chart(self.nested_path)
+        with open(path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))
+
+        with self.assertRaises(SnapshotError):
+            ChartSnapshot.open(path)
+        self.assertIsNone(load_snapshot(self.nested_path))
+
+    def test_bundled_snapshots_are_up_to_date(self):
+        """Tester que les snapshots livrés dans data/ correspondent à leurs sources"""
+        call_command('build_chart_snapshots', '--check', stdout=io.StringIO())
+
+    def test_default_provisioning_skips_json(self):
+        """Tester que le provisionnement par défaut n'analyse pas le JSON"""
+        tenant_id = uuid.uuid4()
+        with patch('apps.core.services.chart_snapshot.build_chart_plan') as build:
+            accounts = Account.create_default_accounts_ohada(tenant_id)
+
+        build.assert_not_called()
+        self.assertGreater(len(accounts), 1000)
+        account = Account.objects.get(tenant_id=tenant_id, code="1011")
+        self.assertEqual(account.parent.code, "101")
+        self.assertEqual(account.normal_balance, "CREDIT")
@@ -0,0 +1,117 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+import io
+import json
+import os
+import tempfile
+import uuid
+
+from apps.core.models.account import Account, AccountCategory
+from apps.core.models.tiers import Tiers
+from apps.core.services.account_hierarchy import rebuild_hierarchy
+
+ROWS = [
+    {"code": "10000000", "libelle": "Capital"},
+    {"code": "10100000", "libelle": "Capital social"},
+    {"code": "10110000", "libelle": "Capital souscrit, non appelé"},
+    {"code": "41100000", "libelle": "Clients"},
+    {"code": "41110000", "libelle": "Clients locaux"},
+]
+
+
+class ChartSyncTestCase(TestCase):
+    """Tests pour la synchronisation --sync des commandes d'import"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        handle, self.file_path = tempfile.mkstemp(suffix='.ndjson')
+        os.close(handle)
+        self.write_rows(ROWS)
+        self.call('import_ohada_avec_classification')
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def write_rows(self, rows):
+        with open(self.file_path, 'w', encoding='utf-8') as file:
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def call(self, command, *args):
+        out = io.StringIO()
+        call_command(command, '--tenant-id', str(self.tenant_id), '--file', self.file_path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_unchanged_chart_writes_nothing(self):
+        """Tester qu'une resynchronisation d'un plan inchangé n'écrit rien"""
+        with CaptureQueriesContext(connection) as queries:
+            output = self.call('import_ohada_avec_classification', '--sync')
+
+        writes = [q['sql'] for q in queries if q['sql'].lstrip().split(' ', 1)[0] in ('INSERT', 'UPDATE', 'DELETE')]
+        self.assertEqual(writes, [])
+        self.assertIn("0 comptes ajoutés, 0 mis à jour, 0 désactivés, 5 inchangés", output)
+
+    def test_sync_applies_keyed_diff(self):
+        """Tester l'ajout, la mise à jour et la désactivation sans suppression"""
+        removed = Account.objects.get(tenant_id=self.tenant_id, code="41110000")
+        Tiers.objects.bulk_create([
+            Tiers(tenant_id=self.tenant_id, code="411LOC", name="Client Local", type="CUSTOMER", account=removed)
+        ])
+        kept_ids = dict(Account.objects.filter(tenant_id=self.tenant_id).values_list('code', 'id'))
+
+        rows = [row for row in ROWS if row["code"] != "41110000"]
+        rows[1] = {"code": "10100000", "libelle": "Capital social et primes"}
+        rows.append({"code": "28100000", "libelle": "Amortissements des immobilisations incorporelles"})
+        self.write_rows(rows)
+
+        output = self.call('import_ohada_avec_classification', '--sync', '--batch-size', '2')
+
+        self.assertIn("1 comptes ajoutés, 1 mis à jour, 1 désactivés, 3 inchangés", output)
+        self.assertIn("name: 1 comptes", output)
+        accounts = Account.objects.filter(tenant_id=self.tenant_id)
+        self.assertEqual(accounts.get(code="10100000").name, "Capital Social Et Primes")
+        self.assertEqual(accounts.get(code="10100000").id, kept_ids["10100000"])
+        self.assertFalse(accounts.get(code="41110000").is_active)
+        self.assertTrue(accounts.get(code="28100000").is_amortization_depreciation)
+        self.assertTrue(Tiers.objects.filter(account=removed).exists())
+        self.assertTrue(AccountCategory.objects.filter(tenant_id=self.tenant_id, code="28").exists())
+
+        # Le compte réapparaît dans le fichier : il est réactivé
+        self.write_rows(ROWS)
+        self.call('import_ohada_avec_classification', '--sync')
+        self.assertTrue(accounts.get(code="41110000").is_active)
+
+    def test_sync_dry_run(self):
+        """Tester que --sync --dry-run affiche les différences sans écrire"""
+        self.write_rows(ROWS + [{"code": "41120000", "libelle": "Clients export"}])
+
+        output = self.call('import_ohada_8chiffres', '--sync', '--dry-run')
+
+        self.assertIn("Simulation: 1 comptes ajoutés", output)
+        self.assertFalse(Account.objects.filter(tenant_id=self.tenant_id, code="41120000").exists())
+
+    def test_sync_rejects_replace(self):
+        """Tester que --sync et --replace sont incompatibles"""
+        with self.assertRaises(CommandError):
+            self.call('import_ohada_8chiffres', '--sync', '--replace')
+
+    def test_sync_maintains_hierarchy_index(self):
+        """Tester que l'index hiérarchique suit les changements de parent"""
+        rows = [row for row in ROWS if row["code"] != "10100000"]
+        self.write_rows(rows)
+        self.call('import_ohada_avec_classification', '--sync')
+        accounts = Account.objects.filter(tenant_id=self.tenant_id)
+        self.assertEqual(accounts.get(code="10110000").parent.code, "10000000")
+
+        self.write_rows(ROWS)
+        self.call('import_ohada_avec_classification', '--sync')
+
+        capital = accounts.get(code="10000000")
+        self.assertEqual(accounts.get(code="10110000").depth, 2)
+        self.assertEqual(capital.descendant_count, 2)
+        self.assertEqual(set(accounts.descendants(capital).values_list('code', flat=True)), {"10100000", "10110000"})
+        self.assertEqual(rebuild_hierarchy(self.tenant_id, dry_run=True)['updated'], 0)
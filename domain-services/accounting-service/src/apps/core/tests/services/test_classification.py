@@ -0,0 +1,121 @@
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+import io
+import itertools
+import json
+import os
+import uuid
+from django.conf import settings
+
+from apps.core.models.account import AccountClass, Account, AccountType
+from apps.core.services.classification import (
+    CLASSIFICATION_RULES, ClassificationTrie, classifier, classify, classify_many
+)
+from apps.core.management.commands._classification_reference import reference_classification
+
+
+class ClassificationTrieTestCase(SimpleTestCase):
+    """Tests pour le trie de classification OHADA"""
+
+    def test_matches_reference_for_all_short_codes(self):
+        """Tester l'égalité exacte avec l'ancienne fonction pour tous les codes de 1 à 5 chiffres"""
+        for length in range(1, 6):
+            for digits in itertools.product('0123456789', repeat=length):
+                code = ''.join(digits)
+                self.assertEqual(classify(code), reference_classification(code), code)
+
+    def test_matches_reference_for_bundled_chart(self):
+        """Tester l'égalité exacte sur le plan OHADA à 8 chiffres livré"""
+        with open(os.path.join(settings.BASE_DIR, 'data', 'plan_comptable_ohada_8chiffres.json'), encoding='utf-8') as file:
+            codes = [row['code'] for row in json.load(file)]
+        for code in codes:
+            self.assertEqual(classify(code), reference_classification(code), code)
+
+    def test_matches_reference_for_edge_cases(self):
+        """Tester les codes vides, non numériques ou entourés d'espaces"""
+        for code in [None, '', '   ', 411, ' 41100000 ', 'A4110', '4X90', '2A11', '6123AB', '9', '0', '8']:
+            self.assertEqual(classify(code), reference_classification(code), repr(code))
+
+    def test_longest_prefix_wins(self):
+        """Tester que le préfixe le plus long l'emporte sur les règles plus générales"""
+        self.assertEqual(classify("40100000")["ref"], "DJ")
+        self.assertEqual(classify("40900000")["type"], "ACTIF")
+        self.assertEqual(classify("49980000")["ref"], "DH")
+        self.assertEqual(classify("49900000")["ref"], "DN")
+        self.assertEqual(classify("49100000")["category"], "AMORTISSEMENT_DEPRECIATION")
+
+    def test_classify_many(self):
+        """Tester la classification groupée indexée par code"""
+        result = classify_many(["60100000", "70100000"])
+        self.assertEqual(result["60100000"]["ref"], "RA")
+        self.assertEqual(result["70100000"]["ref"], "TA")
+
+    def test_lookup_depth_is_bounded(self):
+        """Tester que la descente dans le trie est bornée par la longueur des préfixes"""
+        self.assertEqual(classifier.depth, max(len(prefix) for prefix, _, _ in CLASSIFICATION_RULES))
+        self.assertEqual(classify("6" * 500), classify("6666"))
+
+    def test_duplicate_prefix_rejected(self):
+        """Tester qu'un préfixe défini deux fois est refusé à la compilation"""
+        nature = ("ACTIF", "BRUT", "DEBIT")
+        with self.assertRaises(ValueError):
+            ClassificationTrie([("21", nature, "AE"), ("21", nature, "AF")])
+
+    def test_benchmark_command(self):
+        """Tester la commande de mesure du coût de la classification"""
+        out = io.StringIO()
+        call_command('benchmark_classification', '--codes', '10', stdout=out)
+        self.assertIn(f"Profondeur du trie: {classifier.depth}", out.getvalue())
+        self.assertEqual(len(out.getvalue().splitlines()), 8)
+
+
+class AccountClassificationTestCase(TestCase):
+    """Tests pour l'utilisation de la classification par le modèle et les commandes"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        self.account_class = AccountClass.objects.create(tenant_id=self.tenant_id, number=2, name="Actif immobilisé")
+
+    def test_save_populates_classification(self):
+        """Tester qu'un compte créé hors import reçoit sa classification détaillée"""
+        account = Account.objects.create(
+            tenant_id=self.tenant_id, code="2811", name="Amortissements",
+            account_class=self.account_class, type=AccountType.ASSET
+        )
+
+        self.assertEqual(account.normal_balance, "DEBIT")
+        self.assertTrue(account.is_amortization_depreciation)
+        self.assertEqual(account.ref_financial_statement, "INCONNU")
+        self.assertEqual(account.type, AccountType.ASSET)
+
+    def test_save_keeps_existing_classification(self):
+        """Tester qu'une classification déjà renseignée n'est pas écrasée"""
+        account = Account.objects.create(
+            tenant_id=self.tenant_id, code="2111", name="Frais de développement",
+            account_class=self.account_class, type=AccountType.ASSET,
+            normal_balance="CREDIT", ref_financial_statement="XX"
+        )
+
+        self.assertEqual(account.normal_balance, "CREDIT")
+        self.assertEqual(account.ref_financial_statement, "XX")
+
+    def test_reclassify_command(self):
+        """Tester la reclassification en masse des comptes d'un tenant"""
+        account = Account.objects.create(
+            tenant_id=self.tenant_id, code="2111", name="Frais de développement",
+            account_class=self.account_class, type=AccountType.LIABILITY
+        )
+        Account.objects.filter(id=account.id).update(normal_balance="CREDIT", ref_financial_statement=None)
+
+        out = io.StringIO()
+        call_command('reclassify_accounts', '--tenant-id', str(self.tenant_id), '--dry-run', stdout=out)
+        self.assertIn("1 comptes sur 1 seraient reclassés", out.getvalue())
+        account.refresh_from_db()
+        self.assertEqual(account.normal_balance, "CREDIT")
+
+        call_command('reclassify_accounts', '--tenant-id', str(self.tenant_id), '--with-type', stdout=io.StringIO())
+        account.refresh_from_db()
+        self.assertEqual(account.normal_balance, "DEBIT")
+        self.assertEqual(account.ref_financial_statement, "AE")
+        self.assertEqual(account.type, AccountType.ASSET)
@@ -0,0 +1,193 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from datetime import date, timedelta
+import io
+import uuid
+
+from apps.core.models.account import Account
+from apps.core.models.fiscal_year import FiscalYear, FiscalPeriod
+from apps.core.models.job import Job, JobStatus
+from apps.core.models.tenant import TenantShardStatus
+from apps.core.services.jobs import JobConflictError, JobError, JobWorker, enqueue
+from apps.core.services.tenant_sharding import get_shard_directory
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+
+class JobQueueTestCase(TestCase):
+    """Tests pour la file de jobs : idempotence, réservation par lots et reprise des jobs abandonnés"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenants = [uuid.uuid4() for _ in range(3)]
+
+    def test_enqueue_is_idempotent_per_tenant(self):
+        """Tester qu'une demande répétée renvoie le job existant tant qu'il n'a pas échoué"""
+        job, created = enqueue(self.tenants[0], 'create_default_tiers')
+        self.assertTrue(created)
+        self.assertEqual(enqueue(self.tenants[0], 'create_default_tiers'), (job, False))
+        self.assertTrue(enqueue(self.tenants[1], 'create_default_tiers')[1])
+        self.assertTrue(enqueue(self.tenants[0], 'create_periods', key='FY2025')[1])
+
+        Job.objects.filter(pk=job.pk).update(status=JobStatus.SUCCEEDED)
+        self.assertEqual(enqueue(self.tenants[0], 'create_default_tiers'), (job, False))
+        Job.objects.filter(pk=job.pk).update(status=JobStatus.FAILED)
+        retry, created = enqueue(self.tenants[0], 'create_default_tiers')
+        self.assertTrue(created)
+        self.assertNotEqual(retry.pk, job.pk)
+
+        with self.assertRaises(JobError):
+            enqueue(self.tenants[0], 'inconnu')
+
+    def test_enqueue_refuses_other_params(self):
+        """Tester le refus d'une demande répétée avec d'autres paramètres que le job existant"""
+        template_id = str(uuid.uuid4())
+        job = enqueue(self.tenants[0], 'provision_chart', {'template_tenant_id': template_id})[0]
+        self.assertEqual(enqueue(self.tenants[0], 'provision_chart', {'template_tenant_id': template_id}),
+                         (job, False))
+        with self.assertRaises(JobConflictError) as context:
+            enqueue(self.tenants[0], 'provision_chart')
+        self.assertEqual(context.exception.job, job)
+        with self.assertRaises(JobConflictError):
+            enqueue(self.tenants[0], 'provision_chart', {'template_tenant_id': str(uuid.uuid4())})
+
+    def test_claim_in_batches(self):
+        """Tester la réservation des plus anciens jobs par lots de batch_size"""
+        jobs = [enqueue(tenant_id, 'create_default_tiers')[0] for tenant_id in self.tenants]
+        worker = JobWorker(batch_size=2, name='worker-1')
+
+        self.assertEqual(worker.claim(), jobs[:2])
+        self.assertEqual(JobWorker(batch_size=2, name='worker-2').claim(), jobs[2:])
+        self.assertEqual(worker.claim(), [])
+        self.assertEqual(
+            list(Job.objects.order_by('created_at').values_list('worker', 'attempts')),
+            [('worker-1', 1), ('worker-1', 1), ('worker-2', 1)]
+        )
+
+    def test_failed_job_records_its_error(self):
+        """Tester l'échec d'un job (tenant sans plan comptable) sans interrompre le worker"""
+        job = enqueue(self.tenants[0], 'create_default_tiers')[0]
+        with self.assertLogs('apps.core.services.jobs', 'ERROR'):
+            self.assertEqual(JobWorker().work(once=True), {JobStatus.FAILED: 1})
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertTrue(job.error)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_expired_lease_is_requeued_then_abandoned(self):
+        """Tester la reprise d'un job dont le worker a disparu, puis son abandon après max_attempts"""
+        job = enqueue(self.tenants[0], 'create_default_tiers')[0]
+        lost = JobWorker(name='worker-1', max_attempts=2)
+        self.assertEqual(lost.claim(), [job])
+        expired = timezone.now() - timedelta(seconds=1)
+        Job.objects.filter(pk=job.pk).update(locked_until=expired)
+
+        worker = JobWorker(name='worker-2', max_attempts=2)
+        self.assertEqual(worker.requeue_expired(), 1)
+        self.assertEqual(worker.claim(), [job])
+        # Le worker disparu ne peut plus terminer le job
+        self.assertIsNone(lost.run(job))
+
+        Job.objects.filter(pk=job.pk).update(locked_until=expired)
+        self.assertEqual(worker.requeue_expired(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (JobStatus.FAILED, 2))
+
+    @override_settings(TENANT_SHARDING={'SHARDS': ['default', 'shard_1'], 'DEFAULT_SHARD': 'default'})
+    def test_job_waits_while_tenant_is_moving(self):
+        """Tester qu'un job n'écrit pas dans un tenant en cours de déplacement et reste en attente"""
+        tenant_id = self.tenants[0]
+        job = enqueue(tenant_id, 'provision_chart')[0]
+        directory = get_shard_directory()
+        directory.assign(tenant_id, 'default', TenantShardStatus.MOVING)
+
+        self.assertEqual(JobWorker().work(once=True), {JobStatus.PENDING: 1})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.worker), (JobStatus.PENDING, 0, ''))
+        self.assertFalse(Account.objects.filter(tenant_id=tenant_id).exists())
+        self.assertEqual(JobWorker().claim(), [])
+
+        directory.assign(tenant_id, 'default')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now())
+        self.assertEqual(JobWorker().work(once=True), {JobStatus.SUCCEEDED: 1})
+        self.assertEqual(Job.objects.get(pk=job.pk).attempts, 1)
+        self.assertTrue(Account.objects.filter(tenant_id=tenant_id).exists())
+
+
+class JobEndpointsTestCase(TestCase):
+    """Tests pour les endpoints de provisionnement qui répondent 202 avec un job"""
+
+    def run_workers(self):
+        output = io.StringIO()
+        call_command('run_workers', once=True, stdout=output)
+        return output.getvalue()
+
+    def test_import_ohada(self):
+        """Tester l'import en arrière-plan, les clics répétés et le suivi du job"""
+        url = '/api/accounting/accounts/import_ohada/'
+        response = self.client.post(url, content_type='application/json')
+        self.assertEqual(response.status_code, 202, response.content)
+        job_id = response.json()['job_id']
+        self.assertTrue(response['Location'].endswith(f'/api/accounting/jobs/{job_id}/'))
+        self.assertEqual(response.json()['status'], JobStatus.PENDING)
+        self.assertEqual(self.client.post(url, content_type='application/json').json()['job_id'], job_id)
+        self.assertFalse(Account.objects.filter(tenant_id=TENANT_ID).exists())
+
+        self.assertIn("1 jobs exécutés", self.run_workers())
+        accounts = Account.objects.filter(tenant_id=TENANT_ID).count()
+        self.assertGreater(accounts, 0)
+
+        response = self.client.get(f'/api/accounting/jobs/{job_id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {key: response.json()[key] for key in ('kind', 'status', 'progress', 'result')},
+            {'kind': 'provision_chart', 'status': JobStatus.SUCCEEDED, 'progress': 100,
+             'result': {'accounts': accounts}}
+        )
+        # Plan déjà provisionné : le job terminé est renvoyé, rien n'est recréé
+        self.assertEqual(self.client.post(url, content_type='application/json').json()['status'],
+                         JobStatus.SUCCEEDED)
+        self.assertIn("0 jobs exécutés", self.run_workers())
+
+    def test_create_periods(self):
+        """Tester la génération des périodes d'un exercice par un job"""
+        fiscal_year = FiscalYear.objects.create(
+            tenant_id=TENANT_ID, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        )
+        response = self.client.post(
+            f'/api/accounting/fiscal-years/{fiscal_year.pk}/create_periods/', {'period_type': 'monthly'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 202, response.content)
+        self.run_workers()
+
+        periods = FiscalPeriod.objects.filter(fiscal_year=fiscal_year).order_by('number')
+        self.assertEqual(periods.count(), 12)
+        self.assertEqual((periods.last().code, periods.last().end_date), ("FY2025-M12", date(2025, 12, 31)))
+        response = self.client.get('/api/accounting/jobs/', {'kind': 'create_periods'})
+        self.assertEqual([job['result']['created'] for job in response.json()['results']], [12])
+
+        # Même exercice, autre découpage : refusé tant que le job existe
+        url = f'/api/accounting/fiscal-years/{fiscal_year.pk}/create_periods/'
+        response = self.client.post(url, {'period_type': 'quarterly'}, content_type='application/json')
+        self.assertEqual(response.status_code, 409, response.content)
+        response = self.client.post(url, {'period_type': 'weekly'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_quarterly_periods(self):
+        """Tester la génération de périodes trimestrielles, avec les codes du modèle"""
+        fiscal_year = FiscalYear.objects.create(
+            tenant_id=TENANT_ID, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        )
+        self.client.post(
+            f'/api/accounting/fiscal-years/{fiscal_year.pk}/create_periods/', {'period_type': 'quarterly'},
+            content_type='application/json'
+        )
+        self.run_workers()
+
+        job = Job.objects.get(kind='create_periods')
+        self.assertEqual(job.result, {'created': 4, 'codes': ['FY2025-Q1', 'FY2025-Q2', 'FY2025-Q3', 'FY2025-Q4']})
@@ -0,0 +1,111 @@
+from django.core.management import call_command
+from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+import io
+import uuid
+
+from apps.core.models.account import Account
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.journal import Journal, JournalEntry
+from apps.core.models.transaction import TransactionLine
+from apps.core.services.ledger_posting import PostingError, post_entries, reverse_entries
+
+
+def entry(day, *lines, journal="OD", reference=""):
+    return {'journal': journal, 'date': day, 'reference': reference, 'lines': list(lines)}
+
+
+class LedgerPostingTestCase(TestCase):
+    """Tests pour la passation des écritures par lots"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant_id = uuid.uuid4()
+        Account.create_default_accounts_ohada(cls.tenant_id)
+        Journal.objects.create(tenant_id=cls.tenant_id, code="OD", name="Opérations diverses")
+        cls.year = FiscalYear.objects.create(
+            tenant_id=cls.tenant_id, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        )
+        cls.year.create_periods()
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.supplier = Account.objects.get(tenant_id=self.tenant_id, code="401")
+
+    def test_post_many_entries_in_constant_queries(self):
+        """Tester l'insertion d'écritures équilibrées en un nombre constant de requêtes"""
+        entries = [
+            entry(date(2025, 1 + number % 12, 15),
+                  {'account': "601", 'debit': "100.50"},
+                  {'account': "401", 'credit': Decimal("100.50")},
+                  reference=f"F{number}")
+            for number in range(40)
+        ]
+        # comptes, journaux, périodes, puis dans une transaction : en-têtes et lignes
+        # (un lot chacun), soldes par période (création, verrouillage, mise à jour)
+        with self.assertNumQueries(10):
+            stats = post_entries(self.tenant_id, entries, batch_size=1000)
+        self.assertEqual((stats['entries'], stats['lines']), (40, 80))
+
+        lines = TransactionLine.objects.filter(tenant_id=self.tenant_id)
+        self.assertEqual(lines.count(), 80)
+        line = lines.select_related('entry', 'fiscal_period').filter(entry__reference="F13").get(debit__gt=0)
+        self.assertEqual((line.date, line.fiscal_period.number), (date(2025, 2, 15), 2))
+        self.assertEqual(line.fiscal_period_id, line.entry.fiscal_period_id)
+        self.assertEqual(self.supplier.get_balance(), Decimal("4020.00"))
+
+    def test_invalid_entries_insert_nothing(self):
+        """Tester que toutes les erreurs sont rapportées et qu'aucune écriture n'est insérée"""
+        entries = [
+            entry(date(2025, 3, 1), {'account': "601", 'debit': "10"}, {'account': "401", 'credit': "10"}),
+            entry(date(2025, 3, 1), {'account': "601", 'debit': "10"}, {'account': "401", 'credit': "9.99"}),
+            entry(date(2025, 3, 1), {'account': "999", 'debit': "10"}, {'account': "401", 'credit': "10"}),
+            entry(date(2026, 3, 1), {'account': "601", 'debit': "10"}, {'account': "401", 'credit': "10"}),
+            entry(date(2025, 3, 1), {'account': "601", 'debit': "10.001"}, {'account': "401", 'credit': "10"}),
+            entry(date(2025, 3, 1), {'account': "601", 'debit': "10", 'credit': "10"},
+                  {'account_id': str(self.supplier.id), 'credit': "10"}),
+            entry(date(2025, 3, 1), {'account': "601", 'debit': "10"}, journal="XX"),
+        ]
+        with self.assertRaises(PostingError) as context:
+            post_entries(self.tenant_id, entries)
+        self.assertEqual([index for index, _ in context.exception.errors], [1, 2, 3, 4, 5, 6])
+        self.assertIn("déséquilibrée", context.exception.errors[0][1])
+        self.assertFalse(JournalEntry.objects.filter(tenant_id=self.tenant_id).exists())
+
+    def test_closed_period_is_rejected(self):
+        """Tester le refus d'une écriture dans une période clôturée"""
+        self.year.periods.filter(number=1).update(is_closed=True)
+        with self.assertRaises(PostingError) as context:
+            post_entries(self.tenant_id, [
+                entry(date(2025, 1, 10), {'account': "601", 'debit': "5"}, {'account': "401", 'credit': "5"})
+            ])
+        self.assertIn("clôturée", context.exception.errors[0][1])
+
+    def test_entry_is_reversed_once(self):
+        """Tester qu'une écriture déjà extournée ne peut pas l'être une seconde fois"""
+        post_entries(self.tenant_id, [
+            entry(date(2025, 4, 2), {'account': "601", 'debit': "7"}, {'account': "401", 'credit': "7"})
+        ])
+        original = JournalEntry.objects.get(tenant_id=self.tenant_id)
+        reverse_entries(self.tenant_id, [original.id])
+        self.assertEqual(original.reversed_by.reversal_of_id, original.id)
+
+        with self.assertRaises(PostingError) as context:
+            reverse_entries(self.tenant_id, [str(original.id)])
+        self.assertIn("déjà extournée", context.exception.errors[0][1])
+        self.assertEqual(JournalEntry.objects.filter(tenant_id=self.tenant_id).count(), 2)
+
+    def test_reverse_invalid_identifier(self):
+        """Tester qu'un identifiant d'écriture invalide est rapporté par PostingError"""
+        with self.assertRaises(PostingError) as context:
+            reverse_entries(self.tenant_id, [uuid.uuid4(), "pas-un-uuid"])
+        self.assertEqual(context.exception.errors, [(1, "identifiant d'écriture invalide: pas-un-uuid")])
+
+    def test_benchmark_command(self):
+        """Tester que la commande de mesure s'exécute sans rien conserver"""
+        out = io.StringIO()
+        call_command('benchmark_posting', '--entries', '50', '--lines-per-entry', '3', stdout=out)
+        self.assertIn("lignes: 150", out.getvalue())
+        self.assertFalse(JournalEntry.objects.filter(reference__startswith="BENCH-").exists())
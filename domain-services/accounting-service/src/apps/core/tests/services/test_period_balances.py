@@ -0,0 +1,173 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from datetime import date
+from decimal import Decimal
+import io
+import uuid
+
+from apps.core.models.account import Account
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.journal import Journal
+from apps.core.models.transaction import AccountPeriodBalance, TransactionLine
+from apps.core.services.balances import balances_for
+from apps.core.services.ledger_posting import post_entries, reverse_entries
+from apps.core.services.period_balances import rebuild_period_balances
+from apps.core.services.tenant_sharding import get_shard_directory
+from apps.core.tenant_context import tenant_context
+
+
+def entry(day, debit_code, credit_code, amount):
+    return {'journal': "OD", 'date': day, 'lines': [
+        {'account': debit_code, 'debit': amount}, {'account': credit_code, 'credit': amount},
+    ]}
+
+
+class PeriodBalancesTestCase(TestCase):
+    """Tests pour les soldes des comptes par période fiscale"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant_id = uuid.uuid4()
+        Account.create_default_accounts_ohada(cls.tenant_id)
+        Journal.objects.create(tenant_id=cls.tenant_id, code="OD", name="Opérations diverses")
+        for year in (2024, 2025):
+            FiscalYear.objects.create(
+                tenant_id=cls.tenant_id, name=f"Exercice {year}", code=f"FY{year}",
+                start_date=date(year, 1, 1), end_date=date(year, 12, 31)
+            ).create_periods()
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.accounts = Account.objects.filter(tenant_id=self.tenant_id, code__in=["601", "401", "524"])
+        self.snapshots = AccountPeriodBalance.objects.filter(tenant_id=self.tenant_id)
+
+    def scan(self, start_date=None, end_date=None):
+        """Soldes débit - crédit calculés directement sur les lignes (référence)"""
+        lines = TransactionLine.objects.filter(tenant_id=self.tenant_id)
+        if start_date:
+            lines = lines.filter(date__gte=start_date)
+        if end_date:
+            lines = lines.filter(date__lte=end_date)
+        return {
+            row['account_id']: (row['debit'], row['credit'])
+            for row in lines.values('account_id').annotate(debit=Sum('debit'), credit=Sum('credit'))
+        }
+
+    def assertBalancesMatchScan(self, start_date=None, end_date=None):
+        balances = balances_for(self.accounts, start_date, end_date)
+        expected = self.scan(start_date, end_date)
+        for account in self.accounts:
+            self.assertEqual(
+                (balances[account.pk].debit, balances[account.pk].credit),
+                expected.get(account.pk, (Decimal('0.00'), Decimal('0.00'))),
+                (account.code, start_date, end_date)
+            )
+
+    def test_posting_maintains_running_balances(self):
+        """Tester les soldes d'ouverture et de clôture cumulés après des passations"""
+        post_entries(self.tenant_id, [
+            entry(date(2025, 3, 10), "601", "401", "100.00"),
+            entry(date(2025, 5, 10), "601", "401", "50.00"),
+        ])
+        # Passation antérieure : les soldes des périodes suivantes sont décalés
+        post_entries(self.tenant_id, [entry(date(2024, 12, 31), "601", "401", "10.00")])
+
+        rows = list(self.snapshots.filter(account__code="601").order_by('period_start').values_list(
+            'period_start', 'opening', 'debit', 'closing'
+        ))
+        self.assertEqual(rows, [
+            (date(2024, 12, 1), Decimal('0.00'), Decimal('10.00'), Decimal('10.00')),
+            (date(2025, 3, 1), Decimal('10.00'), Decimal('100.00'), Decimal('110.00')),
+            (date(2025, 5, 1), Decimal('110.00'), Decimal('50.00'), Decimal('160.00')),
+        ])
+        supplier = self.snapshots.filter(account__code="401").order_by('-period_start').first()
+        self.assertEqual((supplier.credit, supplier.closing), (Decimal('50.00'), Decimal('-160.00')))
+
+    def test_ranges_combine_snapshots_and_partial_periods(self):
+        """Tester que les soldes sur une plage quelconque égalent un parcours des lignes"""
+        post_entries(self.tenant_id, [
+            entry(date(2024, month, day), "524", "401" if month % 2 else "601", f"{month}{day}.25")
+            for month in range(1, 13) for day in (1, 15, 28)
+        ] + [entry(date(2025, 2, 14), "601", "524", "75.00")])
+
+        for start_date, end_date in [
+            (None, None), (date(2024, 3, 1), date(2024, 6, 30)), (date(2024, 3, 10), date(2024, 6, 20)),
+            (None, date(2024, 2, 14)), (date(2024, 11, 15), None), (date(2024, 4, 15), date(2024, 4, 15)),
+        ]:
+            self.assertBalancesMatchScan(start_date, end_date)
+
+        with self.assertNumQueries(1):
+            balances_for(self.accounts, date(2024, 3, 10), date(2024, 6, 20))
+
+    def test_reversal_cancels_entries(self):
+        """Tester que l'extourne annule l'effet des écritures sur les soldes"""
+        post_entries(self.tenant_id, [entry(date(2025, 4, 2), "601", "401", "300.00")])
+        purchases = self.accounts.get(code="601")
+        entry_ids = list(TransactionLine.objects.filter(account=purchases).values_list('entry_id', flat=True))
+        reverse_entries(self.tenant_id, entry_ids, day=date(2025, 4, 30))
+
+        self.assertEqual(purchases.get_balance(), Decimal('0.00'))
+        self.assertEqual(purchases.get_balance(end_date=date(2025, 4, 29)), Decimal('300.00'))
+        self.assertBalancesMatchScan()
+
+    def test_rebuild_balances(self):
+        """Tester la reconstruction des soldes après une corruption"""
+        post_entries(self.tenant_id, [
+            entry(date(2024, 6, 1), "601", "401", "20.00"),
+            entry(date(2025, 6, 1), "601", "401", "30.00"),
+        ])
+        expected = list(self.snapshots.order_by('account_id', 'period_start').values_list(
+            'account_id', 'period_start', 'opening', 'debit', 'credit', 'closing'
+        ))
+
+        self.snapshots.filter(period_start__year=2024).update(debit=0, credit=0, opening=5, closing=5)
+        self.snapshots.filter(account__code="401", period_start__year=2025).delete()
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_balances', '--check', stdout=out)
+
+        year = FiscalYear.objects.get(tenant_id=self.tenant_id, code="FY2024")
+        self.assertEqual(rebuild_period_balances(self.tenant_id, year, dry_run=True)['updated'], 2)
+        call_command('rebuild_balances', '--tenant-id', str(self.tenant_id), stdout=out)
+        self.assertEqual(list(self.snapshots.order_by('account_id', 'period_start').values_list(
+            'account_id', 'period_start', 'opening', 'debit', 'credit', 'closing'
+        )), expected)
+        call_command('rebuild_balances', '--check', stdout=out)
+
+
+@override_settings(TENANT_SHARDING={'SHARDS': ['default', 'shard_1'], 'DEFAULT_SHARD': 'default'})
+class ShardedPeriodBalancesTestCase(TestCase):
+    """Tests pour la reconstruction des soldes d'un tenant situé sur un autre shard"""
+    databases = {'default', 'shard_1'}
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        get_shard_directory().assign(self.tenant_id, 'shard_1')
+        self.addCleanup(get_shard_directory().invalidate, self.tenant_id)
+        Account.create_default_accounts_ohada(self.tenant_id)
+        with tenant_context(self.tenant_id):
+            Journal.objects.create(tenant_id=self.tenant_id, code="OD", name="Opérations diverses")
+        FiscalYear.objects.create(
+            tenant_id=self.tenant_id, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        ).create_periods()
+        post_entries(self.tenant_id, [entry(date(2025, 6, 1), "601", "401", "30.00")])
+        self.snapshots = AccountPeriodBalance.objects.using('shard_1').filter(tenant_id=self.tenant_id)
+
+    def test_rebuild_balances(self):
+        """Tester que la commande parcourt chaque shard et trouve l'exercice du tenant"""
+        expected = list(self.snapshots.order_by('account_id', 'period_start').values_list('closing', flat=True))
+        self.assertTrue(expected)
+        self.snapshots.update(closing=5)
+
+        out = io.StringIO()
+        with self.assertRaisesMessage(CommandError, "à corriger"):
+            call_command('rebuild_balances', '--check', stdout=out)
+        call_command('rebuild_balances', '--tenant-id', str(self.tenant_id), '--fiscal-year', 'FY2025', stdout=out)
+        self.assertEqual(
+            list(self.snapshots.order_by('account_id', 'period_start').values_list('closing', flat=True)), expected
+        )
+        call_command('rebuild_balances', '--check', stdout=out)
@@ -0,0 +1,174 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from datetime import date, datetime, timezone
+import io
+import json
+import os
+import tempfile
+import uuid
+
+from apps.core.models.account import AccountClass, AccountCategory, Account, ChartVersion
+from apps.core.models.fiscal_year import FiscalYear, FiscalPeriod
+from apps.core.models.tiers import Tiers
+from apps.core.services.tenant_backup import (
+    TenantBackupError, account_depths, dump_tenants, iter_backup_records, restore_backup
+)
+from apps.core.services.tenant_sharding import get_shard_directory
+
+
+def snapshot(tenant_id, using='default'):
+    """Contenu d'un tenant indépendant de l'ordre des lignes"""
+    return {
+        model._meta.model_name: set(model.objects.using(using).filter(tenant_id=tenant_id).values_list())
+        for model in (AccountClass, AccountCategory, Account, Tiers, FiscalYear, FiscalPeriod)
+    }
+
+
+@override_settings(TENANT_SHARDING={'SHARDS': ['default', 'shard_1'], 'DEFAULT_SHARD': 'default'})
+class TenantBackupTestCase(TestCase):
+    """Tests pour la sauvegarde et la restauration rapides des tenants"""
+    databases = {'default', 'shard_1'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant_id = uuid.uuid4()
+        Account.create_default_accounts_ohada(cls.tenant_id)
+        Tiers.objects.bulk_create([
+            Tiers(tenant_id=cls.tenant_id, code="411CLI", name="Client Générique", type="CUSTOMER",
+                  account=Account.objects.get(tenant_id=cls.tenant_id, code="411")),
+        ])
+        fiscal_year = FiscalYear.objects.create(
+            tenant_id=cls.tenant_id, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        )
+        FiscalPeriod.objects.create(
+            tenant_id=cls.tenant_id, fiscal_year=fiscal_year, name="Janvier", code="FY2025-01",
+            number=1, start_date=date(2025, 1, 1), end_date=date(2025, 1, 31)
+        )
+        # Dates anciennes : la restauration doit les conserver
+        Account.objects.filter(tenant_id=cls.tenant_id).update(
+            created_at=datetime(2024, 3, 1, tzinfo=timezone.utc), updated_at=datetime(2024, 3, 2, tzinfo=timezone.utc)
+        )
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip(self):
+        """Tester qu'une sauvegarde restaurée reproduit exactement le tenant, dans chaque format"""
+        expected = snapshot(self.tenant_id)
+        for name in ('tenant.ndjson.gz', 'tenant.json'):
+            with self.subTest(format=name):
+                count = dump_tenants([self.tenant_id], self.path(name))
+                self.assertEqual(count, sum(len(rows) for rows in expected.values()))
+
+                stats = restore_backup([self.path(name)], batch_size=50, replace=True)
+
+                self.assertEqual(stats['counts']['account'], len(expected['account']))
+                self.assertEqual(snapshot(self.tenant_id), expected)
+
+    def test_restore_orders_parents_first(self):
+        """Tester la restauration d'un fichier où les comptes enfants précèdent leurs parents"""
+        dump_tenants([self.tenant_id], self.path('tenant.ndjson'))
+        with open(self.path('tenant.ndjson'), encoding='utf-8') as file:
+            records = [json.loads(line) for line in file]
+        with open(self.path('reversed.json'), 'w', encoding='utf-8') as file:
+            json.dump(list(reversed(records)), file)
+        expected = snapshot(self.tenant_id)
+
+        restore_backup([self.path('reversed.json')], replace=True)
+
+        self.assertEqual(snapshot(self.tenant_id), expected)
+
+    def test_legacy_dump(self):
+        """Tester la lecture d'une ancienne sauvegarde (cp1252, sans champs de classification)"""
+        class_id, account_id = uuid.uuid4(), uuid.uuid4()
+        tenant_id = uuid.uuid4()
+        records = [
+            {"model": "core.accountclass", "pk": str(class_id), "fields": {
+                "tenant_id": str(tenant_id), "number": 4, "name": "Tiers", "description": None,
+                "created_at": "2025-05-01T07:53:28.727Z", "updated_at": "2025-05-01T07:53:28.727Z"}},
+            {"model": "core.account", "pk": str(account_id), "fields": {
+                "tenant_id": str(tenant_id), "code": "42410000", "name": "Assistance Médicale", "description": None,
+                "account_class": str(class_id), "category": None, "parent": None, "level": 1, "type": "LIABILITY",
+                "is_active": True, "is_reconcilable": True, "is_tax_relevant": False, "obsolete": 1,
+                "created_at": "2025-05-01T07:53:28.727Z", "updated_at": "2025-05-03T19:22:42.989Z"}},
+            {"model": "auth.user", "pk": 1, "fields": {}},
+        ]
+        with open(self.path('accounts_backup.json'), 'w', encoding='cp1252') as file:
+            json.dump(records, file, ensure_ascii=False)
+
+        self.assertEqual(len(list(iter_backup_records(self.path('accounts_backup.json')))), 3)
+        stats = restore_backup([self.path('accounts_backup.json')])
+
+        self.assertEqual(stats['ignored'], {'auth.user': 1})
+        account = Account.objects.get(pk=account_id)
+        self.assertEqual(account.name, "Assistance Médicale")
+        self.assertEqual(account.updated_at, datetime(2025, 5, 3, 19, 22, 42, 989000, tzinfo=timezone.utc))
+        self.assertIsNone(account.normal_balance)
+
+    def test_missing_reference(self):
+        """Tester qu'une clé étrangère non résolue est signalée sans rien écrire"""
+        dump_tenants([self.tenant_id], self.path('tenant.ndjson'))
+        with open(self.path('tenant.ndjson'), encoding='utf-8') as file:
+            records = [json.loads(line) for line in file if '"core.accountclass"' not in line]
+        with open(self.path('partial.ndjson'), 'w', encoding='utf-8') as file:
+            file.write("\n".join(json.dumps(record) for record in records))
+
+        with self.assertRaises(TenantBackupError):
+            restore_backup([self.path('partial.ndjson')], replace=True)
+        self.assertTrue(AccountClass.objects.filter(tenant_id=self.tenant_id).exists())
+
+    def test_restore_to_each_tenant_shard(self):
+        """Tester la restauration d'une sauvegarde dont les tenants sont sur des shards différents"""
+        dump_tenants([self.tenant_id], self.path('tenant.ndjson'))
+        other_tenant, class_id = uuid.uuid4(), uuid.uuid4()
+        with open(self.path('tenant.ndjson'), 'a', encoding='utf-8') as file:
+            file.write(json.dumps({"model": "core.accountclass", "pk": str(class_id), "fields": {
+                "tenant_id": str(other_tenant), "number": 4, "name": "Tiers",
+                "created_at": "2025-05-01T07:53:28.727Z", "updated_at": "2025-05-01T07:53:28.727Z"}}) + "\n")
+        expected = snapshot(self.tenant_id)
+        get_shard_directory().assign(self.tenant_id, 'shard_1')
+        self.addCleanup(get_shard_directory().invalidate, self.tenant_id)
+
+        stats = restore_backup([self.path('tenant.ndjson')])
+
+        self.assertEqual((stats['tenants'], stats['shards']), (2, 2))
+        self.assertEqual(snapshot(self.tenant_id, 'shard_1'), expected)
+        self.assertEqual(ChartVersion.objects.using('shard_1').get(tenant_id=self.tenant_id).version, 1)
+        self.assertEqual(AccountClass.objects.using('default').get(tenant_id=other_tenant).pk, class_id)
+        self.assertFalse(AccountClass.objects.using('shard_1').filter(tenant_id=other_tenant).exists())
+
+    def test_account_depths(self):
+        """Tester le calcul de la profondeur des comptes et la détection des cycles"""
+        a, b, c = (Account(pk=uuid.uuid4()) for _ in range(3))
+        b.parent_id, c.parent_id = a.pk, b.pk
+        self.assertEqual(account_depths([c, b, a]), {a.pk: 0, b.pk: 1, c.pk: 2})
+
+        a.parent_id = c.pk
+        with self.assertRaises(TenantBackupError):
+            account_depths([a, b, c])
+
+    def test_commands(self):
+        """Tester les commandes backup_tenant_data et restore_tenant_data"""
+        out = io.StringIO()
+        call_command('backup_tenant_data', '--tenant-id', str(self.tenant_id),
+                     '--output-dir', self.directory.name, stdout=out)
+        path = self.path(f"{self.tenant_id}.ndjson.gz")
+        self.assertTrue(os.path.exists(path))
+
+        out = io.StringIO()
+        call_command('restore_tenant_data', path, '--dry-run', stdout=out)
+        self.assertIn("Simulation terminée", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('restore_tenant_data', path, stdout=io.StringIO())  # lignes déjà présentes
+        call_command('restore_tenant_data', path, '--replace', stdout=out)
+        self.assertIn("Restauration terminée", out.getvalue())
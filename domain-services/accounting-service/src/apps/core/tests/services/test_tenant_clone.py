@@ -0,0 +1,144 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from datetime import date
+import io
+import uuid
+
+from apps.core.models.account import AccountClass, AccountCategory, Account
+from apps.core.models.fiscal_year import FiscalYear, FiscalPeriod
+from apps.core.models.job import Job, JobStatus
+from apps.core.models.tiers import Tiers
+from apps.core.services.jobs import JobWorker
+from apps.core.services.tenant_clone import TenantCloneError, clone_tenant
+from apps.core.views.account_views import AccountViewSet
+
+
+def chart_signature(tenant_id):
+    """Hiérarchie d'un plan exprimée en clés naturelles (indépendante des UUID)"""
+    return set(
+        Account.objects.filter(tenant_id=tenant_id).values_list(
+            'code', 'name', 'parent__code', 'category__code', 'account_class__number',
+            'level', 'type', 'normal_balance'
+        )
+    )
+
+
+class TenantCloneTestCase(TestCase):
+    """Tests pour le clonage d'un tenant modèle côté base"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template_id = uuid.uuid4()
+        Account.create_default_accounts_ohada(cls.template_id)
+
+        fiscal_year = FiscalYear.objects.create(
+            tenant_id=cls.template_id, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31), is_closed=True
+        )
+        FiscalPeriod.objects.bulk_create([
+            FiscalPeriod(tenant_id=cls.template_id, fiscal_year=fiscal_year, name="Janvier", code="FY2025-01",
+                         number=1, start_date=date(2025, 1, 1), end_date=date(2025, 1, 31), is_closed=True),
+            FiscalPeriod(tenant_id=cls.template_id, fiscal_year=fiscal_year, name="Février", code="FY2025-02",
+                         number=2, start_date=date(2025, 2, 1), end_date=date(2025, 2, 28)),
+        ])
+        customers = Account.objects.get(tenant_id=cls.template_id, code="411")
+        Tiers.objects.bulk_create([
+            Tiers(tenant_id=cls.template_id, code="411CLI", name="Client Générique", type="CUSTOMER",
+                  account=customers),
+            # Client réel du modèle : jamais copié
+            Tiers(tenant_id=cls.template_id, code="411DUP", name="Dupont", type="CUSTOMER",
+                  account=customers, email="dupont@example.com", tax_id="CI-123456"),
+        ])
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+
+    def test_clone_preserves_hierarchy(self):
+        """Tester que le plan cloné reproduit la hiérarchie du modèle avec de nouveaux identifiants"""
+        stats = clone_tenant(self.template_id, self.tenant_id)
+
+        template_count = Account.objects.filter(tenant_id=self.template_id).count()
+        self.assertEqual(stats['accounts'], template_count)
+        self.assertEqual(chart_signature(self.tenant_id), chart_signature(self.template_id))
+
+        template_ids = set(Account.objects.filter(tenant_id=self.template_id).values_list('id', flat=True))
+        cloned = Account.objects.filter(tenant_id=self.tenant_id)
+        self.assertFalse(template_ids & set(cloned.values_list('id', flat=True)))
+        self.assertFalse(cloned.filter(parent__tenant_id=self.template_id).exists())
+        self.assertFalse(cloned.filter(category__tenant_id=self.template_id).exists())
+        self.assertEqual(
+            AccountCategory.objects.filter(tenant_id=self.tenant_id, account_class__tenant_id=self.tenant_id).count(),
+            AccountCategory.objects.filter(tenant_id=self.template_id).count()
+        )
+
+    def test_clone_fiscal_and_tiers(self):
+        """Tester la copie des exercices (réouverts) et des tiers rattachés aux comptes clonés"""
+        clone_tenant(self.template_id, self.tenant_id)
+
+        fiscal_year = FiscalYear.objects.get(tenant_id=self.tenant_id, code="FY2025")
+        self.assertFalse(fiscal_year.is_closed)
+        periods = FiscalPeriod.objects.filter(tenant_id=self.tenant_id)
+        self.assertEqual(set(periods.values_list('fiscal_year_id', flat=True)), {fiscal_year.id})
+        self.assertFalse(periods.filter(is_closed=True).exists())
+
+        tiers = Tiers.objects.get(tenant_id=self.tenant_id)
+        self.assertEqual(tiers.code, "411CLI")
+        self.assertEqual(tiers.account.tenant_id, self.tenant_id)
+        self.assertEqual(tiers.account.code, "411")
+
+    def test_clone_query_count_is_constant(self):
+        """Tester que le clonage s'exécute en une poignée de requêtes"""
+        with CaptureQueriesContext(connection) as queries:
+            clone_tenant(self.template_id, self.tenant_id)
+
+        self.assertLessEqual(len(queries), 15)
+
+    def test_clone_into_provisioned_tenant_fails(self):
+        """Tester qu'un tenant qui possède déjà un plan n'est pas écrasé"""
+        AccountClass.objects.create(tenant_id=self.tenant_id, number=1, name="Classe 1")
+
+        with self.assertRaises(TenantCloneError):
+            clone_tenant(self.template_id, self.tenant_id)
+        with self.assertRaises(TenantCloneError):
+            clone_tenant(uuid.uuid4(), uuid.uuid4())
+
+    def test_clone_command(self):
+        """Tester la commande clone_tenant"""
+        out = io.StringIO()
+        call_command('clone_tenant', '--tenant-id', str(self.tenant_id),
+                     '--template-tenant-id', str(self.template_id), '--no-tiers', stdout=out)
+
+        self.assertIn("provisionné", out.getvalue())
+        self.assertTrue(Account.objects.filter(tenant_id=self.tenant_id, code="1011").exists())
+        self.assertFalse(Tiers.objects.filter(tenant_id=self.tenant_id).exists())
+
+    def import_ohada(self, template_tenant_id):
+        request = APIRequestFactory().post(
+            '/api/accounts/import_ohada/', {'template_tenant_id': str(template_tenant_id)}, format='json'
+        )
+        request.tenant_id = self.tenant_id
+        return AccountViewSet.as_view({'post': 'import_ohada'})(request)
+
+    def test_import_ohada_from_template(self):
+        """Tester le mode clonage de l'endpoint import_ohada"""
+        with self.settings(TEMPLATE_TENANT_IDS=[str(self.template_id)]):
+            response = self.import_ohada(self.template_id)
+
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(JobWorker().work(once=True), {JobStatus.SUCCEEDED: 1})
+        job = Job.objects.get(pk=response.data['job_id'])
+        self.assertEqual(job.result['copied']['accounts'],
+                         Account.objects.filter(tenant_id=self.template_id).count())
+
+    @override_settings(TEMPLATE_TENANT_ID=None, TEMPLATE_TENANT_IDS=[])
+    def test_import_ohada_refuses_other_tenants(self):
+        """Tester le refus d'un tenant qui n'est pas un tenant modèle désigné"""
+        response = self.import_ohada(self.template_id)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(self.import_ohada("pas-un-uuid").status_code, 400)
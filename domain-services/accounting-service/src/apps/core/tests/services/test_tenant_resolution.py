@@ -0,0 +1,134 @@
+from django.test import TestCase
+import threading
+import uuid
+
+from apps.core.models.tenant import Tenant, TenantStatus
+from apps.core.services.tenant_resolution import (
+    StaticTenantResolver, TableTenantResolver, TenantCache, TenantInfo
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingResolver:
+    """Resolver de test : compte les appels, peut bloquer ou échouer"""
+
+    def __init__(self, tenants):
+        self.tenants = tenants
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.error = None
+
+    def resolve(self, tenant_id):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.tenants.get(tenant_id)
+
+
+class TenantCacheTestCase(TestCase):
+    """Tests pour le cache des tenants résolus"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        self.info = TenantInfo(self.tenant_id, "Tenant", TenantStatus.ACTIVE, {})
+        self.resolver = CountingResolver({self.tenant_id: self.info})
+        self.clock = FakeClock()
+        self.cache = TenantCache(self.resolver, ttl=60, negative_ttl=5, max_size=2, clock=self.clock)
+
+    def test_ttl(self):
+        """Tester qu'un tenant est résolu une fois par durée de vie"""
+        for _ in range(3):
+            self.assertEqual(self.cache.get(self.tenant_id), self.info)
+        self.assertEqual(self.resolver.calls, 1)
+
+        self.clock.now = 61
+        self.cache.get(self.tenant_id)
+        self.assertEqual(self.resolver.calls, 2)
+        self.assertEqual((self.cache.stats()['hits'], self.cache.stats()['misses']), (2, 2))
+
+    def test_unknown_tenant_is_cached_for_negative_ttl(self):
+        """Tester la mise en cache courte d'un tenant inconnu"""
+        unknown = uuid.uuid4()
+        self.assertIsNone(self.cache.get(unknown))
+        self.assertIsNone(self.cache.get(unknown))
+        self.assertEqual(self.resolver.calls, 1)
+        self.clock.now = 6
+        self.cache.get(unknown)
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_least_recently_used_tenant_is_evicted(self):
+        """Tester la borne du nombre de tenants en cache"""
+        first, second = uuid.uuid4(), uuid.uuid4()
+        self.cache.get(first)
+        self.cache.get(second)
+        self.cache.get(first)
+        self.cache.get(self.tenant_id)
+        self.assertEqual(list(self.cache.entries), [first, self.tenant_id])
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_single_flight_refresh(self):
+        """Tester qu'un seul thread résout un tenant, les autres attendent son résultat"""
+        self.resolver.release.clear()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get(self.tenant_id))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        self.resolver.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [self.info] * 8)
+        self.assertEqual(self.resolver.calls, 1)
+
+    def test_expired_value_served_during_refresh_and_on_error(self):
+        """Tester que la valeur expirée est servie pendant un rafraîchissement ou si le resolver échoue"""
+        self.cache.get(self.tenant_id)
+        self.clock.now = 61
+
+        self.resolver.release.clear()
+        refresh = threading.Thread(target=self.cache.get, args=(self.tenant_id,))
+        refresh.start()
+        while self.resolver.calls < 2:
+            pass
+        self.assertEqual(self.cache.get(self.tenant_id), self.info)
+        self.resolver.release.set()
+        refresh.join()
+
+        self.clock.now = 200
+        self.resolver.error = ConnectionError("tenant-service indisponible")
+        with self.assertLogs('apps.core.services.tenant_resolution', 'ERROR'):
+            self.assertEqual(self.cache.get(self.tenant_id), self.info)
+        self.assertEqual(self.cache.stats()['stale'], 2)
+        with self.assertRaises(ConnectionError):
+            self.cache.get(uuid.uuid4())
+
+
+class TenantResolverTestCase(TestCase):
+    """Tests pour les resolvers de tenants"""
+
+    def test_table_resolver(self):
+        """Tester la résolution depuis la table Tenant, en une requête"""
+        tenant = Tenant.objects.create(name="Acme", status=TenantStatus.SUSPENDED, settings={'currency': 'XOF'})
+        with self.assertNumQueries(1):
+            info = TableTenantResolver().resolve(tenant.pk)
+        self.assertEqual(info, TenantInfo(tenant.pk, "Acme", TenantStatus.SUSPENDED, {'currency': 'XOF'}))
+        self.assertFalse(info.is_active)
+        self.assertIsNone(TableTenantResolver().resolve(uuid.uuid4()))
+
+    def test_static_resolver(self):
+        """Tester le remplaçant local du tenant-service"""
+        tenant_id = uuid.uuid4()
+        resolver = StaticTenantResolver({str(tenant_id): {'name': "Acme"}})
+        with self.assertNumQueries(0):
+            info = resolver.resolve(tenant_id)
+        self.assertEqual((info.name, info.is_active, info.settings), ("Acme", True, {}))
+        self.assertIsNone(resolver.resolve(uuid.uuid4()))
@@ -0,0 +1,131 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+import uuid
+
+from apps.core.models.account import Account
+from apps.core.services.tenant_runner import TenantRunner, read_checkpoint
+
+ROWS = [
+    {"code": "10000000", "libelle": "Capital"},
+    {"code": "10100000", "libelle": "Capital social"},
+    {"code": "28100000", "libelle": "Amortissements des immobilisations incorporelles"},
+    {"code": "41100000", "libelle": "Clients"},
+]
+
+
+class TenantRunnerTestCase(TestCase):
+    """Tests pour l'exécution d'une opération de plan comptable sur plusieurs tenants"""
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenants = [str(uuid.uuid4()) for _ in range(3)]
+        self.directory = tempfile.TemporaryDirectory()
+        self.chart_file = os.path.join(self.directory.name, 'plan.ndjson')
+        with open(self.chart_file, 'w', encoding='utf-8') as file:
+            for row in ROWS:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.checkpoint = os.path.join(self.directory.name, 'rollout.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def task(self, tenant_id, action='import', **options):
+        task = {'action': action, 'tenant_id': tenant_id, 'command': 'import_ohada_8chiffres',
+                'file': self.chart_file, 'batch_size': 2, 'dry_run': False}
+        task.update(options)
+        return task
+
+    def test_import_each_tenant(self):
+        """Tester l'import du plan pour chaque tenant et le résumé agrégé"""
+        summary = TenantRunner([self.task(t) for t in self.tenants], workers=1).run()
+
+        self.assertEqual(summary['ok'], 3)
+        self.assertEqual(summary['failed'], 0)
+        self.assertEqual(summary['rows'], 3 * len(ROWS))
+        for tenant_id in self.tenants:
+            self.assertEqual(Account.objects.filter(tenant_id=tenant_id).count(), len(ROWS))
+
+    def failing_tasks(self):
+        """Tâches dont la deuxième échoue (fichier du plan introuvable)"""
+        tasks = [self.task(t) for t in self.tenants]
+        tasks[1]['file'] = os.path.join(self.directory.name, 'absent.json')
+        return tasks
+
+    def test_failure_is_isolated(self):
+        """Tester qu'un tenant en échec est signalé sans bloquer les autres"""
+        summary = TenantRunner(self.failing_tasks(), workers=1).run()
+
+        self.assertEqual(summary['ok'], 2)
+        self.assertEqual([f['tenant_id'] for f in summary['failures']], [self.tenants[1]])
+        self.assertIn("absent.json", summary['failures'][0]['error'])
+        self.assertFalse(Account.objects.filter(tenant_id=self.tenants[1]).exists())
+        self.assertTrue(Account.objects.filter(tenant_id=self.tenants[2]).exists())
+
+    def test_checkpoint_resume(self):
+        """Tester qu'une reprise ignore les tenants déjà traités avec succès"""
+        TenantRunner(self.failing_tasks(), checkpoint=self.checkpoint).run()
+        self.assertEqual(read_checkpoint(self.checkpoint), {self.tenants[0], self.tenants[2]})
+
+        summary = TenantRunner([self.task(t) for t in self.tenants], checkpoint=self.checkpoint).run()
+
+        self.assertEqual(summary['skipped'], 2)
+        self.assertEqual(summary['ok'], 1)
+        self.assertEqual(read_checkpoint(self.checkpoint), set(self.tenants))
+
+    def test_dry_run_checkpoint_is_ignored_by_real_run(self):
+        """Tester qu'une exécution réelle ne saute pas les tenants seulement simulés"""
+        TenantRunner([self.task(t) for t in self.tenants]).run()
+        Account.objects.filter(code="28100000").update(is_amortization_depreciation=False)
+        tasks = [self.task(t, 'reclassify', dry_run=True) for t in self.tenants]
+
+        TenantRunner(tasks, checkpoint=self.checkpoint).run()
+        self.assertEqual(read_checkpoint(self.checkpoint, 'reclassify'), set())
+        self.assertEqual(read_checkpoint(self.checkpoint, 'reclassify', dry_run=True), set(self.tenants))
+        self.assertEqual(TenantRunner(tasks, checkpoint=self.checkpoint).run()['skipped'], 3)
+
+        summary = TenantRunner([self.task(t, 'reclassify') for t in self.tenants], checkpoint=self.checkpoint).run()
+        self.assertEqual((summary['skipped'], summary['ok']), (0, 3))
+        self.assertEqual(Account.objects.filter(code="28100000", is_amortization_depreciation=True).count(), 3)
+
+    def test_sync_and_reclassify(self):
+        """Tester les actions sync et reclassify"""
+        TenantRunner([self.task(t) for t in self.tenants]).run()
+        Account.objects.filter(code="28100000").update(is_amortization_depreciation=False, normal_balance="DEBIT")
+
+        summary = TenantRunner([self.task(t, 'reclassify', dry_run=True) for t in self.tenants]).run()
+        self.assertEqual(summary['rows'], 3 * len(ROWS))
+        self.assertFalse(Account.objects.filter(code="28100000", is_amortization_depreciation=True).exists())
+
+        results = []
+        TenantRunner([self.task(t, 'reclassify') for t in self.tenants], on_result=results.append).run()
+        self.assertEqual([r['details']['changed'] for r in results], [1, 1, 1])
+        self.assertEqual(Account.objects.filter(code="28100000", is_amortization_depreciation=True).count(), 3)
+
+        summary = TenantRunner([self.task(t, 'sync') for t in self.tenants]).run()
+        self.assertEqual(summary['ok'], 3)
+
+    def test_rollout_command(self):
+        """Tester la commande chart_rollout avec un fichier de tenants"""
+        tenants_file = os.path.join(self.directory.name, 'tenants.txt')
+        with open(tenants_file, 'w', encoding='utf-8') as file:
+            file.write("# tenants\n" + "\n".join(self.tenants) + "\n")
+
+        out = io.StringIO()
+        call_command('chart_rollout', 'import', '--tenants-file', tenants_file, '--file', self.chart_file,
+                     '--workers', '1', '--checkpoint', self.checkpoint, stdout=out)
+        self.assertIn("3 tenants traités, 0 en échec", out.getvalue())
+
+        out = io.StringIO()
+        call_command('chart_rollout', 'sync', '--all-tenants', '--file', self.chart_file,
+                     '--workers', '2', '--dry-run', stdout=out)
+        self.assertIn("3 tenants traités", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('chart_rollout', 'import', '--tenant-id', self.tenants[0], '--dry-run', stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command('chart_rollout', 'import', '--tenant-id', 'abc', stdout=io.StringIO())
@@ -0,0 +1,280 @@
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from datetime import date
+from unittest import mock
+import io
+import json
+import os
+import tempfile
+import uuid
+
+from apps.core.models.account import AccountClass, Account, AccountType, ChartVersion
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.journal import Journal
+from apps.core.models.tenant import TenantShard, TenantShardStatus
+from apps.core.models.tiers import Tiers
+from apps.core.models.transaction import TransactionLine
+from apps.core.services.ledger_posting import post_entries
+from apps.core.services.tenant_clone import TenantCloneError, clone_tenant
+from apps.core.services.tenant_move import MODELS, TenantMover, TenantMoveError
+from apps.core.services.tenant_runner import TenantRunner
+from apps.core.services.tenant_sharding import get_shard_directory, is_tenant_model
+from apps.core.tenant_context import tenant_context
+from apps.core.tests.services.test_tenant_runner import ROWS
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+SHARDING = {'SHARDS': ['default', 'shard_1'], 'DEFAULT_SHARD': 'default', 'DIRECTORY_TTL': 60}
+
+
+@override_settings(TENANT_SHARDING=SHARDING)
+class TenantShardRouterTestCase(TestCase):
+    """Tests pour le routage des modèles multi-tenants vers le shard de leur tenant"""
+    databases = {'default', 'shard_1'}
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        get_shard_directory().assign(self.tenant_id, 'shard_1')
+
+    def test_rows_follow_their_tenant(self):
+        """Tester que créations, lectures et relations passent par le shard du tenant"""
+        account_class = AccountClass.objects.create(tenant_id=self.tenant_id, number=4, name="Tiers")
+        account = Account.objects.create(
+            tenant_id=self.tenant_id, code="401", name="Fournisseurs", account_class=account_class,
+            type=AccountType.LIABILITY
+        )
+        AccountClass.objects.create(tenant_id=TENANT_ID, number=4, name="Tiers")
+
+        self.assertEqual((account_class._state.db, account._state.db), ('shard_1', 'shard_1'))
+        self.assertEqual(AccountClass.objects.using('shard_1').get().tenant_id, self.tenant_id)
+        self.assertEqual(AccountClass.objects.using('default').get().tenant_id, TENANT_ID)
+        self.assertEqual(AccountClass.objects.for_tenant(self.tenant_id).get(), account_class)
+        self.assertEqual(list(account_class.accounts.all()), [account])
+        with tenant_context(self.tenant_id):
+            self.assertEqual(Account.tenant_objects.get(code="401"), account)
+            self.assertEqual(AccountClass.objects.get(), account_class)
+
+    def test_copy_to_another_database(self):
+        """Tester la copie d'un compte lu vers une autre base avec save(using=...)"""
+        account_class = AccountClass.objects.create(tenant_id=TENANT_ID, number=4, name="Tiers")
+        Account.objects.create(
+            tenant_id=TENANT_ID, code="401", name="Fournisseurs", account_class=account_class,
+            type=AccountType.LIABILITY
+        )
+        account = Account.objects.using('default').get(code="401")
+        account_class.save(using='shard_1')
+        account.save(using='shard_1')
+
+        copy = Account.objects.using('shard_1').get(pk=account.pk)
+        self.assertEqual((copy.code, copy.path, copy.depth), ("401", account.path, 0))
+        self.assertTrue(Account.objects.using('default').filter(pk=account.pk).exists())
+
+    def test_directory_is_cached(self):
+        """Tester qu'un tenant connu est routé sans lire l'annuaire"""
+        directory = get_shard_directory()
+        self.assertEqual(directory.alias_for(self.tenant_id), 'shard_1')
+        with self.assertNumQueries(0):
+            self.assertEqual(directory.alias_for(self.tenant_id), 'shard_1')
+            self.assertEqual(directory.alias_for(str(self.tenant_id)), 'shard_1')
+        self.assertEqual(directory.alias_for(uuid.uuid4()), 'default')
+
+    def test_every_tenant_model_is_moved(self):
+        """Tester que le déplacement couvre tous les modèles routés par tenant"""
+        routed = {model for model in apps.get_app_config('core').get_models() if is_tenant_model(model)}
+        self.assertEqual(routed, set(MODELS))
+        self.assertFalse(is_tenant_model(TenantShard))
+
+    def test_writes_refused_while_moving(self):
+        """Tester le refus des écritures d'un tenant en cours de déplacement"""
+        get_shard_directory().assign(TENANT_ID, 'default', TenantShardStatus.MOVING)
+        url = '/api/accounting/account-classes/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.post(url, {'number': 1, 'name': "Capitaux"}, content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
+
+
+@override_settings(TENANT_SHARDING=SHARDING)
+class TenantMoveTestCase(TestCase):
+    """Tests pour le déplacement d'un tenant vers un autre shard"""
+    databases = {'default', 'shard_1'}
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        Account.create_default_accounts_ohada(self.tenant_id)
+        customers = Account.objects.get(tenant_id=self.tenant_id, code="411")
+        for code, name in (("411DUP", "Dupont"), ("411MAR", "Martin")):
+            Tiers.objects.create(tenant_id=self.tenant_id, code=code, name=name, account=customers, type='CUSTOMER')
+        Journal.objects.create(tenant_id=self.tenant_id, code="OD", name="Opérations diverses")
+        FiscalYear.objects.create(
+            tenant_id=self.tenant_id, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        ).create_periods()
+        post_entries(self.tenant_id, [
+            {'journal': "OD", 'date': date(2025, 3, 15), 'lines': [
+                {'account': "601", 'debit': "100.00"}, {'account': "401", 'credit': "100.00"},
+            ]},
+        ])
+        self.counts = {
+            model._meta.model_name: model.objects.using('default').filter(tenant_id=self.tenant_id).count()
+            for model in MODELS
+        }
+
+    def test_move_with_writes_during_copy(self):
+        """Tester la copie, le rattrapage des écritures faites pendant la copie et la bascule"""
+        directory_states = []
+
+        def writes_during_copy(seconds):
+            directory_states.append(get_shard_directory().get(self.tenant_id))
+            if len(directory_states) > 1:
+                return
+            # Écritures acceptées pendant la copie, donc absentes de celle-ci
+            source = Account.objects.using('default').filter(tenant_id=self.tenant_id)
+            source.filter(code="601").update(name="Achats de marchandises (modifié)")
+            Journal.objects.using('default').create(tenant_id=self.tenant_id, code="AC", name="Achats")
+            Tiers.objects.using('default').filter(tenant_id=self.tenant_id).order_by('code').first().delete()
+
+        stats = TenantMover(self.tenant_id, 'shard_1', batch_size=50, wait=0, sleep=writes_during_copy).move()
+
+        # Gel pendant le rattrapage, puis délai avant la suppression de la source
+        self.assertEqual(directory_states, [
+            ('default', TenantShardStatus.MOVING), ('shard_1', TenantShardStatus.ACTIVE)
+        ])
+        self.assertEqual(stats['counts'], self.counts)
+        self.assertEqual(stats['resynced'], 3)
+        self.assertEqual(get_shard_directory().get(self.tenant_id), ('shard_1', TenantShardStatus.ACTIVE))
+        for model in MODELS:
+            self.assertFalse(model.objects.using('default').filter(tenant_id=self.tenant_id).exists())
+        with tenant_context(self.tenant_id):
+            self.assertEqual(Account.tenant_objects.get(code="601").name, "Achats de marchandises (modifié)")
+            self.assertEqual(Journal.objects.filter(tenant_id=self.tenant_id).count(), 2)
+            self.assertEqual(TransactionLine.objects.filter(tenant_id=self.tenant_id).count(), 2)
+            supplier = Account.tenant_objects.get(code="401")
+        self.assertEqual((supplier._state.db, supplier.parent._state.db), ('shard_1', 'shard_1'))
+
+    def test_failed_move_keeps_the_tenant_on_its_shard(self):
+        """Tester l'abandon d'un déplacement : copie supprimée, tenant réactivé sur la source"""
+        with mock.patch.object(TenantMover, 'verify', side_effect=TenantMoveError("écarts")):
+            with self.assertRaises(TenantMoveError):
+                TenantMover(self.tenant_id, 'shard_1', wait=0).move()
+        self.assertEqual(get_shard_directory().get(self.tenant_id), ('default', TenantShardStatus.ACTIVE))
+        self.assertFalse(TenantShard.objects.exists())
+        for model in MODELS:
+            self.assertFalse(model.objects.using('shard_1').filter(tenant_id=self.tenant_id).exists())
+        self.assertEqual(Account.objects.using('default').filter(tenant_id=self.tenant_id).count(),
+                         self.counts['account'])
+
+    def test_command(self):
+        """Tester la commande move_tenant et le refus d'une cible déjà occupée"""
+        output = io.StringIO()
+        call_command('move_tenant', tenant_id=str(self.tenant_id), to='shard_1', wait=0, keep_source=True,
+                     stdout=output)
+        self.assertIn("vers 'shard_1'", output.getvalue())
+        self.assertEqual(
+            Account.objects.using('shard_1').filter(tenant_id=self.tenant_id).count(), self.counts['account']
+        )
+        self.assertEqual(
+            Account.objects.using('default').filter(tenant_id=self.tenant_id).count(), self.counts['account']
+        )
+        with self.assertRaisesMessage(TenantMoveError, "déjà sur le shard"):
+            TenantMover(self.tenant_id, 'shard_1')
+        with self.assertRaisesMessage(TenantMoveError, "absent de SHARDS"):
+            TenantMover(self.tenant_id, 'shard_2')
+
+
+@override_settings(TENANT_SHARDING=SHARDING)
+class TenantShardCommandsTestCase(TestCase):
+    """Tests pour le routage des imports, synchronisations, reclassements et clonages hors requête"""
+    databases = {'default', 'shard_1'}
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.tenant_id = uuid.uuid4()
+        get_shard_directory().assign(self.tenant_id, 'shard_1')
+        self.directory = tempfile.TemporaryDirectory()
+        self.chart_file = os.path.join(self.directory.name, 'plan.ndjson')
+        with open(self.chart_file, 'w', encoding='utf-8') as file:
+            for row in ROWS:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def import_chart(self, tenant_id, *args):
+        output = io.StringIO()
+        call_command('import_ohada_8chiffres', '--tenant-id', str(tenant_id), '--file', self.chart_file, *args,
+                     stdout=output)
+        return output.getvalue()
+
+    def accounts(self, alias, tenant_id=None):
+        return Account.objects.using(alias).filter(tenant_id=tenant_id or self.tenant_id)
+
+    def test_import_and_sync(self):
+        """Tester que l'import et la synchronisation lisent et écrivent le shard du tenant"""
+        self.import_chart(self.tenant_id)
+        self.assertEqual(self.accounts('shard_1').count(), len(ROWS))
+        self.assertFalse(self.accounts('default').exists())
+        self.assertEqual(ChartVersion.objects.using('shard_1').get(tenant_id=self.tenant_id).version, 1)
+
+        # Le plan existant est retrouvé sur le shard : rien à ajouter
+        self.assertIn(f"0 comptes ajoutés, 0 mis à jour, 0 désactivés, {len(ROWS)} inchangés", self.import_chart(self.tenant_id, '--sync', '--dry-run'))
+        self.import_chart(self.tenant_id, '--replace')
+        self.assertEqual(self.accounts('shard_1').count(), len(ROWS))
+        self.assertFalse(self.accounts('default').exists())
+
+    def test_reclassify(self):
+        """Tester le reclassement d'un tenant, puis de tous les shards"""
+        self.import_chart(self.tenant_id)
+        self.accounts('shard_1').filter(code="28100000").update(is_amortization_depreciation=False)
+
+        output = io.StringIO()
+        call_command('reclassify_accounts', '--tenant-id', str(self.tenant_id), stdout=output)
+        self.assertIn(f"1 comptes reclassés sur {len(ROWS)} analysés", output.getvalue())
+        self.assertTrue(self.accounts('shard_1').get(code="28100000").is_amortization_depreciation)
+
+        other_tenant = uuid.uuid4()
+        self.import_chart(other_tenant)
+        Account.objects.using('shard_1').filter(code="28100000").update(is_amortization_depreciation=False)
+        Account.objects.using('default').filter(code="28100000").update(is_amortization_depreciation=False)
+        output = io.StringIO()
+        call_command('reclassify_accounts', stdout=output)
+        self.assertIn(f"2 comptes reclassés sur {2 * len(ROWS)} analysés", output.getvalue())
+
+    def test_rollout_all_tenants(self):
+        """Tester que --all-tenants déploie les tenants de chaque shard"""
+        other_tenant = uuid.uuid4()
+        self.import_chart(self.tenant_id)
+        self.import_chart(other_tenant)
+        Account.objects.using('shard_1').filter(code="28100000").update(is_amortization_depreciation=False)
+
+        output = io.StringIO()
+        call_command('chart_rollout', 'reclassify', '--all-tenants', '--workers', '2', stdout=output)
+        self.assertIn("2 tenants traités, 0 en échec", output.getvalue())
+        self.assertTrue(self.accounts('shard_1').get(code="28100000").is_amortization_depreciation)
+
+    def test_runner(self):
+        """Tester l'exécution d'un import par le runner multi-tenants"""
+        task = {'action': 'import', 'tenant_id': str(self.tenant_id), 'command': 'import_ohada_8chiffres',
+                'file': self.chart_file, 'batch_size': 2, 'dry_run': False}
+        self.assertEqual(TenantRunner([task], workers=1).run()['ok'], 1)
+        self.assertEqual(self.accounts('shard_1').count(), len(ROWS))
+        self.assertFalse(self.accounts('default').exists())
+
+    def test_clone(self):
+        """Tester le clonage sur le shard du tenant et le refus d'un modèle situé sur un autre shard"""
+        template_id = uuid.uuid4()
+        self.import_chart(template_id)
+        with self.assertRaisesMessage(TenantCloneError, "sur le shard 'default'"):
+            clone_tenant(template_id, self.tenant_id)
+
+        get_shard_directory().assign(template_id, 'shard_1')
+        self.import_chart(template_id)
+        stats = clone_tenant(template_id, self.tenant_id, include_fiscal=False, include_tiers=False)
+        self.assertEqual(stats['accounts'], len(ROWS))
+        self.assertEqual(self.accounts('shard_1').count(), len(ROWS))
+        self.assertFalse(self.accounts('default').exists())
+        self.assertEqual(ChartVersion.objects.using('shard_1').get(tenant_id=self.tenant_id).version, 1)
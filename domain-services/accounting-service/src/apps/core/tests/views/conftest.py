@@ -0,0 +1,79 @@
+"""
+Fixtures pour les tests des vues.
+"""
+
+import uuid
+import pytest
+from datetime import date
+from rest_framework.test import APIClient
+
+from apps.core.models.account import AccountClass, AccountCategory, Account, AccountType
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.job import Job, JobStatus
+from apps.core.models.tiers import Tiers
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+
+@pytest.fixture
+def api_client():
+    """Client de l'API"""
+    return APIClient()
+
+
+@pytest.fixture
+def seed_tenant():
+    """
+    Fonction qui ajoute au tenant `size` éléments de chaque ressource de l'API :
+    classes, catégories, comptes (parent et enfant), tiers, exercices avec leurs
+    périodes et jobs. Des appels successifs complètent les données déjà créées.
+    """
+    # Numéros des classes créées à chaque appel ; la classe 4 (tiers) est commune
+    numbers = [1, 2, 3, 5, 6, 7, 8, 9]
+    created = {'count': 0, 'third_party': None}
+
+    def seed(size):
+        if created['third_party'] is None:
+            third_party_class = AccountClass.objects.create(tenant_id=TENANT_ID, number=4, name="Tiers")
+            created['third_party'] = Account.objects.create(
+                tenant_id=TENANT_ID, code="41", name="Clients", account_class=third_party_class,
+                type=AccountType.ASSET, level=1
+            )
+        for index in range(created['count'], created['count'] + size):
+            number = numbers[index]
+            account_class = AccountClass.objects.create(
+                tenant_id=TENANT_ID, number=number, name=f"Classe {number}"
+            )
+            category = AccountCategory.objects.create(
+                tenant_id=TENANT_ID, account_class=account_class, code=f"{number}0", name=f"Catégorie {index}"
+            )
+            parent = Account.objects.create(
+                tenant_id=TENANT_ID, code=f"{number}0", name=f"Compte {index}", account_class=account_class,
+                category=category, type=AccountType.ASSET, level=1
+            )
+            Account.objects.create(
+                tenant_id=TENANT_ID, code=f"{number}01", name=f"Sous-compte {index}",
+                account_class=account_class, category=category, parent=parent, type=AccountType.ASSET, level=2
+            )
+            customer = Account.objects.create(
+                tenant_id=TENANT_ID, code=f"411{index:02d}", name=f"Client {index}",
+                account_class=created['third_party'].account_class, parent=created['third_party'],
+                type=AccountType.ASSET, level=2
+            )
+            Tiers.objects.create(
+                tenant_id=TENANT_ID, code=f"411CL{chr(ord('A') + index)}", name=f"Tiers {index}",
+                account=customer, type='CUSTOMER'
+            )
+            fiscal_year = FiscalYear.objects.create(
+                tenant_id=TENANT_ID, name=f"Exercice {2000 + index}", code=f"FY{2000 + index}",
+                start_date=date(2000 + index, 1, 1), end_date=date(2000 + index, 12, 31)
+            )
+            fiscal_year.create_periods()
+            Job.objects.create(
+                tenant_id=TENANT_ID, kind='create_periods', dedupe_key=f"create_periods:{fiscal_year.pk}",
+                params={'fiscal_year_id': str(fiscal_year.pk)}, status=JobStatus.SUCCEEDED, progress=100
+            )
+        created['count'] += size
+
+    return seed
@@ -0,0 +1,90 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+import uuid
+
+from apps.core.models.account import Account, ChartVersion
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+TREE_URL = '/api/accounting/accounts/tree/'
+
+
+class AccountTreeViewTestCase(TestCase):
+    """Tests pour l'arborescence du plan comptable (/accounts/tree/)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Account.create_default_accounts_ohada(TENANT_ID)
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.client = APIClient()
+        self.accounts = Account.objects.filter(tenant_id=TENANT_ID)
+
+    def flatten(self, nodes, parent=None):
+        """Couples (id, parent) de l'arborescence, en vérifiant l'ordre des frères"""
+        codes = [node['code'] for node in nodes]
+        self.assertEqual(codes, sorted(codes))
+        pairs = []
+        for node in nodes:
+            pairs.append((uuid.UUID(str(node['id'])), parent))
+            pairs.extend(self.flatten(node['children'], uuid.UUID(str(node['id']))))
+        return pairs
+
+    def test_full_tree_in_one_query(self):
+        """Tester que l'arborescence complète est lue en une requête sur les comptes"""
+        with self.assertNumQueries(2):  # version du plan, puis comptes
+            response = self.client.get(TREE_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], self.accounts.count())
+
+        pairs = self.flatten(response.data['results'])
+        self.assertEqual(sorted(pairs, key=str), sorted(self.accounts.values_list('id', 'parent_id'), key=str))
+
+    def test_root_and_depth(self):
+        """Tester la restriction à un sous-arbre et à une profondeur"""
+        account = self.accounts.get(code="41")
+        response = self.client.get(TREE_URL, {'root': str(account.id), 'depth': 1})
+        self.assertEqual(response.status_code, 200)
+        [root] = response.data['results']
+        self.assertEqual(root['code'], "41")
+        children = set(self.accounts.filter(parent=account).values_list('id', flat=True))
+        self.assertEqual({node['id'] for node in root['children']}, children)
+        self.assertTrue(all(node['children'] == [] for node in root['children']))
+
+        response = self.client.get(TREE_URL, {'depth': 0})
+        self.assertEqual(response.data['count'], self.accounts.filter(parent__isnull=True).count())
+
+    def test_etag_revalidation(self):
+        """Tester le 304 sans lecture des comptes, puis l'invalidation après une écriture"""
+        response = self.client.get(TREE_URL)
+        etag = response['ETag']
+        self.assertNotEqual(etag, self.client.get(TREE_URL, {'depth': 1})['ETag'])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(TREE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        account = self.accounts.get(code="41")
+        account.name = "Clients et comptes rattachés"
+        account.save()
+        response = self.client.get(TREE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_chart_writes_bump_version(self):
+        """Tester que les écritures groupées et unitaires incrémentent la version du plan"""
+        tenant_id = uuid.uuid4()
+        self.assertEqual(ChartVersion.current(tenant_id), 0)
+        Account.create_default_accounts_ohada(tenant_id)
+        self.assertEqual(ChartVersion.current(tenant_id), 1)
+        Account.objects.filter(tenant_id=tenant_id, code="41").get().delete()
+        self.assertEqual(ChartVersion.current(tenant_id), 2)
+
+    def test_invalid_parameters(self):
+        """Tester les paramètres invalides et un compte racine inconnu"""
+        self.assertEqual(self.client.get(TREE_URL, {'root': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(TREE_URL, {'depth': '-1'}).status_code, 400)
+        self.assertEqual(self.client.get(TREE_URL, {'root': str(uuid.uuid4())}).status_code, 404)
@@ -0,0 +1,111 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from datetime import date
+import csv
+import io
+import json
+import unittest
+import uuid
+
+from apps.core import exports
+from apps.core.models.account import Account
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.tiers import Tiers
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+
+class ExportTestCase(TestCase):
+    """Tests pour les exports en flux des listes (?export=csv|ndjson|xlsx)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Account.create_default_accounts_ohada(TENANT_ID)
+        cls.supplier_account = Account.objects.get(tenant_id=TENANT_ID, code="401")
+        cls.customer_account = Account.objects.get(tenant_id=TENANT_ID, code="411")
+        Tiers.objects.bulk_create([
+            Tiers(tenant_id=TENANT_ID, code=f"401F{number:02d}", name=f"Fournisseur {number}",
+                  account=cls.supplier_account, type='SUPPLIER', email=f"f{number}@example.com")
+            for number in range(30)
+        ] + [
+            Tiers(tenant_id=TENANT_ID, code=f"411C{number:02d}", name=f"Client {number}",
+                  account=cls.customer_account, type='CUSTOMER')
+            for number in range(5)
+        ])
+        for year in (2024, 2025):
+            FiscalYear.objects.create(
+                tenant_id=TENANT_ID, name=f"Exercice {year}", code=f"FY{year}",
+                start_date=date(year, 1, 1), end_date=date(year, 12, 31)
+            ).create_periods()
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.client = APIClient()
+
+    def export(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return response
+
+    def test_csv_export_respects_filters_without_pagination(self):
+        """Tester l'export CSV des comptes filtrés, toutes pages confondues"""
+        parent = Account.objects.get(tenant_id=TENANT_ID, code="40")
+        response = self.export('/api/accounting/accounts/', {'export': 'csv', 'parent': parent.pk})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="account.csv"')
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        expected = list(Account.objects.filter(tenant_id=TENANT_ID, parent=parent).order_by('code'))
+        self.assertEqual([row['code'] for row in rows], [account.code for account in expected])
+        self.assertEqual(rows[0]['parent'], str(parent.pk))
+        self.assertEqual(rows[0]['parent_name'], parent.name)
+        self.assertEqual(rows[0]['type_display'], expected[0].get_type_display())
+
+        response = self.export('/api/accounting/accounts/', {'export': 'csv', 'q': 'fournisseurs', 'is_active': 'true'})
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertTrue(rows)
+        self.assertTrue(all('fournisseurs' in row['name'].lower() for row in rows))
+
+    def test_ndjson_export_of_tiers(self):
+        """Tester l'export NDJSON des tiers avec les filtres type et account"""
+        response = self.export('/api/accounting/tiers/', {
+            'export': 'ndjson', 'type': 'SUPPLIER', 'account': self.supplier_account.pk
+        })
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(lines), 30)
+        self.assertEqual(lines[0]['code'], "401F00")
+        self.assertEqual(lines[0]['account_code'], "401")
+        self.assertEqual(lines[0]['email'], "f0@example.com")
+        self.assertEqual(lines[0]['type_display'], "Fournisseur")
+
+    def test_fiscal_periods_export(self):
+        """Tester l'export des périodes d'un exercice"""
+        fiscal_year = FiscalYear.objects.get(tenant_id=TENANT_ID, code="FY2025")
+        response = self.export('/api/accounting/fiscal-periods/', {'export': 'csv', 'fiscal_year': fiscal_year.pk})
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['number'] for row in rows], [str(number) for number in range(1, 13)])
+        self.assertEqual(rows[0]['start_date'], "2025-01-01")
+        self.assertEqual(rows[0]['is_closed'], "False")
+
+    def test_unknown_format(self):
+        """Tester le refus d'un format d'export inconnu"""
+        response = self.client.get('/api/accounting/tiers/', {'export': 'pdf'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("csv, ndjson, xlsx", response.data['error'])
+
+    @unittest.skipIf(exports.openpyxl is None, "openpyxl n'est pas installé")
+    def test_xlsx_export(self):
+        """Tester l'export XLSX écrit en mode write_only"""
+        response = self.export('/api/accounting/tiers/', {'export': 'xlsx', 'type': 'CUSTOMER'})
+        workbook = exports.openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        rows = list(workbook.active.values)
+        self.assertEqual(rows[0][:3], ('id', 'code', 'name'))
+        self.assertEqual([row[1] for row in rows[1:]], [f"411C{number:02d}" for number in range(5)])
+
+    @unittest.skipIf(exports.openpyxl is not None, "openpyxl est installé")
+    def test_xlsx_export_without_openpyxl(self):
+        """Tester le refus de l'export XLSX sans openpyxl"""
+        response = self.client.get('/api/accounting/tiers/', {'export': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("openpyxl", response.data['error'])
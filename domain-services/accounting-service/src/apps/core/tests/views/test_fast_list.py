@@ -0,0 +1,92 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from datetime import date
+import json
+import uuid
+
+from apps.core.models.account import Account, AccountCategory
+from apps.core.models.fiscal_year import FiscalYear, FiscalPeriod
+from apps.core.models.tiers import Tiers
+from apps.core.serializers.account_serializers import AccountSerializer, AccountCategorySerializer
+from apps.core.serializers.fiscal_year_serializers import FiscalPeriodSerializer
+from apps.core.serializers.tiers_serializers import TiersListSerializer
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+
+class ValuesListTestCase(TestCase):
+    """Tests pour les listes lues par .values() sans sérialiseur"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Account.create_default_accounts_ohada(TENANT_ID)
+        account = Account.objects.get(tenant_id=TENANT_ID, code="401")
+        Tiers.objects.bulk_create([
+            Tiers(tenant_id=TENANT_ID, code=f"401F{number:02d}", name=f"Fournisseur {number}", account=account,
+                  type='SUPPLIER' if number % 2 else 'CUSTOMER')
+            for number in range(25)
+        ])
+        FiscalYear.objects.create(
+            tenant_id=TENANT_ID, name="Exercice 2025", code="FY2025",
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        ).create_periods()
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.client = APIClient()
+
+    def assertSameAsSerializer(self, url, params, serializer_class, queryset):
+        """Compare la liste rapide au rendu du sérialiseur pour les mêmes lignes"""
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.content)['results']
+        ids = [row['id'] for row in results]
+        instances = {str(instance.pk): instance for instance in queryset.filter(pk__in=ids)}
+        expected = JSONRenderer().render(serializer_class([instances[pk] for pk in ids], many=True).data)
+        self.assertEqual(results, json.loads(expected))
+        self.assertTrue(results)
+        return results
+
+    def test_accounts(self):
+        """Tester les comptes : jointures classe, catégorie, parent et libellé du type"""
+        with self.assertNumQueries(2):  # total, puis page
+            response = self.client.get('/api/accounting/accounts/', {'page': 5})
+        self.assertEqual(response.status_code, 200)
+        results = self.assertSameAsSerializer(
+            '/api/accounting/accounts/', {'page': 5}, AccountSerializer, Account.objects.all()
+        )
+        self.assertTrue(all(row['parent_name'] for row in results))
+
+        # Comme ReadOnlyField, parent_name est omis pour un compte sans parent
+        results = self.assertSameAsSerializer(
+            '/api/accounting/accounts/', {'parent': "null"}, AccountSerializer, Account.objects.all()
+        )
+        self.assertNotIn('parent_name', results[0])
+
+    def test_categories_periods_and_tiers(self):
+        """Tester les catégories, les périodes fiscales et les tiers"""
+        self.assertSameAsSerializer(
+            '/api/accounting/account-categories/', {}, AccountCategorySerializer, AccountCategory.objects.all()
+        )
+        self.assertSameAsSerializer(
+            '/api/accounting/fiscal-periods/', {}, FiscalPeriodSerializer, FiscalPeriod.objects.all()
+        )
+        results = self.assertSameAsSerializer(
+            '/api/accounting/tiers/', {'page': 2}, TiersListSerializer, Tiers.objects.all()
+        )
+        self.assertEqual({row['type_display'] for row in results}, {"Client", "Fournisseur"})
+
+    def test_cursor_pagination_on_values(self):
+        """Tester la pagination par curseur sur un tri absent des colonnes de la liste"""
+        response = self.client.get('/api/accounting/tiers/', {'pagination': "cursor", 'ordering': "-created_at"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_browsable_api_uses_serializer(self):
+        """Tester que l'API navigable passe toujours par le sérialiseur"""
+        response = self.client.get('/api/accounting/tiers/', HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Fournisseur 0', response.content)
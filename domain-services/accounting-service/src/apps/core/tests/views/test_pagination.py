@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from datetime import date
+import uuid
+
+from apps.core.models.account import Account
+from apps.core.models.fiscal_year import FiscalYear
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+ACCOUNTS_URL = '/api/accounting/accounts/'
+
+
+class KeysetPaginationTestCase(TestCase):
+    """Tests pour la pagination par numéro de page et par curseur"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Account.create_default_accounts_ohada(TENANT_ID)
+        for year in (2024, 2025):
+            FiscalYear.objects.create(
+                tenant_id=TENANT_ID, name=f"Exercice {year}", code=f"FY{year}",
+                start_date=date(year, 1, 1), end_date=date(year, 12, 31)
+            ).create_periods()
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.client = APIClient()
+        self.codes = list(Account.objects.filter(tenant_id=TENANT_ID).order_by('code').values_list('code', flat=True))
+
+    def walk(self, url, params):
+        """Pages successives en suivant les liens next ; renvoie les réponses"""
+        pages = [self.client.get(url, params)]
+        while pages[-1].data['next']:
+            self.assertEqual(pages[-1].status_code, 200)
+            pages.append(self.client.get(pages[-1].data['next']))
+        return pages
+
+    def test_page_numbers_unchanged(self):
+        """Tester que les clients par numéro de page reçoivent la même réponse qu'avant"""
+        response = self.client.get(ACCOUNTS_URL, {'page': 2})
+        self.assertEqual(list(response.data), ['count', 'next', 'previous', 'results'])
+        self.assertEqual(response.data['count'], len(self.codes))
+        self.assertEqual([row['code'] for row in response.data['results']], self.codes[20:40])
+
+    def test_cursor_walk_covers_every_row_once(self):
+        """Tester le parcours complet par curseur, puis le retour à la page précédente"""
+        pages = self.walk(ACCOUNTS_URL, {'pagination': "cursor"})
+        codes = [row['code'] for page in pages for row in page.data['results']]
+        self.assertEqual(codes, self.codes)
+        self.assertNotIn('count', pages[0].data)
+        self.assertIsNone(pages[0].data['previous'])
+
+        back = self.client.get(pages[3].data['previous'])
+        self.assertEqual(back.data['results'], pages[2].data['results'])
+        self.assertEqual(back.data['next'], pages[2].data['next'])
+
+    def test_deep_cursor_page_has_no_offset_nor_count(self):
+        """Tester qu'une page lointaine est lue par une requête triée, sans OFFSET ni COUNT"""
+        pages = self.walk(ACCOUNTS_URL, {'pagination': "cursor"})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(pages[-2].data['next'])
+        self.assertEqual(response.status_code, 200)
+        # Les autres requêtes sont celles du sérialiseur (relations, lues par clé primaire)
+        [query] = [query['sql'] for query in context.captured_queries if 'ORDER BY' in query['sql']]
+        self.assertNotIn('OFFSET', query.upper())
+        self.assertNotIn('COUNT(', query.upper())
+
+    def test_count_modes(self):
+        """Tester le total omis en mode page et demandé en mode curseur"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(ACCOUNTS_URL, {'page': 3, 'count': "none"})
+        self.assertNotIn('count', response.data)
+        self.assertIn('page=4', response.data['next'])
+        self.assertFalse([query for query in context.captured_queries if 'COUNT(' in query['sql'].upper()])
+
+        response = self.client.get(ACCOUNTS_URL, {'pagination': "cursor", 'count': "approximate"})
+        self.assertEqual(response.data['count'], len(self.codes))
+        self.assertEqual(self.client.get(ACCOUNTS_URL, {'count': "maybe"}).status_code, 400)
+
+    def test_cursor_ordering(self):
+        """Tester le tri du curseur sur ?ordering et sur cursor_ordering de la vue"""
+        pages = self.walk(ACCOUNTS_URL, {'pagination': "cursor", 'ordering': "-code"})
+        self.assertEqual([row['code'] for page in pages for row in page.data['results']], self.codes[::-1])
+
+        pages = self.walk('/api/accounting/fiscal-periods/', {'pagination': "cursor"})
+        starts = [row['start_date'] for page in pages for row in page.data['results']]
+        self.assertEqual(len(starts), 24)
+        self.assertEqual(starts, sorted(starts))
+
+        self.assertEqual(self.client.get(ACCOUNTS_URL, {'cursor': "not-a-cursor"}).status_code, 404)
@@ -0,0 +1,71 @@
+import logging
+import pytest
+from django.urls import reverse
+
+from apps.core.query_budget import count_queries, get_query_budget, router_endpoints
+from apps.core.urls import router
+
+from .conftest import TENANT_ID
+
+ENDPOINTS = list(router_endpoints(router))
+
+
+def endpoint_id(endpoint):
+    viewset, action, _, _ = endpoint
+    return f"{viewset.__name__}.{action}"
+
+
+def endpoint_url(endpoint):
+    """URL d'une route ; une route de détail porte sur le premier objet du tenant"""
+    viewset, _, detail, url_name = endpoint
+    if not detail:
+        return reverse(url_name)
+    model = viewset.serializer_class.Meta.model
+    return reverse(url_name, kwargs={'pk': model.objects.filter(tenant_id=TENANT_ID).values_list('pk', flat=True)[0]})
+
+
+def queries_for(api_client, endpoint):
+    url = endpoint_url(endpoint)
+    with count_queries() as counter:
+        response = api_client.get(url)
+    assert response.status_code == 200, response.content
+    return counter.count
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS, ids=endpoint_id)
+def test_endpoint_declares_a_budget(endpoint):
+    """Tester que chaque route GET du routeur déclare son budget de requêtes"""
+    viewset, action, _, _ = endpoint
+    assert get_query_budget(viewset, action) is not None, f"{endpoint_id(endpoint)} sans budget de requêtes"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('endpoint', ENDPOINTS, ids=endpoint_id)
+def test_queries_within_budget_and_independent_of_volume(api_client, seed_tenant, endpoint):
+    """Tester le nombre de requêtes de chaque route avec deux volumes de données"""
+    viewset, action, _, _ = endpoint
+    budget = get_query_budget(viewset, action)
+
+    seed_tenant(2)
+    small = queries_for(api_client, endpoint)
+    seed_tenant(4)
+    large = queries_for(api_client, endpoint)
+
+    assert large == small, f"{endpoint_id(endpoint)}: {small} requêtes pour 2 éléments, {large} pour 6 (N+1)"
+    assert large <= budget, f"{endpoint_id(endpoint)}: {large} requêtes pour un budget de {budget}"
+
+
+@pytest.mark.django_db
+def test_middleware_logs_budget_violations(settings, seed_tenant, caplog, monkeypatch):
+    """Tester la journalisation d'un dépassement de budget par le middleware"""
+    from rest_framework.test import APIClient
+    from apps.core.views.account_views import AccountClassViewSet
+
+    settings.QUERY_BUDGET_LOGGING = True
+    seed_tenant(1)
+    monkeypatch.setattr(AccountClassViewSet, 'query_budgets', {'list': 1, 'retrieve': 1})
+    with caplog.at_level(logging.WARNING, logger='apps.core.middleware.query_budget_middleware'):
+        assert APIClient().get(reverse('account-class-list')).status_code == 200
+        assert APIClient().get(reverse('account-list')).status_code == 200
+    [record] = caplog.records
+    assert "(AccountClassViewSet.list) a exécuté 2 requêtes pour un budget de 1" in record.getMessage()
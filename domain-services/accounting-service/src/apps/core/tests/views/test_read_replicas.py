@@ -0,0 +1,85 @@
+from django.db import OperationalError, connections, router
+from django.test import TestCase, override_settings
+from unittest import mock
+
+from apps.core.models.account import AccountClass
+from apps.core.services.read_replicas import get_read_replicas, replica_reads, reset_read_replicas
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = '284e521a-7899-4290-88e3-ea6a50913210'
+
+REPLICAS = {'REPLICAS': {'default': ['default_replica']}, 'STICKINESS': 'cookie', 'STICKY_SECONDS': 5}
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReadReplicaTestCase(TestCase):
+    """Tests pour les lectures sur réplica et l'épinglage au primaire après une écriture"""
+    databases = {'default', 'default_replica'}
+    url = '/api/accounting/account-classes/'
+    payload = {'tenant_id': TENANT_ID, 'number': 2, 'name': "Immobilisations"}
+
+    @classmethod
+    def setUpTestData(cls):
+        # Le réplica simulé n'est pas répliqué : une lecture sur le réplica ne voit pas cette classe
+        cls.account_class = AccountClass.objects.create(tenant_id=TENANT_ID, number=1, name="Capitaux")
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        # Réplicas écartés et tenants épinglés par les tests précédents
+        reset_read_replicas()
+
+    def names(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row['name'] for row in response.json()['results']]
+
+    def test_safe_actions_read_from_replica(self):
+        """Tester que list et retrieve lisent le réplica"""
+        self.assertEqual(self.names(self.client.get(self.url)), [])
+        self.assertEqual(self.client.get(f'{self.url}{self.account_class.pk}/').status_code, 404)
+
+    def test_write_pins_client_to_primary(self):
+        """Tester la lecture de ses propres écritures pendant la fenêtre d'épinglage (cookie)"""
+        response = self.client.post(self.url, self.payload, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.cookies['accounting_primary'].value, TENANT_ID)
+        self.assertEqual(response.cookies['accounting_primary']['max-age'], 5)
+        self.assertEqual(self.names(self.client.get(self.url)), ["Capitaux", "Immobilisations"])
+
+        # Cookie expiré : retour au réplica
+        del self.client.cookies['accounting_primary']
+        self.assertEqual(self.names(self.client.get(self.url)), [])
+
+    @override_settings(READ_REPLICAS={**REPLICAS, 'STICKINESS': 'process'})
+    def test_write_pins_tenant_in_process(self):
+        """Tester l'épinglage du tenant dans la mémoire du processus"""
+        self.client.post(self.url, self.payload, content_type='application/json')
+        self.assertEqual(self.names(self.client.get(self.url)), ["Capitaux", "Immobilisations"])
+        get_read_replicas().pinned.until.clear()
+        self.assertEqual(self.names(self.client.get(self.url)), [])
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        """Tester le repli sur le primaire, puis la mise à l'écart du réplica injoignable"""
+        replica = connections['default_replica']
+        with mock.patch.object(replica, 'ensure_connection', side_effect=OperationalError("connexion refusée")):
+            with self.assertLogs('apps.core.services.read_replicas', 'WARNING'):
+                self.assertEqual(self.names(self.client.get(self.url)), ["Capitaux"])
+            self.assertEqual(self.names(self.client.get(self.url)), ["Capitaux"])
+            self.assertEqual(replica.ensure_connection.call_count, 1)
+
+    def test_router(self):
+        """Tester le routage : lectures, lectures après une écriture, instances lues sur le réplica"""
+        self.assertEqual(router.db_for_read(AccountClass), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(AccountClass), 'default_replica')
+            self.assertEqual(router.db_for_write(AccountClass), 'default')
+            self.assertEqual(router.db_for_read(AccountClass), 'default')
+        self.assertFalse(router.allow_migrate('default_replica', 'core'))
+
+        replica_copy = AccountClass.objects.using('default_replica').create(
+            pk=self.account_class.pk, tenant_id=TENANT_ID, number=1, name="Capitaux"
+        )
+        replica_copy.name = "Capitaux propres"
+        replica_copy.save()
+        self.assertEqual(replica_copy._state.db, 'default')
+        self.assertEqual(AccountClass.objects.using('default').get().name, "Capitaux propres")
+        self.assertEqual(AccountClass.objects.using('default_replica').get().name, "Capitaux")
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+import uuid
+
+from apps.core.models.account import AccountClass
+from apps.core.models.tenant import Tenant, TenantStatus
+from apps.core.services.tenant_resolution import get_tenant_cache
+
+
+@override_settings(DEFAULT_TENANT_ID=None, TRUST_TENANT_HEADER=True, TENANT_RESOLUTION={'RESOLVER': 'table', 'TTL': 60})
+class TenantMiddlewareTestCase(TestCase):
+    """Tests pour la résolution du tenant des requêtes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Acme")
+        cls.other = Tenant.objects.create(name="Globex")
+        cls.suspended = Tenant.objects.create(name="Initech", status=TenantStatus.SUSPENDED)
+        AccountClass.objects.create(tenant_id=cls.tenant.pk, number=1, name="Capitaux Acme")
+        AccountClass.objects.create(tenant_id=cls.other.pk, number=1, name="Capitaux Globex")
+        cls.user = get_user_model().objects.create_user(username="comptable", password="secret")
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.client = APIClient()
+        get_tenant_cache().invalidate()
+
+    def token(self, tenant_id):
+        token = AccessToken.for_user(self.user)
+        token['tenant_id'] = str(tenant_id)
+        return f"Bearer {token}"
+
+    def names(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row['name'] for row in response.json()['results']]
+
+    def test_tenant_from_header_or_token(self):
+        """Tester le tenant désigné par l'en-tête ou par le jeton JWT"""
+        url = '/api/accounting/account-classes/'
+        self.assertEqual(self.names(self.client.get(url, HTTP_X_TENANT_ID=str(self.tenant.pk))), ["Capitaux Acme"])
+        self.assertEqual(
+            self.names(self.client.get(url, HTTP_AUTHORIZATION=self.token(self.other.pk))), ["Capitaux Globex"]
+        )
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=self.token(self.other.pk), HTTP_X_TENANT_ID=str(self.tenant.pk)
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(TRUST_TENANT_HEADER=False)
+    def test_header_without_token_is_refused(self):
+        """Tester le refus de l'en-tête seul, sans jeton, quand il n'est pas de confiance"""
+        url = '/api/accounting/account-classes/'
+        response = self.client.get(url, HTTP_X_TENANT_ID=str(self.tenant.pk))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=self.token(self.tenant.pk), HTTP_X_TENANT_ID=str(self.tenant.pk)
+        )
+        self.assertEqual(self.names(response), ["Capitaux Acme"])
+
+    def test_warm_cache_adds_no_query(self):
+        """Tester qu'un tenant en cache est résolu sans requête SQL"""
+        url = '/api/accounting/account-classes/'
+        with self.assertNumQueries(3):
+            self.client.get(url, HTTP_X_TENANT_ID=str(self.tenant.pk))
+        with self.assertNumQueries(2):
+            self.client.get(url, HTTP_X_TENANT_ID=str(self.tenant.pk))
+
+    def test_rejected_tenants(self):
+        """Tester le refus des tenants invalides, inconnus ou inactifs"""
+        url = '/api/accounting/account-classes/'
+        self.assertEqual(self.client.get(url, HTTP_X_TENANT_ID="acme").status_code, 400)
+        self.assertEqual(self.client.get(url, HTTP_X_TENANT_ID=str(uuid.uuid4())).status_code, 403)
+        response = self.client.get(url, HTTP_X_TENANT_ID=str(self.suspended.pk))
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("inactif", response.json()['error'])
+
+    def test_request_without_tenant(self):
+        """Tester le refus des requêtes de l'API qui ne désignent aucun tenant"""
+        response = self.client.get('/api/accounting/account-classes/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], "Tenant ID est requis pour cette opération")
@@ -0,0 +1,103 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from datetime import date
+from decimal import Decimal
+import csv
+import io
+import json
+import uuid
+
+from apps.core.models.account import Account
+from apps.core.models.fiscal_year import FiscalYear
+from apps.core.models.journal import Journal
+from apps.core.services.ledger_posting import post_entries
+
+# Tenant fixé par TenantMiddleware
+TENANT_ID = uuid.UUID('284e521a-7899-4290-88e3-ea6a50913210')
+
+TRIAL_BALANCE_URL = '/api/accounting/trial-balance/'
+
+
+def entry(day, debit_code, credit_code, amount):
+    return {'journal': "OD", 'date': day, 'lines': [
+        {'account': debit_code, 'debit': amount}, {'account': credit_code, 'credit': amount},
+    ]}
+
+
+class TrialBalanceViewTestCase(TestCase):
+    """Tests pour la balance générale (/trial-balance/)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Account.create_default_accounts_ohada(TENANT_ID)
+        Journal.objects.create(tenant_id=TENANT_ID, code="OD", name="Opérations diverses")
+        for year in (2024, 2025):
+            FiscalYear.objects.create(
+                tenant_id=TENANT_ID, name=f"Exercice {year}", code=f"FY{year}",
+                start_date=date(year, 1, 1), end_date=date(year, 12, 31)
+            ).create_periods()
+        post_entries(TENANT_ID, [
+            entry(date(2024, 6, 1), "601", "401", "300.00"),
+            entry(date(2025, 1, 15), "601", "401", "100.00"),
+            entry(date(2025, 3, 10), "401", "524", "250.00"),
+            entry(date(2025, 7, 1), "601", "401", "40.00"),
+        ])
+
+    def setUp(self):
+        """Configuration initiale pour les tests"""
+        self.client = APIClient()
+
+    def stream(self, params):
+        response = self.client.get(TRIAL_BALANCE_URL, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_json_with_opening_balances_and_rollup(self):
+        """Tester les à-nouveaux, les mouvements et le cumul sur les comptes parents"""
+        with self.assertNumQueries(4):  # exercice, périodes, comptes, soldes
+            body = self.stream({'fiscal_year': "FY2025", 'period_from': 1, 'period_to': 3})
+        data = json.loads(body)
+        rows = {row['code']: row for row in data['results']}
+        self.assertEqual((data['start_date'], data['end_date']), ("2025-01-01", "2025-03-31"))
+
+        supplier = rows["401"]
+        self.assertEqual(Decimal(supplier['opening_credit']), Decimal("300.00"))
+        self.assertEqual((Decimal(supplier['debit']), Decimal(supplier['credit'])),
+                         (Decimal("250.00"), Decimal("100.00")))
+        self.assertEqual(Decimal(supplier['closing_credit']), Decimal("150.00"))
+        self.assertEqual(rows["40"]['closing_credit'], supplier['closing_credit'])
+        self.assertEqual(rows["40"]['debit'], supplier['debit'])
+        self.assertNotIn("411", rows)
+
+        totals = data['totals']
+        self.assertEqual(totals['debit'], totals['credit'])
+        self.assertEqual(Decimal(totals['debit']), Decimal("350.00"))
+        self.assertEqual(totals['closing_debit'], totals['closing_credit'])
+
+    def test_level_and_class_filters(self):
+        """Tester la restriction aux premiers niveaux et à une classe"""
+        data = json.loads(self.stream({'fiscal_year': "FY2025", 'level': 1}))
+        self.assertEqual({row['level'] for row in data['results']}, {1})
+
+        data = json.loads(self.stream({'fiscal_year': "FY2025", 'account_class': 6}))
+        self.assertEqual({row['account_class'] for row in data['results']}, {6})
+        self.assertEqual(Decimal(data['totals']['debit']), Decimal("140.00"))
+
+    def test_csv_and_ndjson(self):
+        """Tester les formats csv et ndjson"""
+        rows = list(csv.DictReader(io.StringIO(self.stream({'fiscal_year': "FY2025", 'format': "csv"}))))
+        self.assertEqual(rows[-1]['name'], "Total")
+        self.assertEqual(Decimal(rows[-1]['debit']), Decimal("390.00"))
+
+        lines = self.stream({'fiscal_year': "FY2025", 'format': "ndjson"}).splitlines()
+        self.assertEqual([json.loads(line)['code'] for line in lines], [row['code'] or None for row in rows])
+
+    def test_invalid_parameters(self):
+        """Tester les erreurs de paramètres"""
+        self.assertEqual(self.client.get(TRIAL_BALANCE_URL, {'fiscal_year': "FY2030"}).status_code, 404)
+        for params in ({'format': "xml"}, {'fiscal_year': "FY2025", 'level': "x"},
+                       {'fiscal_year': "FY2025", 'period_from': 13}):
+            response = self.client.get(TRIAL_BALANCE_URL, params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.json())
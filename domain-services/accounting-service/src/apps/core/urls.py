@@ -4,6 +4,9 @@ from rest_framework.routers import DefaultRouter
 from .views.account_views import AccountClassViewSet, AccountCategoryViewSet, AccountViewSet
 from .views.fiscal_year_views import FiscalYearViewSet, FiscalPeriodViewSet
 from .views.tiers_views import TiersViewSet
+from .views.trial_balance_views import TrialBalanceView
+from .views.chart_cache_views import ChartCacheStatsView
+from .views.job_views import JobViewSet
 from apps.core.views.home_views import home_view
 
 # Créer un routeur pour les viewsets
@@ -14,10 +17,13 @@ router.register(r'accounts', AccountViewSet, basename='account')
 router.register(r'fiscal-years', FiscalYearViewSet, basename='fiscal-year')
 router.register(r'fiscal-periods', FiscalPeriodViewSet, basename='fiscal-period')
 router.register(r'tiers', TiersViewSet, basename='tiers')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     # Inclure les routes générées automatiquement par le routeur
     path('', include(router.urls)),
+    path('trial-balance/', TrialBalanceView.as_view(), name='trial-balance'),
+    path('chart-cache/', ChartCacheStatsView.as_view(), name='chart-cache'),
     path('', home_view, name='home')
     
     # Vous pouvez ajouter d'autres routes personnalisées ici si nécessaire
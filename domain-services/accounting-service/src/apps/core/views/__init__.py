@@ -1,6 +1,9 @@
 # Import des vues
 from .account_views import AccountClassViewSet, AccountCategoryViewSet, AccountViewSet
 from .fiscal_year_views import FiscalYearViewSet, FiscalPeriodViewSet
+from .trial_balance_views import TrialBalanceView
+from .chart_cache_views import ChartCacheStatsView
+from .job_views import JobViewSet
 
 
 # Exporter les classes explicitement
@@ -9,5 +12,8 @@ __all__ = [
     'AccountCategoryViewSet', 
     'AccountViewSet',
     'FiscalYearViewSet', 
-    'FiscalPeriodViewSet'
+    'FiscalPeriodViewSet',
+    'TrialBalanceView',
+    'ChartCacheStatsView',
+    'JobViewSet'
 ]
\ No newline at end of file
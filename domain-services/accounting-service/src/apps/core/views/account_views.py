@@ -1,8 +1,16 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
 from django.db.models import Q
-from apps.core.models.account import AccountClass, AccountCategory, Account
+import uuid
+from apps.core.models.account import AccountClass, AccountCategory, Account, ChartVersion
+from apps.core.query_budget import query_budget
+from apps.core.services.account_tree import account_tree, etag_matches, tree_etag
+from apps.core.services.jobs import JobConflictError, enqueue
+from apps.core.services.tenant_clone import TenantCloneError, check_template_tenant
+from apps.core.views.job_views import job_accepted, job_conflict
+from apps.core.views.mixins import ValuesListMixin
 from apps.core.serializers.account_serializers import (
     AccountClassSerializer, 
     AccountCategorySerializer, 
@@ -16,29 +24,29 @@ class AccountClassViewSet(viewsets.ModelViewSet):
     search_fields = ['number', 'name']
     ordering_fields = ['number', 'name', 'created_at']
     ordering = ['number']
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     def get_queryset(self):
-        """Filtre les résultats par tenant_id"""
-        queryset = AccountClass.objects.all()
-        tenant_id = getattr(self.request, 'tenant_id', None)
-        if tenant_id:
-            queryset = queryset.filter(tenant_id=tenant_id)
-        return queryset
+        """Classes du tenant courant"""
+        return AccountClass.tenant_objects.all()
 
-class AccountCategoryViewSet(viewsets.ModelViewSet):
+class AccountCategoryViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet pour les catégories de comptes"""
     serializer_class = AccountCategorySerializer
+    list_values = [
+        ('id', 'id'), ('code', 'code'), ('name', 'name'), ('description', 'description'),
+        ('account_class', 'account_class_id'), ('account_class_name', 'account_class__name'),
+        ('tenant_id', 'tenant_id'), ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    ]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['code', 'name']
     ordering_fields = ['code', 'name', 'created_at']
     ordering = ['code']
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     def get_queryset(self):
-        """Filtre les résultats par tenant_id et account_class"""
-        queryset = AccountCategory.objects.all()
-        tenant_id = getattr(self.request, 'tenant_id', None)
-        if tenant_id:
-            queryset = queryset.filter(tenant_id=tenant_id)
+        """Catégories du tenant courant, filtrées par account_class"""
+        queryset = AccountCategory.tenant_objects.select_related('account_class')
         
         account_class_id = self.request.query_params.get('account_class', None)
         if account_class_id:
@@ -46,20 +54,27 @@ class AccountCategoryViewSet(viewsets.ModelViewSet):
             
         return queryset
 
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet pour les comptes"""
     serializer_class = AccountSerializer
+    list_values = [
+        ('id', 'id'), ('code', 'code'), ('name', 'name'), ('description', 'description'),
+        ('account_class', 'account_class_id'), ('account_class_name', 'account_class__name'),
+        ('category', 'category_id'), ('category_name', 'category__name'),
+        ('parent', 'parent_id'), ('parent_name', 'parent__name'), ('level', 'level'),
+        ('type', 'type'), ('type_display', 'get_type_display'), ('is_active', 'is_active'),
+        ('is_reconcilable', 'is_reconcilable'), ('is_tax_relevant', 'is_tax_relevant'),
+        ('tenant_id', 'tenant_id'), ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    ]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['code', 'name', 'description']
     ordering_fields = ['code', 'name', 'account_class', 'type', 'created_at']
     ordering = ['code']
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     def get_queryset(self):
-        """Filtre les résultats par tenant_id et divers critères"""
-        queryset = Account.objects.all()
-        tenant_id = getattr(self.request, 'tenant_id', None)
-        if tenant_id:
-            queryset = queryset.filter(tenant_id=tenant_id)
+        """Comptes du tenant courant, filtrés par divers critères"""
+        queryset = Account.tenant_objects.select_related('account_class', 'category', 'parent')
         
         # Filtrage par critères additionnels
         account_class = self.request.query_params.get('account_class', None)
@@ -97,24 +112,100 @@ class AccountViewSet(viewsets.ModelViewSet):
             
         return queryset
     
+    @query_budget(2)
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        Arborescence complète du plan comptable du tenant, sans pagination.
+
+        Paramètres : root (UUID du compte racine du sous-arbre) et depth (nombre
+        de niveaux sous les racines). La réponse porte un ETag dérivé de la
+        version du plan : si If-None-Match le désigne, la réponse est un 304
+        obtenu sans lire la table des comptes.
+        """
+        tenant_id = getattr(request, 'tenant_id', None)
+        if not tenant_id:
+            return Response(
+                {"error": "Tenant ID est requis pour cette opération"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        root = request.query_params.get('root') or None
+        if root is not None:
+            try:
+                root = uuid.UUID(root)
+            except ValueError:
+                return Response(
+                    {"error": f"'{root}' n'est pas un UUID valide"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        depth = request.query_params.get('depth') or None
+        if depth is not None:
+            if not depth.isdigit():
+                return Response(
+                    {"error": "depth doit être un entier positif ou nul"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            depth = int(depth)
+
+        # La version est lue avant les comptes : au pire l'ETag est plus ancien
+        # que le contenu, et la requête suivante relit l'arborescence
+        version = ChartVersion.current(tenant_id)
+        etag = tree_etag(tenant_id, version, root, depth)
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            try:
+                nodes, count = account_tree(tenant_id, root, depth)
+            except Account.DoesNotExist:
+                return Response(
+                    {"error": f"Le compte {root} n'existe pas"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            response = Response({"version": version, "count": count, "results": nodes})
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
     @action(detail=False, methods=['post'])
     def import_ohada(self, request):
-        """Endpoint pour importer le plan comptable OHADA"""
+        """
+        Endpoint pour provisionner le plan comptable du tenant, en arrière-plan.
+
+        Si un tenant modèle est indiqué (champ template_tenant_id, ou
+        TEMPLATE_TENANT_ID des settings), son plan, ses exercices et ses tiers
+        par défaut sont copiés côté base ; sinon le plan est créé depuis le
+        fichier OHADA. Seuls les tenants modèles désignés par les settings
+        (TEMPLATE_TENANT_ID, TEMPLATE_TENANT_IDS) sont acceptés.
+        Répond 202 avec le job (voir services.jobs) ; une demande répétée
+        renvoie le même job.
+        """
         tenant_id = getattr(request, 'tenant_id', None)
         if not tenant_id:
             return Response(
                 {"error": "Tenant ID est requis pour cette opération"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-            
+
+        params = {}
+        template_tenant_id = request.data.get('template_tenant_id') or settings.TEMPLATE_TENANT_ID
+        if template_tenant_id:
+            try:
+                params['template_tenant_id'] = str(check_template_tenant(template_tenant_id))
+            except ValueError:
+                return Response(
+                    {"error": f"'{template_tenant_id}' n'est pas un UUID valide"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            except TenantCloneError as e:
+                # Un autre tenant ne peut pas servir de modèle : ses données ne sont pas copiées
+                return Response({"error": str(e)}, status=status.HTTP_403_FORBIDDEN)
+
         try:
-            accounts = Account.create_default_accounts_ohada(tenant_id)
-            return Response(
-                {"message": f"{len(accounts)} comptes créés avec succès"},
-                status=status.HTTP_201_CREATED
-            )
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            job, _ = enqueue(tenant_id, 'provision_chart', params)
+        except JobConflictError as e:
+            # Plan déjà demandé à partir d'un autre modèle
+            return job_conflict(request, e)
+        return job_accepted(request, job)
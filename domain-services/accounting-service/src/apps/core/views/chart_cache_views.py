@@ -0,0 +1,15 @@
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..services.chart_cache import get_chart_cache
+
+
+class ChartCacheStatsView(APIView):
+    """
+    Compteurs du cache des plans comptables du processus (GET /chart-cache/) :
+    hits, misses, taux de hits, évictions et nombre de plans en cache.
+    """
+    query_budgets = {'get': 0}
+
+    def get(self, request):
+        return Response(get_chart_cache().stats())
@@ -1,11 +1,12 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from dateutil.relativedelta import relativedelta
-from datetime import timedelta
 
 from ..models.fiscal_year import FiscalYear, FiscalPeriod
 from ..serializers.fiscal_year_serializers import FiscalYearSerializer, FiscalPeriodSerializer
+from ..services.jobs import JobConflictError, enqueue
+from .job_views import job_accepted, job_conflict
+from .mixins import ValuesListMixin
 
 class FiscalYearViewSet(viewsets.ModelViewSet):
     """ViewSet pour les exercices fiscaux"""
@@ -14,13 +15,12 @@ class FiscalYearViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'code']
     ordering_fields = ['start_date', 'end_date', 'name', 'code', 'is_active', 'created_at']
     ordering = ['-start_date']
+    # Les périodes imbriquées sont lues en une requête (prefetch)
+    query_budgets = {'list': 3, 'retrieve': 2}
 
     def get_queryset(self):
-        """Filtre les résultats par tenant_id et autres critères"""
-        queryset = FiscalYear.objects.all()
-        tenant_id = getattr(self.request, 'tenant_id', None)
-        if tenant_id:
-            queryset = queryset.filter(tenant_id=tenant_id)
+        """Exercices du tenant courant, filtrés par statut"""
+        queryset = FiscalYear.tenant_objects.prefetch_related('periods')
         
         # Filtrage supplémentaire
         is_active = self.request.query_params.get('is_active', None)
@@ -37,53 +37,44 @@ class FiscalYearViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def create_periods(self, request, pk=None):
-        """Crée automatiquement des périodes pour un exercice fiscal."""
+        """
+        Crée automatiquement des périodes pour un exercice fiscal, en
+        arrière-plan : répond 202 avec le job (un seul job par exercice).
+        """
         fiscal_year = self.get_object()
         period_type = request.data.get('period_type', 'monthly')
-        tenant_id = request.data.get('tenant_id')
-        
-        # Logique pour créer les périodes
-        periods = []
-        if period_type == 'monthly':
-            # Créer 12 périodes mensuelles
-            start_date = fiscal_year.start_date
-            while start_date <= fiscal_year.end_date:
-                end_date = min(
-                    (start_date.replace(day=1) + relativedelta(months=1, days=-1)),
-                    fiscal_year.end_date
-                )
-                
-                period = FiscalPeriod.objects.create(
-                    fiscal_year=fiscal_year,
-                    name=f"{start_date.strftime('%B %Y')}",
-                    code=f"{start_date.strftime('%Y-%m')}",
-                    start_date=start_date,
-                    end_date=end_date,
-                    number=len(periods) + 1,
-                    tenant_id=tenant_id or fiscal_year.tenant_id
-                )
-                periods.append(period)
-                
-                # Passer au mois suivant
-                start_date = end_date + timedelta(days=1)
-        
-        serializer = FiscalPeriodSerializer(periods, many=True)
-        return Response(serializer.data)
+        if period_type not in ('monthly', 'quarterly'):
+            return Response(
+                {"error": "period_type doit être 'monthly' ou 'quarterly'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        params = {'fiscal_year_id': str(fiscal_year.pk), 'period_type': period_type}
+        try:
+            job, _ = enqueue(fiscal_year.tenant_id, 'create_periods', params, key=fiscal_year.pk)
+        except JobConflictError as e:
+            return job_conflict(request, e)
+        return job_accepted(request, job)
 
-class FiscalPeriodViewSet(viewsets.ModelViewSet):
+class FiscalPeriodViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet pour les périodes fiscales"""
     serializer_class = FiscalPeriodSerializer
+    list_values = [
+        ('id', 'id'), ('fiscal_year', 'fiscal_year_id'), ('fiscal_year_name', 'fiscal_year__name'),
+        ('name', 'name'), ('code', 'code'), ('start_date', 'start_date'), ('end_date', 'end_date'),
+        ('number', 'number'), ('is_closed', 'is_closed'), ('is_locked', 'is_locked'),
+        ('tenant_id', 'tenant_id'), ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    ]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'code']
     ordering_fields = ['fiscal_year', 'number', 'start_date', 'end_date', 'created_at']
     ordering = ['fiscal_year', 'number']
+    # Pagination par curseur : tri sur des colonnes (fiscal_year trie sur l'ordre des exercices)
+    cursor_ordering = ['start_date', 'number']
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     def get_queryset(self):
-        """Filtre les résultats par tenant_id et fiscal_year"""
-        queryset = FiscalPeriod.objects.all()
-        tenant_id = getattr(self.request, 'tenant_id', None)
-        if tenant_id:
-            queryset = queryset.filter(tenant_id=tenant_id)
+        """Périodes du tenant courant, filtrées par fiscal_year et statut"""
+        queryset = FiscalPeriod.tenant_objects.select_related('fiscal_year')
         
         # Filtrage par exercice fiscal
         fiscal_year = self.request.query_params.get('fiscal_year', None)
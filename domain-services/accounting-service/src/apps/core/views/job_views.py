@@ -0,0 +1,54 @@
+"""
+Vues pour le suivi des jobs
+"""
+from rest_framework import viewsets, filters, status
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from ..models.job import Job
+from ..serializers.job_serializers import JobSerializer
+
+
+def job_accepted(request, job):
+    """Réponse 202 d'une action confiée à un job : identifiant et URL de suivi"""
+    url = reverse('job-detail', kwargs={'pk': job.pk}, request=request)
+    return Response(
+        {"job_id": str(job.pk), "kind": job.kind, "status": job.status, "status_url": url},
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': url}
+    )
+
+
+def job_conflict(request, error):
+    """Réponse 409 à une demande répétée avec d'autres paramètres que le job existant"""
+    job = error.job
+    url = reverse('job-detail', kwargs={'pk': job.pk}, request=request)
+    return Response(
+        {"error": str(error), "job_id": str(job.pk), "status": job.status, "status_url": url},
+        status=status.HTTP_409_CONFLICT
+    )
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """ViewSet des jobs du tenant : statut, avancement, résultat ou erreur"""
+    serializer_class = JobSerializer
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['created_at', 'finished_at']
+    ordering = ['-created_at']
+    query_budgets = {'list': 2, 'retrieve': 1}
+    # L'avancement est suivi en interrogeant l'endpoint : pas de retard de réplication
+    replica_reads = False
+
+    def get_queryset(self):
+        """Jobs du tenant courant, filtrés par type et statut"""
+        queryset = Job.tenant_objects.all()
+
+        kind = self.request.query_params.get('kind', None)
+        if kind:
+            queryset = queryset.filter(kind=kind)
+
+        job_status = self.request.query_params.get('status', None)
+        if job_status:
+            queryset = queryset.filter(status=job_status.upper())
+
+        return queryset
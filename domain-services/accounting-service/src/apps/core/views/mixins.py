@@ -0,0 +1,117 @@
+"""
+Mixins communs aux viewsets
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F
+from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from ..exports import EXPORT_CHUNK_SIZE, ExportError, check_export_format, export_response
+from ..renderers import FastJSONRenderer
+
+
+class ValuesListMixin:
+    """
+    Liste rapide, sans sérialiseur.
+
+    list_values décrit, dans l'ordre des champs du sérialiseur de liste, la
+    colonne lue pour chaque clé de la réponse :
+
+    - un champ du modèle ('code', 'account_class_id' pour une clé étrangère) ;
+    - un champ d'un modèle lié ('account_class__name'), lu par jointure ; la clé
+      est omise si la relation est vide, comme le fait ReadOnlyField ;
+    - 'get_<champ>_display', libellé du choix calculé en mémoire.
+
+    La liste (filtres et pagination compris) est alors lue par une seule
+    requête .values() et rendue telle quelle par FastJSONRenderer, au lieu
+    d'instancier un modèle et les champs du sérialiseur pour chaque ligne.
+    Les formats autres que JSON (API navigable) passent par le sérialiseur.
+
+    Avec ?export=csv|ndjson|xlsx, la liste filtrée et triée, sans pagination,
+    est exportée en flux (voir apps.core.exports) ; ses colonnes sont celles
+    de export_values (par défaut list_values), une clé vide valant None.
+    """
+    list_values = None
+    export_values = None
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def list(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export')
+        if export_format:
+            return self.export(export_format)
+
+        if not self.list_values or getattr(request.accepted_renderer, 'format', None) != 'json':
+            return super().list(request, *args, **kwargs)
+
+        queryset, to_dict = self.values_queryset(self.filter_queryset(self.get_queryset()), self.list_values)
+        page = self.paginate_queryset(queryset)
+        data = [to_dict(row) for row in (page if page is not None else queryset)]
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def export(self, export_format):
+        """Export en flux de la liste filtrée et triée"""
+        spec = self.export_values or self.list_values
+        try:
+            check_export_format(export_format)
+        except ExportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset, to_dict = self.values_queryset(self.filter_queryset(self.get_queryset()), spec, omit_empty=False)
+        rows = (to_dict(row) for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE))
+        filename = self.basename or queryset.model._meta.model_name
+        return export_response(export_format, [key for key, source in spec], rows, filename)
+
+    def values_queryset(self, queryset, spec, omit_empty=True):
+        """
+        Queryset .values() des colonnes décrites par spec (voir list_values).
+
+        Returns:
+            tuple: (queryset, fonction qui convertit une ligne en dictionnaire de la réponse)
+        """
+        model = queryset.model
+        columns, joins, displays, sources = [], {}, [], []
+
+        def add_column(name):
+            if name not in columns:
+                columns.append(name)
+
+        for key, source in spec:
+            if source.startswith('get_') and source.endswith('_display'):
+                name = source[4:-8]
+                choices = {value: str(label) for value, label in model._meta.get_field(name).flatchoices}
+                displays.append((key, name, choices))
+                add_column(name)
+                sources.append((key, key, None))
+            elif '__' in source:
+                # Comme ReadOnlyField, la clé est omise quand la relation est vide
+                relation = model._meta.get_field(source.split('__', 1)[0])
+                joins[key] = F(source)
+                via = relation.attname if relation.null and omit_empty else None
+                if via:
+                    add_column(via)
+                sources.append((key, key, via))
+            else:
+                add_column(source)
+                sources.append((key, source, None))
+
+        # Colonnes de tri, nécessaires à la pagination par curseur
+        for name in [*queryset.query.order_by, *(getattr(self, 'cursor_ordering', None) or [])]:
+            if isinstance(name, str):
+                try:
+                    field = model._meta.get_field(name.lstrip('-'))
+                except FieldDoesNotExist:
+                    continue
+                if field.concrete:
+                    add_column(field.attname)
+
+        def to_dict(row):
+            for key, name, choices in displays:
+                value = row[name]
+                row[key] = choices.get(value, value)
+            return {key: row[column] for key, column, via in sources if via is None or row[via] is not None}
+
+        return queryset.values(*columns, **joins), to_dict
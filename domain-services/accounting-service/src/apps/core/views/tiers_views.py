@@ -8,22 +8,36 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from ..models.tiers import Tiers
 from ..serializers.tiers_serializers import TiersSerializer, TiersListSerializer
+from ..services.jobs import enqueue
+from .job_views import job_accepted
+from .mixins import ValuesListMixin
 
-class TiersViewSet(viewsets.ModelViewSet):
+class TiersViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet pour les tiers (clients, fournisseurs, etc.)"""
     serializer_class = TiersSerializer
+    # Champs de TiersListSerializer
+    list_values = [
+        ('id', 'id'), ('code', 'code'), ('name', 'name'), ('type', 'type'),
+        ('type_display', 'get_type_display'), ('is_active', 'is_active'),
+    ]
+    # Colonnes des exports (?export=csv|ndjson|xlsx) : fiche complète du tiers
+    export_values = [
+        ('id', 'id'), ('code', 'code'), ('name', 'name'), ('type', 'type'),
+        ('type_display', 'get_type_display'), ('account', 'account_id'), ('account_code', 'account__code'),
+        ('account_name', 'account__name'), ('address', 'address'), ('email', 'email'), ('phone', 'phone'),
+        ('tax_id', 'tax_id'), ('notes', 'notes'), ('is_active', 'is_active'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    ]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend]
     search_fields = ['code', 'name', 'email', 'tax_id']
     ordering_fields = ['code', 'name', 'type', 'created_at']
     ordering = ['code']
     filterset_fields = ['type', 'is_active']
+    query_budgets = {'list': 2, 'retrieve': 1}
     
     def get_queryset(self):
-        """Filtre les résultats par tenant_id et autres critères"""
-        queryset = Tiers.objects.all()
-        tenant_id = getattr(self.request, 'tenant_id', None)
-        if tenant_id:
-            queryset = queryset.filter(tenant_id=tenant_id)
+        """Tiers du tenant courant, filtrés par compte"""
+        queryset = Tiers.tenant_objects.select_related('account')
         
         # Filtrage par compte
         account_id = self.request.query_params.get('account', None)
@@ -45,20 +59,13 @@ class TiersViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['post'])
     def create_defaults(self, request):
-        """Crée les tiers par défaut pour le tenant actuel"""
+        """Crée les tiers par défaut pour le tenant actuel, en arrière-plan (202 avec le job)"""
         tenant_id = getattr(request, 'tenant_id', None)
         if not tenant_id:
             return Response(
                 {"detail": "Tenant ID requis pour cette opération."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        try:
-            created_tiers = Tiers.create_default_tiers(tenant_id)
-            serializer = TiersListSerializer(created_tiers, many=True)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+
+        job, _ = enqueue(tenant_id, 'create_default_tiers')
+        return job_accepted(request, job)
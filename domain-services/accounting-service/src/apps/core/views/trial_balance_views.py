@@ -0,0 +1,151 @@
+import csv
+import datetime
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..exports import Echo
+from ..models.fiscal_year import FiscalYear, FiscalPeriod
+from ..services.trial_balance import ROW_FIELDS, TrialBalance
+
+FORMATS = {
+    'json': 'application/json',
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class QueryFormatNegotiation(BaseContentNegotiation):
+    """
+    Toujours le premier renderer : le paramètre format est interprété par la vue,
+    qui écrit elle-même la réponse en flux
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+def json_stream(trial_balance, header):
+    """Objet JSON {..., "results": [...], "totals": {...}} écrit ligne par ligne"""
+    encoder = DjangoJSONEncoder()
+    yield encoder.encode(header)[:-1] + ', "results": ['
+    separator = ''
+    for row in trial_balance.rows():
+        yield separator + encoder.encode(row)
+        separator = ', '
+    yield '], "totals": ' + encoder.encode(trial_balance.totals()) + '}'
+
+
+def ndjson_stream(trial_balance):
+    """Une ligne JSON par compte, puis la ligne de total"""
+    encoder = DjangoJSONEncoder()
+    for row in trial_balance.rows():
+        yield encoder.encode(row) + '\n'
+    yield encoder.encode(trial_balance.totals()) + '\n'
+
+
+def csv_stream(trial_balance):
+    """En-tête, une ligne par compte, puis la ligne de total"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(ROW_FIELDS)
+    for row in trial_balance.rows():
+        yield writer.writerow(['' if row[field] is None else row[field] for field in ROW_FIELDS])
+    totals = trial_balance.totals()
+    yield writer.writerow(['' if totals[field] is None else totals[field] for field in ROW_FIELDS])
+
+
+class TrialBalanceView(APIView):
+    """
+    Balance générale du tenant (GET /trial-balance/).
+
+    Paramètres :
+    - fiscal_year : UUID ou code de l'exercice (par défaut celui qui contient la date du jour)
+    - period_from, period_to : numéros des première et dernière périodes de l'exercice
+    - level : niveau le plus profond affiché (1 = comptes racines)
+    - account_class : numéro de la classe de comptes (1 à 9)
+    - include_empty : true pour afficher les comptes sans montant
+    - format : json (défaut), csv ou ndjson
+
+    Les montants sont calculés avant l'envoi (une requête groupée), puis les
+    lignes sont écrites en flux.
+    """
+    content_negotiation_class = QueryFormatNegotiation
+    # Exercice, périodes, comptes, soldes
+    query_budgets = {'get': 4}
+
+    def error(self, message, status_code=status.HTTP_400_BAD_REQUEST):
+        return Response({"error": message}, status=status_code)
+
+    def get(self, request):
+        tenant_id = getattr(request, 'tenant_id', None)
+        if not tenant_id:
+            return self.error("Tenant ID est requis pour cette opération")
+
+        params = request.query_params
+        output = params.get('format') or 'json'
+        if output not in FORMATS:
+            return self.error(f"format doit être parmi: {', '.join(FORMATS)}")
+
+        numbers = {}
+        for name in ('period_from', 'period_to', 'level', 'account_class'):
+            value = params.get(name) or None
+            if value is not None:
+                if not value.isdigit() or int(value) < 1:
+                    return self.error(f"{name} doit être un entier strictement positif")
+                value = int(value)
+            numbers[name] = value
+
+        years = FiscalYear.objects.filter(tenant_id=tenant_id)
+        reference = params.get('fiscal_year') or None
+        try:
+            if reference is None:
+                today = datetime.date.today()
+                fiscal_year = years.get(start_date__lte=today, end_date__gte=today)
+            else:
+                try:
+                    fiscal_year = years.get(pk=uuid.UUID(reference))
+                except ValueError:
+                    fiscal_year = years.get(code=reference)
+        except FiscalYear.DoesNotExist:
+            return self.error(f"Exercice {reference or 'en cours'} introuvable", status.HTTP_404_NOT_FOUND)
+
+        periods = list(FiscalPeriod.objects.filter(fiscal_year=fiscal_year).order_by('number').values_list(
+            'number', 'start_date', 'end_date'
+        ))
+        if periods:
+            period_from = numbers['period_from'] or periods[0][0]
+            period_to = numbers['period_to'] or periods[-1][0]
+            selected = [period for period in periods if period_from <= period[0] <= period_to]
+            if not selected:
+                return self.error(f"Aucune période entre {period_from} et {period_to}")
+            start_date, end_date = selected[0][1], selected[-1][2]
+        elif numbers['period_from'] or numbers['period_to']:
+            return self.error("L'exercice n'a pas de périodes")
+        else:
+            start_date, end_date = fiscal_year.start_date, fiscal_year.end_date
+
+        trial_balance = TrialBalance(
+            tenant_id, start_date, end_date, max_level=numbers['level'], account_class=numbers['account_class'],
+            include_empty=params.get('include_empty', '').lower() == 'true'
+        ).load()
+
+        if output == 'csv':
+            stream = csv_stream(trial_balance)
+        elif output == 'ndjson':
+            stream = ndjson_stream(trial_balance)
+        else:
+            stream = json_stream(trial_balance, {
+                'fiscal_year': fiscal_year.code, 'start_date': start_date, 'end_date': end_date,
+            })
+        response = StreamingHttpResponse(stream, content_type=FORMATS[output])
+        if output != 'json':
+            response['Content-Disposition'] = f'attachment; filename="balance-{fiscal_year.code}.{output}"'
+        return response
@@ -50,7 +50,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "apps.core.middleware.tenant_middleware.TenantMiddleware",  # Middleware d'isolation des tenants
-    # Vous ajouterez votre middleware tenant plus tard
+    "apps.core.middleware.read_replica_middleware.ReadReplicaMiddleware",  # Lectures sur réplicas (READ_REPLICAS)
+    "apps.core.middleware.query_budget_middleware.QueryBudgetMiddleware",  # Budgets de requêtes (DEBUG)
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -88,6 +89,70 @@ DATABASES = {
     }
 }
 
+# Répartition des tenants entre plusieurs bases (voir apps.core.services.tenant_sharding) :
+# SHARDS liste les alias de DATABASES qui portent des données de tenants. Le routeur
+# ajoute au routage des shards celui des lectures vers les réplicas (READ_REPLICAS)
+DATABASE_ROUTERS = ['apps.core.db_routers.ReadReplicaRouter']
+TENANT_SHARDING = {
+    'SHARDS': ['default'],
+    'DEFAULT_SHARD': 'default',
+    'DIRECTORY_TTL': int(os.environ.get('TENANT_SHARD_DIRECTORY_TTL', 10)),
+}
+
+# Réplicas en lecture seule des bases primaires (voir apps.core.services.read_replicas) :
+# les lectures des actions sûres de l'API y sont envoyées, sauf pendant STICKY_SECONDS
+# après une écriture du client ('cookie') ou du tenant dans le processus ('process')
+READ_REPLICAS = {
+    'REPLICAS': {},
+    'STICKINESS': os.environ.get('READ_REPLICA_STICKINESS', 'cookie'),
+    'STICKY_SECONDS': int(os.environ.get('READ_REPLICA_STICKY_SECONDS', 5)),
+    'COOKIE_NAME': 'accounting_primary',
+    'RETRY_SECONDS': 30,
+}
+
+# File des jobs des tenants (voir apps.core.services.jobs), exécutés par la commande
+# run_workers : CONCURRENCY processus, qui réservent les jobs par lots de BATCH_SIZE
+JOBS = {
+    'CONCURRENCY': int(os.environ.get('JOB_WORKERS', 2)),
+    'BATCH_SIZE': int(os.environ.get('JOB_BATCH_SIZE', 10)),
+    'POLL_INTERVAL': float(os.environ.get('JOB_POLL_INTERVAL', 1.0)),
+    'LEASE_SECONDS': 300,
+    'MAX_ATTEMPTS': 3,
+}
+
+
+def shard_databases(default):
+    """
+    Bases des shards déclarés par DB_SHARDS (ex: "shard_1,shard_2") : configuration
+    de default, base <NAME>_<alias>, hôte DB_<ALIAS>_HOST s'il est défini.
+    """
+    databases = {}
+    for alias in filter(None, (name.strip() for name in os.environ.get('DB_SHARDS', '').split(','))):
+        databases[alias] = {
+            **default,
+            'NAME': f"{default['NAME']}_{alias}",
+            'HOST': os.environ.get(f'DB_{alias.upper()}_HOST', default.get('HOST')),
+        }
+    return databases
+
+
+def replica_databases(databases):
+    """
+    Réplicas des bases primaires dont l'hôte est déclaré par DB_<ALIAS>_REPLICA_HOST :
+    configuration du primaire sur cet hôte, alias <alias>_replica.
+
+    Returns:
+        tuple: (bases des réplicas, alias primaire -> alias de ses réplicas)
+    """
+    replicas = {}
+    for alias, database in databases.items():
+        host = os.environ.get(f'DB_{alias.upper()}_REPLICA_HOST')
+        if host:
+            # Sous manage.py test, le réplica lit la base de test de son primaire
+            replicas[f'{alias}_replica'] = {**database, 'HOST': host, 'TEST': {'MIRROR': alias}}
+    return replicas, {alias[:-len('_replica')]: [alias] for alias in replicas}
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -129,7 +194,7 @@ REST_FRAMEWORK = {
         # "rest_framework.permissions.IsAuthenticated",  # Décommenter en production
         
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.KeysetPagination",
     "PAGE_SIZE": int(os.environ.get('DEFAULT_PAGE_SIZE', 20)),
 }
 
@@ -157,7 +222,22 @@ SWAGGER_SETTINGS = {
 }
 
 # Tenant configuration
+# Revendication du jeton JWT et en-tête qui désignent le tenant (voir TenantMiddleware)
 TENANT_ID_FIELD = os.environ.get('TENANT_ID_FIELD', 'tenant_id')
+TENANT_HEADER = os.environ.get('TENANT_HEADER', 'X-Tenant-ID')
+# En-tête accepté sans jeton uniquement derrière une passerelle qui le pose après authentification
+TRUST_TENANT_HEADER = os.environ.get('TRUST_TENANT_HEADER', 'false').lower() in ('1', 'true', 'yes')
+# URL refusées sans tenant (hors PUBLIC_URLS)
+TENANT_REQUIRED_URLS = ['/api/accounting/']
+# Tenant des requêtes qui n'en désignent aucun (développement et tests uniquement)
+DEFAULT_TENANT_ID = os.environ.get('DEFAULT_TENANT_ID') or None
+# Résolution des tenants (voir apps.core.services.tenant_resolution) : 'table' ou 'static'
+TENANT_RESOLUTION = {
+    'RESOLVER': os.environ.get('TENANT_RESOLVER', 'table'),
+    'TTL': int(os.environ.get('TENANT_CACHE_TTL', 60)),
+    'NEGATIVE_TTL': 5,
+    'MAX_SIZE': int(os.environ.get('TENANT_CACHE_MAX_SIZE', 10000)),
+}
 PUBLIC_URLS = [
     '/admin/',
     '/api-auth/',
@@ -166,4 +246,18 @@ PUBLIC_URLS = [
     '/api/auth/login/',
     '/api/auth/register/',
     '/api/auth/refresh/',
-]
\ No newline at end of file
+]
+# Tenant modèle dont le plan comptable, les exercices et les tiers par défaut
+# sont copiés à l'onboarding (voir apps.core.services.tenant_clone)
+TEMPLATE_TENANT_ID = os.environ.get('TEMPLATE_TENANT_ID') or None
+# Autres tenants modèles que l'API peut copier (champ template_tenant_id d'import_ohada)
+TEMPLATE_TENANT_IDS = [value.strip() for value in os.environ.get('TEMPLATE_TENANT_IDS', '').split(',') if value.strip()]
+
+# Cache des plans comptables par tenant (voir apps.core.services.chart_cache) :
+# 'local' (LRU en mémoire du processus, MAX_TENANTS plans) ou 'django' (cache CACHE_ALIAS)
+CHART_CACHE = {
+    'BACKEND': os.environ.get('CHART_CACHE_BACKEND', 'local'),
+    'MAX_TENANTS': int(os.environ.get('CHART_CACHE_MAX_TENANTS', 256)),
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': None,
+}
@@ -24,6 +24,11 @@ DATABASES = {
         'PORT': os.environ.get('DB_PORT', '5432'),
     }
 }
+DATABASES.update(shard_databases(DATABASES['default']))
+TENANT_SHARDING = {**TENANT_SHARDING, 'SHARDS': list(DATABASES)}
+_replicas, _replica_aliases = replica_databases(DATABASES)
+DATABASES.update(_replicas)
+READ_REPLICAS = {**READ_REPLICAS, 'REPLICAS': _replica_aliases}
 
 # Paramètres de développement supplémentaires
 LOGGING = {
@@ -38,4 +43,12 @@ LOGGING = {
         'handlers': ['console'],
         'level': 'INFO',
     },
-}
\ No newline at end of file
+}
+
+# Tenant unique de développement, résolu sans le tenant-service
+DEFAULT_TENANT_ID = os.environ.get('DEFAULT_TENANT_ID', '284e521a-7899-4290-88e3-ea6a50913210')
+TENANT_RESOLUTION = {
+    **TENANT_RESOLUTION,
+    'RESOLVER': os.environ.get('TENANT_RESOLVER', 'static'),
+    'TENANTS': {DEFAULT_TENANT_ID: {'name': "Tenant de développement"}},
+}
@@ -17,6 +17,11 @@ DATABASES = {
         'PORT': os.environ.get('DB_PORT', '5432'),
     }
 }
+DATABASES.update(shard_databases(DATABASES['default']))
+TENANT_SHARDING = {**TENANT_SHARDING, 'SHARDS': list(DATABASES)}
+_replicas, _replica_aliases = replica_databases(DATABASES)
+DATABASES.update(_replicas)
+READ_REPLICAS = {**READ_REPLICAS, 'REPLICAS': _replica_aliases}
 
 # Security settings
 SECURE_SSL_REDIRECT = True
@@ -12,7 +12,18 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Shard des tests de répartition des tenants (TENANT_SHARDING surchargé par ces tests)
+    'shard_1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+    # Réplica simulé des tests de READ_REPLICAS : base distincte, sans réplication,
+    # pour voir quelle base sert les lectures
+    'default_replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
 
 # Disable password hashing to speed up tests
@@ -30,4 +41,12 @@ LOGGING = {
 }
 
 # Make tests run faster
-DEBUG_PROPAGATE_EXCEPTIONS = True
\ No newline at end of file
+DEBUG_PROPAGATE_EXCEPTIONS = True
+
+# Tenant unique de test, résolu sans le tenant-service
+DEFAULT_TENANT_ID = '284e521a-7899-4290-88e3-ea6a50913210'
+TENANT_RESOLUTION = {
+    **TENANT_RESOLUTION,
+    'RESOLVER': 'static',
+    'TENANTS': {DEFAULT_TENANT_ID: {'name': "Tenant de test"}},
+}